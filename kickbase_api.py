@@ -0,0 +1,344 @@
+"""
+Asynchroner Python-Client für die Kickbase v4 API, abgeleitet aus der Swagger-Spezifikation
+KickbaseCore/Sources/KickbaseCore/Resources/kickbasev4.json.
+
+Jede Operation der Spezifikation wird zu einer Methode (GET /v4/competitions/{competitionId}/players/
+{playerId}/performance -> get_competitions_players_performance(competitionId=..., playerId=...)).
+Alle Aufrufe teilen einen HTTP/2 Keep-Alive Pool; Antworten werden erst beim Zugriff dekodiert
+und in Modelle mit __slots__ verpackt.
+
+    async with KickbaseClient(token=...) as api:
+        results = await api.batch(api.get_competitions_players_performance,
+                                  [{'competitionId': 1, 'playerId': pid} for pid in player_ids])
+"""
+import asyncio
+import json
+import keyword
+import os
+import re
+
+import httpx
+
+from ligainsider_throttle import AdaptiveLimiter, request_with_retry_async
+
+BASE_URL = "https://api.kickbase.com"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SPEC_PATH = os.path.join(SCRIPT_DIR, "KickbaseCore", "Sources", "KickbaseCore", "Resources", "kickbasev4.json")
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_TIMEOUT = 15
+
+PATH_PARAM_RE = re.compile(r'\{([^}]+)\}')
+CAMEL_RE = re.compile(r'(?<=[a-z0-9])([A-Z])')
+
+class KickbaseAPIError(Exception):
+    def __init__(self, status, operation, body=b""):
+        super().__init__(f"{operation}: HTTP {status}")
+        self.status = status
+        self.operation = operation
+        self.body = body
+
+def snake_case(name):
+    return CAMEL_RE.sub(r'_\1', name).replace('-', '_').lower()
+
+def attribute_name(key):
+    """
+    JSON-Schlüssel als Attributname (ungültige Namen und Python-Schlüsselwörter bekommen '_').
+    """
+    name = re.sub(r'\W', '_', key)
+    if not name or name[0].isdigit() or keyword.iskeyword(name):
+        name += '_'
+    return name
+
+# ---------------------------------------------------------------------------------------------
+# Modelle
+# ---------------------------------------------------------------------------------------------
+
+class Model:
+    """
+    Basis der generierten Antwort-Modelle. Hält das dekodierte JSON-Objekt und wandelt
+    verschachtelte Objekte/Listen erst beim ersten Attributzugriff um.
+    Unbekannte Felder sind per model['key'] erreichbar.
+    """
+    __slots__ = ('_data', '_cache')
+    _schema = {}
+
+    def __init__(self, data):
+        self._data = data if isinstance(data, dict) else {}
+        self._cache = None
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def to_dict(self):
+        return self._data
+
+    def __repr__(self):
+        keys = ", ".join(list(self._data)[:6])
+        return f"<{type(self).__name__} {keys}{', ...' if len(self._data) > 6 else ''}>"
+
+def _converter(schema, name):
+    """
+    Funktion, die einen Rohwert passend zum Schema umwandelt (None = unverändert).
+    """
+    kind = schema.get('type')
+    if kind == 'object' or 'properties' in schema:
+        if not schema.get('properties'):
+            return None
+        model = make_model(name, schema)
+        return lambda value: model(value) if isinstance(value, dict) else value
+    if kind == 'array' and isinstance(schema.get('items'), dict):
+        convert = _converter(schema['items'], name + "Item")
+        if convert is None:
+            return None
+        return lambda value: [convert(item) for item in value] if isinstance(value, list) else value
+    return None
+
+def _field(key, schema, name):
+    # Konverter erst beim ersten Zugriff bauen: verschachtelte Klassen entstehen nur bei Bedarf
+    state = []
+
+    def getter(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        elif key in cache:
+            return cache[key]
+        if not state:
+            state.append(_converter(schema, name))
+        value = self._data.get(key)
+        if value is not None and state[0] is not None:
+            value = state[0](value)
+        cache[key] = value
+        return value
+
+    return property(getter, doc=f"{key} ({schema.get('type', 'object')})")
+
+def make_model(name, schema):
+    """
+    Erzeugt eine Modellklasse mit __slots__ und einer Property pro Schema-Feld.
+    """
+    namespace = {'__slots__': (), '_schema': schema}
+    for key, prop in (schema.get('properties') or {}).items():
+        attr = attribute_name(key)
+        if attr in Model.__dict__ or attr in ('_data', '_cache', '_schema'):
+            attr += '_'
+        namespace[attr] = _field(key, prop if isinstance(prop, dict) else {},
+                                 name + attr[:1].upper() + attr[1:])
+    return type(name, (Model,), namespace)
+
+class ApiResponse:
+    """
+    Antwort eines Aufrufs; der Body wird erst bei .json()/.data dekodiert.
+    """
+    __slots__ = ('status', 'headers', 'content', '_operation', '_json', '_data')
+
+    def __init__(self, operation, status, headers, content):
+        self._operation = operation
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self._json = None
+        self._data = None
+
+    def json(self):
+        if self._json is None and self.content:
+            self._json = json.loads(self.content)
+        return self._json
+
+    @property
+    def data(self):
+        """
+        Antwort als Modell der Operation (bzw. Liste von Modellen).
+        """
+        if self._data is None:
+            raw = self.json()
+            convert = self._operation.converter()
+            self._data = convert(raw) if convert is not None and raw is not None else raw
+        return self._data
+
+# ---------------------------------------------------------------------------------------------
+# Operationen aus der Spezifikation
+# ---------------------------------------------------------------------------------------------
+
+class Operation:
+    __slots__ = ('name', 'method', 'path', 'path_params', 'query_params', 'has_body', 'summary',
+                 'response_schema', '_converter')
+
+    def __init__(self, name, method, path, parameters, response_schema, summary=""):
+        self.name = name
+        self.method = method.upper()
+        self.path = path
+        self.path_params = PATH_PARAM_RE.findall(path)
+        self.query_params = [p['name'] for p in parameters if p.get('in') == 'query']
+        self.has_body = any(p.get('in') == 'body' for p in parameters)
+        self.summary = summary
+        self.response_schema = response_schema or {}
+        self._converter = None
+
+    def converter(self):
+        if self._converter is None:
+            model_name = "".join(part[:1].upper() + part[1:] for part in self.name.split('_')) + "Response"
+            self._converter = (_converter(self.response_schema, model_name),)
+        return self._converter[0]
+
+    def url_path(self, path_values):
+        missing = [name for name in self.path_params if name not in path_values]
+        if missing:
+            raise TypeError(f"{self.name}: fehlende Pfad-Parameter {', '.join(missing)}")
+        return PATH_PARAM_RE.sub(lambda match: str(path_values[match.group(1)]), self.path)
+
+    def __repr__(self):
+        return f"<Operation {self.name}: {self.method} {self.path}>"
+
+def operation_name(method, path):
+    """
+    GET /v4/leagues/{leagueId}/players/{playerId}/marketvalue/{timeframe}
+    -> get_leagues_players_marketvalue_by_timeframe
+    """
+    segments = [segment for segment in path.split('/')[2:] if segment]
+    words = [snake_case(segment) for segment in segments if not segment.startswith('{')]
+    name = "_".join([method.lower()] + words)
+    if segments and segments[-1].startswith('{'):
+        name += "_by_" + snake_case(segments[-1][1:-1])
+    return name
+
+def load_spec(path=None):
+    with open(path or SPEC_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_operations(spec):
+    """
+    Liefert name -> Operation für alle Pfade und Methoden der Spezifikation.
+    """
+    operations = {}
+    for path, item in spec.get('paths', {}).items():
+        shared = item.get('parameters', [])
+        for method, op in item.items():
+            if method == 'parameters':
+                continue
+            name = operation_name(method, path)
+            if name in operations:
+                raise ValueError(f"Doppelter Operationsname {name} für {path}")
+            response = op.get('responses', {}).get('200', {})
+            operations[name] = Operation(name, method, path, shared + op.get('parameters', []),
+                                         response.get('schema'), response.get('description', ''))
+    return operations
+
+_operations = None
+
+def get_operations():
+    global _operations
+    if _operations is None:
+        _operations = build_operations(load_spec())
+    return _operations
+
+# ---------------------------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------------------------
+
+class KickbaseClient:
+    """
+    Ein Client = ein HTTP/2 Keep-Alive Pool für alle Aufrufe und Batches.
+    """
+
+    def __init__(self, token=None, base_url=BASE_URL, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 timeout=DEFAULT_TIMEOUT, http2=True, operations=None):
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.operations = operations or get_operations()
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        try:
+            self._client = httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout,
+                                             headers={'Accept': 'application/json'})
+        except ImportError:
+            # http2=True braucht das Paket h2; ohne läuft der Pool über HTTP/1.1
+            self._client = httpx.AsyncClient(limits=limits, timeout=timeout, headers={'Accept': 'application/json'})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def __getattr__(self, name):
+        operations = self.__dict__.get('operations') or {}
+        if name not in operations:
+            raise AttributeError(name)
+        operation = operations[name]
+
+        async def call(body=None, limiter=None, **params):
+            return await self.call(operation, body=body, limiter=limiter, **params)
+
+        call.__name__ = name
+        call.__doc__ = f"{operation.method} {operation.path}"
+        call.operation = operation
+        return call
+
+    async def login(self, email, password):
+        """
+        POST /v4/user/login; übernimmt das Token (tkn) für alle weiteren Aufrufe.
+        """
+        response = await self.call('post_user_login', body={'em': email, 'pass': password, 'loy': False, 'rep': {}})
+        self.token = response.json().get('tkn')
+        return response
+
+    async def call(self, operation, body=None, limiter=None, **params):
+        """
+        Führt eine Operation aus. Pfad-Parameter und Query-Parameter werden als Keywords übergeben,
+        body als JSON-Objekt. 429/5xx werden mit Backoff wiederholt.
+        """
+        if isinstance(operation, str):
+            operation = self.operations[operation]
+        path_values = {name: params.pop(name) for name in operation.path_params if name in params}
+        url = self.base_url + operation.url_path(path_values)
+        unknown = [name for name in params if name not in operation.query_params]
+        if unknown:
+            raise TypeError(f"{operation.name}: unbekannte Parameter {', '.join(unknown)}")
+        query = {name: value for name, value in params.items() if value is not None}
+
+        headers = {}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        content = None
+        if body is not None:
+            content = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        response = await request_with_retry_async(
+            lambda: self._client.request(operation.method, url, params=query, headers=headers, content=content),
+            limiter)
+        if response.status_code >= 400:
+            raise KickbaseAPIError(response.status_code, operation.name, response.content)
+        return ApiResponse(operation, response.status_code, response.headers, response.content)
+
+    async def batch(self, operation, param_list, max_concurrency=DEFAULT_MAX_CONCURRENCY, return_exceptions=True):
+        """
+        Führt dieselbe Operation für viele Parameter-Sätze gleichzeitig aus (adaptiv begrenzt).
+        Ergebnisse in Eingabe-Reihenfolge; Fehler stehen mit return_exceptions=True als Exception
+        an ihrer Stelle.
+        """
+        operation = getattr(operation, 'operation', operation)
+        limiter = AdaptiveLimiter(max_concurrency)
+
+        async def one(params):
+            params = dict(params)
+            body = params.pop('body', None)
+            return await self.call(operation, body=body, limiter=limiter, **params)
+
+        return await asyncio.gather(*(one(params) for params in param_list), return_exceptions=return_exceptions)
+
+if __name__ == "__main__":
+    for operation in get_operations().values():
+        params = ", ".join(operation.path_params + [f"{name}=None" for name in operation.query_params])
+        print(f"{operation.name}({params})  ->  {operation.method} {operation.path}")
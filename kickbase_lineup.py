@@ -0,0 +1,558 @@
+"""
+Exakte Aufstellungs-Optimierung (Formation + Startelf) unter Budget- und Positionsvorgaben.
+
+Ersetzt die gierige Suche aus generateOptimalLineupComparison / generateHybridLineup /
+findBestMarketPlayerForPosition (PlayerRecommendationService.swift): statt pro Slot den
+besten Marktspieler zu nehmen und erst danach isHybridLineupAffordable zu prüfen, wird die
+beste finanzierbare Kombination exakt bestimmt.
+
+Budget wie in isHybridLineupAffordable: Marktkäufe müssen durch Kontostand + Verkauf der
+eigenen Spieler außerhalb der Startelf gedeckt sein. Ein eigener Startelf-Spieler "kostet"
+also seinen Marktwert (er kann nicht verkauft werden), ein Marktspieler seinen Preis; die
+Aufstellung ist finanzierbar, wenn die Summe <= Kontostand + Marktwert des ganzen Kaders ist.
+
+Pro Position wird einmal die Pareto-Front (Kosten, Score) für 0..k Spieler berechnet
+(dominierte Kandidaten vorher entfernt), pro Formation die Summe der vier Fronten. Danach
+ist jedes Budget-Szenario eine Binärsuche. Das Vereinslimit (mpst) gilt wie in Swift nur
+für Marktspieler; verletzt das Optimum es, sucht ein Branch-and-Bound mit den Fronten als
+Schranke die beste zulässige Aufstellung.
+
+    python kickbase_lineup.py --squad squad.json --market market.json --budget -2500000
+    python kickbase_lineup.py --bench
+"""
+import argparse
+import heapq
+import itertools
+import json
+import time
+
+import numpy as np
+
+from kickbase_scoring import _first, load_json, player_list
+
+# Formationen aus LineupOptimizerView.Formation als (TW, ABW, MF, ST)
+FORMATIONS = {
+    "4-4-2": (1, 4, 4, 2),
+    "4-2-4": (1, 4, 2, 4),
+    "3-4-3": (1, 3, 4, 3),
+    "4-3-3": (1, 4, 3, 3),
+    "5-3-2": (1, 5, 3, 2),
+    "3-5-2": (1, 3, 5, 2),
+    "5-4-1": (1, 5, 4, 1),
+    "4-5-1": (1, 4, 5, 1),
+    "3-6-1": (1, 3, 6, 1),
+    "5-2-3": (1, 5, 2, 3),
+}
+POSITIONS = (1, 2, 3, 4)
+MAX_PER_POSITION = tuple(max(counts[i] for counts in FORMATIONS.values()) for i in range(4))
+DEFAULT_MAX_PLAYERS_PER_TEAM = 3
+
+# Vorfilter für Marktspieler aus generateOptimalLineupComparison
+EXCLUDED_STATUS = (8, 16)
+MIN_MARKET_TOTAL_POINTS = 140
+
+def slot_scores(average_points, market_value_trend, status, position):
+    """
+    calculatePlayerScore / calculateMarketPlayerScore für ganze Arrays.
+    """
+    average_points = np.asarray(average_points, dtype=np.float64)
+    trend = np.asarray(market_value_trend)
+    status = np.asarray(status)
+    position = np.asarray(position)
+    score = average_points * 2.0
+    score = score + np.select([trend > 1_000_000, trend < -1_000_000], [2.0, -2.0], 0.0)
+    score = score + np.select([status == 1, status == 2], [-5.0, -2.0], 0.0)
+    score = score * np.select([position == 1, position == 4], [1.2, 1.15], 1.0)
+    return np.maximum(0.0, score)
+
+class Candidates:
+    """
+    Alle Spieler, die in die Startelf können: eigene (owned, Kosten = Marktwert) und
+    Marktspieler (Kosten = Preis).
+    """
+    __slots__ = ("ids", "names", "position", "score", "cost", "owned", "club", "own_value")
+
+    def __init__(self, ids, names, position, score, cost, owned, club):
+        self.ids = np.asarray(ids, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.position = np.asarray(position, dtype=np.int64)
+        self.score = np.asarray(score, dtype=np.float64)
+        self.cost = np.asarray(cost, dtype=np.int64)
+        self.owned = np.asarray(owned, dtype=bool)
+        self.club = np.asarray(club, dtype=object)
+        self.own_value = int(self.cost[self.owned].sum())
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_players(cls, team_players, market_players=()):
+        team_players = list(team_players)
+        team_ids = {str(_first(p, ("id", "i"), "")) for p in team_players}
+        market_players = [p for p in market_players
+                          if int(_first(p, ("st", "status"), 0)) not in EXCLUDED_STATUS
+                          and int(_first(p, ("totalPoints", "p", "points"), 0)) >= MIN_MARKET_TOTAL_POINTS
+                          and str(_first(p, ("id", "playerId", "i", "pId"), "")) not in team_ids]
+        players = team_players + market_players
+        owned = [True] * len(team_players) + [False] * len(market_players)
+
+        position = [int(_first(p, ("position", "pos"), 0)) for p in players]
+        score = slot_scores([float(_first(p, ("averagePoints", "ap", "avgPoints"), 0.0)) for p in players],
+                            [int(_first(p, ("marketValueTrend", "mvt"), 0)) for p in players],
+                            [int(_first(p, ("st", "status"), 0)) for p in players], position)
+        cost = [int(_first(p, ("marketValue", "mv"), 0)) if own else int(_first(p, ("price", "prc"), 0))
+                for p, own in zip(players, owned)]
+        return cls([str(_first(p, ("id", "playerId", "i", "pId"), "")) for p in players],
+                   [" ".join(filter(None, (_first(p, ("firstName", "fn"), ""), _first(p, ("lastName", "ln", "n"), ""))))
+                    for p in players],
+                   position, score, cost, owned,
+                   [str(_first(p, ("teamId", "tid"), "")) for p in players])
+
+# ---------------------------------------------------------------------------------------------
+# Pareto-Fronten
+# ---------------------------------------------------------------------------------------------
+
+class Frontier:
+    """
+    Nicht dominierte (Kosten, Score)-Punkte, Kosten aufsteigend und Score streng steigend.
+    picks[i] sind die Kandidaten-Indizes von Punkt i (Zeilen einer 2D-Matrix).
+    """
+    __slots__ = ("cost", "score", "picks")
+
+    def __init__(self, cost, score, picks):
+        self.cost = cost
+        self.score = score
+        self.picks = picks
+
+    def __len__(self):
+        return len(self.cost)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(1, dtype=np.int64), np.zeros(1), np.zeros((1, 0), dtype=np.int64))
+
+    def best_index(self, capacity):
+        """
+        Index des besten Punkts mit Kosten <= capacity (-1 = keiner).
+        """
+        return int(np.searchsorted(self.cost, capacity, side="right")) - 1
+
+def pareto(cost, score, picks):
+    order = np.lexsort((-score, cost))
+    cost, score, picks = cost[order], score[order], picks[order]
+    # Punkt bleibt, wenn er mehr Score hat als alle billigeren (bei gleichen Kosten: der beste)
+    previous = np.maximum.accumulate(np.concatenate(([-np.inf], score[:-1])))
+    keep = score > previous
+    return Frontier(cost[keep], score[keep], picks[keep])
+
+def prune_dominated(candidates, indices, slots, club_limit):
+    """
+    Entfernt Kandidaten, die von mindestens `slots` anderen dominiert werden (Score >= und
+    Kosten <=): sie können nie in einer optimalen Auswahl nötig sein. Mit Vereinslimit zählen
+    nur Dominatoren, die ohne Limit-Folgen tauschbar sind (eigene oder vom selben Verein).
+    """
+    if len(indices) <= slots:
+        return indices
+    score = candidates.score[indices]
+    cost = candidates.cost[indices]
+    # Gleichstände über den Index brechen, damit sich zwei gleiche Spieler nicht gegenseitig entfernen
+    rank = np.arange(len(indices))
+    dominates = ((score[:, None] > score[None, :]) | ((score[:, None] == score[None, :]) & (rank[:, None] < rank[None, :]))) \
+        & (cost[:, None] <= cost[None, :])
+    dominates |= (score[:, None] >= score[None, :]) & (cost[:, None] < cost[None, :])
+    np.fill_diagonal(dominates, False)
+    if club_limit is not None:
+        owned = candidates.owned[indices]
+        club = candidates.club[indices]
+        dominates &= owned[:, None] | (club[:, None] == club[None, :])
+    return indices[dominates.sum(axis=0) < slots]
+
+def position_frontiers(candidates, indices, max_count):
+    """
+    Fronten für genau 0..max_count Spieler aus indices (0/1-Rucksack mit Anzahl, exakt).
+    """
+    frontiers = [Frontier.empty()] + [Frontier(np.zeros(0, dtype=np.int64), np.zeros(0),
+                                               np.zeros((0, count), dtype=np.int64))
+                                      for count in range(1, max_count + 1)]
+    for candidate in indices:
+        cost = candidates.cost[candidate]
+        score = candidates.score[candidate]
+        for count in range(max_count, 0, -1):
+            base = frontiers[count - 1]
+            if not len(base):
+                continue
+            current = frontiers[count]
+            added = np.column_stack((base.picks, np.full(len(base), candidate, dtype=np.int64)))
+            frontiers[count] = pareto(np.concatenate((current.cost, base.cost + cost)),
+                                      np.concatenate((current.score, base.score + score)),
+                                      np.concatenate((current.picks, added)))
+    return frontiers
+
+def combine(first, second, block_size=200_000):
+    """
+    Pareto-Front der Summe zweier Fronten (in Blöcken, damit das Kreuzprodukt klein bleibt).
+    """
+    if not len(first) or not len(second):
+        width = first.picks.shape[1] + second.picks.shape[1]
+        return Frontier(np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros((0, width), dtype=np.int64))
+    chunk = max(1, block_size // len(second))
+    result = None
+    for start in range(0, len(first), chunk):
+        block = slice(start, start + chunk)
+        cost = (first.cost[block, None] + second.cost[None, :]).ravel()
+        score = (first.score[block, None] + second.score[None, :]).ravel()
+        left = np.repeat(first.picks[block], len(second), axis=0)
+        right = np.tile(second.picks, (len(first.picks[block]), 1))
+        part = pareto(cost, score, np.concatenate((left, right), axis=1))
+        if result is not None:
+            part = pareto(np.concatenate((result.cost, part.cost)), np.concatenate((result.score, part.score)),
+                          np.concatenate((result.picks, part.picks)))
+        result = part
+    return result
+
+# ---------------------------------------------------------------------------------------------
+# Solver
+# ---------------------------------------------------------------------------------------------
+
+class Lineup:
+    __slots__ = ("formation", "picks", "score", "cost", "market_cost", "sale_proceeds")
+
+    def __init__(self, formation, picks, score, cost, market_cost, sale_proceeds):
+        self.formation = formation
+        self.picks = picks
+        self.score = score
+        self.cost = cost
+        self.market_cost = market_cost
+        self.sale_proceeds = sale_proceeds
+
+    def to_dict(self, candidates):
+        slots = sorted(self.picks, key=lambda i: (candidates.position[i], -candidates.score[i]))
+        return {
+            "formation": self.formation,
+            "totalLineupScore": round(self.score, 3),
+            "averagePlayerScore": round(self.score / len(slots), 3) if slots else 0.0,
+            "totalMarketCost": self.market_cost,
+            "saleProceeds": self.sale_proceeds,
+            "marketPlayersNeeded": [candidates.ids[i] for i in slots if not candidates.owned[i]],
+            "slots": [{
+                "positionType": int(candidates.position[i]),
+                "playerId": candidates.ids[i],
+                "name": candidates.names[i],
+                "owned": bool(candidates.owned[i]),
+                "slotScore": round(float(candidates.score[i]), 3),
+            } for i in slots],
+        }
+
+class LineupSolver:
+    """
+    Fronten werden pro Position einmal und pro Formation beim ersten Gebrauch berechnet;
+    solve()/evaluate() sind danach nur noch Suchen darin.
+    max_players_per_team=None schaltet das Vereinslimit ab.
+    """
+
+    def __init__(self, candidates, max_players_per_team=DEFAULT_MAX_PLAYERS_PER_TEAM):
+        self.candidates = candidates
+        self.club_limit = max_players_per_team
+        self.pools = []
+        self.position_fronts = []
+        for index, position in enumerate(POSITIONS):
+            indices = np.flatnonzero(candidates.position == position)
+            indices = indices[np.argsort(-candidates.score[indices], kind="stable")]
+            self.pools.append(indices)
+            self.position_fronts.append(self._position_fronts(index, indices))
+        self._pool_sets = [frozenset(int(i) for i in pool) for pool in self.pools]
+        self._formation_fronts = {}
+        self._restricted_fronts = {}
+        self._halves = {}
+        self._constrained = {}
+
+    def _position_fronts(self, index, indices):
+        indices = prune_dominated(self.candidates, indices, MAX_PER_POSITION[index], self.club_limit)
+        return position_frontiers(self.candidates, indices, MAX_PER_POSITION[index])
+
+    def frontier(self, formation):
+        counts = FORMATIONS[formation]
+        front = self._formation_fronts.get(counts)
+        if front is None:
+            front = self.position_fronts[0][counts[0]]
+            for index in range(1, 4):
+                front = combine(front, self.position_fronts[index][counts[index]])
+            self._formation_fronts[counts] = front
+        return front
+
+    def capacity(self, budget):
+        """
+        Budget (Kontostand) -> zulässige Summe der Kosten; None = unbegrenzt.
+        """
+        if budget is None:
+            return np.iinfo(np.int64).max
+        return budget + self.candidates.own_value
+
+    def _lineup(self, formation, picks):
+        candidates = self.candidates
+        picks = [int(i) for i in picks]
+        owned = candidates.owned[picks]
+        used_value = int(candidates.cost[picks][owned].sum())
+        return Lineup(formation, picks, float(candidates.score[picks].sum()), int(candidates.cost[picks].sum()),
+                      int(candidates.cost[picks][~owned].sum()), candidates.own_value - used_value)
+
+    def _club_violation(self, picks):
+        """
+        Marktspieler des ersten Vereins über dem Limit (None = Aufstellung zulässig).
+        """
+        if self.club_limit is None:
+            return None
+        by_club = {}
+        for i in picks:
+            if not self.candidates.owned[i]:
+                by_club.setdefault(self.candidates.club[i], []).append(int(i))
+        for players in by_club.values():
+            if len(players) > self.club_limit:
+                return players
+        return None
+
+    def solve(self, formation, budget=None):
+        """
+        Beste Aufstellung für eine Formation (None, wenn keine vollständige Elf finanzierbar ist).
+        """
+        return self._solve(formation, self.capacity(budget))
+
+    def _solve(self, formation, capacity):
+        front = self.frontier(formation)
+        index = front.best_index(capacity)
+        if index < 0:
+            return None
+        if self._club_violation(front.picks[index]) is None:
+            return self._lineup(formation, front.picks[index])
+        return self._solve_with_club_limit(formation, capacity)
+
+    def best(self, budget=None, formations=None):
+        """
+        Beste Formation samt Elf für ein Budget.
+        """
+        best = None
+        for formation in formations or FORMATIONS:
+            lineup = self.solve(formation, budget)
+            if lineup is not None and (best is None or lineup.score > best.score):
+                best = lineup
+        return best
+
+    def evaluate(self, budgets, formations=None):
+        """
+        Bester Score je (Formation, Budget) als Matrix (NaN = nicht finanzierbar). Für "Was wäre
+        wenn"-Auswertungen: alle Budgets einer Formation mit einer searchsorted-Abfrage; nur
+        Punkte, die das Vereinslimit verletzen, gehen einzeln durch die Suche.
+        """
+        formations = list(formations or FORMATIONS)
+        budgets = np.asarray(budgets, dtype=np.int64)
+        capacity = budgets + self.candidates.own_value
+        scores = np.full((len(formations), len(budgets)), np.nan)
+        for row, formation in enumerate(formations):
+            front = self.frontier(formation)
+            index = np.searchsorted(front.cost, capacity, side="right") - 1
+            feasible = index >= 0
+            scores[row, feasible] = front.score[index[feasible]]
+            if self.club_limit is None:
+                continue
+            invalid = {}
+            for point in np.unique(index[feasible]):
+                invalid[int(point)] = self._club_violation(front.picks[point]) is not None
+            columns = [column for column in np.flatnonzero(feasible) if invalid[int(index[column])]]
+            # Von oben nach unten: ein Ergebnis gilt für alle Budgets bis hinab zu seinen Kosten
+            for column in sorted(columns, key=lambda column: -capacity[column]):
+                lineup = self._solve_with_club_limit(formation, int(capacity[column]))
+                scores[row, column] = lineup.score if lineup is not None else np.nan
+        return formations, scores
+
+    # -----------------------------------------------------------------------------------------
+    # Vereinslimit: Best-First Branch-and-Bound über ausgeschlossene Marktspieler
+    # -----------------------------------------------------------------------------------------
+
+    def _fronts_without(self, index, excluded):
+        excluded = excluded & self._pool_sets[index]
+        if not excluded:
+            return self.position_fronts[index], excluded
+        key = (index, excluded)
+        fronts = self._restricted_fronts.get(key)
+        if fronts is None:
+            pool = np.array([i for i in self.pools[index] if int(i) not in excluded], dtype=np.int64)
+            fronts = self._restricted_fronts[key] = self._position_fronts(index, pool)
+        return fronts, excluded
+
+    def _half(self, first, counts, excluded):
+        # Front zweier benachbarter Positionen (TW+ABW bzw. MF+ST)
+        fronts_a, excluded_a = self._fronts_without(first, excluded)
+        fronts_b, excluded_b = self._fronts_without(first + 1, excluded)
+        key = (first, counts[first], counts[first + 1], excluded_a, excluded_b)
+        half = self._halves.get(key)
+        if half is None:
+            half = self._halves[key] = combine(fronts_a[counts[first]], fronts_b[counts[first + 1]])
+        return half
+
+    def _relaxed(self, counts, capacity, excluded):
+        """
+        Optimum ohne Vereinslimit, wenn die Spieler in excluded fehlen: (Score, picks) oder None.
+        """
+        first = self._half(0, counts, excluded)
+        second = self._half(2, counts, excluded)
+        affordable = first.cost <= capacity
+        if not affordable.any():
+            return None
+        match = np.searchsorted(second.cost, capacity - first.cost[affordable], side="right") - 1
+        valid = match >= 0
+        if not valid.any():
+            return None
+        totals = first.score[affordable][valid] + second.score[match[valid]]
+        best = int(np.argmax(totals))
+        picks = np.concatenate((first.picks[affordable][valid][best], second.picks[match[valid][best]]))
+        return float(totals[best]), picks
+
+    def _solve_with_club_limit(self, formation, capacity):
+        """
+        Verletzt das Optimum das Vereinslimit, muss jede zulässige Elf mindestens einen der
+        Marktspieler dieses Vereins auslassen: je ein Zweig pro Spieler. Die Zweige werden nach
+        ihrem Optimum ohne Limit (obere Schranke) abgearbeitet; der erste zulässige ist optimal.
+        Ein Ergebnis gilt für alle Budgets zwischen seinen Kosten und capacity.
+        """
+        for low, high, lineup in self._constrained.get(formation, ()):
+            if low <= capacity <= high:
+                return lineup
+
+        counts = FORMATIONS[formation]
+        root = self._relaxed(counts, capacity, frozenset())
+        result = None
+        if root is not None:
+            order = itertools.count()
+            heap = [(-root[0], next(order), frozenset(), root[1])]
+            seen = {frozenset()}
+            while heap:
+                _, _, excluded, picks = heapq.heappop(heap)
+                players = self._club_violation(picks)
+                if players is None:
+                    result = self._lineup(formation, picks)
+                    break
+                for player in players:
+                    child = excluded | {player}
+                    if child in seen:
+                        continue
+                    seen.add(child)
+                    relaxed = self._relaxed(counts, capacity, child)
+                    if relaxed is not None:
+                        heapq.heappush(heap, (-relaxed[0], next(order), child, relaxed[1]))
+
+        low = result.cost if result is not None else np.iinfo(np.int64).min
+        self._constrained.setdefault(formation, []).append((low, capacity, result))
+        return result
+
+def brute_force(candidates, formation, budget=None, club_limit=None):
+    """
+    Referenz für kleine Kader: probiert alle Kombinationen durch.
+    """
+    counts = FORMATIONS[formation]
+    capacity = np.iinfo(np.int64).max if budget is None else budget + candidates.own_value
+    pools = [np.flatnonzero(candidates.position == position) for position in POSITIONS]
+    best = None
+    for combo in itertools.product(*(itertools.combinations(pool, count) for pool, count in zip(pools, counts))):
+        picks = [i for group in combo for i in group]
+        if candidates.cost[picks].sum() > capacity:
+            continue
+        if club_limit is not None:
+            market = [candidates.club[i] for i in picks if not candidates.owned[i]]
+            if any(market.count(club) > club_limit for club in market):
+                continue
+        score = candidates.score[picks].sum()
+        if best is None or score > best:
+            best = score
+    return best
+
+def random_players(rng, own=16, market=300, clubs=18):
+    """
+    Kader + Markt mit Preisen, die grob mit den Punkten steigen (für --bench).
+    """
+    players = []
+    for index in range(own + market):
+        average = float(rng.gamma(2.0, 40.0))
+        value = int(max(500_000, average * 120_000 * rng.uniform(0.6, 1.4)) // 10_000 * 10_000)
+        players.append({
+            "i": f"p{index}",
+            "pos": int(rng.choice(POSITIONS, p=[0.12, 0.33, 0.35, 0.20])),
+            "ap": round(average, 1),
+            "p": int(average * rng.uniform(4, 12)) + 140,
+            "mv": value,
+            "prc": int(value * rng.uniform(0.95, 1.3)),
+            "mvt": int(rng.integers(-2_000_000, 2_000_000)),
+            "st": int(rng.choice([0, 0, 0, 0, 1, 2])),
+            "tid": str(rng.integers(0, clubs)),
+        })
+    return players[:own], players[own:]
+
+def verify(seed=0, rounds=30):
+    """
+    Vergleicht den Solver mit brute_force() auf kleinen Zufallskadern (mit/ohne Budget und Vereinslimit).
+    """
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for _ in range(rounds):
+        team, market = random_players(rng, own=int(rng.integers(8, 14)), market=int(rng.integers(4, 9)), clubs=3)
+        candidates = Candidates.from_players(team, market)
+        formation = str(rng.choice(list(FORMATIONS)))
+        budget = None if rng.random() < 0.2 else int(rng.integers(-candidates.own_value, 20_000_000))
+        club_limit = None if rng.random() < 0.3 else int(rng.integers(1, 3))
+        lineup = LineupSolver(candidates, club_limit).solve(formation, budget)
+        expected = brute_force(candidates, formation, budget, club_limit)
+        actual = lineup.score if lineup is not None else None
+        if (expected is None) != (actual is None) or (expected is not None and abs(expected - actual) > 1e-9):
+            mismatches += 1
+            print(f"❌ {formation} budget={budget} limit={club_limit}: {actual} != {expected}")
+    print(f"{'✅' if not mismatches else '❌'} {rounds} Zufallskader gegen Brute-Force, {mismatches} Abweichungen")
+    return mismatches
+
+def bench(seed=0, scenarios=10000):
+    rng = np.random.default_rng(seed)
+    team, market = random_players(rng)
+    started = time.perf_counter()
+    solver = LineupSolver(Candidates.from_players(team, market))
+    for formation in FORMATIONS:
+        solver.frontier(formation)
+    prepared = time.perf_counter() - started
+    sizes = ", ".join(f"{name}: {len(solver.frontier(name))}" for name in FORMATIONS)
+    print(f"Vorberechnung {len(team)} eigene + {len(market)} Markt: {prepared * 1000:.0f} ms (Frontpunkte {sizes})")
+
+    budgets = rng.integers(-solver.candidates.own_value, 50_000_000, scenarios // len(FORMATIONS))
+    started = time.perf_counter()
+    formations, scores = solver.evaluate(budgets)
+    elapsed = time.perf_counter() - started
+    print(f"{scores.size} Szenarien (Budget x Formation) in {elapsed * 1000:.0f} ms "
+          f"= {scores.size / elapsed:,.0f}/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exakte Aufstellung (Formation + Elf) unter Budget")
+    parser.add_argument('--squad', help="Kader-Antwort (JSON)")
+    parser.add_argument('--market', help="Markt-Antwort (JSON)")
+    parser.add_argument('--budget', type=int, help="Kontostand; ohne Angabe kein Budgetlimit")
+    parser.add_argument('--formation', choices=sorted(FORMATIONS), help="Nur diese Formation")
+    parser.add_argument('--max-per-team', type=int, default=DEFAULT_MAX_PLAYERS_PER_TEAM, help="mpst der Liga (0 = aus)")
+    parser.add_argument('--verify', action='store_true', help="Gegen Brute-Force prüfen")
+    parser.add_argument('--bench', action='store_true', help="Szenarien pro Sekunde messen")
+    args = parser.parse_args()
+
+    if args.verify:
+        raise SystemExit(1 if verify() else 0)
+    if args.bench:
+        bench()
+        raise SystemExit(0)
+    if not args.squad:
+        parser.error("--squad, --verify oder --bench angeben")
+
+    team = player_list(load_json(args.squad))
+    market = player_list(load_json(args.market)) if args.market else []
+    club_limit = args.max_per_team or None
+    formations = [args.formation] if args.formation else None
+    team_only = LineupSolver(Candidates.from_players(team), club_limit).best(None, formations)
+    hybrid_solver = LineupSolver(Candidates.from_players(team, market), club_limit)
+    hybrid = hybrid_solver.best(args.budget, formations)
+    output = {
+        "teamOnlyLineup": team_only.to_dict(Candidates.from_players(team)) if team_only else None,
+        "hybridLineup": hybrid.to_dict(hybrid_solver.candidates) if hybrid else None,
+    }
+    print(json.dumps(output, ensure_ascii=False, indent=2))
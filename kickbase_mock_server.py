@@ -0,0 +1,144 @@
+"""
+Lokaler Mock der Kickbase v4 API für Offline-Tests.
+
+Beantwortet jede Operation aus kickbasev4.json mit der Beispiel-Antwort der Spezifikation
+(aus den example-Werten des Schemas zusammengesetzt). Außer /v4/user/login verlangen alle
+Pfade einen Authorization-Header, wie die echte API.
+
+    python kickbase_mock_server.py --port 8766
+    python kickbase_api.py   # Liste aller Operationen
+"""
+import argparse
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+
+from kickbase_api import PATH_PARAM_RE, get_operations
+
+MOCK_TOKEN = "mock-token"
+
+def example_for(schema):
+    """
+    Beispielwert aus einem Schema: example, wenn vorhanden, sonst aus properties/items aufgebaut.
+    """
+    if not isinstance(schema, dict):
+        return None
+    if 'example' in schema:
+        return schema['example']
+    if 'properties' in schema:
+        return {key: example_for(prop) for key, prop in schema['properties'].items()}
+    if schema.get('type') == 'array':
+        item = example_for(schema.get('items'))
+        return [item] if item is not None else []
+    return {'string': "string", 'number': 0, 'integer': 0, 'boolean': True}.get(schema.get('type'))
+
+def build_routes(operations):
+    """
+    (Methode, Regex, Operation, Beispiel-Body) pro Operation; feste Pfade vor Pfaden mit Parametern.
+    """
+    routes = []
+    for operation in operations.values():
+        pattern = PATH_PARAM_RE.sub(r'[^/]+', re.escape(operation.path).replace(r'\{', '{').replace(r'\}', '}'))
+        example = example_for(operation.response_schema)
+        if operation.name == 'post_user_login' and isinstance(example, dict):
+            example = dict(example, tkn=MOCK_TOKEN)
+        body = json.dumps(example if example is not None else {}).encode('utf-8')
+        routes.append((operation.method, re.compile('^' + pattern.rstrip('/') + '/?$'), operation, body))
+    routes.sort(key=lambda route: len(route[2].path_params))
+    return routes
+
+class MockKickbaseServer:
+    """
+    latency in Sekunden pro Antwort; requests zählt alle Aufrufe pro Operation.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, operations=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.routes = build_routes(operations or get_operations())
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _route(self, method, path):
+        for route_method, pattern, operation, body in self.routes:
+            if route_method == method and pattern.match(path):
+                return operation, body
+        return None, None
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.latency:
+                    time.sleep(server.latency)
+
+                path = urllib.parse.urlsplit(self.path).path
+                operation, body = server._route(self.command, path)
+                if operation is None:
+                    self._send(404, b'{"err":404}')
+                    return
+                with server._lock:
+                    server.requests[operation.name] = server.requests.get(operation.name, 0) + 1
+                if operation.name != 'post_user_login' and not self.headers.get('Authorization', '').startswith('Bearer '):
+                    self._send(401, b'{"err":401}')
+                    return
+                self._send(200, body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._httpd = http.server.ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock der Kickbase v4 API mit den Beispielantworten der Spezifikation")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0, help="Latenz pro Antwort in ms")
+    args = parser.parse_args()
+    server = MockKickbaseServer(args.host, args.port, args.latency / 1000).start()
+    print(f"Kickbase-Mock läuft auf {server.base_url} ({len(server.routes)} Operationen)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,672 @@
+"""
+Verkaufs-Empfehlungen für viele Ligen in einem Batch.
+
+Portiert die Verkaufs-Strategien aus PlayerRecommendationService.swift
+(generateBudgetBalancingSales, generateRiskReductionSales, generateCapitalRaisingSales,
+generateMaxValueSales, generatePositionImprovementSales, findReplacementCandidates). In der
+App laufen sie pro Liga und Ziel einzeln; hier werden die Spieler des Wettbewerbs einmal
+geladen und alle Ziele für alle Ligen auf mehreren Kernen ausgewertet.
+
+Einmal berechnet und von allen Ligen geteilt:
+
+    PlayerPool       Spalten aller Spieler (dedupliziert nach id) mit Unwichtigkeits-Score,
+                     Risiko- und Kapital-Maske pro Spieler
+    CandidateIndex   pro Markt (gleicher Markt = gleiche Signatur) die Qualitätskandidaten pro
+                     Position, sortiert nach ihrem Anteil am Swift-Score
+                     (ap * 0.3 - Preis / 1e6 * 0.7); Kandidatenlisten pro (Position,
+                     Preisband) werden gemerkt. Preisband = Anzahl verschiedener Preise
+                     <= maxPrice, gleiche Kandidatenmenge teilt sich also einen Eintrag.
+
+Pro Liga bleiben nur Kontostand, Vereinslimit (mpst), eigene Verkäufer-ID und der Kader übrig.
+Ohne eigenen Liga-Markt dient der ganze Wettbewerb als Ersatzmarkt (Preis = Marktwert).
+Position verbessern und Maximalen Wert erzielen sind in Swift Stubs und liefern wie dort [].
+
+    python kickbase_sales.py --check                            # Parität gegen die Swift-Logik
+    python kickbase_sales.py --players players.json --leagues leagues.json --output sales.json
+    python kickbase_sales.py --league 123 --league 456 --workers 4
+
+leagues.json ist eine Liste von {"id", "budget", "mpst", "userId", "squad": [...],
+"market": [...] (optional)} mit Kader/Markt im Format der API-Antworten.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kickbase_scoring import PRIORITY_LABELS, _first, load_json, player_list, seller_id
+
+GOAL_BALANCE_BUDGET = "Budget ausgleichen"
+GOAL_IMPROVE_POSITION = "Position verbessern"
+GOAL_MAX_VALUE = "Maximalen Wert erzielen"
+GOAL_REDUCE_RISK = "Risiko reduzieren"
+GOAL_RAISE_CAPITAL = "Kapital aufbringen"
+GOALS = (GOAL_BALANCE_BUDGET, GOAL_IMPROVE_POSITION, GOAL_MAX_VALUE, GOAL_REDUCE_RISK, GOAL_RAISE_CAPITAL)
+
+PRIORITY_ESSENTIAL, PRIORITY_RECOMMENDED, PRIORITY_OPTIONAL = PRIORITY_LABELS
+
+# Filter für Ersatzspieler aus generateSaleRecommendations / findReplacementCandidates
+EXCLUDED_STATUS = (8, 16)
+MIN_AVERAGE_POINTS = 70.0
+MAX_REPLACEMENTS = 3
+PRICE_WEIGHT = 0.7
+PERFORMANCE_WEIGHT = 0.3
+
+# Faktoren für maxPrice pro Ziel
+BALANCE_PRICE_FACTOR = 0.8
+RISK_PRICE_FACTOR = 2
+CAPITAL_PRICE_FACTOR = 1.5
+
+RISK_TEXTS = {1: "verletzt", 2: "angeschlagen", 4: "im Aufbautraining"}
+CAPITAL_MAX_TOTAL_POINTS = 100
+CAPITAL_MAX_PLAYERS = 5
+BALANCE_MIN_RECOMMENDATIONS = 3
+
+# Ab dieser Zahl Kaderspieler (Ligen x Kadergröße) lohnen sich Worker-Prozesse: inline kostet
+# ein Kaderspieler gemessen ~30 µs, Start der spawn-Worker samt Übertragung von Pool und Indizes
+# ~0.65 s. Bei 4 Kernen gleicht sich das erst bei ~30000 Kaderspielern aus.
+PARALLEL_MIN_SQUAD_PLAYERS = 30_000
+
+# Sortierschlüssel und Swift-Score können bei Rundung minimal abweichen: Kandidaten innerhalb
+# dieser Toleranz zum dritten werden exakt nachbewertet
+KEY_TOLERANCE = 1e-6
+
+def _truncating_div(value, divisor):
+    # Ganzzahl-Division wie in Swift (Richtung 0)
+    quotient = abs(value) // divisor
+    return quotient if value >= 0 else -quotient
+
+def _full_name(player):
+    return " ".join(filter(None, (_first(player, ("firstName", "fn", "name"), ""),
+                                  _first(player, ("lastName", "ln", "n"), ""))))
+
+# ---------------------------------------------------------------------------------------------
+# Geteilte Daten
+# ---------------------------------------------------------------------------------------------
+
+class PlayerPool:
+    """
+    Alle Spieler des Wettbewerbs als Spalten (erste Angabe pro id gewinnt) plus die
+    ligaunabhängigen Werte der Verkaufs-Strategien.
+    """
+
+    def __init__(self, players):
+        self.rows = {}
+        unique = []
+        for player in players:
+            player_id = str(_first(player, ("id", "playerId", "i", "pId"), ""))
+            if player_id and player_id not in self.rows:
+                self.rows[player_id] = len(unique)
+                unique.append(player)
+        count = len(unique)
+
+        def ints(keys):
+            return np.fromiter((int(_first(p, keys, 0)) for p in unique), dtype=np.int64, count=count)
+
+        self.ids = np.array(list(self.rows), dtype=object)
+        self.names = np.array([_full_name(p) for p in unique], dtype=object)
+        self.team_ids = np.array([str(_first(p, ("teamId", "tid"), "")) for p in unique], dtype=object)
+        self.position = ints(("position", "pos"))
+        self.average_points = np.fromiter((float(_first(p, ("averagePoints", "ap", "avgPoints"), 0.0)) for p in unique),
+                                          dtype=np.float64, count=count)
+        self.total_points = ints(("totalPoints", "p", "points"))
+        self.market_value = ints(("marketValue", "mv"))
+        self.status = ints(("st", "status"))
+
+        # Unwichtigkeits-Score aus generateBudgetBalancingSales (niedrig = eher verkaufen)
+        self.unwantedness = self.total_points + self.average_points * 10
+        self.unwantedness -= np.where(self.status == 1, 500.0, np.where(self.status == 2, 250.0, 0.0))
+        self.risky = np.isin(self.status, tuple(RISK_TEXTS))
+        self.capital = self.total_points < CAPITAL_MAX_TOTAL_POINTS
+
+    def __len__(self):
+        return len(self.ids)
+
+    def squad_rows(self, squad):
+        """
+        Zeilen der Kaderspieler (Spieler ohne Eintrag im Pool werden übersprungen).
+        """
+        rows = [self.rows.get(str(_first(p, ("id", "playerId", "i", "pId"), ""))) for p in squad]
+        return np.array([row for row in rows if row is not None], dtype=np.int64)
+
+    def summary(self, row):
+        return {
+            "id": self.ids[row],
+            "name": self.names[row],
+            "position": int(self.position[row]),
+            "teamId": self.team_ids[row],
+            "marketValue": int(self.market_value[row]),
+            "averagePoints": float(self.average_points[row]),
+            "totalPoints": int(self.total_points[row]),
+            "status": int(self.status[row]),
+        }
+
+class CandidateIndex:
+    """
+    Ersatzkandidaten eines Marktes. Ohne Preisangabe (Wettbewerb statt Liga-Markt) gilt der
+    Marktwert als Preis. Der Filter nach eigener Verkäufer-ID und das Vereinslimit hängen
+    von der Liga ab und werden erst beim Durchlaufen angewendet.
+    """
+
+    def __init__(self, players):
+        players = list(players)
+        count = len(players)
+
+        def ints(keys):
+            return np.fromiter((int(_first(p, keys, 0)) for p in players), dtype=np.int64, count=count)
+
+        self.ids = np.array([str(_first(p, ("id", "playerId", "i", "pId"), "")) for p in players], dtype=object)
+        self.names = np.array([_full_name(p) for p in players], dtype=object)
+        self.team_ids = np.array([str(_first(p, ("teamId", "tid"), "")) for p in players], dtype=object)
+        self.seller_ids = np.array([seller_id(p) for p in players], dtype=object)
+        self.position = ints(("position", "pos"))
+        self.average_points = np.fromiter((float(_first(p, ("averagePoints", "ap", "avgPoints"), 0.0)) for p in players),
+                                          dtype=np.float64, count=count)
+        self.total_points = ints(("totalPoints", "p", "points"))
+        self.market_value = ints(("marketValue", "mv"))
+        self.price = np.fromiter((int(_first(p, ("price", "prc", "bid", "amount", "marketValue", "mv"), 0))
+                                  for p in players), dtype=np.int64, count=count)
+        self.status = ints(("st", "status"))
+        self.key = self.average_points * PERFORMANCE_WEIGHT - self.price / 1_000_000.0 * PRICE_WEIGHT
+
+        quality = (~np.isin(self.status, EXCLUDED_STATUS) & (self.average_points >= MIN_AVERAGE_POINTS)
+                   & (self.total_points >= 0))
+        self.by_position = {}
+        self.band_prices = {}
+        for position in np.unique(self.position[quality]):
+            rows = np.flatnonzero(quality & (self.position == position))
+            # absteigend nach Schlüssel, bei Gleichstand Marktreihenfolge
+            self.by_position[int(position)] = rows[np.lexsort((rows, -self.key[rows]))]
+            self.band_prices[int(position)] = np.unique(self.price[rows])
+        self._bands = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def signature(players):
+        """
+        Inhalts-Hash eines Marktes: Ligen mit identischem Markt teilen sich einen Index.
+        """
+        digest = hashlib.sha256()
+        for player in players:
+            digest.update(json.dumps(player, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        return digest.hexdigest()
+
+    def band(self, position, max_price):
+        """
+        Kandidaten einer Position mit Preis <= max_price in Score-Reihenfolge (gemerkt pro Preisband).
+        """
+        prices = self.band_prices.get(position)
+        if prices is None:
+            return ()
+        band = int(np.searchsorted(prices, max_price, side='right'))
+        rows = self._bands.get((position, band))
+        if rows is None:
+            self.misses += 1
+            rows = self.by_position[position]
+            if band < len(prices):
+                rows = rows[self.price[rows] <= prices[band - 1]] if band else rows[:0]
+            rows = rows.tolist()
+            self._bands[(position, band)] = rows
+        else:
+            self.hits += 1
+        return rows
+
+    def replacements(self, position, max_price, market_value, average_points, team_id="", user_id=None,
+                     team_counts=None, max_per_team=None):
+        """
+        findReplacementCandidates: bis zu drei Kandidaten als (Zeile, Score). team_counts
+        (teamId -> eigene Spieler) und max_per_team nur beim Budget-Ausgleich.
+        """
+        picked = []
+        cutoff = None
+        for row in self.band(position, max_price):
+            if cutoff is not None and self.key[row] < cutoff:
+                break
+            if user_id is not None and self.seller_ids[row] == user_id:
+                continue
+            if max_per_team is not None:
+                count = team_counts.get(self.team_ids[row], 0)
+                if count >= max_per_team and (count == 0 or self.team_ids[row] != team_id):
+                    continue
+            picked.append(row)
+            if cutoff is None and len(picked) == MAX_REPLACEMENTS:
+                cutoff = self.key[row] - KEY_TOLERANCE
+        scored = [((market_value - int(self.price[row])) / 1_000_000.0 * PRICE_WEIGHT
+                   + (float(self.average_points[row]) - average_points) * PERFORMANCE_WEIGHT, row) for row in picked]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(row, score) for score, row in scored[:MAX_REPLACEMENTS]]
+
+    def summary(self, row):
+        return {
+            "id": self.ids[row],
+            "name": self.names[row],
+            "position": int(self.position[row]),
+            "teamId": self.team_ids[row],
+            "price": int(self.price[row]),
+            "marketValue": int(self.market_value[row]),
+            "averagePoints": float(self.average_points[row]),
+            "totalPoints": int(self.total_points[row]),
+        }
+
+# ---------------------------------------------------------------------------------------------
+# Strategien
+# ---------------------------------------------------------------------------------------------
+
+def _suggestions(pool, index, row, found):
+    market_value = int(pool.market_value[row])
+    average_points = float(pool.average_points[row])
+    return [{
+        "player": index.summary(candidate),
+        "reasonForSale": "Bessere Alternative verfügbar",
+        "budgetSavings": market_value - int(index.price[candidate]),
+        "performanceGain": float(index.average_points[candidate]) - average_points,
+        "riskReduction": 0.0,
+        "score": score,
+    } for candidate, score in found]
+
+def _sale(pool, index, row, found, goal, explanation, priority):
+    return {
+        "playerToSell": pool.summary(row),
+        "replacements": _suggestions(pool, index, row, found),
+        "goal": goal,
+        "explanation": explanation,
+        "priority": priority,
+    }
+
+def _find(pool, index, row, max_price, user_id, **limit):
+    return index.replacements(int(pool.position[row]), max_price, int(pool.market_value[row]),
+                              float(pool.average_points[row]), pool.team_ids[row], user_id, **limit)
+
+def budget_balancing_sales(pool, index, rows, budget, user_id=None, max_per_team=None):
+    if budget >= 0:
+        return []
+    gap = abs(budget)
+    team_counts = {}
+    for team_id in pool.team_ids[rows]:
+        team_counts[team_id] = team_counts.get(team_id, 0) + 1
+    sales = []
+    accumulated = 0
+    for row in rows[np.argsort(pool.unwantedness[rows], kind='stable')]:
+        max_price = int(float(pool.market_value[row]) * BALANCE_PRICE_FACTOR)
+        found = _find(pool, index, row, max_price, user_id, team_counts=team_counts, max_per_team=max_per_team)
+        if not found:
+            continue
+        best = found[0][0]
+        savings = int(pool.market_value[row]) - int(index.market_value[best])
+        remaining = gap - accumulated
+        if savings >= remaining:
+            priority = PRIORITY_ESSENTIAL
+        elif savings >= _truncating_div(remaining, 2):
+            priority = PRIORITY_RECOMMENDED
+        else:
+            priority = PRIORITY_OPTIONAL
+        sales.append(_sale(pool, index, row, found, GOAL_BALANCE_BUDGET, f"Empfehlung: {index.names[best]}", priority))
+        accumulated += savings
+        if accumulated >= gap and len(sales) >= BALANCE_MIN_RECOMMENDATIONS:
+            break
+    return sales
+
+def risk_reduction_sales(pool, index, rows, user_id=None):
+    sales = []
+    for row in rows[pool.risky[rows]]:
+        found = _find(pool, index, row, int(pool.market_value[row]) * RISK_PRICE_FACTOR, user_id)
+        if not found:
+            continue
+        status = int(pool.status[row])
+        explanation = (f"{pool.names[row]} ist aktuell {RISK_TEXTS.get(status, 'mit Risiko')}. Verkaufe ihn jetzt "
+                       f"und ersetze ihn durch einen gesünderen Spieler, um Ausfallrisiko zu minimieren.")
+        priority = PRIORITY_ESSENTIAL if status == 1 else PRIORITY_RECOMMENDED
+        sales.append(_sale(pool, index, row, found, GOAL_REDUCE_RISK, explanation, priority))
+    return sales
+
+def capital_raising_sales(pool, index, rows, user_id=None):
+    sales = []
+    candidates = rows[pool.capital[rows]]
+    candidates = candidates[np.argsort(-pool.market_value[candidates], kind='stable')][:CAPITAL_MAX_PLAYERS]
+    for row in candidates:
+        found = _find(pool, index, row, int(float(pool.market_value[row]) * CAPITAL_PRICE_FACTOR), user_id)
+        if not found:
+            continue
+        explanation = (f"Verkaufe {pool.names[row]} (~€{int(pool.market_value[row]) // 1000}k) "
+                       f"um Kapital für neue Transfers zu beschaffen.")
+        sales.append(_sale(pool, index, row, found, GOAL_RAISE_CAPITAL, explanation, PRIORITY_RECOMMENDED))
+    return sales
+
+def evaluate_league(pool, index, league):
+    """
+    Alle Ziele einer Liga. league: {"id", "budget", "mpst", "userId", "rows"} mit rows =
+    PlayerPool.squad_rows(Kader).
+    """
+    rows = np.asarray(league["rows"], dtype=np.int64)
+    user_id = league.get("userId")
+    return {
+        "leagueId": league.get("id"),
+        "budget": league["budget"],
+        "recommendations": {
+            GOAL_BALANCE_BUDGET: budget_balancing_sales(pool, index, rows, league["budget"], user_id, league.get("mpst")),
+            # generatePositionImprovementSales / generateMaxValueSales sind in Swift Stubs
+            GOAL_IMPROVE_POSITION: [],
+            GOAL_MAX_VALUE: [],
+            GOAL_REDUCE_RISK: risk_reduction_sales(pool, index, rows, user_id),
+            GOAL_RAISE_CAPITAL: capital_raising_sales(pool, index, rows, user_id),
+        },
+    }
+
+# ---------------------------------------------------------------------------------------------
+# Batch über alle Ligen
+# ---------------------------------------------------------------------------------------------
+
+_POOL = None
+_INDEXES = None
+
+def _init_worker(pool, indexes):
+    # Pool und Indizes werden einmal pro Worker übertragen, nicht pro Liga
+    global _POOL, _INDEXES
+    _POOL, _INDEXES = pool, indexes
+
+def _cache_counts():
+    return (sum(index.hits for index in _INDEXES.values()), sum(index.misses for index in _INDEXES.values()))
+
+def _evaluate_chunk(leagues):
+    hits, misses = _cache_counts()
+    results = [evaluate_league(_POOL, _INDEXES[league["market"]], league) for league in leagues]
+    total_hits, total_misses = _cache_counts()
+    return results, total_hits - hits, total_misses - misses
+
+def prepare(competition_players, leagues):
+    """
+    Baut PlayerPool und einen CandidateIndex pro verschiedenem Markt. leagues: Dicts mit
+    "squad", optional "market" (sonst Wettbewerb als Markt), "budget", "mpst", "userId", "id".
+    Liefert (pool, indexes, Liga-Aufträge).
+    """
+    pool = PlayerPool(list(competition_players) + [p for league in leagues for p in league.get("squad", [])])
+    indexes = {}
+    jobs = []
+    for league in leagues:
+        market = league.get("market")
+        signature = "competition" if market is None else CandidateIndex.signature(market)
+        if signature not in indexes:
+            indexes[signature] = CandidateIndex(competition_players if market is None else market)
+        jobs.append({"id": league.get("id"), "budget": int(league.get("budget", 0)), "mpst": league.get("mpst"),
+                     "userId": league.get("userId"), "rows": pool.squad_rows(league.get("squad", [])),
+                     "market": signature})
+    return pool, indexes, jobs
+
+def evaluate_all(pool, indexes, jobs, workers=None):
+    """
+    Wertet alle Ligen aus, bei workers > 1 in Worker-Prozessen (spawn). Ligen mit gleichem
+    Markt landen im selben Paket, damit die gemerkten Preisbänder wiederverwendet werden.
+    Ohne Angabe läuft alles inline, erst ab PARALLEL_MIN_SQUAD_PLAYERS auf allen Kernen.
+    Liefert (Ergebnisse in Eingabereihenfolge, Cache-Treffer, Cache-Fehlschläge).
+    """
+    if workers is None:
+        squad_players = sum(len(job["rows"]) for job in jobs)
+        workers = (os.cpu_count() or 1) if squad_players >= PARALLEL_MIN_SQUAD_PLAYERS else 0
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i]["market"])
+    if workers <= 1 or len(jobs) <= 1:
+        _init_worker(pool, indexes)
+        results, hits, misses = _evaluate_chunk([jobs[i] for i in order])
+        chunks = [(results, hits, misses)]
+    else:
+        size = max(1, -(-len(jobs) // (workers * 2)))
+        packets = [[jobs[i] for i in order[start:start + size]] for start in range(0, len(order), size)]
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(pool, indexes)) as executor:
+            chunks = list(executor.map(_evaluate_chunk, packets))
+    flat = [result for results, _, _ in chunks for result in results]
+    results = [None] * len(jobs)
+    for position, result in zip(order, flat):
+        results[position] = result
+    return results, sum(hits for _, hits, _ in chunks), sum(misses for _, _, misses in chunks)
+
+# ---------------------------------------------------------------------------------------------
+# Prüfung
+# ---------------------------------------------------------------------------------------------
+
+def reference_replacements(team_player, market, max_price, user_id, team_players=None, max_per_team=None):
+    """
+    findReplacementCandidates Spieler für Spieler wie in Swift (inkl. Qualitätsfilter aus
+    generateSaleRecommendations).
+    """
+    candidates = []
+    for player in market:
+        if player["status"] in EXCLUDED_STATUS or player["averagePoints"] < MIN_AVERAGE_POINTS:
+            continue
+        if user_id is not None and player["seller"]["id"] == user_id:
+            continue
+        if player["position"] != team_player["position"] or player["price"] > max_price:
+            continue
+        if max_per_team is not None:
+            count = sum(1 for p in team_players or [] if p["teamId"] == player["teamId"])
+            selected = any(p["teamId"] == player["teamId"] for p in team_players or [])
+            if selected and count >= max_per_team:
+                if player["teamId"] != team_player["teamId"]:
+                    continue
+            elif count >= max_per_team:
+                continue
+        if player["totalPoints"] < 0:
+            continue
+        candidates.append(player)
+    scored = [(float(team_player["marketValue"] - c["price"]) / 1_000_000.0 * 0.7
+               + (c["averagePoints"] - team_player["averagePoints"]) * 0.3, c) for c in candidates]
+    scored.sort(key=lambda item: -item[0])
+    return [(c["id"], score) for score, c in scored[:3]]
+
+def reference_league(team_players, market, budget, user_id, max_per_team):
+    """
+    Die drei nicht-gestubbten Ziele als {Ziel: [(Verkauf-id, Priorität, [Ersatz-ids], Erklärung)]}.
+    """
+    by_id = {p["id"]: p for p in market}
+    result = {GOAL_BALANCE_BUDGET: [], GOAL_REDUCE_RISK: [], GOAL_RAISE_CAPITAL: []}
+    if budget < 0:
+        gap = abs(budget)
+        scored = []
+        for player in team_players:
+            score = float(player["totalPoints"]) + player["averagePoints"] * 10
+            if player["status"] == 1:
+                score -= 500
+            elif player["status"] == 2:
+                score -= 250
+            scored.append((score, player))
+        accumulated = 0
+        for _, player in sorted(scored, key=lambda item: item[0]):
+            found = reference_replacements(player, market, int(float(player["marketValue"]) * 0.8), user_id,
+                                           team_players, max_per_team)
+            if not found:
+                continue
+            best = by_id[found[0][0]]
+            savings = player["marketValue"] - best["marketValue"]
+            remaining = gap - accumulated
+            priority = (PRIORITY_ESSENTIAL if savings >= remaining
+                        else PRIORITY_RECOMMENDED if savings >= int(remaining / 2) else PRIORITY_OPTIONAL)
+            result[GOAL_BALANCE_BUDGET].append((player["id"], priority, found, f"Empfehlung: {_full_name(best)}"))
+            accumulated += savings
+            if accumulated >= gap and len(result[GOAL_BALANCE_BUDGET]) >= 3:
+                break
+    for player in team_players:
+        if player["status"] in (1, 2, 4):
+            found = reference_replacements(player, market, player["marketValue"] * 2, user_id)
+            if found:
+                priority = PRIORITY_ESSENTIAL if player["status"] == 1 else PRIORITY_RECOMMENDED
+                text = {1: "verletzt", 2: "angeschlagen", 4: "im Aufbautraining"}[player["status"]]
+                explanation = (f"{_full_name(player)} ist aktuell {text}. Verkaufe ihn jetzt und ersetze ihn durch "
+                               f"einen gesünderen Spieler, um Ausfallrisiko zu minimieren.")
+                result[GOAL_REDUCE_RISK].append((player["id"], priority, found, explanation))
+    valuable = sorted((p for p in team_players if p["totalPoints"] < 100), key=lambda p: -p["marketValue"])[:5]
+    for player in valuable:
+        found = reference_replacements(player, market, int(float(player["marketValue"]) * 1.5), user_id)
+        if found:
+            explanation = (f"Verkaufe {_full_name(player)} (~€{player['marketValue'] // 1000}k) um Kapital "
+                           f"für neue Transfers zu beschaffen.")
+            result[GOAL_RAISE_CAPITAL].append((player["id"], PRIORITY_RECOMMENDED, found, explanation))
+    return result
+
+def _random_players(rng, count, clubs=18, prefix="p"):
+    players = []
+    for index in range(count):
+        average = float(np.round(rng.choice([rng.uniform(0, 200), 70.0, 69.9]), 1))
+        value = int(rng.choice([rng.integers(500_000, 40_000_000) // 100_000 * 100_000, 5_000_000]))
+        players.append({
+            "id": f"{prefix}{index}",
+            "firstName": "Spieler",
+            "lastName": f"{prefix.upper()}{index}",
+            "position": int(rng.integers(1, 5)),
+            "teamId": str(rng.integers(0, clubs)),
+            "averagePoints": average,
+            "totalPoints": int(rng.choice([rng.integers(-20, 3000), 99, 100])),
+            "marketValue": value,
+            "status": int(rng.choice([0, 0, 0, 0, 1, 2, 4, 8, 16])),
+        })
+    return players
+
+def _random_market(rng, players, user_ids):
+    market = []
+    for player in rng.choice(players, int(rng.integers(20, 120)), replace=False):
+        price = player["marketValue"] if rng.random() < 0.3 else int(player["marketValue"] * rng.uniform(0.9, 1.4))
+        market.append(dict(player, price=price, seller={"id": str(rng.choice(user_ids))}))
+    return market
+
+def verify(seed=0, leagues=60, players=550, workers=2):
+    """
+    Vergleicht den Batch (inline und mit Worker-Prozessen) mit reference_league() auf zufälligen
+    Ligen (eigene Märkte, gemeinsamer Wettbewerbsmarkt, Vereinslimits). Liefert die Abweichungen.
+    """
+    rng = np.random.default_rng(seed)
+    competition = _random_players(rng, players)
+    shared_market = _random_market(rng, competition, ["0", "1", "2"])
+    specs = []
+    for number in range(leagues):
+        squad = [dict(p) for p in rng.choice(competition, int(rng.integers(0, 18)), replace=False)]
+        choice = rng.random()
+        market = None if choice < 0.3 else shared_market if choice < 0.6 else _random_market(rng, competition, ["0", "1"])
+        budget = int(rng.choice([rng.integers(-40_000_000, 10_000_000), 0, -1]))
+        specs.append({"id": f"L{number}", "squad": squad, "market": market, "budget": budget,
+                      "mpst": None if rng.random() < 0.2 else int(rng.integers(0, 4)),
+                      "userId": None if market is None else str(rng.integers(0, 3))})
+
+    pool, indexes, jobs = prepare(competition, specs)
+    mismatches = 0
+    for label, count in ((f"{workers} Worker", workers), ("inline", 0)):
+        started = time.perf_counter()
+        results, hits, misses = evaluate_all(pool, indexes, jobs, count)
+        elapsed = time.perf_counter() - started
+        for spec, result in zip(specs, results):
+            market = spec["market"] if spec["market"] is not None else [dict(p, price=p["marketValue"], seller={"id": ""})
+                                                                          for p in competition]
+            expected = reference_league(spec["squad"], market, spec["budget"], spec["userId"], spec["mpst"])
+            for goal, sales in expected.items():
+                actual = [(s["playerToSell"]["id"], s["priority"],
+                           [(r["player"]["id"], r["score"]) for r in s["replacements"]], s["explanation"])
+                          for s in result["recommendations"][goal]]
+                if actual != sales:
+                    mismatches += 1
+                    if mismatches <= 5:
+                        print(f"❌ {spec['id']} {goal}: {actual} != {sales}")
+            if result["recommendations"][GOAL_IMPROVE_POSITION] or result["recommendations"][GOAL_MAX_VALUE]:
+                mismatches += 1
+        sales = sum(len(s) for r in results for s in r["recommendations"].values())
+        print(f"   {label}: {len(jobs)} Ligen, {sales} Verkäufe in {elapsed * 1000:.0f} ms "
+              f"(Preisbänder {misses} berechnet, {hits} aus dem Cache)")
+
+    started = time.perf_counter()
+    for spec in specs:
+        market = spec["market"] if spec["market"] is not None else [dict(p, price=p["marketValue"], seller={"id": ""})
+                                                                      for p in competition]
+        reference_league(spec["squad"], market, spec["budget"], spec["userId"], spec["mpst"])
+    print(f"   Referenz Liga für Liga: {(time.perf_counter() - started) * 1000:.0f} ms")
+    print(f"{'✅' if not mismatches else '❌'} Parität: {len(specs)} Ligen, {len(indexes)} Märkte, "
+          f"{mismatches} Abweichungen")
+    return mismatches
+
+# ---------------------------------------------------------------------------------------------
+# Daten laden
+# ---------------------------------------------------------------------------------------------
+
+async def fetch_leagues_async(league_ids, competition_id=1, token=None, email=None, password=None,
+                              user_ids=(), with_market=True):
+    """
+    Lädt die Spieler des Wettbewerbs einmal und pro Liga Kader, Markt und Kontostand/mpst.
+    Liefert (Wettbewerbsspieler, Liga-Dicts für prepare()).
+    """
+    from kickbase_api import KickbaseClient
+
+    async with KickbaseClient(token=token) as api:
+        if email:
+            await api.login(email, password)
+        competition = api.get_competitions_players(competitionId=competition_id)
+        per_league = [asyncio.gather(api.get_leagues_squad(leagueId=league_id), api.get_leagues_me(leagueId=league_id),
+                                     *([api.get_leagues_market(leagueId=league_id)] if with_market else []))
+                      for league_id in league_ids]
+        competition, *responses = await asyncio.gather(competition, *per_league)
+
+    leagues = []
+    for number, (league_id, league_responses) in enumerate(zip(league_ids, responses)):
+        squad, me = league_responses[0].json() or {}, league_responses[1].json() or {}
+        user_id = user_ids[number] if number < len(user_ids) else str(_first(me, ("i", "id", "userId"), "")) or None
+        leagues.append({
+            "id": league_id,
+            "squad": player_list(squad),
+            "market": player_list(league_responses[2].json() or {}) if with_market else None,
+            "budget": int(_first(me, ("b", "budget"), 0)),
+            "mpst": _first(me, ("mpst", "maxPlayersPerTeam"), None),
+            "userId": user_id,
+        })
+    return player_list(competition.json() or {}), leagues
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verkaufs-Empfehlungen für viele Ligen (Batch)")
+    parser.add_argument('--check', action='store_true', help="Parität gegen die Swift-Logik prüfen")
+    parser.add_argument('--players', help="Antwort von /v4/competitions/{competitionId}/players (JSON)")
+    parser.add_argument('--leagues', help="Ligen als JSON-Liste ({id, budget, mpst, userId, squad, market})")
+    parser.add_argument('--league', action='append', default=[], help="Liga-ID, direkt über die API laden")
+    parser.add_argument('--user', action='append', default=[], help="Eigene Benutzer-ID pro --league (Filter)")
+    parser.add_argument('--no-market', action='store_true', help="Wettbewerb statt Liga-Markt als Ersatzmarkt")
+    parser.add_argument('--competition', type=int, default=1)
+    parser.add_argument('--token', default=os.environ.get("KICKBASE_TOKEN"))
+    parser.add_argument('--email', default=os.environ.get("KICKBASE_EMAIL"))
+    parser.add_argument('--password', default=os.environ.get("KICKBASE_PASSWORD"))
+    parser.add_argument('--workers', type=int, default=None, help="Worker-Prozesse (0 = inline). Standard: inline, "
+                        f"alle Kerne erst ab {PARALLEL_MIN_SQUAD_PLAYERS} Kaderspielern (Ligen x Kadergröße)")
+    parser.add_argument('--output', help="Ergebnisse als JSON schreiben")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if verify() else 0)
+
+    if args.league:
+        competition, leagues = asyncio.run(fetch_leagues_async(args.league, args.competition, args.token, args.email,
+                                                               args.password, args.user, not args.no_market))
+    else:
+        if not (args.players and args.leagues):
+            parser.error("--players und --leagues, --league oder --check angeben")
+        competition = player_list(load_json(args.players))
+        leagues = load_json(args.leagues)
+
+    started = time.perf_counter()
+    pool, indexes, jobs = prepare(competition, leagues)
+    prepared = time.perf_counter() - started
+    results, hits, misses = evaluate_all(pool, indexes, jobs, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(jobs)} Ligen, {len(pool)} Spieler, {len(indexes)} Märkte: Vorbereitung {prepared * 1000:.0f} ms, "
+          f"gesamt {elapsed * 1000:.0f} ms (Preisbänder {misses} berechnet, {hits} aus dem Cache)", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    else:
+        for result in results:
+            print(f"Liga {result['leagueId']} (Kontostand {result['budget']:,}):")
+            for goal, sales in result["recommendations"].items():
+                for sale in sales:
+                    best = sale["replacements"][0]["player"]
+                    print(f"  [{goal}] {sale['playerToSell']['name']} -> {best['name']} ({sale['priority']})")
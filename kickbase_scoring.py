@@ -0,0 +1,634 @@
+"""
+Transfer-Bewertung für den ganzen Markt in einem NumPy-Durchlauf.
+
+Portiert die Formeln aus PlayerRecommendationService.swift (calculateCurrentForm,
+calculateInjuryRisk, calculateSeasonProjection[WithStats], calculateValueForMoney,
+calculateRecommendationScore, determineRiskLevel, determinePriority) auf Spalten-Arrays:
+statt Spieler für Spieler in 50er-Batches werden alle Marktspieler aller Ligen auf einmal
+bewertet. Spieldaten (smdc/ismc/smc) kommen aus Performance-Antworten im Format von
+ResponseExamples/PerformanceResponse.json.
+
+    python kickbase_scoring.py --check                      # Parität gegen die Swift-Formeln
+    python kickbase_scoring.py --market market.json --squad squad.json --performance perf/
+"""
+import argparse
+import asyncio
+import decimal
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+# Kodierung der Swift-Enums (Index = Wert im Array)
+FORM_LABELS = ("improving", "stable", "declining")
+RISK_LABELS = ("low", "medium", "high")
+PRIORITY_LABELS = ("essential", "recommended", "optional")
+FORM_IMPROVING, FORM_STABLE, FORM_DECLINING = range(3)
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = range(3)
+PRIORITY_ESSENTIAL, PRIORITY_RECOMMENDED, PRIORITY_OPTIONAL = range(3)
+
+# Positionen 1-4 (Torwart, Abwehr, Mittelfeld, Sturm); Index 0 = ungültige Position
+POSITIONS = 5
+MIN_PLAYERS_PER_POSITION = np.array([0, 1, 3, 6, 1])
+WEAK_AVERAGE_POINTS = 100.0
+STRONG_AVERAGE_POINTS = 150.0
+
+SEASON_MATCHDAYS = 34
+STATUS_INJURED = 8
+STATUS_DOUBTFUL = 4
+STATUS_EXCLUDED = (8, 16)
+# st in der Performance-Antwort: 5 = Startelf, 3 = eingewechselt
+PERFORMANCE_STARTED = 5
+PERFORMANCE_SUBSTITUTED = 3
+
+MIN_AVERAGE_POINTS = 70.0
+MIN_TOTAL_POINTS = 140
+MIN_SCORE = 2.0
+MAX_SCORE = 24.0
+
+def _first(data, keys, default):
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return default
+
+def player_list(response):
+    """
+    Spielerliste aus einer Markt-/Kader-Antwort (it, players, squad oder data).
+    """
+    if isinstance(response, list):
+        return response
+    for key in ("it", "players", "squad", "data"):
+        if isinstance(response.get(key), list):
+            return response[key]
+    return []
+
+def seller_id(player):
+    seller = player.get("seller")
+    if isinstance(seller, dict):
+        return seller.get("id") or seller.get("userId") or ""
+    return player.get("sellerId") or ""
+
+# ---------------------------------------------------------------------------------------------
+# Spalten
+# ---------------------------------------------------------------------------------------------
+
+class MarketColumns:
+    """
+    Marktspieler als Spalten-Arrays (gleiche Feldnamen-Varianten wie EnhancedMarketParser).
+    league ist der Index der Liga pro Spieler, wenn mehrere Märkte zusammen bewertet werden.
+    """
+    __slots__ = ("ids", "names", "seller_ids", "league", "position", "number", "average_points",
+                 "total_points", "market_value", "market_value_trend", "price", "status",
+                 "smdc", "ismc", "smc", "has_stats")
+
+    def __init__(self, players, league=0):
+        players = list(players)
+        count = len(players)
+        self.ids = np.array([str(_first(p, ("id", "playerId", "i", "pId"), "")) for p in players], dtype=object)
+        self.names = np.array([" ".join(filter(None, (_first(p, ("firstName", "fn", "name"), ""),
+                                                      _first(p, ("lastName", "ln", "n"), ""))))
+                               for p in players], dtype=object)
+        self.seller_ids = np.array([seller_id(p) for p in players], dtype=object)
+        self.league = np.full(count, league, dtype=np.int32) if np.isscalar(league) else np.asarray(league, dtype=np.int32)
+
+        def ints(keys):
+            return np.fromiter((int(_first(p, keys, 0)) for p in players), dtype=np.int64, count=count)
+
+        self.position = ints(("position", "pos"))
+        self.number = ints(("number", "jerseyNumber"))
+        self.average_points = np.fromiter((float(_first(p, ("averagePoints", "ap", "avgPoints"), 0.0)) for p in players),
+                                          dtype=np.float64, count=count)
+        self.total_points = ints(("totalPoints", "p", "points"))
+        self.market_value = ints(("marketValue", "mv"))
+        self.market_value_trend = ints(("marketValueTrend", "mvt"))
+        self.price = ints(("price", "prc", "bid", "amount"))
+        self.status = ints(("st", "status"))
+        self.smdc = np.zeros(count, dtype=np.int64)
+        self.ismc = np.zeros(count, dtype=np.int64)
+        self.smc = np.zeros(count, dtype=np.int64)
+        self.has_stats = np.zeros(count, dtype=bool)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def set_stats(self, stats):
+        """
+        stats: player_id -> (smdc, ismc, smc), z.B. aus stats_from_performances().
+        """
+        for index, player_id in enumerate(self.ids):
+            values = stats.get(player_id)
+            if values is not None:
+                self.smdc[index], self.ismc[index], self.smc[index] = values
+                self.has_stats[index] = True
+        return self
+
+    @classmethod
+    def concat(cls, markets):
+        """
+        Fügt die Spalten mehrerer Ligen zusammen (league = Position in markets).
+        """
+        result = cls([])
+        for slot in cls.__slots__:
+            parts = [getattr(market, slot) for market in markets]
+            if slot == "league":
+                parts = [np.full(len(market), index, dtype=np.int32) for index, market in enumerate(markets)]
+            if parts:
+                setattr(result, slot, np.concatenate(parts))
+        return result
+
+def stats_from_performances(performances):
+    """
+    Leitet (smdc, ismc, smc) pro Spieler aus Performance-Antworten ab, spaltenweise:
+    alle Spieltage der aktuellen Saison werden zu flachen Arrays, gezählt wird per bincount.
+    performances: player_id -> Antwort von /players/{id}/performance.
+    """
+    player_ids = list(performances)
+    owners, days, statuses, current = [], [], [], []
+    for index, player_id in enumerate(player_ids):
+        seasons = (performances[player_id] or {}).get("it") or []
+        if not seasons:
+            continue
+        matches = seasons[-1].get("ph") or []
+        owners.extend([index] * len(matches))
+        days.extend(int(match.get("day") or 0) for match in matches)
+        statuses.extend(int(match.get("st") or 0) for match in matches)
+        current.extend(bool(match.get("cur")) for match in matches)
+
+    count = len(player_ids)
+    owners = np.asarray(owners, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    statuses = np.asarray(statuses, dtype=np.int64)
+    current = np.asarray(current, dtype=bool)
+
+    started = statuses == PERFORMANCE_STARTED
+    played = started | (statuses == PERFORMANCE_SUBSTITUTED)
+    ismc = np.bincount(owners, weights=played, minlength=count).astype(np.int64)
+    smc = np.bincount(owners, weights=started, minlength=count).astype(np.int64)
+
+    # Aktueller Spieltag: Eintrag mit cur, sonst der letzte Spieltag mit Status
+    smdc = np.zeros(count, dtype=np.int64)
+    np.maximum.at(smdc, owners[statuses != 0], days[statuses != 0])
+    has_current = np.zeros(count, dtype=bool)
+    has_current[owners[current]] = True
+    smdc[has_current] = 0
+    np.maximum.at(smdc, owners[current], days[current])
+
+    return {player_id: (int(smdc[i]), int(ismc[i]), int(smc[i])) for i, player_id in enumerate(player_ids)}
+
+def team_positions(team_players):
+    """
+    Schwache und starke Positionen eines Kaders (identifyWeakPositions/identifyStrongPositions)
+    als bool-Arrays mit Index = Position.
+    """
+    team_players = list(team_players)
+    positions = np.fromiter((int(_first(p, ("position", "pos"), 0)) for p in team_players), dtype=np.int64,
+                            count=len(team_players))
+    points = np.fromiter((float(_first(p, ("totalPoints", "p"), 0)) for p in team_players), dtype=np.float64,
+                         count=len(team_players))
+    valid = (positions >= 0) & (positions < POSITIONS)
+    counts = np.bincount(positions[valid], minlength=POSITIONS)
+    totals = np.bincount(positions[valid], weights=points[valid], minlength=POSITIONS)
+    average = np.divide(totals, counts, out=np.zeros(POSITIONS), where=counts > 0)
+
+    weak = (counts < MIN_PLAYERS_PER_POSITION) | ((counts > 0) & (average < WEAK_AVERAGE_POINTS))
+    strong = (counts > 0) & (average > STRONG_AVERAGE_POINTS)
+    weak[0] = strong[0] = False
+    return weak, strong
+
+# ---------------------------------------------------------------------------------------------
+# Bewertung
+# ---------------------------------------------------------------------------------------------
+
+def _round_half_away(values):
+    # Swift round(): .5 wird von null weg gerundet (np.round rundet auf gerade Zahlen)
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+def score_market(market, weak, strong, current_user_ids=None):
+    """
+    Bewertet alle Spieler in market in einem Durchlauf.
+    weak/strong: bool-Array [Position] oder [Liga, Position] aus team_positions().
+    current_user_ids: Benutzer-ID pro Liga (eigene Angebote werden ausgefiltert).
+    Liefert ein dict aus Arrays; 'recommended' markiert, was die App als Empfehlung zeigen würde.
+    """
+    weak = np.atleast_2d(np.asarray(weak, dtype=bool))
+    strong = np.atleast_2d(np.asarray(strong, dtype=bool))
+    league = market.league if weak.shape[0] > 1 else np.zeros(len(market), dtype=np.int64)
+
+    ppg = market.average_points
+    trend = market.market_value_trend
+    total = market.total_points
+    price = market.price
+
+    form = np.select([(trend > 500000) & (ppg > 8.0), (trend < -500000) | (ppg < 4.0)],
+                     [FORM_IMPROVING, FORM_DECLINING], FORM_STABLE)
+    injury = np.select([market.status == STATUS_INJURED, market.status == STATUS_DOUBTFUL],
+                       [RISK_HIGH, RISK_MEDIUM], RISK_LOW)
+
+    millions = price / 1_000_000.0
+    value_for_money = np.divide(total, millions, out=np.zeros(len(market)), where=price > 0)
+
+    # Saisonprognose: mit Spieldaten über ismc, sonst geschätzte Spiele aus Punkten
+    estimated = np.zeros(len(market), dtype=np.int64)
+    positive = ppg > 0
+    estimated[positive] = _round_half_away(total[positive] / ppg[positive])
+    games = np.where(market.has_stats, market.ismc, estimated)
+    remaining = np.maximum(SEASON_MATCHDAYS - games, 0)
+    projected_total = total + np.trunc(ppg * remaining).astype(np.int64)
+    projected_value = trend * remaining
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = market.ismc / market.smdc
+        starter = market.smc / np.maximum(market.ismc, 1.0)
+        stats_confidence = np.where((market.smdc > 0) & (market.ismc > 0),
+                                    np.minimum(ratio * (0.7 + starter * 0.3), 1.0), 0.0)
+    confidence = np.where(market.has_stats, stats_confidence, 0.5)
+
+    # calculateRecommendationScore, Summanden in derselben Reihenfolge wie in Swift
+    position = market.position
+    valid_position = (position >= 1) & (position <= 4)
+    safe_position = np.where(valid_position, position, 0)
+    is_weak = weak[league, safe_position] & valid_position
+    is_strong = strong[league, safe_position] & valid_position
+
+    score = np.minimum(ppg / 1.5, 6.0)
+    score = score + np.select([total >= 150, total >= 100, total >= 75], [3.0, 2.0, 1.0], 0.0)
+    score = score + np.minimum(value_for_money / 8.0, 4.0)
+    score = score + np.choose(form, (3.0, 0.5, -2.0))
+    score = score + np.select([trend > 1_000_000, trend > 500000, trend < -1_000_000], [2.0, 1.0, -1.5], 0.0)
+    score = score + np.select([is_weak, is_strong, valid_position], [4.0, 0.5, 2.0], 0.0)
+    number = market.number.astype(np.float64)
+    score = score + np.select([number >= 15, number >= 10, number < 5], [1.0, 0.5, -1.0], 0.0)
+    score = score + np.select([(millions <= 5.0) & (ppg >= 7.0), (millions <= 3.0) & (ppg >= 6.0)], [2.0, 1.5], 0.0)
+    score = np.minimum(np.maximum(score, 0.0), MAX_SCORE)
+
+    declining = form == FORM_DECLINING
+    risk_level = np.select([injury == RISK_HIGH, injury == RISK_MEDIUM],
+                           [RISK_HIGH, np.where(declining, RISK_HIGH, RISK_MEDIUM)],
+                           np.where(declining, RISK_MEDIUM, RISK_LOW))
+    priority = np.select([is_weak & (score >= 19.2), valid_position & (score >= 12.0)],
+                         [PRIORITY_ESSENTIAL, PRIORITY_RECOMMENDED], PRIORITY_OPTIONAL)
+
+    # Vorfilter aus generateRecommendations
+    eligible = ~np.isin(market.status, STATUS_EXCLUDED) & (ppg >= MIN_AVERAGE_POINTS) & (total >= MIN_TOTAL_POINTS)
+    if current_user_ids is not None:
+        users = np.asarray(current_user_ids, dtype=object)
+        eligible &= market.seller_ids != users[league]
+
+    return {
+        "points_per_game": ppg,
+        "value_for_money": value_for_money,
+        "form": form,
+        "injury_risk": injury,
+        "projected_total_points": projected_total,
+        "projected_value_increase": projected_value,
+        "confidence": confidence,
+        "score": score,
+        "risk_level": risk_level,
+        "priority": priority,
+        "recommended": eligible & (score >= MIN_SCORE),
+    }
+
+def top_recommendations(market, result, limit=20):
+    """
+    Empfehlungen je Liga, absteigend nach Score (wie die App: Top 20).
+    """
+    picks = {}
+    for league in np.unique(market.league):
+        candidates = np.flatnonzero(result["recommended"] & (market.league == league))
+        order = candidates[np.argsort(-result["score"][candidates], kind="stable")][:limit]
+        picks[int(league)] = [{
+            "id": market.ids[i],
+            "name": market.names[i],
+            "score": round(float(result["score"][i]), 2),
+            "form": FORM_LABELS[result["form"][i]],
+            "risk": RISK_LABELS[result["risk_level"][i]],
+            "priority": PRIORITY_LABELS[result["priority"][i]],
+            "valueForMoney": round(float(result["value_for_money"][i]), 2),
+            "projectedTotalPoints": int(result["projected_total_points"][i]),
+            "confidence": round(float(result["confidence"][i]), 3),
+        } for i in order]
+    return picks
+
+# ---------------------------------------------------------------------------------------------
+# Referenz: die Swift-Funktionen Zeile für Zeile (ein Spieler pro Aufruf)
+# ---------------------------------------------------------------------------------------------
+
+def _swift_round(value):
+    return int(decimal.Decimal(value).quantize(decimal.Decimal(1), rounding=decimal.ROUND_HALF_UP))
+
+def reference_score(player, weak_positions, strong_positions, stats=None):
+    """
+    Skalare Übersetzung von PlayerRecommendationService.swift für den Paritätstest.
+    player: dict mit den MarketPlayer-Feldnamen; stats: (smdc, ismc, smc) oder None.
+    """
+    ppg = player["averagePoints"]
+    total = player["totalPoints"]
+    trend = player["marketValueTrend"]
+    price = player["price"]
+    status = player["status"]
+
+    if trend > 500000 and ppg > 8.0:
+        form = FORM_IMPROVING
+    elif trend < -500000 or ppg < 4.0:
+        form = FORM_DECLINING
+    else:
+        form = FORM_STABLE
+
+    if status == 8:
+        injury = RISK_HIGH
+    elif status == 4:
+        injury = RISK_MEDIUM
+    else:
+        injury = RISK_LOW
+
+    value_for_money = total / (price / 1_000_000.0) if price > 0 else 0.0
+
+    if stats is None:
+        estimated = _swift_round(total / ppg) if ppg > 0 else 0
+        remaining = max(34 - estimated, 0)
+        confidence = 0.5
+    else:
+        smdc, ismc, smc = stats
+        remaining = max(34 - ismc, 0)
+        if smdc > 0 and ismc > 0:
+            played_ratio = ismc / smdc
+            starter_bonus = smc / max(float(ismc), 1.0)
+            confidence = min(played_ratio * (0.7 + starter_bonus * 0.3), 1.0)
+        else:
+            confidence = 0.0
+    projected_total = total + int(ppg * remaining)
+    projected_value = trend * remaining
+
+    score = 0.0
+    score += min(ppg / 1.5, 6.0)
+    if total >= 150:
+        score += 3.0
+    elif total >= 100:
+        score += 2.0
+    elif total >= 75:
+        score += 1.0
+    score += min(value_for_money / 8.0, 4.0)
+    score += {FORM_IMPROVING: 3.0, FORM_STABLE: 0.5, FORM_DECLINING: -2.0}[form]
+    if trend > 1_000_000:
+        score += 2.0
+    elif trend > 500000:
+        score += 1.0
+    elif trend < -1_000_000:
+        score -= 1.5
+    position = player["position"]
+    valid_position = position in (1, 2, 3, 4)
+    if valid_position:
+        if position in weak_positions:
+            score += 4.0
+        elif position in strong_positions:
+            score += 0.5
+        else:
+            score += 2.0
+    games = float(player["number"])
+    if games >= 15:
+        score += 1.0
+    elif games >= 10:
+        score += 0.5
+    elif games < 5:
+        score -= 1.0
+    millions = price / 1_000_000.0
+    if millions <= 5.0 and ppg >= 7.0:
+        score += 2.0
+    elif millions <= 3.0 and ppg >= 6.0:
+        score += 1.5
+    score = min(max(score, 0.0), 24.0)
+
+    if injury == RISK_HIGH:
+        risk_level = RISK_HIGH
+    elif injury == RISK_MEDIUM:
+        risk_level = RISK_HIGH if form == FORM_DECLINING else RISK_MEDIUM
+    else:
+        risk_level = RISK_MEDIUM if form == FORM_DECLINING else RISK_LOW
+
+    if valid_position and position in weak_positions and score >= 19.2:
+        priority = PRIORITY_ESSENTIAL
+    elif valid_position and score >= 12.0:
+        priority = PRIORITY_RECOMMENDED
+    else:
+        priority = PRIORITY_OPTIONAL
+
+    return {
+        "points_per_game": ppg,
+        "value_for_money": value_for_money,
+        "form": form,
+        "injury_risk": injury,
+        "projected_total_points": projected_total,
+        "projected_value_increase": projected_value,
+        "confidence": confidence,
+        "score": score,
+        "risk_level": risk_level,
+        "priority": priority,
+    }
+
+def reference_team_positions(team_players):
+    counts, totals = {}, {}
+    for player in team_players:
+        position = player["position"]
+        counts[position] = counts.get(position, 0) + 1
+        totals[position] = totals.get(position, 0.0) + float(player["totalPoints"])
+    weak = {position for position, minimum in ((1, 1), (2, 3), (3, 6), (4, 1)) if counts.get(position, 0) < minimum}
+    weak |= {position for position, points in totals.items() if points / counts[position] < 100.0}
+    strong = {position for position, points in totals.items() if points / counts[position] > 150.0}
+    return weak & {1, 2, 3, 4}, strong & {1, 2, 3, 4}
+
+def _random_market(rng, count):
+    # Werte bewusst auf und um die Schwellen der Swift-Formeln gelegt
+    trends = np.concatenate([rng.integers(-3_000_000, 3_000_000, count),
+                             [500000, 500001, -500000, -500001, 1_000_000, 1_000_001, -1_000_000, -1_000_001]])
+    count = len(trends)
+    averages = np.round(rng.choice([rng.uniform(-2, 200), 0.0, 4.0, 6.0, 7.0, 8.0, 8.5, 70.0, 7.4],
+                                   count), 1)
+    averages = np.where(rng.random(count) < 0.7, np.round(rng.uniform(-2, 200, count), 1), averages)
+    totals = rng.choice([rng.integers(-50, 3000), 74, 75, 99, 100, 140, 149, 150], count)
+    totals = np.where(rng.random(count) < 0.6, rng.integers(-50, 3000, count), totals)
+    prices = np.where(rng.random(count) < 0.1, rng.choice([0, 3_000_000, 5_000_000, 5_000_001], count),
+                      rng.integers(0, 60_000_000, count))
+    return [{
+        "id": str(index),
+        "position": int(rng.integers(0, 6)),
+        "number": int(rng.choice([4, 5, 9, 10, 14, 15, 30])),
+        "averagePoints": float(averages[index]),
+        "totalPoints": int(totals[index]),
+        "marketValue": int(prices[index]),
+        "marketValueTrend": int(trends[index]),
+        "price": int(prices[index]),
+        "status": int(rng.choice([0, 0, 0, 1, 2, 4, 8, 16])),
+        "seller": {"id": str(rng.integers(0, 3))},
+    } for index in range(count)]
+
+def _random_squad(rng):
+    return [{"position": int(rng.integers(1, 5)), "totalPoints": int(rng.integers(0, 300))}
+            for _ in range(int(rng.integers(0, 16)))]
+
+def _random_stats(rng, players):
+    stats = {}
+    for player in players:
+        if rng.random() < 0.6:
+            smdc = int(rng.integers(0, 35))
+            ismc = int(rng.integers(0, smdc + 1)) if rng.random() < 0.9 else int(rng.integers(0, 35))
+            stats[player["id"]] = (smdc, ismc, int(rng.integers(0, ismc + 1)))
+    return stats
+
+def verify_parity(players=2000, leagues=3, seed=0, performance_path=None):
+    """
+    Vergleicht score_market() mit reference_score() auf zufälligen Märkten mehrerer Ligen
+    (inkl. aller Schwellenwerte) und prüft stats_from_performances() an der Beispielantwort.
+    Liefert die Anzahl der Abweichungen.
+    """
+    rng = np.random.default_rng(seed)
+    markets, squads, stats = [], [], []
+    for league in range(leagues):
+        market = _random_market(rng, players // leagues)
+        markets.append(market)
+        squads.append(_random_squad(rng))
+        stats.append(_random_stats(rng, market))
+
+    columns = MarketColumns.concat([MarketColumns(market).set_stats(league_stats)
+                                    for market, league_stats in zip(markets, stats)])
+    positions = [team_positions(squad) for squad in squads]
+    weak = np.array([w for w, _ in positions])
+    strong = np.array([s for _, s in positions])
+    result = score_market(columns, weak, strong, current_user_ids=["0"] * leagues)
+
+    mismatches = 0
+    index = 0
+    for league, market in enumerate(markets):
+        ref_weak, ref_strong = reference_team_positions(squads[league])
+        if ref_weak != set(np.flatnonzero(weak[league])) or ref_strong != set(np.flatnonzero(strong[league])):
+            print(f"❌ Liga {league}: schwache/starke Positionen weichen ab")
+            mismatches += 1
+        for player in market:
+            expected = reference_score(player, ref_weak, ref_strong, stats[league].get(player["id"]))
+            for key, value in expected.items():
+                actual = result[key][index]
+                if not (actual == value or (isinstance(value, float) and abs(actual - value) <= 1e-9)):
+                    mismatches += 1
+                    if mismatches <= 10:
+                        print(f"❌ Spieler {player['id']} (Liga {league}) {key}: {actual!r} != {value!r}")
+            recommended = (player["status"] not in (8, 16) and player["averagePoints"] >= 70.0
+                           and player["totalPoints"] >= 140 and player["seller"]["id"] != "0"
+                           and expected["score"] >= 2.0)
+            if bool(result["recommended"][index]) != recommended:
+                mismatches += 1
+            index += 1
+
+    performance_path = performance_path or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        "Kickbasehelper", "ResponseExamples",
+                                                        "PerformanceResponse.json")
+    if os.path.exists(performance_path):
+        with open(performance_path, 'r', encoding='utf-8') as f:
+            performance = json.load(f)
+        season = performance["it"][-1]["ph"]
+        expected = (next(m["day"] for m in season if m.get("cur")),
+                    sum(1 for m in season if m.get("st") in (3, 5)),
+                    sum(1 for m in season if m.get("st") == 5))
+        actual = stats_from_performances({"example": performance, "empty": {}})
+        if actual["example"] != expected or actual["empty"] != (0, 0, 0):
+            print(f"❌ Performance-Statistik {actual} != {expected}")
+            mismatches += 1
+
+    print(f"{'✅' if not mismatches else '❌'} Parität: {index} Spieler in {leagues} Ligen, {mismatches} Abweichungen")
+    return mismatches
+
+# ---------------------------------------------------------------------------------------------
+# Daten laden
+# ---------------------------------------------------------------------------------------------
+
+async def fetch_league_async(api, league_id, competition_id=1, with_performance=True):
+    """
+    Lädt Markt, eigenen Kader und (optional) die Performance aller Marktspieler einer Liga
+    über einen kickbase_api.KickbaseClient. Liefert (MarketColumns, squad, stats).
+    """
+    market_response, squad_response = await asyncio.gather(api.get_leagues_market(leagueId=league_id),
+                                                           api.get_leagues_squad(leagueId=league_id))
+    market = MarketColumns(player_list(market_response.json() or {}))
+    squad = player_list(squad_response.json() or {})
+    stats = {}
+    if with_performance and len(market):
+        responses = await api.batch(api.get_competitions_players_performance,
+                                    [{'competitionId': competition_id, 'playerId': player_id} for player_id in market.ids])
+        stats = stats_from_performances({player_id: response.json() for player_id, response in zip(market.ids, responses)
+                                         if not isinstance(response, Exception)})
+        market.set_stats(stats)
+    return market, squad, stats
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_performances(directory):
+    """
+    Performance-Antworten aus einem Verzeichnis (<player_id>.json).
+    """
+    return {os.path.splitext(os.path.basename(path))[0]: load_json(path)
+            for path in glob.glob(os.path.join(directory, "*.json"))}
+
+async def _score_leagues(args):
+    from kickbase_api import KickbaseClient
+
+    async with KickbaseClient(token=args.token) as api:
+        if args.email:
+            await api.login(args.email, args.password)
+        leagues = await asyncio.gather(*(fetch_league_async(api, league_id, args.competition, not args.no_performance)
+                                         for league_id in args.league))
+    return leagues
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transfer-Empfehlungen für den ganzen Markt (NumPy)")
+    parser.add_argument('--check', action='store_true', help="Parität gegen die Swift-Formeln prüfen")
+    parser.add_argument('--players', type=int, default=2000, help="Spieler für --check")
+    parser.add_argument('--market', action='append', default=[], help="Markt-Antwort (JSON), mehrfach für mehrere Ligen")
+    parser.add_argument('--squad', action='append', default=[], help="Kader-Antwort (JSON), eine pro --market")
+    parser.add_argument('--performance', help="Verzeichnis mit Performance-Antworten <player_id>.json")
+    parser.add_argument('--league', action='append', default=[], help="Liga-ID, direkt über die API laden")
+    parser.add_argument('--competition', type=int, default=1)
+    parser.add_argument('--token', default=os.environ.get("KICKBASE_TOKEN"))
+    parser.add_argument('--email', default=os.environ.get("KICKBASE_EMAIL"))
+    parser.add_argument('--password', default=os.environ.get("KICKBASE_PASSWORD"))
+    parser.add_argument('--no-performance', action='store_true', help="Ohne Spieldaten (Confidence 0.5)")
+    parser.add_argument('--user', action='append', default=[], help="Eigene Benutzer-ID pro Liga (Filter)")
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--output', help="Empfehlungen als JSON schreiben")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if verify_parity(args.players) else 0)
+
+    if args.league:
+        loaded = asyncio.run(_score_leagues(args))
+        markets = [market for market, _, _ in loaded]
+        squads = [squad for _, squad, _ in loaded]
+        names = args.league
+    else:
+        if not args.market:
+            parser.error("--market, --league oder --check angeben")
+        stats = stats_from_performances(load_performances(args.performance)) if args.performance else {}
+        markets = [MarketColumns(player_list(load_json(path))).set_stats(stats) for path in args.market]
+        squads = [player_list(load_json(path)) for path in args.squad] + [[]] * (len(args.market) - len(args.squad))
+        names = args.market
+
+    started = time.perf_counter()
+    columns = MarketColumns.concat(markets)
+    positions = [team_positions(squad) for squad in squads]
+    result = score_market(columns, [w for w, _ in positions], [s for _, s in positions],
+                          current_user_ids=args.user if len(args.user) == len(markets) else None)
+    picks = top_recommendations(columns, result, args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"{len(columns)} Marktspieler in {len(markets)} Ligen bewertet ({elapsed * 1000:.1f} ms)")
+
+    output = {name: picks.get(index, []) for index, name in enumerate(names)}
+    for name, recommendations in output.items():
+        print(f"\n{name}:")
+        for pick in recommendations:
+            print(f"  {pick['score']:5.2f}  {pick['name']:<28} {pick['form']:<10} {pick['risk']:<7} {pick['priority']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,592 @@
+"""
+Marktwert- und Punkte-Trends für den ganzen Spielerpool.
+
+Jede Historie (Marktwert aus /v4/competitions/{competitionId}/players/{playerId}/marketvalue/
+{timeframe}, Punkte aus den ph-Listen der Performance-Antwort) liegt in einem gemeinsamen
+Puffer: pro Spieler Startposition, Länge und Kapazität (Offsets + Werte, mit Reserve zum
+Anhängen). Rollende Kennzahlen und Regressionen laufen über Präfixsummen für alle Spieler
+auf einmal.
+
+Für den Betrieb hält TrendEngine pro Fenster die Summen (n, Σx, Σy, Σxx, Σxy, Σyy) der
+letzten w Punkte. Ein neuer Spieltag/Tag ist dann pro Spieler ein Punkt dazu und einer
+heraus, statt alles neu zu rechnen; refresh() rechnet exakt aus dem Puffer nach.
+
+    python kickbase_trends.py --marketvalue mv/ --performance perf/ --top 20
+    python kickbase_trends.py --check
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from kickbase_scoring import load_performances
+
+DEFAULT_WINDOWS = (7, 30)
+DEFAULT_TIMEFRAME = 365
+# Punkte-Historie: x = Startjahr der Saison * 34 + Spieltag - 1, Saisons schließen lückenlos an
+SEASON_MATCHDAYS = 34
+FORECAST_Z = 1.96
+MIN_CAPACITY = 8
+
+class RaggedHistory:
+    """
+    Zeitreihen aller Spieler in zwei Puffern (x, y). Spieler i belegt
+    x[starts[i]:starts[i] + lengths[i]]; dahinter ist Platz bis capacity[i].
+    """
+
+    def __init__(self, ids=(), starts=None, lengths=None, capacity=None, x=None, y=None):
+        self.ids = list(ids)
+        self.index = {player_id: i for i, player_id in enumerate(self.ids)}
+        count = len(self.ids)
+        self.starts = np.zeros(count, dtype=np.int64) if starts is None else np.asarray(starts, dtype=np.int64)
+        self.lengths = np.zeros(count, dtype=np.int64) if lengths is None else np.asarray(lengths, dtype=np.int64)
+        self.capacity = np.zeros(count, dtype=np.int64) if capacity is None else np.asarray(capacity, dtype=np.int64)
+        self.x = np.zeros(0) if x is None else np.asarray(x, dtype=np.float64)
+        self.y = np.zeros(0) if y is None else np.asarray(y, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_series(cls, series, reserve=0.25):
+        """
+        series: player_id -> (x, y). Punkte werden pro Spieler nach x sortiert; jede Reihe
+        bekommt reserve * Länge (mindestens MIN_CAPACITY) Platz für neue Werte.
+        """
+        ids = list(series)
+        lengths = np.array([len(series[player_id][0]) for player_id in ids], dtype=np.int64)
+        capacity = np.maximum(lengths + np.ceil(lengths * reserve).astype(np.int64), MIN_CAPACITY)
+        starts = np.concatenate(([0], np.cumsum(capacity)[:-1])).astype(np.int64) if ids else np.zeros(0, dtype=np.int64)
+        x = np.zeros(int(capacity.sum()))
+        y = np.zeros(int(capacity.sum()))
+        for i, player_id in enumerate(ids):
+            xs, ys = (np.asarray(values, dtype=np.float64) for values in series[player_id])
+            order = np.argsort(xs, kind="stable")
+            x[starts[i]:starts[i] + lengths[i]] = xs[order]
+            y[starts[i]:starts[i] + lengths[i]] = ys[order]
+        return cls(ids, starts, lengths, capacity, x, y)
+
+    def packed(self):
+        """
+        Lückenlose Form: (offsets mit len+1 Einträgen, x, y).
+        """
+        offsets = np.concatenate(([0], np.cumsum(self.lengths))).astype(np.int64)
+        positions = np.repeat(self.starts - offsets[:-1], self.lengths) + np.arange(offsets[-1])
+        return offsets, self.x[positions], self.y[positions]
+
+    def series(self, player_id):
+        i = self.index[player_id]
+        end = self.starts[i] + self.lengths[i]
+        return self.x[self.starts[i]:end], self.y[self.starts[i]:end]
+
+    def last_x(self):
+        last = np.full(len(self), -np.inf)
+        filled = self.lengths > 0
+        last[filled] = self.x[self.starts[filled] + self.lengths[filled] - 1]
+        return last
+
+    def _add_players(self, player_ids):
+        for player_id in player_ids:
+            if player_id not in self.index:
+                self.index[player_id] = len(self.ids)
+                self.ids.append(player_id)
+        grow = len(self.ids) - len(self.starts)
+        if grow:
+            self.starts = np.concatenate((self.starts, np.full(grow, len(self.x), dtype=np.int64)))
+            self.lengths = np.concatenate((self.lengths, np.zeros(grow, dtype=np.int64)))
+            self.capacity = np.concatenate((self.capacity, np.zeros(grow, dtype=np.int64)))
+
+    def _reserve(self, players):
+        """
+        Verschiebt volle Reihen ans Pufferende (doppelte Kapazität); amortisiert O(1) pro Punkt.
+        """
+        full = players[self.lengths[players] >= self.capacity[players]]
+        if not len(full):
+            return
+        new_capacity = np.maximum(self.capacity[full] * 2, MIN_CAPACITY)
+        new_starts = len(self.x) + np.concatenate(([0], np.cumsum(new_capacity)[:-1]))
+        grow = int(new_capacity.sum())
+        self.x = np.concatenate((self.x, np.zeros(grow)))
+        self.y = np.concatenate((self.y, np.zeros(grow)))
+        for player, start in zip(full, new_starts):
+            old, length = self.starts[player], self.lengths[player]
+            self.x[start:start + length] = self.x[old:old + length]
+            self.y[start:start + length] = self.y[old:old + length]
+            self.x[old:old + length] = 0.0
+            self.y[old:old + length] = 0.0
+        self.starts[full] = new_starts
+        self.capacity[full] = new_capacity
+
+    def compact(self):
+        """
+        Baut den Puffer ohne verwaiste Lücken neu auf (z.B. vor dem Speichern).
+        """
+        series = {player_id: tuple(np.copy(values) for values in self.series(player_id)) for player_id in self.ids}
+        compacted = RaggedHistory.from_series(series)
+        self.__dict__.update(compacted.__dict__)
+
+    def save(self, path):
+        np.savez_compressed(state_path(path), ids=np.array(self.ids, dtype=str), starts=self.starts, lengths=self.lengths,
+                            capacity=self.capacity, x=self.x, y=self.y)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(state_path(path))
+        return cls(data["ids"].tolist(), data["starts"], data["lengths"], data["capacity"], data["x"], data["y"])
+
+def state_path(path):
+    """
+    Pfad der gespeicherten Historie mit Endung .npz (np.savez_compressed hängt sie sonst still an).
+    """
+    return path if path.endswith(".npz") else path + ".npz"
+
+# ---------------------------------------------------------------------------------------------
+# Laden
+# ---------------------------------------------------------------------------------------------
+
+def marketvalue_series(responses):
+    """
+    player_id -> Antwort von .../marketvalue/{timeframe} ({"it": [{"dt": Tage, "mv": Wert}]}).
+    """
+    series = {}
+    for player_id, response in responses.items():
+        entries = [entry for entry in (response or {}).get("it") or []
+                   if isinstance(entry.get("dt"), int) and isinstance(entry.get("mv"), int)]
+        series[player_id] = ([entry["dt"] for entry in entries], [entry["mv"] for entry in entries])
+    return series
+
+def season_start(title):
+    """
+    "2024/2025" -> 2024 (0 wenn unbekannt).
+    """
+    head = str(title or "").split("/")[0]
+    return int(head) if head.isdigit() else 0
+
+def performance_series(responses):
+    """
+    player_id -> Performance-Antwort; Punkte aller Saisons, nur Spiele mit Punktwert (p).
+    """
+    series = {}
+    for player_id, response in responses.items():
+        xs, ys = [], []
+        seen = set()
+        for season in (response or {}).get("it") or []:
+            base = season_start(season.get("ti")) * SEASON_MATCHDAYS
+            for match in season.get("ph") or []:
+                x = base + int(match.get("day") or 0) - 1
+                if match.get("p") is None or x in seen:
+                    continue
+                seen.add(x)
+                xs.append(x)
+                ys.append(match["p"])
+        series[player_id] = (xs, ys)
+    return series
+
+def new_points(history, series):
+    """
+    Punkte aus series, die neuer sind als das Letzte im Puffer: (ids, x, y) für TrendEngine.add().
+    """
+    last = history.last_x()
+    ids, xs, ys = [], [], []
+    for player_id, (x_values, y_values) in series.items():
+        i = history.index.get(player_id)
+        threshold = last[i] if i is not None else -np.inf
+        for x, y in sorted(zip(x_values, y_values)):
+            if x > threshold:
+                ids.append(player_id)
+                xs.append(x)
+                ys.append(y)
+    return ids, np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+
+# ---------------------------------------------------------------------------------------------
+# Batch-Kennzahlen
+# ---------------------------------------------------------------------------------------------
+
+def _moments(x, y):
+    return np.stack((np.ones_like(x), x, y, x * x, x * y, y * y), axis=-1)
+
+def window_sums(history, window, origin=0.0):
+    """
+    (n, Σx, Σy, Σxx, Σxy, Σyy) der letzten `window` Punkte jedes Spielers über Präfixsummen
+    (x relativ zu origin, damit Σxx bei Tageszahlen ~20000 nicht an Genauigkeit verliert).
+    """
+    moments = _moments(history.x - origin, history.y)
+    ends = history.starts + history.lengths
+    begins = ends - np.minimum(history.lengths, window)
+    prefix = np.concatenate((np.zeros((1, 6)), np.cumsum(moments, axis=0)))
+    sums = prefix[ends] - prefix[begins]
+    sums[:, 0] = ends - begins
+    return sums
+
+def regression(sums, x_last, horizon=0.0):
+    """
+    Mittelwert, Streuung, lineare Regression und Prognose x_last + horizon aus den Summen.
+    """
+    n, sx, sy, sxx, sxy, syy = sums.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_n = np.maximum(n, 1)
+        mean = sy / safe_n
+        sxx_c = sxx - sx * sx / safe_n
+        sxy_c = sxy - sx * sy / safe_n
+        syy_c = np.maximum(syy - sy * sy / safe_n, 0.0)
+        slope = np.where(sxx_c > 1e-9, sxy_c / sxx_c, 0.0)
+        intercept = (sy - slope * sx) / safe_n
+        residual = np.maximum(syy_c - slope * sxy_c, 0.0)
+        residual_std = np.where(n > 2, np.sqrt(residual / np.maximum(n - 2, 1)), 0.0)
+        r2 = np.where(syy_c > 0, 1.0 - residual / syy_c, 0.0)
+        x_mean = sx / safe_n
+        target = x_last + horizon
+        forecast = intercept + slope * target
+        leverage = np.where(sxx_c > 1e-9, (target - x_mean) ** 2 / sxx_c, 0.0)
+        interval = FORECAST_Z * residual_std * np.sqrt(1.0 + 1.0 / safe_n + leverage)
+    empty = n == 0
+    return {
+        "n": n.astype(np.int64),
+        "mean": np.where(empty, np.nan, mean),
+        "std": np.sqrt(syy_c / safe_n),
+        "slope": slope,
+        "r2": r2,
+        "forecast": np.where(empty, np.nan, forecast),
+        "forecast_low": np.where(empty, np.nan, forecast - interval),
+        "forecast_high": np.where(empty, np.nan, forecast + interval),
+    }
+
+def rolling(history, window):
+    """
+    Rollender Mittelwert, Streuung und Steigung für jeden Punkt jeder Reihe (lückenlose
+    Reihenfolge wie packed()), ein Durchlauf über den ganzen Pool.
+    """
+    offsets, x, y = history.packed()
+    origin = x[0] if len(x) else 0.0
+    moments = _moments(x - origin, y)
+    prefix = np.concatenate((np.zeros((1, 6)), np.cumsum(moments, axis=0)))
+    segment_start = np.repeat(offsets[:-1], np.diff(offsets))
+    ends = np.arange(1, len(x) + 1)
+    begins = np.maximum(segment_start, ends - window)
+    sums = prefix[ends] - prefix[begins]
+    sums[:, 0] = ends - begins
+    stats = regression(sums, x - origin)
+    return offsets, {"mean": stats["mean"], "std": stats["std"], "slope": stats["slope"]}
+
+# ---------------------------------------------------------------------------------------------
+# Inkrementelle Engine
+# ---------------------------------------------------------------------------------------------
+
+class TrendEngine:
+    """
+    Hält die Fenstersummen aller Spieler. add() hängt neue Punkte an und aktualisiert die
+    Summen (+ neuer Punkt, - Punkt, der aus dem Fenster fällt); stats() braucht danach nur
+    noch O(Spieler).
+    """
+
+    def __init__(self, history, windows=DEFAULT_WINDOWS):
+        self.history = history
+        self.windows = tuple(sorted(windows))
+        filled = history.lengths > 0
+        self.origin = float(history.x[history.starts[filled]].min()) if filled.any() else 0.0
+        self.sums = {}
+        self.refresh()
+
+    def refresh(self):
+        """
+        Exakte Neuberechnung aller Summen aus dem Puffer.
+        """
+        for window in self.windows:
+            self.sums[window] = window_sums(self.history, window, self.origin)
+
+    def add(self, ids, x, y):
+        """
+        Neue Punkte (je Spieler aufsteigend in x). Gleiches x wie der letzte Punkt ersetzt
+        diesen (korrigierte Live-Punkte); ältere Punkte werden ignoriert. Liefert die Anzahl
+        übernommener Punkte.
+        """
+        history = self.history
+        history._add_players(ids)
+        for window in self.windows:
+            missing = len(history) - len(self.sums[window])
+            if missing:
+                self.sums[window] = np.concatenate((self.sums[window], np.zeros((missing, 6))))
+
+        players = np.fromiter((history.index[player_id] for player_id in ids), dtype=np.int64, count=len(ids))
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        # k-ter neuer Punkt eines Spielers landet in Runde k: pro Runde jeder Spieler höchstens einmal
+        order = np.argsort(players, kind="stable")
+        first = np.concatenate(([True], players[order][1:] != players[order][:-1])) if len(order) else np.zeros(0, bool)
+        group_start = np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))
+        rounds = np.empty(len(order), dtype=np.int64)
+        rounds[order] = np.arange(len(order)) - group_start
+
+        accepted = 0
+        for round_index in range(int(rounds.max()) + 1 if len(rounds) else 0):
+            selected = rounds == round_index
+            accepted += self._add_round(players[selected], x[selected], y[selected])
+        return accepted
+
+    def _add_round(self, players, x, y):
+        history = self.history
+        last = history.last_x()[players]
+        replace = x == last
+        append = x > last
+
+        if replace.any():
+            targets = players[replace]
+            positions = history.starts[targets] + history.lengths[targets] - 1
+            old = _moments(history.x[positions] - self.origin, history.y[positions])
+            new = _moments(x[replace] - self.origin, y[replace])
+            history.y[positions] = y[replace]
+            for window in self.windows:
+                np.add.at(self.sums[window], targets, new - old)
+
+        if append.any():
+            targets = players[append]
+            history._reserve(targets)
+            lengths = history.lengths[targets]
+            positions = history.starts[targets] + lengths
+            history.x[positions] = x[append]
+            history.y[positions] = y[append]
+            new = _moments(x[append] - self.origin, y[append])
+            for window in self.windows:
+                np.add.at(self.sums[window], targets, new)
+                leaving = lengths >= window
+                if leaving.any():
+                    old_positions = history.starts[targets[leaving]] + lengths[leaving] - window
+                    old = _moments(history.x[old_positions] - self.origin, history.y[old_positions])
+                    np.subtract.at(self.sums[window], targets[leaving], old)
+            history.lengths[targets] += 1
+        return int(replace.sum() + append.sum())
+
+    def stats(self, horizon=7.0):
+        """
+        Kennzahlen pro Spieler und Fenster; momentum = Steigung kurzes - langes Fenster,
+        change = relative Veränderung über das kurze Fenster.
+        """
+        history = self.history
+        x_last = history.last_x() - self.origin
+        result = {window: regression(self.sums[window], x_last, horizon) for window in self.windows}
+        short, long = self.windows[0], self.windows[-1]
+        filled = history.lengths > 0
+        last_y = np.full(len(history), np.nan)
+        first_y = np.full(len(history), np.nan)
+        ends = history.starts + history.lengths
+        last_y[filled] = history.y[ends[filled] - 1]
+        first_y[filled] = history.y[ends[filled] - np.minimum(history.lengths[filled], short)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = np.where(first_y != 0, (last_y - first_y) / np.abs(first_y), 0.0)
+        result["momentum"] = result[short]["slope"] - result[long]["slope"]
+        result["change"] = change
+        result["last"] = last_y
+        return result
+
+    def report(self, horizon=7.0, top=20):
+        """
+        Spieler mit dem stärksten Momentum (auf- und abwärts) als Liste von dicts.
+        """
+        stats = self.stats(horizon)
+        short, long = self.windows[0], self.windows[-1]
+        momentum = np.nan_to_num(stats["momentum"])
+
+        def row(i):
+            return {
+                "id": self.history.ids[i],
+                "last": float(stats["last"][i]),
+                f"slope{short}": round(float(stats[short]["slope"][i]), 2),
+                f"slope{long}": round(float(stats[long]["slope"][i]), 2),
+                "momentum": round(float(momentum[i]), 2),
+                "change": round(float(stats["change"][i]), 4),
+                "forecast": round(float(stats[short]["forecast"][i]), 1),
+                "forecastLow": round(float(stats[short]["forecast_low"][i]), 1),
+                "forecastHigh": round(float(stats[short]["forecast_high"][i]), 1),
+            }
+
+        order = np.argsort(-momentum, kind="stable")
+        return {"rising": [row(i) for i in order[:top]], "falling": [row(i) for i in order[::-1][:top]]}
+
+# ---------------------------------------------------------------------------------------------
+# Abruf, Prüfung, CLI
+# ---------------------------------------------------------------------------------------------
+
+async def fetch_histories_async(api, player_ids, competition_id=1, timeframe=DEFAULT_TIMEFRAME):
+    """
+    Marktwert- und Performance-Antworten für viele Spieler über einen KickbaseClient-Pool.
+    """
+    player_ids = list(player_ids)
+    values, performances = await asyncio.gather(
+        api.batch(api.get_competitions_players_marketvalue_by_timeframe,
+                  [{'competitionId': competition_id, 'playerId': pid, 'timeframe': timeframe} for pid in player_ids]),
+        api.batch(api.get_competitions_players_performance,
+                  [{'competitionId': competition_id, 'playerId': pid} for pid in player_ids]))
+
+    def ok(responses):
+        return {pid: response.json() for pid, response in zip(player_ids, responses) if not isinstance(response, Exception)}
+
+    return ok(values), ok(performances)
+
+def _random_series(rng, players, days):
+    series = {}
+    for index in range(players):
+        length = int(rng.integers(1, days + 1))
+        start = 19000 + int(rng.integers(0, days))
+        value = rng.uniform(5e5, 3e7)
+        steps = rng.normal(rng.normal(0, 2e4), 1.5e5, length)
+        series[f"p{index}"] = (list(range(start, start + length)), list(np.maximum(value + np.cumsum(steps), 5e5).round()))
+    return series
+
+def verify(seed=0, players=300, days=120, updates=40):
+    """
+    Prüft Fenstersummen gegen polyfit pro Spieler und inkrementelle Updates gegen refresh().
+    """
+    rng = np.random.default_rng(seed)
+    series = _random_series(rng, players, days)
+    cut = {pid: (x[:max(1, len(x) - updates)], y[:max(1, len(y) - updates)]) for pid, (x, y) in series.items()}
+    engine = TrendEngine(RaggedHistory.from_series(cut))
+    problems = 0
+
+    # Nachlieferung Tag für Tag, dazu ein neuer Spieler und eine Korrektur des letzten Werts
+    for step in range(updates):
+        ids, xs, ys = [], [], []
+        for pid, (x, y) in series.items():
+            position = max(1, len(x) - updates) + step
+            if position < len(x):
+                ids.append(pid)
+                xs.append(x[position])
+                ys.append(y[position])
+        engine.add(ids, xs, ys)
+    engine.add(["neu", "neu", "neu"], [19500, 19501, 19502], [1e6, 1.1e6, 1.3e6])
+    pid = "p0"
+    x0, y0 = engine.history.series(pid)
+    engine.add([pid], [x0[-1]], [y0[-1] + 12345])
+    series["neu"] = ([19500, 19501, 19502], [1e6, 1.1e6, 1.3e6])
+    series[pid] = (series[pid][0], series[pid][1][:-1] + [series[pid][1][-1] + 12345])
+
+    incremental = {window: sums.copy() for window, sums in engine.sums.items()}
+    engine.refresh()
+    for window in engine.windows:
+        scale = np.maximum(np.abs(engine.sums[window]), 1.0)
+        if np.max(np.abs(incremental[window] - engine.sums[window]) / scale) > 1e-9:
+            print(f"❌ Fenster {window}: inkrementelle Summen weichen ab")
+            problems += 1
+
+    stats = engine.stats(horizon=0.0)
+    for pid, (x, y) in series.items():
+        i = engine.history.index[pid]
+        for window in engine.windows:
+            xs, ys = np.asarray(x[-window:], float), np.asarray(y[-window:], float)
+            if len(xs) >= 2:
+                slope, intercept = np.polyfit(xs - engine.origin, ys, 1)
+                got = stats[window]["slope"][i]
+                if abs(got - slope) > 1e-6 * max(1.0, abs(slope)) or abs(stats[window]["mean"][i] - ys.mean()) > 1e-6 * abs(ys.mean()):
+                    problems += 1
+                    if problems <= 5:
+                        print(f"❌ {pid} Fenster {window}: Steigung {got} != {slope}")
+
+    offsets, rolled = rolling(engine.history, engine.windows[0])
+    _, _, packed_y = engine.history.packed()
+    i = engine.history.index["p1"]
+    segment = packed_y[offsets[i]:offsets[i + 1]]
+    expected = [segment[max(0, k + 1 - engine.windows[0]):k + 1].mean() for k in range(len(segment))]
+    if not np.allclose(rolled["mean"][offsets[i]:offsets[i + 1]], expected):
+        print("❌ rollender Mittelwert weicht ab")
+        problems += 1
+
+    print(f"{'✅' if not problems else '❌'} {len(series)} Reihen, {updates} inkrementelle Tage, {problems} Abweichungen")
+    return problems
+
+def bench(seed=0, players=600, days=365):
+    rng = np.random.default_rng(seed)
+    series = _random_series(rng, players, days)
+    started = time.perf_counter()
+    history = RaggedHistory.from_series(series)
+    engine = TrendEngine(history)
+    built = time.perf_counter() - started
+    started = time.perf_counter()
+    offsets, rolled = rolling(history, 30)
+    rolled_time = time.perf_counter() - started
+
+    ids = history.ids
+    last = history.last_x()
+    started = time.perf_counter()
+    for day in range(1, 31):
+        engine.add(ids, last + day, rng.uniform(5e5, 3e7, len(ids)))
+        engine.stats()
+    incremental = (time.perf_counter() - started) / 30
+    started = time.perf_counter()
+    engine.refresh()
+    engine.stats()
+    full = time.perf_counter() - started
+    print(f"{players} Spieler, {int(history.lengths.sum())} Punkte: Aufbau {built * 1000:.1f} ms, "
+          f"rollend (alle Punkte) {rolled_time * 1000:.1f} ms")
+    print(f"Neuer Tag inkrementell {incremental * 1000:.2f} ms, komplett neu {full * 1000:.2f} ms")
+
+async def _fetch(args, player_ids):
+    from kickbase_api import KickbaseClient
+
+    async with KickbaseClient(token=args.token) as api:
+        if args.email:
+            await api.login(args.email, args.password)
+        return await fetch_histories_async(api, player_ids, args.competition, args.timeframe)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Marktwert-/Punkte-Trends und Prognosen für den Spielerpool")
+    parser.add_argument('--marketvalue', help="Verzeichnis mit Marktwert-Antworten <player_id>.json")
+    parser.add_argument('--performance', help="Verzeichnis mit Performance-Antworten <player_id>.json")
+    parser.add_argument('--players', nargs='*', default=[], help="Spieler-IDs direkt über die API laden")
+    parser.add_argument('--competition', type=int, default=1)
+    parser.add_argument('--timeframe', type=int, default=DEFAULT_TIMEFRAME)
+    parser.add_argument('--token', default=os.environ.get("KICKBASE_TOKEN"))
+    parser.add_argument('--email', default=os.environ.get("KICKBASE_EMAIL"))
+    parser.add_argument('--password', default=os.environ.get("KICKBASE_PASSWORD"))
+    parser.add_argument('--state', help="Gespeicherte Marktwert-Historie (.npz): laden, neue Werte anhängen, speichern")
+    parser.add_argument('--windows', type=int, nargs=2, default=DEFAULT_WINDOWS, help="Kurzes und langes Fenster")
+    parser.add_argument('--horizon', type=float, default=7, help="Prognose-Horizont (Tage bzw. Spieltage)")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help="Bericht als JSON schreiben")
+    parser.add_argument('--check', action='store_true', help="Inkrementell gegen Neuberechnung und polyfit prüfen")
+    parser.add_argument('--bench', action='store_true')
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if verify() else 0)
+    if args.bench:
+        bench()
+        raise SystemExit(0)
+
+    values, performances = {}, {}
+    if args.players:
+        values, performances = asyncio.run(_fetch(args, args.players))
+    if args.marketvalue:
+        values.update(load_performances(args.marketvalue))
+    if args.performance:
+        performances.update(load_performances(args.performance))
+
+    output = {}
+    if values or args.state:
+        mv_series = marketvalue_series(values)
+        if args.state:
+            args.state = state_path(args.state)
+        if args.state and os.path.exists(args.state):
+            engine = TrendEngine(RaggedHistory.load(args.state), args.windows)
+            added = engine.add(*new_points(engine.history, mv_series))
+            print(f"Marktwert: {added} neue Werte an gespeicherte Historie angehängt")
+        else:
+            engine = TrendEngine(RaggedHistory.from_series(mv_series), args.windows)
+        if args.state:
+            engine.history.save(args.state)
+        output["marketValue"] = engine.report(args.horizon, args.top)
+    if performances:
+        engine = TrendEngine(RaggedHistory.from_series(performance_series(performances)), args.windows)
+        output["points"] = engine.report(args.horizon, args.top)
+
+    if not output:
+        parser.error("--marketvalue, --performance, --players, --check oder --bench angeben")
+    for kind, report in output.items():
+        print(f"\n{kind} – stärkstes Momentum:")
+        for entry in report["rising"][:args.top]:
+            print(f"  {entry['id']:<12} {entry['last']:>12,.0f}  Momentum {entry['momentum']:>10,.2f}  "
+                  f"Prognose {entry['forecast']:>12,.0f} [{entry['forecastLow']:,.0f} – {entry['forecastHigh']:,.0f}]")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,336 @@
+"""
+Spielerfotos und Team-Logos einmal zentral laden statt auf jedem Gerät.
+
+Die Bilder landen inhaltsadressiert (SHA-256 des Inhalts) im Cache-Verzeichnis: dasselbe Foto
+unter verschiedenen URLs, Teams oder Spieltagen liegt nur einmal auf der Platte. Pro URL merkt
+sich der Store den Hash und die Validatoren (ETag / Last-Modified); innerhalb der TTL wird gar
+nicht angefragt, danach bedingt. Optional entstehen verkleinerte Vorschaubilder (Pillow), die
+ebenfalls inhaltsadressiert abgelegt werden.
+
+Die Ausgaben des Scrapers bekommen beim Schreiben neben imageUrl / homeLogo / awayLogo die
+Hashes (imageHash, homeLogoHash, awayLogoHash); ligainsider_assets.json (Aufstellungen) bzw.
+ligainsider_squad_assets.json (Kader) beschreiben genau die Dateien, die die aktuelle Ausgabe
+referenziert, sodass Clients dieses vorab aufgelöste Set laden.
+
+    python ligainsider_scraper.py --assets --thumbnail 96
+    python ligainsider_assets.py   # Statistik des Stores
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import ligainsider_metrics as metrics
+
+from ligainsider_cache import get_cache_dir, write_if_changed
+from ligainsider_throttle import AdaptiveLimiter, request_with_retry_async
+
+# Pillow ist optional; ohne Pillow gibt es keine Vorschaubilder
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ASSET_DIR = "assets"
+ASSET_INDEX_FILE = "index.json"
+# Ein Manifest pro Modus, jeweils nur mit den Dateien der aktuellen Ausgabe
+ASSET_MANIFEST_FILES = {'lineups': "ligainsider_assets.json", 'squads': "ligainsider_squad_assets.json"}
+
+# Fotos und Wappen ändern sich selten: eine Woche ohne erneute Prüfung beim Server
+ASSET_TTL = 7 * 24 * 3600
+DEFAULT_ASSET_CONCURRENCY = 16
+
+EXTENSIONS = {
+    'image/png': '.png', 'image/jpeg': '.jpg', 'image/jpg': '.jpg', 'image/webp': '.webp',
+    'image/gif': '.gif', 'image/svg+xml': '.svg',
+}
+
+def get_asset_dir():
+    return os.path.join(get_cache_dir(), ASSET_DIR)
+
+def get_manifest_path(kind='lineups'):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ASSET_MANIFEST_FILES[kind])
+
+def extension_for(url, content_type=None):
+    content_type = (content_type or "").split(';')[0].strip().lower()
+    if content_type in EXTENSIONS:
+        return EXTENSIONS[content_type]
+    _, extension = os.path.splitext(url.split('?')[0])
+    return extension.lower() if extension.lower() in EXTENSIONS.values() or extension.lower() == '.jpeg' else ""
+
+class AssetStore:
+    """
+    Inhaltsadressierter Bild-Cache: blobs (Hash -> Datei, Typ, Größe, Vorschaubilder) und
+    urls (URL -> Hash plus Validatoren). Threadsicher wie ResponseCache.
+    """
+
+    def __init__(self, directory=None, ttl=ASSET_TTL):
+        self.directory = directory or get_asset_dir()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        index = self._load_index()
+        self.urls = index.get('urls', {})
+        self.blobs = index.get('blobs', {})
+
+    def _index_path(self):
+        return os.path.join(self.directory, ASSET_INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def path_for(self, digest):
+        """
+        Relativer Pfad eines Blobs im Store (zwei Zeichen Verzeichnis-Präfix wie bei git).
+        """
+        blob = self.blobs[digest]
+        return os.path.join(digest[:2], digest + blob.get('ext', ""))
+
+    def read(self, digest):
+        with open(os.path.join(self.directory, self.path_for(digest)), 'rb') as f:
+            return f.read()
+
+    def lookup(self, url):
+        """
+        Liefert (Hash, fresh) einer URL oder (None, False). Fehlt die Datei, zählt der Eintrag nicht.
+        """
+        with self._lock:
+            entry = self.urls.get(url)
+            if not entry or entry['hash'] not in self.blobs:
+                return None, False
+            if not os.path.exists(os.path.join(self.directory, self.path_for(entry['hash']))):
+                return None, False
+            return entry['hash'], time.time() - entry['stored_at'] < self.ttl
+
+    def conditional_headers(self, url):
+        with self._lock:
+            entry = self.urls.get(url)
+            headers = {}
+            if entry:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def add_blob(self, body, ext="", content_type=None):
+        """
+        Legt body unter seinem Inhalts-Hash ab (vorhandene Blobs werden nicht neu geschrieben).
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            if digest not in self.blobs:
+                self.blobs[digest] = {'ext': ext, 'type': content_type, 'size': len(body)}
+                path = os.path.join(self.directory, self.path_for(digest))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_if_changed(path, body)
+                self._dirty = True
+        return digest
+
+    def store(self, url, body, headers):
+        content_type = headers.get('Content-Type')
+        if not (content_type or "").strip().lower().startswith('image/'):
+            # z.B. HTML-Fehlerseite mit Status 200
+            raise ValueError(f"Kein Bild: Content-Type {content_type or 'fehlt'}")
+        digest = self.add_blob(body, extension_for(url, content_type), content_type)
+        with self._lock:
+            self.urls[url] = {
+                'hash': digest,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'stored_at': time.time(),
+            }
+            self._dirty = True
+        return digest
+
+    def revalidated(self, url, headers):
+        with self._lock:
+            entry = self.urls.get(url)
+            if not entry:
+                return
+            entry['stored_at'] = time.time()
+            if headers.get('ETag'):
+                entry['etag'] = headers['ETag']
+            if headers.get('Last-Modified'):
+                entry['last_modified'] = headers['Last-Modified']
+            self._dirty = True
+
+    def thumbnail(self, digest, size):
+        """
+        Hash des Vorschaubilds (max. size x size Pixel, PNG) oder None ohne Pillow bzw.
+        bei nicht lesbaren Bildern. Schon vorhandene Vorschaubilder werden wiederverwendet.
+        """
+        key = str(size)
+        with self._lock:
+            existing = self.blobs[digest].get('thumbnails', {}).get(key)
+        if existing in self.blobs:
+            return existing
+        if Image is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(self.read(digest))) as image:
+                image.thumbnail((size, size))
+                buffer = io.BytesIO()
+                image.save(buffer, format='PNG', optimize=True)
+        except (OSError, ValueError):
+            return None
+        thumb = self.add_blob(buffer.getvalue(), '.png', 'image/png')
+        with self._lock:
+            self.blobs[digest].setdefault('thumbnails', {})[key] = thumb
+            self._dirty = True
+        return thumb
+
+    def manifest(self, digests):
+        """
+        Beschreibung der referenzierten Blobs (inkl. ihrer Vorschaubilder) für die Clients.
+        """
+        assets = {}
+        with self._lock:
+            for digest in sorted(set(digests)):
+                blob = self.blobs.get(digest)
+                if blob is None:
+                    continue
+                assets[digest] = {'path': self.path_for(digest).replace(os.sep, '/'),
+                                  'type': blob.get('type'), 'size': blob['size']}
+                for size, thumb in sorted(blob.get('thumbnails', {}).items()):
+                    if thumb in self.blobs:
+                        assets[digest].setdefault('thumbnails', {})[size] = thumb
+                        assets[thumb] = {'path': self.path_for(thumb).replace(os.sep, '/'),
+                                         'type': self.blobs[thumb].get('type'), 'size': self.blobs[thumb]['size']}
+        return assets
+
+    def stats(self):
+        with self._lock:
+            return {'urls': len(self.urls), 'blobs': len(self.blobs),
+                    'bytes': sum(blob['size'] for blob in self.blobs.values())}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({'urls': self.urls, 'blobs': self.blobs}, ensure_ascii=False).encode('utf-8')
+            write_if_changed(self._index_path(), data)
+            self._dirty = False
+
+def asset_urls(matches=(), squads=None, players=()):
+    """
+    Alle Bild-URLs aus Matches (homeLogo/awayLogo), Kadern und Spielerlisten, ohne Duplikate.
+    """
+    urls = []
+    seen = set()
+
+    def add(url):
+        if url and url not in seen:
+            seen.add(url)
+            urls.append(url)
+
+    for match in matches:
+        add(match.get('homeLogo'))
+        add(match.get('awayLogo'))
+    for squad in (squads or {}).values():
+        for player in squad:
+            add(player.get('imageUrl'))
+    for player in players:
+        add(player.get('imageUrl'))
+    return urls
+
+async def fetch_asset_async(client, url, store, limiter=None, deadline_at=None):
+    """
+    Lädt ein Bild (bzw. nur die Bestätigung per 304) und liefert seinen Inhalts-Hash.
+    """
+    digest, fresh = store.lookup(url)
+    if digest is not None and fresh:
+        return digest
+
+    headers = store.conditional_headers(url) if digest is not None else {}
+    response = await request_with_retry_async(lambda: metrics.timed_get(client, url, headers),
+                                              limiter, deadline_at)
+    if response.status_code == 304 and digest is not None:
+        store.revalidated(url, response.headers)
+        return digest
+    response.raise_for_status()
+    return store.store(url, response.content, response.headers)
+
+async def prefetch_assets_async(client, urls, store, max_concurrency=DEFAULT_ASSET_CONCURRENCY,
+                                deadline=None, thumbnail_size=None):
+    """
+    Lädt alle URLs gleichzeitig (adaptiv begrenzt) in den Store. Liefert URL -> Hash;
+    fehlgeschlagene Bilder fehlen im Ergebnis, der Lauf geht weiter.
+    """
+    started = time.monotonic()
+    deadline_at = started + deadline if deadline else None
+    limiter = AdaptiveLimiter(max_concurrency)
+    if thumbnail_size and Image is None:
+        print("Pillow nicht installiert, keine Vorschaubilder")
+        thumbnail_size = None
+
+    async def fetch(url):
+        try:
+            digest = await fetch_asset_async(client, url, store, limiter, deadline_at)
+            if thumbnail_size:
+                # Verkleinern ist CPU-Arbeit; nicht im Event-Loop
+                await asyncio.to_thread(store.thumbnail, digest, thumbnail_size)
+            return digest
+        except Exception as e:
+            print(f"Fehler Bild {url}: {e}")
+            run = metrics.current()
+            if run is not None:
+                run.record_error(url, e)
+            return None
+
+    digests = await asyncio.gather(*(fetch(url) for url in urls))
+    mapping = {url: digest for url, digest in zip(urls, digests) if digest is not None}
+    print(f"Bilder: {len(mapping)}/{len(urls)} URLs, {len(set(mapping.values()))} verschiedene Dateien. "
+          f"{limiter.summary()}")
+    run = metrics.current()
+    if run is not None:
+        run.add_stage("assets", time.monotonic() - started)
+    return mapping
+
+def attach_hashes(mapping, matches=(), squads=None, players=()):
+    """
+    Kopien von matches / squads / players mit imageHash bzw. homeLogoHash/awayLogoHash neben
+    den URLs (mapping: URL -> Hash). Die Eingaben bleiben unverändert: Kaderzeilen und Spieler
+    sind oft die Parse-Ergebnisse aus dem LineupManifest, die Hashes gehören nur in die Ausgabe.
+    Liefert (matches, squads, players).
+    """
+    def lookup(url):
+        return mapping.get(url) if url else None
+
+    matches = [dict(match, homeLogoHash=lookup(match.get('homeLogo')), awayLogoHash=lookup(match.get('awayLogo')))
+               for match in matches]
+    if squads is not None:
+        squads = {name: [dict(player, imageHash=lookup(player.get('imageUrl'))) for player in squad]
+                  for name, squad in squads.items()}
+    players = [dict(player, imageHash=lookup(player.get('imageUrl'))) for player in players]
+    return matches, squads, players
+
+def write_manifest(store, digests, path=None, kind='lineups'):
+    """
+    Schreibt das Manifest eines Modus (nur bei Änderungen) mit genau den Dateien aus digests;
+    root ist das Store-Verzeichnis relativ zum Manifest. Rückgabe: (Pfad, geändert).
+    """
+    path = path or get_manifest_path(kind)
+    root = os.path.relpath(os.path.abspath(store.directory), os.path.dirname(os.path.abspath(path)))
+    data = json.dumps({'root': root.replace(os.sep, '/'), 'assets': store.manifest(digests)},
+                      ensure_ascii=False, indent=4).encode('utf-8')
+    return path, write_if_changed(path, data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistik des inhaltsadressierten Bild-Caches")
+    parser.add_argument('--directory', default=None, help="Store-Verzeichnis (Standard: .ligainsider_cache/assets)")
+    args = parser.parse_args()
+    store = AssetStore(args.directory)
+    stats = store.stats()
+    thumbnails = sum(len(blob.get('thumbnails', {})) for blob in store.blobs.values())
+    print(f"{stats['urls']} URLs -> {stats['blobs']} Dateien ({stats['bytes'] / 1024:.0f} KB), "
+          f"{thumbnails} Vorschaubilder, Pillow {'verfügbar' if Image is not None else 'nicht installiert'}")
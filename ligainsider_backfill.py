@@ -0,0 +1,317 @@
+"""
+Historischer Backfill aller Spieltage einer Saison in eine lokale SQLite-Datenbank.
+
+Die Spieltage kommen aus der Auswahlliste der Team-Seiten (<option ...>19.</option>), geladen
+wird mit adaptiver Parallelität über einen gemeinsamen Client. Jede Seite wird sofort
+gespeichert, ein abgebrochener Lauf setzt beim nächsten Start dort fort.
+
+    python ligainsider_backfill.py run --season 2024-2025 --season 2025-2026
+    python ligainsider_backfill.py starts mathias-pereira-lage_37699 --last 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import ligainsider_scraper as scraper
+from ligainsider_cache import content_hash
+from ligainsider_parser import extract_lineup, extract_matchday_links
+from ligainsider_pipeline import ParseStage, default_workers
+from ligainsider_throttle import AdaptiveLimiter
+
+HISTORY_FILE = "ligainsider_history.sqlite"
+MATCHDAYS_PER_SEASON = 34
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    season TEXT NOT NULL,
+    matchday INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (season, matchday, team)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lineups (
+    season TEXT NOT NULL,
+    matchday INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    ligainsider_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    alternative TEXT,
+    image_url TEXT,
+    PRIMARY KEY (season, matchday, team, ligainsider_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS lineups_player ON lineups (ligainsider_id, season, matchday);
+"""
+
+def get_history_path():
+    return os.path.join(os.path.dirname(scraper.get_output_path()), HISTORY_FILE)
+
+def team_key(team_url):
+    """
+    /bundesliga/team/fc-st-pauli/20/... bzw. /fc-st-pauli/20/kader/ -> "fc-st-pauli/20"
+    """
+    match = scraper.TEAM_URL_RE.search(team_url)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}"
+    parts = [part for part in team_url.split('/') if part]
+    return f"{parts[0]}/{parts[1]}" if len(parts) >= 2 and parts[1].isdigit() else None
+
+def has_players(rows):
+    """
+    Mindestens ein speicherbarer Spieler (mit ligainsiderId) in den Aufstellungsreihen.
+    """
+    return any(player.get('ligainsiderId') for row in rows or () for player in row)
+
+def season_url(team, season=None):
+    url = f"{scraper.BASE_URL}/bundesliga/team/{team}/"
+    return url + f"saison-{season}" if season else url
+
+class HistoryStore:
+    """
+    SQLite-Ablage der Aufstellungen, Schlüssel (Saison, Spieltag, Team, ligainsiderId).
+    Nur aus einem Thread benutzen (dem Event-Loop des Backfills).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_history_path()
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # Seiten ohne gespeicherte Spieler (leer geparst) gelten nicht als erledigt: beim nächsten
+        # Lauf erneut laden und nicht als "nicht in der Startelf" in predicted_starts zählen
+        with self.connection:
+            self.connection.execute(
+                """
+                DELETE FROM pages WHERE NOT EXISTS (
+                    SELECT 1 FROM lineups WHERE lineups.season = pages.season
+                    AND lineups.matchday = pages.matchday AND lineups.team = pages.team)
+                """)
+
+    def close(self):
+        self.connection.close()
+
+    def page_hash(self, season, matchday, team):
+        row = self.connection.execute(
+            "SELECT content_hash FROM pages WHERE season = ? AND matchday = ? AND team = ?",
+            (season, matchday, team)).fetchone()
+        return row[0] if row else None
+
+    def save_page(self, season, matchday, team, url, body_hash, rows):
+        """
+        Ersetzt die Aufstellung eines Teams an einem Spieltag (eine Transaktion pro Seite).
+        rows muss mindestens einen Spieler mit ligainsiderId enthalten (siehe has_players).
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM lineups WHERE season = ? AND matchday = ? AND team = ?",
+                                    (season, matchday, team))
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO lineups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(season, matchday, team, player['ligainsiderId'], player['name'], row_index, position,
+                  player.get('alternative'), player.get('imageUrl'))
+                 for row_index, row in enumerate(rows)
+                 for position, player in enumerate(row)
+                 if player.get('ligainsiderId')])
+            self.connection.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                                    (season, matchday, team, url, body_hash, time.time()))
+
+    def predicted_starts(self, ligainsider_id, last=10):
+        """
+        Wie oft stand der Spieler in den letzten `last` gespeicherten Spieltagen seines
+        (zuletzt bekannten) Teams in der voraussichtlichen Startelf?
+        """
+        row = self.connection.execute(
+            "SELECT team FROM lineups WHERE ligainsider_id = ? ORDER BY season DESC, matchday DESC LIMIT 1",
+            (ligainsider_id,)).fetchone()
+        if row is None:
+            return {'ligainsiderId': ligainsider_id, 'team': None, 'matchdays': 0, 'starts': 0, 'details': []}
+        team = row[0]
+        details = self.connection.execute(
+            """
+            WITH recent AS (
+                SELECT season, matchday FROM pages WHERE team = ?
+                ORDER BY season DESC, matchday DESC LIMIT ?
+            )
+            SELECT recent.season, recent.matchday, lineups.ligainsider_id IS NOT NULL
+            FROM recent
+            LEFT JOIN lineups ON lineups.season = recent.season AND lineups.matchday = recent.matchday
+                             AND lineups.team = ? AND lineups.ligainsider_id = ?
+            ORDER BY recent.season DESC, recent.matchday DESC
+            """, (team, last, team, ligainsider_id)).fetchall()
+        return {
+            'ligainsiderId': ligainsider_id,
+            'team': team,
+            'matchdays': len(details),
+            'starts': sum(started for _, _, started in details),
+            'details': [{'season': season, 'matchday': matchday, 'start': bool(started)}
+                        for season, matchday, started in details],
+        }
+
+async def discover_teams_async(client, limiter):
+    """
+    Teams des aktuellen Spieltags plus die bekannten Kader-Pfade (für frühere Saisons).
+    """
+    teams = []
+    try:
+        overview = await scraper.fetch_page_async(client, scraper.OVERVIEW_URL, None, limiter)
+        for pair in scraper.parse_match_pairs(overview):
+            teams.extend(team_key(team['url']) for team in pair)
+    except Exception as e:
+        print(f"Übersicht nicht verfügbar ({e}), nutze bekannte Teams")
+    teams.extend(team_key(path) for path in scraper.TEAM_SQUAD_PATHS.values())
+    return list(dict.fromkeys(team for team in teams if team))
+
+async def _fetch(client, url, limiter):
+    try:
+        return await scraper.fetch_page_async(client, url, None, limiter)
+    except Exception as e:
+        print(f"Fehler bei {url}: {e}")
+        return None
+
+async def _fetch_matchday_stream(client, limiter, job):
+    """
+    Spieltags-Seite nur bis zum Ende der Aufstellung laden; der Hash deckt genau diesen Teil ab.
+    """
+    season, matchday, team, url = job
+    try:
+        lineup = await scraper.fetch_lineup_stream_async(client, url, limiter)
+    except Exception as e:
+        print(f"Fehler bei {url}: {e}")
+        return job, None, None
+    return job, content_hash(bytes(lineup.head)), lineup.rows
+
+async def _fetch_matchday(client, limiter, parse_stage, job, body=None, stream=False):
+    season, matchday, team, url = job
+    if body is None and stream:
+        return await _fetch_matchday_stream(client, limiter, job)
+    if body is None:
+        body = await _fetch(client, url, limiter)
+    if body is None:
+        return job, None, None
+    rows = await parse_stage.run(extract_lineup, url, body)
+    return job, content_hash(body), rows
+
+async def backfill_async(seasons=None, teams=None, db_path=None, refresh=False,
+                         max_concurrency=scraper.DEFAULT_MAX_CONCURRENCY,
+                         max_connections=scraper.DEFAULT_MAX_CONNECTIONS,
+                         timeout=scraper.DEFAULT_TIMEOUT, parse_workers=scraper.DEFAULT_PARSE_WORKERS,
+                         stream=False):
+    """
+    Lädt alle Spieltage der Saisons (None = aktuelle) für alle Teams und speichert sie.
+    Bereits gespeicherte Spieltage werden übersprungen, außer dem letzten einer laufenden Saison
+    (oder mit refresh=True alle). Mit stream=True wird jede Spieltags-Seite nur bis zum Ende der
+    Aufstellung geladen; die Seiten-Hashes beziehen sich dann auf diesen Teil.
+    """
+    store = HistoryStore(db_path)
+    stored = skipped = unchanged = failed = 0
+    try:
+        with ParseStage(parse_workers) as parse_stage:
+            async with scraper.create_async_client(max_connections=max_connections, timeout=timeout) as client:
+                limiter = AdaptiveLimiter(max_concurrency)
+                teams = teams or await discover_teams_async(client, limiter)
+                print(f"Backfill für {len(teams)} Teams, Saisons: {', '.join(seasons or ['aktuell'])}")
+
+                # Stufe 1: Saison-Seite je Team und Saison (enthält die Spieltags-Auswahl)
+                season_jobs = [(team, season) for team in teams for season in (seasons or [None])]
+                season_pages = await asyncio.gather(
+                    *(_fetch(client, season_url(team, season), limiter) for team, season in season_jobs))
+
+                # Stufe 2: alle noch fehlenden Spieltage
+                tasks = []
+                for (team, season), body in zip(season_jobs, season_pages):
+                    links = [link for link in extract_matchday_links(body or b"")
+                             if season is None or link[0] == season]
+                    if not links:
+                        continue
+                    last_matchday = max(matchday for _, matchday, _, _ in links)
+                    for link_season, matchday, path, selected in links:
+                        open_matchday = matchday == last_matchday and last_matchday < MATCHDAYS_PER_SEASON
+                        if not refresh and not open_matchday and store.page_hash(link_season, matchday, team):
+                            skipped += 1
+                            continue
+                        job = (link_season, matchday, team, scraper.BASE_URL + path)
+                        # Die ausgewählte Option ist die Saison-Seite selbst
+                        tasks.append(asyncio.create_task(_fetch_matchday(
+                            client, limiter, parse_stage, job, body if selected else None, stream)))
+
+                print(f"{len(tasks)} Spieltags-Seiten zu laden, {skipped} bereits gespeichert")
+                for next_done in asyncio.as_completed(tasks):
+                    (season, matchday, team, url), body_hash, rows = await next_done
+                    if body_hash is None:
+                        failed += 1
+                    elif not has_players(rows):
+                        # Geladen, aber keine Aufstellung erkannt: nicht als erledigt speichern
+                        print(f"Keine Aufstellung erkannt: {url}")
+                        failed += 1
+                    elif store.page_hash(season, matchday, team) == body_hash:
+                        unchanged += 1
+                    else:
+                        store.save_page(season, matchday, team, url, body_hash, rows)
+                        stored += 1
+                print(limiter.summary())
+    finally:
+        store.close()
+
+    print(f"Backfill beendet: {stored} gespeichert, {unchanged} unverändert, {skipped} übersprungen, "
+          f"{failed} fehlgeschlagen (werden beim nächsten Lauf erneut versucht).")
+    return failed == 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill aller Spieltage in eine lokale SQLite-Datenbank")
+    parser.add_argument('--db', default=None, help=f"Pfad der Datenbank (Standard: {HISTORY_FILE})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Spieltage laden (setzt abgebrochene Läufe fort)")
+    run.add_argument('--season', action='append', metavar='JJJJ-JJJJ',
+                     help="Saison, z.B. 2024-2025 (mehrfach möglich, Standard: aktuelle)")
+    run.add_argument('--team', action='append', metavar='SLUG/ID',
+                     help="Nur diese Teams, z.B. fc-st-pauli/20 (Standard: aktuelle + bekannte Teams)")
+    run.add_argument('--refresh', action='store_true', help="Auch bereits gespeicherte Spieltage neu laden")
+    run.add_argument('--concurrency', type=int, default=scraper.DEFAULT_MAX_CONCURRENCY,
+                     help="Obergrenze gleichzeitiger Abrufe")
+    run.add_argument('--connections', type=int, default=scraper.DEFAULT_MAX_CONNECTIONS,
+                     help="Maximale Anzahl offener Verbindungen im Pool")
+    run.add_argument('--timeout', type=float, default=scraper.DEFAULT_TIMEOUT, help="Timeout pro Request in Sekunden")
+    run.add_argument('--parse-workers', type=int, nargs='?', const=default_workers(),
+                     default=scraper.DEFAULT_PARSE_WORKERS, metavar='N',
+                     help="Seiten in N Prozessen parsen (ohne N: alle Kerne)")
+    run.add_argument('--parser', choices=scraper.available_backends(), default=None,
+                     help="HTML-Parser (Standard: schnellster installierter)")
+    run.add_argument('--stream', action='store_true',
+                     help="Spieltags-Seiten nur bis zum Ende der Aufstellung laden und dabei parsen")
+
+    starts = commands.add_parser('starts', help="Startelf-Prognosen eines Spielers in den letzten Spieltagen")
+    starts.add_argument('ligainsider_id', help="z.B. mathias-pereira-lage_37699")
+    starts.add_argument('--last', type=int, default=10, help="Anzahl Spieltage")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == 'run':
+        scraper.set_backend(args.parser)
+        try:
+            ok = asyncio.run(backfill_async(seasons=args.season, teams=args.team, db_path=args.db,
+                                            refresh=args.refresh, max_concurrency=args.concurrency,
+                                            max_connections=args.connections, timeout=args.timeout,
+                                            parse_workers=args.parse_workers, stream=args.stream))
+        except KeyboardInterrupt:
+            print("Abgebrochen, gespeicherte Spieltage bleiben erhalten.")
+            ok = False
+        sys.exit(0 if ok else 1)
+
+    store = HistoryStore(args.db)
+    try:
+        result = store.predicted_starts(args.ligainsider_id, args.last)
+    finally:
+        store.close()
+    print(json.dumps(result, ensure_ascii=False, indent=4))
+    sys.exit(0 if result['team'] else 1)
@@ -0,0 +1,345 @@
+"""
+Offline-Benchmark für ligainsider_scraper.py.
+
+Startet einen lokalen Stellvertreter für ligainsider.de, der page_dump.html / partial.html
+als Team-Seiten und eine synthetische Spieltagsübersicht ausliefert (mit einstellbarer
+Latenz, Jitter, Bandbreite und Fehlerrate), und misst den Scraper über verschiedene
+Parallelitätsstufen und Parser-Backends.
+
+    python ligainsider_bench.py --latency 80 --jitter 40 --concurrency 1 4 10 18
+    python ligainsider_bench.py --bandwidth 500 --concurrency 10 --stream   # mit Abbruch nach der Aufstellung
+"""
+import argparse
+import contextlib
+import http.server
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import ligainsider_parser
+import ligainsider_scraper
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = ["page_dump.html", "partial.html"]
+
+# Synthetische Teams der Übersicht (Slug, Anzeigename)
+TEAM_NAMES = [
+    "FC Bayern München", "Borussia Dortmund", "RB Leipzig", "Bayer 04 Leverkusen",
+    "VfB Stuttgart", "Eintracht Frankfurt", "VfL Wolfsburg", "SC Freiburg",
+    "1. FC Heidenheim", "Werder Bremen", "FC Augsburg", "TSG Hoffenheim",
+    "1. FSV Mainz 05", "Borussia M'gladbach", "1. FC Union Berlin", "Hamburger SV",
+    "FC St. Pauli", "1. FC Köln",
+]
+
+def _slug(name):
+    return "".join(c if c.isalnum() else "-" for c in name.lower()).strip("-")
+
+def build_overview(team_count=len(TEAM_NAMES)):
+    """
+    Synthetische Spieltagsübersicht mit Team-Links paarweise in der Reihenfolge Heim, Gast.
+    """
+    links = []
+    for index, name in enumerate(TEAM_NAMES[:team_count]):
+        href = f"/bundesliga/team/{_slug(name)}/{index + 1}/saison-2025-2026/183894"
+        links.append(f'<div class="match_team"><a href="{href}">{name}</a></div>')
+    return ("<!DOCTYPE HTML><html><head><meta charset=\"utf-8\"><title>Spieltag</title></head><body>"
+            + "\n".join(links) + "</body></html>").encode('utf-8')
+
+class BenchServer:
+    """
+    Lokaler HTTP-Server als Stellvertreter für ligainsider.de.
+
+    latency/jitter in Sekunden, bandwidth in Bytes/s (None = unbegrenzt),
+    error_rate als Anteil der Requests, die mit 503 beantwortet werden.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, bandwidth=None, error_rate=0.0,
+                 team_count=len(TEAM_NAMES), seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.overview = build_overview(team_count)
+        self.team_pages = []
+        for name in FIXTURES:
+            with open(os.path.join(SCRIPT_DIR, name), 'rb') as f:
+                self.team_pages.append(f.read())
+        self.requests = 0
+        self.errors = 0
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _page_for(self, path):
+        if path.startswith("/bundesliga/spieltage/"):
+            return self.overview
+        if path.startswith("/bundesliga/team/"):
+            # Teams abwechselnd mit vollständiger Seite und Ausschnitt beliefern
+            team_id = int(path.split("/")[4])
+            return self.team_pages[team_id % len(self.team_pages)]
+        return None
+
+    def _delay(self):
+        with self.random_lock:
+            jitter = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            failed = self.random.random() < self.error_rate
+        return max(0.0, self.latency + jitter), failed
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay, failed = server._delay()
+                server.requests += 1
+                time.sleep(delay)
+
+                body = server._page_for(self.path)
+                if failed or body is None:
+                    server.errors += failed
+                    self.send_response(503 if failed else 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    if not server.bandwidth:
+                        self.wfile.write(body)
+                        return
+                    # Bandbreite simulieren: Stücke von 1/20 Sekunde
+                    chunk = max(1, int(server.bandwidth / 20))
+                    for start in range(0, len(body), chunk):
+                        self.wfile.write(body[start:start + chunk])
+                        self.wfile.flush()
+                        time.sleep(0.05)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Gestreamter Abruf hat nach der Aufstellung abgebrochen
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+@contextlib.contextmanager
+def _instrumented(fetch_times, parse_times, page_bytes):
+    """
+    Misst Latenz und gelesene Bytes pro Seitenabruf und Parse-Zeit pro Seite im Scraper.
+    Beim gestreamten Abruf steckt die Parse-Zeit in der Abrufzeit.
+    """
+    original_fetch = ligainsider_scraper.fetch_page_async
+    original_stream = ligainsider_scraper.fetch_lineup_stream_async
+    original_extract = ligainsider_scraper.extract_lineup
+
+    async def timed_fetch(client, url, cache=None, limiter=None, deadline_at=None):
+        started = time.perf_counter()
+        try:
+            body = await original_fetch(client, url, cache, limiter, deadline_at)
+            page_bytes.append(len(body))
+            return body
+        finally:
+            fetch_times.append(time.perf_counter() - started)
+
+    async def timed_stream(client, url, limiter=None, deadline_at=None):
+        started = time.perf_counter()
+        try:
+            lineup = await original_stream(client, url, limiter, deadline_at)
+            page_bytes.append(lineup.bytes_read)
+            return lineup
+        finally:
+            fetch_times.append(time.perf_counter() - started)
+
+    def timed_extract(html, backend=None):
+        started = time.perf_counter()
+        try:
+            return original_extract(html, backend)
+        finally:
+            parse_times.append(time.perf_counter() - started)
+
+    ligainsider_scraper.fetch_page_async = timed_fetch
+    ligainsider_scraper.fetch_lineup_stream_async = timed_stream
+    ligainsider_scraper.extract_lineup = timed_extract
+    try:
+        yield
+    finally:
+        ligainsider_scraper.fetch_page_async = original_fetch
+        ligainsider_scraper.fetch_lineup_stream_async = original_stream
+        ligainsider_scraper.extract_lineup = original_extract
+
+def _point_scraper_at(base_url, output_dir):
+    ligainsider_scraper.BASE_URL = base_url
+    ligainsider_scraper.OVERVIEW_URL = base_url + "/bundesliga/spieltage/"
+    ligainsider_scraper.OUTPUT_FILE = os.path.join(output_dir, "ligainsider_lineups.json")
+
+def stream_label():
+    """
+    Name des Stream-Szenarios. LineupStream parst unabhängig vom gewählten Backend mit dem
+    Pull-Parser von lxml (ohne lxml gepuffert mit dem Standard-Backend), daher nur ein Szenario.
+    """
+    if ligainsider_parser.lxml is not None:
+        return "lxml-stream"
+    return ligainsider_parser.available_backends()[0] + "-buffered-stream"
+
+def _run_scenario(base_url, backend, concurrency, deadline, repeat, queue, stream=False):
+    """
+    Läuft in einem eigenen Prozess, damit Peak-RSS pro Szenario messbar ist.
+    """
+    fetch_times = []
+    parse_times = []
+    page_bytes = []
+    wall_times = []
+    sync_times = []
+    ok_runs = 0
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, 'w') as devnull:
+        _point_scraper_at(base_url, output_dir)
+        ligainsider_parser.set_backend(backend)
+        with _instrumented(fetch_times, parse_times, page_bytes), contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                started = time.perf_counter()
+                ok_runs += ligainsider_scraper.fetch_lineups(
+                    max_concurrency=concurrency, max_connections=concurrency,
+                    deadline=deadline, use_cache=False, stream=stream)
+                wall_times.append(time.perf_counter() - started)
+
+            # Synchroner Einzelabruf (fetch_team_lineup) zum Vergleich
+            try:
+                overview = ligainsider_scraper.fetch_page(ligainsider_scraper.OVERVIEW_URL)
+            except Exception:
+                overview = b""
+            for pair in ligainsider_scraper.parse_match_pairs(overview):
+                for team in pair:
+                    started = time.perf_counter()
+                    ligainsider_scraper.fetch_team_lineup(team['url'])
+                    sync_times.append(time.perf_counter() - started)
+
+    queue.put({
+        'backend': stream_label() if stream else backend,
+        'concurrency': concurrency,
+        'runs': repeat,
+        'ok_runs': ok_runs,
+        'pages': len(fetch_times),
+        'wall_s': statistics.median(wall_times),
+        'pages_per_s': len(fetch_times) / sum(wall_times) if wall_times else 0.0,
+        'fetch_p50_ms': _percentile(fetch_times, 0.50) * 1000,
+        'fetch_p95_ms': _percentile(fetch_times, 0.95) * 1000,
+        'parse_ms_per_page': statistics.mean(parse_times) * 1000 if parse_times else 0.0,
+        'kb_per_page': statistics.mean(page_bytes) / 1024 if page_bytes else 0.0,
+        'sync_team_p50_ms': _percentile(sync_times, 0.50) * 1000,
+        # ru_maxrss: Linux in KB, macOS in Bytes
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                       / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+    })
+
+def run_benchmark(backends=None, concurrency_levels=(1, 4, 10, 18), repeat=3, deadline=120, stream=False,
+                  **server_options):
+    if stream and backends:
+        raise ValueError("Gestreamter Abruf parst immer mit lxml, Parser-Backends nicht wählbar")
+    # None: Standard-Backend, nur für den synchronen Vergleichsabruf
+    backends = [None] if stream else backends or ligainsider_parser.available_backends()
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with BenchServer(**server_options) as server:
+        for backend in backends:
+            label = stream_label() if stream else backend
+            for concurrency in concurrency_levels:
+                queue = context.Queue()
+                process = context.Process(target=_run_scenario,
+                                          args=(server.base_url, backend, concurrency, deadline, repeat, queue,
+                                                stream))
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    print(f"{label} c={concurrency}: Szenario fehlgeschlagen (Exit-Code {process.exitcode})")
+                    continue
+                result = queue.get()
+                results.append(result)
+                print_result(result)
+        print(f"Server: {server.requests} Requests, {server.errors} simulierte Fehler")
+    return results
+
+def print_result(result):
+    print(f"{result['backend']:>19} c={result['concurrency']:<3} "
+          f"{result['wall_s']:7.3f} s/Lauf  {result['pages_per_s']:7.1f} Seiten/s  "
+          f"p50 {result['fetch_p50_ms']:7.1f} ms  p95 {result['fetch_p95_ms']:7.1f} ms  "
+          f"Parse {result['parse_ms_per_page']:6.1f} ms/Seite  {result['kb_per_page']:6.1f} KB/Seite  "
+          f"sync {result['sync_team_p50_ms']:7.1f} ms/Team  RSS {result['peak_rss_mb']:6.1f} MB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline-Benchmark des Ligainsider-Scrapers")
+    parser.add_argument('--latency', type=float, default=50, help="Latenz pro Request in ms")
+    parser.add_argument('--jitter', type=float, default=20, help="Jitter (+/-) in ms")
+    parser.add_argument('--bandwidth', type=float, default=None, help="Bandbreite pro Verbindung in KB/s")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Anteil fehlerhafter Antworten (0..1)")
+    parser.add_argument('--teams', type=int, default=len(TEAM_NAMES), help="Anzahl Teams in der Übersicht")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 10, 18],
+                        help="Zu messende Parallelitätsstufen")
+    parser.add_argument('--parser', nargs='+', choices=ligainsider_parser.available_backends(), default=None,
+                        help="Zu messende Parser-Backends (Standard: alle installierten)")
+    parser.add_argument('--repeat', type=int, default=3, help="Läufe pro Szenario")
+    parser.add_argument('--stream', action='store_true',
+                        help="Team-Seiten gestreamt laden und nach der Aufstellung abbrechen")
+    parser.add_argument('--json', metavar='PFAD', help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+    if args.stream and args.parser:
+        parser.error(f"--stream misst nur {stream_label()}, --parser nicht kombinierbar")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(
+        backends=args.parser,
+        concurrency_levels=args.concurrency,
+        repeat=args.repeat,
+        stream=args.stream,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        bandwidth=args.bandwidth * 1024 if args.bandwidth else None,
+        error_rate=args.error_rate,
+        team_count=args.teams,
+    )
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
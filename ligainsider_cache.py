@@ -0,0 +1,327 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+# Dateisperre nur unter POSIX; ohne fcntl (Windows) wird ungesperrt gemergt
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Cache-Verzeichnis liegt neben dem Scraper
+CACHE_DIR = ".ligainsider_cache"
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB auf der Platte
+DEFAULT_TTL = 60                      # Sekunden ohne erneute Prüfung beim Server
+# Bodies ohne Index-Eintrag erst nach dieser Zeit löschen: ein anderer Prozess kann den Body
+# schon geschrieben, seinen Index aber noch nicht gespeichert haben
+ORPHAN_GRACE = 15 * 60
+
+# TTL pro URL-Muster (erster Treffer gewinnt).
+# Die Übersicht ändert sich selten, Team-Seiten werden am Spieltag laufend aktualisiert.
+TTL_RULES = [
+    (re.compile(r'/bundesliga/spieltage/'), 600),
+    (re.compile(r'/bundesliga/team/'), 60),
+]
+
+def get_cache_dir():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, CACHE_DIR)
+
+def ttl_for(url, rules=None):
+    for pattern, ttl in (TTL_RULES if rules is None else rules):
+        if pattern.search(url):
+            return ttl
+    return DEFAULT_TTL
+
+def _atomic_write(path, data):
+    # Eigene Temp-Datei pro Aufruf: Daemon, Cron-Läufe und Backfill schreiben evtl. gleichzeitig
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp legt 0600 an, die Ausgaben sollen wie bisher lesbar sein
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@contextlib.contextmanager
+def _locked(path):
+    """
+    Exklusive Sperre über eine Lock-Datei (zwischen Prozessen, z.B. Daemon und Cron-Lauf).
+    """
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class ResponseCache:
+    """
+    Persistenter HTTP-Cache für Übersicht und Team-Seiten.
+    Speichert Body plus Validatoren (ETag / Last-Modified), beachtet eine TTL pro URL
+    und begrenzt die Größe auf der Platte per LRU-Verdrängung. Mehrere Prozesse können sich das
+    Verzeichnis teilen: save() mergt unter einer Dateisperre mit dem Index auf der Platte.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, ttl_rules=None):
+        self.directory = directory or get_cache_dir()
+        self.max_bytes = max_bytes
+        self.ttl_rules = ttl_rules
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._removed = set()  # seit dem letzten save() entfernte URLs (nicht aus dem Platten-Index zurückholen)
+        os.makedirs(self.directory, exist_ok=True)
+        self._entries = self._load_index()
+
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + ".body")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def lookup(self, url):
+        """
+        Liefert (body, fresh) für eine URL oder (None, False), wenn nichts im Cache liegt.
+        fresh ist True, solange die TTL noch nicht abgelaufen ist.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return None, False
+            try:
+                with open(self._body_path(entry['key']), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                # Body fehlt auf der Platte -> Eintrag verwerfen
+                del self._entries[url]
+                self._removed.add(url)
+                self._dirty = True
+                return None, False
+
+            now = time.time()
+            entry['last_access'] = now
+            self._dirty = True
+            fresh = now - entry['stored_at'] < ttl_for(url, self.ttl_rules)
+            return body, fresh
+
+    def conditional_headers(self, url):
+        """
+        Header für einen bedingten Request (If-None-Match / If-Modified-Since).
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            headers = {}
+            if entry:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def store(self, url, body, headers):
+        """
+        Legt eine 200-Antwort mit ihren Validatoren ab.
+        """
+        with self._lock:
+            key = self.key_for(url)
+            _atomic_write(self._body_path(key), body)
+            now = time.time()
+            self._entries[url] = {
+                'key': key,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'stored_at': now,
+                'last_access': now,
+                'size': len(body),
+            }
+            self._removed.discard(url)
+            self._dirty = True
+            self._evict()
+
+    def revalidated(self, url, headers):
+        """
+        Der Server hat mit 304 geantwortet: TTL neu starten, ggf. neue Validatoren übernehmen.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return
+            entry['stored_at'] = entry['last_access'] = time.time()
+            if headers.get('ETag'):
+                entry['etag'] = headers['ETag']
+            if headers.get('Last-Modified'):
+                entry['last_modified'] = headers['Last-Modified']
+            self._dirty = True
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        # Am längsten nicht genutzte Einträge zuerst entfernen
+        for url, entry in sorted(self._entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(entry['key']))
+            except OSError:
+                pass
+            total -= entry['size']
+            del self._entries[url]
+            self._removed.add(url)
+
+    def _merge(self, on_disk):
+        # Einträge anderer Prozesse übernehmen; bei beiden vorhandenen gewinnt der neuer gespeicherte
+        for url, entry in on_disk.items():
+            if url in self._removed:
+                continue
+            own = self._entries.get(url)
+            if own is None or entry['stored_at'] > own['stored_at']:
+                self._entries[url] = dict(entry, last_access=max(entry['last_access'],
+                                                                 own['last_access'] if own else 0))
+            elif entry['last_access'] > own['last_access']:
+                own['last_access'] = entry['last_access']
+
+    def _sweep(self, now):
+        # Bodies, auf die kein Eintrag mehr zeigt (z.B. von einem Prozess, dessen Index überschrieben wurde)
+        referenced = {entry['key'] + ".body" for entry in self._entries.values()}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body") or name in referenced:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > ORPHAN_GRACE:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def save(self):
+        """
+        Schreibt den Index auf die Platte (nur wenn sich etwas geändert hat). Unter der Dateisperre
+        wird der aktuelle Index von der Platte gemergt, damit ein zweiter Prozess im selben
+        Verzeichnis keine Einträge verliert; verwaiste Bodies werden dabei gelöscht.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            with _locked(os.path.join(self.directory, LOCK_FILE)):
+                self._merge(self._load_index())
+                self._evict()
+                data = json.dumps(self._entries, ensure_ascii=False).encode('utf-8')
+                _atomic_write(self._index_path(), data)
+                self._sweep(time.time())
+            self._removed.clear()
+            self._dirty = False
+
+MANIFEST_FILE = "manifest.json"
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+class LineupManifest:
+    """
+    Merkt sich pro Team-Seite den Hash des Bodys und das Parse-Ergebnis.
+    Unveränderte Seiten müssen beim nächsten Lauf nicht erneut geparst werden.
+    version ist die Version der Extraktoren (ligainsider_parser.EXTRACTOR_VERSION): ein Manifest
+    mit anderer Version wird verworfen, damit geänderte Parser nicht alte Ergebnisse ausliefern.
+    """
+
+    def __init__(self, directory=None, version=0):
+        self.directory = directory or get_cache_dir()
+        self.version = version
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        self._entries = self._load()
+
+    def _path(self):
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def _load(self):
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            # Ergebnisse einer anderen Extraktor-Version (oder altes Format ohne Version)
+            self._dirty = True
+            return {}
+        return data.get('entries', {})
+
+    def lookup(self, url, body_hash):
+        """
+        Liefert das gespeicherte Parse-Ergebnis, wenn sich der Body seit dem letzten Lauf nicht geändert hat.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry and entry['hash'] == body_hash:
+                return entry['result']
+            return None
+
+    def update(self, url, body_hash, result):
+        with self._lock:
+            self._entries[url] = {'hash': body_hash, 'result': result}
+            self._dirty = True
+
+    def prune(self, urls, pattern=None):
+        """
+        Entfernt Einträge für Seiten, die nicht mehr zum aktuellen Spieltag gehören.
+        Mit pattern werden nur passende URLs betrachtet (z.B. nur Team-Seiten, nicht Kader).
+        """
+        with self._lock:
+            keep = set(urls)
+            for url in list(self._entries):
+                if pattern is not None and not pattern.search(url):
+                    continue
+                if url not in keep:
+                    del self._entries[url]
+                    self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({'version': self.version, 'entries': self._entries}, ensure_ascii=False).encode('utf-8')
+            _atomic_write(self._path(), data)
+            self._dirty = False
+
+def write_if_changed(path, data):
+    """
+    Schreibt data (bytes) atomar nach path, aber nur wenn sich der Inhalt unterscheidet.
+    Liefert True, wenn die Datei neu geschrieben wurde.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    _atomic_write(path, data)
+    return True
@@ -0,0 +1,380 @@
+"""
+Daemon-Modus für den Ligainsider-Scraper.
+
+Hält Verbindungspool, HTTP-Cache und Parse-Manifest im Speicher, aktualisiert die Aufstellungen
+nach Zeitplan (rund um den Anpfiff häufiger) und liefert den letzten Stand über einen kleinen
+lokalen HTTP-Endpunkt mit ETag aus. Änderungen einzelner Spieler (ligainsider_feed) gibt es
+als Server-Sent-Events bzw. zum Nachladen ab einer Ereignis-id:
+
+    python ligainsider_daemon.py --port 8765
+    curl -H 'If-None-Match: "<etag>"' http://127.0.0.1:8765/lineups
+    curl -N http://127.0.0.1:8765/events              # Live, Wiederaufnahme per Last-Event-ID
+    curl http://127.0.0.1:8765/events.json?since=120
+    curl http://127.0.0.1:8765/metrics
+"""
+import argparse
+import asyncio
+import datetime
+import email.utils
+import hashlib
+import http.server
+import json
+import re
+import signal
+import sys
+import threading
+import time
+import urllib.parse
+import zoneinfo
+
+import ligainsider_metrics as metrics
+import ligainsider_scraper as scraper
+from ligainsider_cache import LineupManifest, ResponseCache
+from ligainsider_feed import EventFeed, format_sse
+from ligainsider_parser import EXTRACTOR_VERSION
+from ligainsider_pipeline import ParseStage, default_workers
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Kommentarzeile im Event-Stream, damit Proxies und Clients die Verbindung offen halten
+SSE_KEEPALIVE = 15
+
+TIMEZONE = zoneinfo.ZoneInfo("Europe/Berlin")
+
+# Abstände zwischen zwei Aktualisierungen in Sekunden
+INTERVAL_NEAR_KICKOFF = 60       # ab 90 Minuten vor bis 15 Minuten nach dem Anpfiff
+INTERVAL_MATCHDAY = 300          # in den 6 Stunden davor
+INTERVAL_IDLE = 1800             # sonst
+NEAR_BEFORE = datetime.timedelta(minutes=90)
+NEAR_AFTER = datetime.timedelta(minutes=15)
+MATCHDAY_BEFORE = datetime.timedelta(hours=6)
+
+# Übliche Bundesliga-Anstoßzeiten (Wochentag, Stunde, Minute), falls die Übersicht keine Termine enthält
+KICKOFF_SLOTS = [
+    (4, 20, 30),                                    # Freitag
+    (5, 15, 30), (5, 18, 30),                       # Samstag
+    (6, 15, 30), (6, 17, 30), (6, 19, 30),          # Sonntag
+]
+
+# "24.01.2026 15:30" bzw. "24.01.2026, 15:30 Uhr"
+KICKOFF_RE = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})[,\s]+(\d{1,2}):(\d{2})')
+
+def parse_kickoff_times(html):
+    """
+    Anstoßzeiten aus der Spieltagsübersicht (Europe/Berlin). Zeitstempel der letzten
+    Aktualisierung ("Letzte Aktualisierung: ... | 19.01.2026 13:52") werden ignoriert.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    kickoffs = set()
+    for match in KICKOFF_RE.finditer(html):
+        if 'Aktualisierung' in html[max(0, match.start() - 40):match.start()]:
+            continue
+        day, month, year, hour, minute = (int(value) for value in match.groups())
+        try:
+            kickoffs.add(datetime.datetime(year, month, day, hour, minute, tzinfo=TIMEZONE))
+        except ValueError:
+            continue
+    return sorted(kickoffs)
+
+def slot_kickoffs(now, days=8):
+    """
+    Anstoßzeiten nach KICKOFF_SLOTS für die nächsten Tage (inkl. der letzten Stunden).
+    """
+    start = (now - MATCHDAY_BEFORE).date()
+    kickoffs = []
+    for offset in range(-1, days):
+        day = start + datetime.timedelta(days=offset)
+        for weekday, hour, minute in KICKOFF_SLOTS:
+            if day.weekday() == weekday:
+                kickoffs.append(datetime.datetime(day.year, day.month, day.day, hour, minute, tzinfo=TIMEZONE))
+    return kickoffs
+
+def next_interval(now, kickoffs):
+    """
+    Sekunden bis zur nächsten Aktualisierung, abhängig vom Abstand zum nächsten Anpfiff.
+    Das Intervall endet spätestens dort, wo die nächste engere Phase beginnt.
+    """
+    interval = INTERVAL_IDLE
+    for kickoff in kickoffs:
+        if kickoff - NEAR_BEFORE <= now <= kickoff + NEAR_AFTER:
+            return INTERVAL_NEAR_KICKOFF
+        if kickoff - MATCHDAY_BEFORE <= now < kickoff - NEAR_BEFORE:
+            interval = min(interval, INTERVAL_MATCHDAY,
+                           max(INTERVAL_NEAR_KICKOFF, (kickoff - NEAR_BEFORE - now).total_seconds()))
+        elif now < kickoff - MATCHDAY_BEFORE:
+            interval = min(interval, max(INTERVAL_NEAR_KICKOFF, (kickoff - MATCHDAY_BEFORE - now).total_seconds()))
+    return interval
+
+class LineupStore:
+    """
+    Letzter Stand der Aufstellungen als fertig serialisierter Body plus ETag.
+    Der HTTP-Thread liest nur den Snapshot, der Refresh-Loop tauscht ihn atomar aus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.body = None
+        self.etag = None
+        self.last_modified = None
+        self.last_refresh = None
+        self.next_refresh = None
+        self.last_error = None
+        self.refreshes = 0
+        self.metrics_text = None
+
+    def update(self, matches):
+        """
+        Übernimmt eine neue Match-Liste; liefert True, wenn sich der Inhalt geändert hat.
+        """
+        body = json.dumps(matches, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        now = time.time()
+        with self._lock:
+            self.last_refresh = now
+            self.last_error = None
+            self.refreshes += 1
+            if etag == self.etag:
+                return False
+            self.body = body
+            self.etag = etag
+            self.last_modified = email.utils.formatdate(now, usegmt=True)
+            return True
+
+    def failed(self, error):
+        with self._lock:
+            self.last_error = repr(error)
+
+    def set_metrics(self, run):
+        text = run.prometheus().encode('utf-8')
+        with self._lock:
+            self.metrics_text = text
+
+    def snapshot(self):
+        with self._lock:
+            return self.body, self.etag, self.last_modified
+
+    def status(self):
+        with self._lock:
+            return {
+                'ready': self.body is not None,
+                'etag': self.etag,
+                'lastRefresh': self.last_refresh,
+                'nextRefresh': self.next_refresh,
+                'refreshes': self.refreshes,
+                'lastError': self.last_error,
+            }
+
+def make_handler(store, request_refresh, feed=None):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body=b"", content_type="application/json; charset=utf-8", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def _last_event_id(self, query):
+            # Wiederverbindung: Last-Event-ID; sonst ?since=N; ohne beides nur neue Ereignisse
+            value = self.headers.get('Last-Event-ID') or (query.get('since') or [None])[0]
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+
+        def _event_stream(self, last_id):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            if self.command == 'HEAD':
+                return
+            if last_id is None:
+                last_id = feed.last_id
+            try:
+                self.wfile.write(b"retry: 5000\n\n")
+                self.wfile.flush()
+                while True:
+                    events = feed.wait(last_id, SSE_KEEPALIVE)
+                    for event in events:
+                        self.wfile.write(format_sse(event))
+                    if events:
+                        last_id = events[-1]['id']
+                    else:
+                        self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_GET(self):
+            path, _, query_string = self.path.partition('?')
+            query = urllib.parse.parse_qs(query_string)
+            if path == '/events' and feed is not None:
+                self._event_stream(self._last_event_id(query))
+            elif path == '/events.json' and feed is not None:
+                last_id = self._last_event_id(query)
+                events = feed.since(last_id if last_id is not None else 0)
+                self._send(200, json.dumps({'lastId': feed.last_id, 'events': events},
+                                           ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            elif path in ('/', '/lineups', '/lineups.json'):
+                body, etag, last_modified = store.snapshot()
+                if body is None:
+                    self._send(503, b'{"error":"Noch keine Daten"}', headers={"Retry-After": "5"})
+                    return
+                headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+                if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+                    self._send(304, headers=headers)
+                    return
+                self._send(200, body, headers=headers)
+            elif path == '/health':
+                self._send(200, json.dumps(store.status()).encode('utf-8'))
+            elif path == '/metrics':
+                # Messwerte der letzten Aktualisierung im Prometheus-Format
+                self._send(200, store.metrics_text or b"", content_type="text/plain; version=0.0.4")
+            else:
+                self._send(404, b'{"error":"Nicht gefunden"}')
+
+        do_HEAD = do_GET
+
+        def do_POST(self):
+            if self.path.split('?', 1)[0] == '/refresh':
+                request_refresh()
+                self._send(202, b'{"refresh":true}')
+            else:
+                self._send(404, b'{"error":"Nicht gefunden"}')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def start_server(store, request_refresh, host=DEFAULT_HOST, port=DEFAULT_PORT, feed=None):
+    httpd = http.server.ThreadingHTTPServer((host, port), make_handler(store, request_refresh, feed))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+async def run_daemon(host=DEFAULT_HOST, port=DEFAULT_PORT, max_concurrency=scraper.DEFAULT_MAX_CONCURRENCY,
+                     max_connections=scraper.DEFAULT_MAX_CONNECTIONS, timeout=scraper.DEFAULT_TIMEOUT,
+                     deadline=scraper.DEFAULT_DEADLINE, use_cache=True, kickoffs=None, write_files=True,
+                     parse_workers=scraper.DEFAULT_PARSE_WORKERS):
+    """
+    Refresh-Loop: ein Client, ein Cache, ein Manifest (und ggf. ein Parse-Pool) für die ganze Laufzeit.
+    kickoffs überschreibt die Anstoßzeiten aus Übersicht bzw. KICKOFF_SLOTS.
+    """
+    loop = asyncio.get_running_loop()
+    refresh = asyncio.Event()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    store = LineupStore()
+    feed = EventFeed()
+    httpd = start_server(store, lambda: loop.call_soon_threadsafe(refresh.set), host, port, feed)
+    print(f"Daemon läuft auf http://{host}:{httpd.server_address[1]}/lineups")
+
+    cache = ResponseCache() if use_cache else None
+    manifest = LineupManifest(version=EXTRACTOR_VERSION) if use_cache else None
+    parse_stage = ParseStage(parse_workers).start()
+    try:
+        async with scraper.create_async_client(max_connections=max_connections, timeout=timeout,
+                                               keepalive_expiry=INTERVAL_NEAR_KICKOFF * 2) as client:
+            while not stop.is_set():
+                players = []
+                team_rows = {}
+                metrics.start_run("daemon")
+                try:
+                    matches = await scraper.scrape_matches_async(client, max_concurrency=max_concurrency,
+                                                                 deadline=deadline, cache=cache,
+                                                                 manifest=manifest, players=players,
+                                                                 parse_stage=parse_stage, team_rows=team_rows)
+                    # Deltas pro Spieler an Log und SSE-Clients, bevor der neue Gesamtstand erscheint
+                    scraper.publish_events(team_rows, feed)
+                    if store.update(matches):
+                        print(f"Neuer Stand: {len(matches)} Spiele")
+                        if write_files:
+                            scraper.save_matches(matches)
+                            scraper.update_index(players)
+                except Exception as e:
+                    print(f"Fehler bei der Aktualisierung: {e!r}")
+                    store.failed(e)
+                finally:
+                    if cache is not None:
+                        cache.save()
+                    if manifest is not None:
+                        manifest.save()
+                    store.set_metrics(metrics.stop_run())
+
+                now = datetime.datetime.now(TIMEZONE)
+                upcoming = kickoffs
+                if upcoming is None and cache is not None:
+                    overview, _ = cache.lookup(scraper.OVERVIEW_URL)
+                    upcoming = parse_kickoff_times(overview) if overview else None
+                interval = next_interval(now, upcoming or slot_kickoffs(now))
+                store.next_refresh = time.time() + interval
+                print(f"Nächste Aktualisierung in {interval:.0f} s")
+
+                refresh.clear()
+                waiters = [asyncio.create_task(refresh.wait()), asyncio.create_task(stop.wait())]
+                await asyncio.wait(waiters, timeout=interval, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters:
+                    waiter.cancel()
+    finally:
+        parse_stage.close()
+        httpd.shutdown()
+        httpd.server_close()
+        print("Daemon beendet.")
+
+def parse_kickoff_arg(value):
+    try:
+        kickoff = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Anstoßzeit: {value} (erwartet z.B. 2026-01-24T15:30)")
+    return kickoff if kickoff.tzinfo else kickoff.replace(tzinfo=TIMEZONE)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ligainsider-Aufstellungen als Daemon mit lokalem JSON-Endpunkt")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Adresse des HTTP-Endpunkts")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port des HTTP-Endpunkts")
+    parser.add_argument('--concurrency', type=int, default=scraper.DEFAULT_MAX_CONCURRENCY,
+                        help="Obergrenze gleichzeitiger Team-Abrufe")
+    parser.add_argument('--connections', type=int, default=scraper.DEFAULT_MAX_CONNECTIONS,
+                        help="Maximale Anzahl offener Verbindungen im Pool")
+    parser.add_argument('--timeout', type=float, default=scraper.DEFAULT_TIMEOUT,
+                        help="Timeout pro Request in Sekunden")
+    parser.add_argument('--deadline', type=float, default=scraper.DEFAULT_DEADLINE,
+                        help="Zeitlimit pro Aktualisierung in Sekunden")
+    parser.add_argument('--no-cache', action='store_true', help="HTTP-Cache und Parse-Manifest nicht verwenden")
+    parser.add_argument('--no-files', action='store_true',
+                        help="Nur über HTTP ausliefern, ligainsider_lineups.json nicht schreiben")
+    parser.add_argument('--kickoff', type=parse_kickoff_arg, action='append', metavar='ZEIT',
+                        help="Anstoßzeit (ISO, Europe/Berlin), mehrfach möglich; sonst aus Übersicht bzw. Standard-Slots")
+    parser.add_argument('--parse-workers', type=int, nargs='?', const=default_workers(),
+                        default=scraper.DEFAULT_PARSE_WORKERS, metavar='N',
+                        help="Seiten in N Prozessen parsen (ohne N: alle Kerne, 0 = im Event-Loop)")
+    parser.add_argument('--parser', choices=scraper.available_backends(), default=None,
+                        help="HTML-Parser (Standard: schnellster installierter)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    scraper.set_backend(args.parser)
+    try:
+        asyncio.run(run_daemon(host=args.host, port=args.port, max_concurrency=args.concurrency,
+                               max_connections=args.connections, timeout=args.timeout, deadline=args.deadline,
+                               use_cache=not args.no_cache, kickoffs=args.kickoff, write_files=not args.no_files,
+                               parse_workers=args.parse_workers))
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
@@ -0,0 +1,212 @@
+"""
+Änderungs-Feed der Aufstellungen: statt die komplette ligainsider_lineups.json neu zu laden und
+zu vergleichen, bekommen Konsumenten nur die Änderungen pro Team und Spieler.
+
+Zwischen zwei Ständen entstehen Ereignisse:
+
+    entered              Spieler steht neu in der voraussichtlichen Startelf
+    left                 Spieler steht nicht mehr in der Startelf (und auch nicht als Alternative)
+    benched              Spieler war in der Startelf und ist jetzt nur noch Alternative
+    alternative_changed  Startelf-Spieler bleibt, aber seine Alternative hat sich geändert
+
+Jedes Ereignis bekommt eine fortlaufende id und wird an ligainsider_events.ndjson angehängt
+(append-only, eine JSON-Zeile pro Ereignis). Der letzte Stand pro Team liegt in
+ligainsider_feed_state.json, damit auch einzelne Scraper-Läufe nacheinander Deltas liefern.
+Der Daemon verteilt die Ereignisse zusätzlich per Server-Sent-Events (/events).
+
+    python ligainsider_scraper.py --events
+    python ligainsider_feed.py --since 120     # Ereignisse nach id 120
+    curl -N http://127.0.0.1:8765/events       # Live-Feed vom Daemon
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+from ligainsider_cache import write_if_changed
+
+EVENTS_FILE = "ligainsider_events.ndjson"
+FEED_STATE_FILE = "ligainsider_feed_state.json"
+
+ENTERED = "entered"
+LEFT = "left"
+BENCHED = "benched"
+ALTERNATIVE_CHANGED = "alternative_changed"
+EVENT_TYPES = (ENTERED, LEFT, BENCHED, ALTERNATIVE_CHANGED)
+
+# Ereignisse, die im Speicher für Wiederaufnahme (Last-Event-ID) bereitgehalten werden
+DEFAULT_KEEP = 2000
+
+def _script_path(name):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+def team_state(rows):
+    """
+    Vergleichbarer Stand eines Teams aus den Aufstellungsreihen: Startelf-Spieler (Key:
+    ligainsiderId, sonst Name) mit Reihe, Position und Alternative sowie alle Alternativen.
+    """
+    starters = {}
+    alternatives = []
+    for row_index, row in enumerate(rows):
+        for position, player in enumerate(row):
+            key = player.get('ligainsiderId') or player['name']
+            starters[key] = {'name': player['name'], 'alternative': player.get('alternative'),
+                             'row': row_index, 'position': position}
+            if player.get('alternative'):
+                alternatives.append(player['alternative'])
+    return {'starters': starters, 'alternatives': alternatives}
+
+def diff_team(team, previous, current):
+    """
+    Ereignisse (ohne id/Zeit) zwischen zwei Ständen eines Teams, in stabiler Reihenfolge.
+    """
+    events = []
+    before = previous['starters']
+    after = current['starters']
+    alternatives = set(current['alternatives'])
+    for key, player in after.items():
+        if key not in before:
+            events.append({'type': ENTERED, 'team': team, 'ligainsiderId': key, 'name': player['name'],
+                           'alternative': player['alternative']})
+        elif before[key]['alternative'] != player['alternative']:
+            events.append({'type': ALTERNATIVE_CHANGED, 'team': team, 'ligainsiderId': key, 'name': player['name'],
+                           'alternative': player['alternative'], 'previous': before[key]['alternative']})
+    for key, player in before.items():
+        if key in after:
+            continue
+        kind = BENCHED if player['name'] in alternatives else LEFT
+        events.append({'type': kind, 'team': team, 'ligainsiderId': key, 'name': player['name']})
+    return events
+
+def diff_snapshots(previous, current):
+    """
+    Ereignisse aller Teams. Teams ohne vorherigen Stand gelten als Ausgangsbasis (keine Ereignisse).
+    """
+    events = []
+    for team, state in current.items():
+        if team in previous:
+            events.extend(diff_team(team, previous[team], state))
+    return events
+
+class EventFeed:
+    """
+    Append-only Ereignis-Log plus letzter Stand pro Team. Threadsicher: der Refresh-Loop
+    ruft update(), HTTP-Threads warten mit wait() auf neue Ereignisse.
+    """
+
+    def __init__(self, log_path=None, state_path=None, keep=DEFAULT_KEEP):
+        self.log_path = log_path or _script_path(EVENTS_FILE)
+        self.state_path = state_path or _script_path(FEED_STATE_FILE)
+        self._condition = threading.Condition()
+        self._recent = collections.deque(maxlen=keep)
+        state = self._load_state()
+        self.teams = state.get('teams', {})
+        self.last_id = state.get('lastId', 0)
+        self._load_recent()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_recent(self):
+        for event in self._read_log():
+            self._recent.append(event)
+            self.last_id = max(self.last_id, event['id'])
+
+    def _read_log(self):
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            # Abgebrochene letzte Zeile eines früheren Laufs
+                            continue
+        except OSError:
+            return
+
+    def update(self, team_rows):
+        """
+        Übernimmt die Aufstellungsreihen pro Team (Key: Teamname) und liefert die neuen Ereignisse.
+        Teams ohne Reihen (Fehler, Deadline) behalten ihren alten Stand.
+        """
+        current = {team: team_state(rows) for team, rows in team_rows.items() if rows}
+        events = diff_snapshots(self.teams, current)
+        now = time.time()
+        with self._condition:
+            for event in events:
+                self.last_id += 1
+                event['id'] = self.last_id
+                event['ts'] = now
+            if events:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    for event in events:
+                        f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + "\n")
+                self._recent.extend(events)
+            self.teams.update(current)
+            data = json.dumps({'lastId': self.last_id, 'teams': self.teams}, ensure_ascii=False,
+                              separators=(',', ':'), sort_keys=True).encode('utf-8')
+            write_if_changed(self.state_path, data)
+            self._condition.notify_all()
+        return events
+
+    def since(self, last_id):
+        """
+        Alle Ereignisse mit id > last_id (aus dem Speicher, ältere aus dem Log).
+        """
+        with self._condition:
+            if not self._recent or self._recent[0]['id'] <= last_id + 1:
+                return [event for event in self._recent if event['id'] > last_id]
+        return [event for event in self._read_log() if event['id'] > last_id]
+
+    def wait(self, last_id, timeout):
+        """
+        Blockiert bis zu timeout Sekunden, bis es Ereignisse nach last_id gibt.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.last_id > last_id, timeout)
+        return self.since(last_id)
+
+def format_sse(event):
+    """
+    Ein Ereignis im text/event-stream Format (id für Last-Event-ID bei Wiederverbindung).
+    """
+    data = json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n".encode('utf-8')
+
+def describe(event):
+    team, name = event['team'], event['name']
+    if event['type'] == ENTERED:
+        return f"{team}: {name} neu in der Startelf"
+    if event['type'] == LEFT:
+        return f"{team}: {name} nicht mehr in der Startelf"
+    if event['type'] == BENCHED:
+        return f"{team}: {name} nur noch Alternative"
+    return f"{team}: Alternative zu {name} jetzt {event['alternative'] or '-'} (vorher {event['previous'] or '-'})"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Änderungen der Aufstellungen aus dem Ereignis-Log")
+    parser.add_argument('--since', type=int, default=0, help="Nur Ereignisse nach dieser id")
+    parser.add_argument('--team', default=None, help="Nur Ereignisse dieses Teams")
+    parser.add_argument('--json', action='store_true', help="Als NDJSON ausgeben")
+    args = parser.parse_args()
+    feed = EventFeed()
+    count = 0
+    for event in feed.since(args.since):
+        if args.team and event['team'] != args.team:
+            continue
+        count += 1
+        if args.json:
+            print(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        else:
+            print(f"#{event['id']} {time.strftime('%d.%m. %H:%M', time.localtime(event['ts']))}  {describe(event)}")
+    if not args.json:
+        print(f"{count} Ereignisse (letzte id {feed.last_id})", file=sys.stderr)
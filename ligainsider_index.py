@@ -0,0 +1,193 @@
+import json
+import os
+import sys
+import unicodedata
+
+INDEX_FILE = "ligainsider_index.json"
+INDEX_VERSION = 1
+
+# Manuelle Transliteration wie normalize() in LigainsiderService.swift
+# (deutsche Umlaute, da IDs oft ae/oe/ue nutzen, und kroatische/slawische Buchstaben)
+TRANSLITERATION = {
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
+    'ć': 'c', 'č': 'c', 'š': 's', 'ž': 'z', 'đ': 'd', 'ł': 'l',
+}
+_TRANSLATE_TABLE = str.maketrans(TRANSLITERATION)
+TOKEN_SEPARATORS = str.maketrans({'_': ' ', '-': ' '})
+
+# Nur Tokens ab dieser Länge bekommen Tippfehler-Varianten
+FUZZY_MIN_LENGTH = 5
+
+def normalize(text):
+    """
+    Entspricht normalize() in LigainsiderService.swift: Kleinschreibung, Transliteration,
+    Akzente entfernen, '-' -> ' ', trimmen.
+    """
+    text = (text or "").lower().translate(_TRANSLATE_TABLE)
+    text = "".join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return text.replace('-', ' ').strip()
+
+def tokens(text):
+    """
+    Namensteile eines normalisierten Schlüssels (getrennt an ' ', '_' und '-');
+    die numerische ID am Ende eines Slugs zählt nicht als Namensteil.
+    """
+    return [part for part in normalize(text).translate(TOKEN_SEPARATORS).split() if not part.isdigit()]
+
+def deletion_variants(token):
+    """
+    Alle Varianten mit genau einem gelöschten Zeichen (Symmetric-Delete für Tippfehler).
+    """
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def _add(table, key, value):
+    bucket = table.setdefault(key, [])
+    if value not in bucket:
+        bucket.append(value)
+
+def build_index(players):
+    """
+    Baut den Lookup-Index aus Spielern im LigainsiderPlayer-Schema.
+
+    tokens:  Namensteil des Slugs -> ligainsiderIds (entspricht keyParts.contains(...) im Swift-Code)
+    aliases: vollständige Namen / Anzeigenamen / zusammengeschriebene Nachnamen -> ligainsiderIds
+    fuzzy:   Tokens mit einem gelöschten Zeichen -> Original-Tokens (Tippfehler, fehlende Buchstaben)
+    """
+    entries = {}
+    token_table = {}
+    alias_table = {}
+    fuzzy_table = {}
+
+    for player in players:
+        player_id = player.get('ligainsiderId')
+        if not player_id:
+            continue
+        existing = entries.get(player_id)
+        # Wie im Swift-Cache: vorhandenen Eintrag behalten, außer er hat kein Bild
+        if existing and (existing.get('imageUrl') or not player.get('imageUrl')):
+            continue
+        entries[player_id] = {key: player.get(key) for key in ('name', 'alternative', 'ligainsiderId', 'imageUrl')}
+        if player.get('imageHash'):
+            entries[player_id]['imageHash'] = player['imageHash']
+
+    for player_id in sorted(entries):
+        slug_tokens = tokens(player_id)
+        for token in slug_tokens:
+            _add(token_table, token, player_id)
+            if len(token) >= FUZZY_MIN_LENGTH:
+                for variant in deletion_variants(token):
+                    _add(fuzzy_table, variant, token)
+
+        name_tokens = tokens(entries[player_id]['name'])
+        for alias in (" ".join(slug_tokens), " ".join(name_tokens), "".join(name_tokens),
+                      " ".join(slug_tokens[1:]), "".join(slug_tokens[1:])):
+            if alias:
+                _add(alias_table, alias, player_id)
+
+    return {
+        'version': INDEX_VERSION,
+        'players': entries,
+        'tokens': token_table,
+        'aliases': alias_table,
+        'fuzzy': fuzzy_table,
+    }
+
+def serialize_index(index):
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+class LigainsiderIndex:
+    """
+    O(1)-Lookup von Kickbase-Namen auf Ligainsider-Spieler über den vorberechneten Index.
+    Die Reihenfolge der Schritte folgt getLigainsiderPlayer(firstName:lastName:) im Swift-Code.
+    """
+
+    def __init__(self, index):
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unbekannte Index-Version: {index.get('version')}")
+        self.players = index['players']
+        self.tokens = index['tokens']
+        self.aliases = index['aliases']
+        self.fuzzy = index['fuzzy']
+
+    @classmethod
+    def load(cls, path=None):
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), INDEX_FILE)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _ids_for_token(self, token):
+        return self.tokens.get(token, []) if token else []
+
+    def _fuzzy_ids(self, token):
+        """
+        Kandidaten mit Edit-Distanz 1 (Löschen, Einfügen, Ersetzen) über die Symmetric-Delete-Tabelle.
+        """
+        if len(token) < FUZZY_MIN_LENGTH - 1:
+            return []
+        originals = set(self.fuzzy.get(token, []))          # ein Zeichen zu wenig
+        if token in self.tokens:
+            return list(self.tokens[token])
+        for variant in deletion_variants(token):
+            if variant in self.tokens:                      # ein Zeichen zu viel
+                originals.add(variant)
+            originals.update(self.fuzzy.get(variant, []))   # ein Zeichen ersetzt
+        ids = []
+        for original in sorted(originals):
+            for player_id in self.tokens.get(original, []):
+                if player_id not in ids:
+                    ids.append(player_id)
+        return ids
+
+    def _pick(self, candidates, first, last):
+        if len(candidates) == 1:
+            return candidates[0]
+        first_ids = set(self._ids_for_token(first))
+        # Mehrere Treffer: Eintrag mit Vor- und Nachname bevorzugen
+        for player_id in candidates:
+            if player_id in first_ids:
+                return player_id
+        # Sonst Eintrag, dessen Schlüssel mit dem Nach- oder Vornamen beginnt
+        for player_id in candidates:
+            key = normalize(player_id)
+            if key.startswith(last) or (first and key.startswith(first)):
+                return player_id
+        return candidates[0]
+
+    def lookup_id(self, first_name, last_name):
+        first = normalize(first_name)
+        last = normalize(last_name)
+
+        # 1. Nachname als eigener Namensteil, sonst Vorname (Einzelnamen / vertauschte Speicherung)
+        candidates = self._ids_for_token(last) or self._ids_for_token(first)
+        if candidates:
+            return self._pick(candidates, first, last)
+
+        # 2. Mehrteilige Namen: "Pereira Lage", "pereiralage", "mathias pereira lage"
+        for alias in (last, last.replace(' ', ''), f"{first} {last}".strip()):
+            candidates = self.aliases.get(alias)
+            if candidates:
+                return self._pick(candidates, first, last)
+
+        # 3. Tippfehler / abweichende Schreibweise im Nachnamen
+        last_tokens = tokens(last)
+        if last_tokens:
+            candidates = self._fuzzy_ids(last_tokens[-1])
+            if candidates:
+                return self._pick(candidates, first, last)
+        return None
+
+    def lookup(self, first_name, last_name):
+        """
+        Liefert den Spieler (LigainsiderPlayer-Schema) oder None.
+        """
+        player_id = self.lookup_id(first_name, last_name)
+        return self.players.get(player_id) if player_id else None
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Aufruf: python ligainsider_index.py <Vorname> <Nachname>")
+        sys.exit(2)
+    player = LigainsiderIndex.load().lookup(sys.argv[1], sys.argv[2])
+    print(json.dumps(player, ensure_ascii=False, indent=4) if player else "Nicht gefunden")
+    sys.exit(0 if player else 1)
@@ -0,0 +1,312 @@
+"""
+Zeitmessung pro Stufe für den Ligainsider-Scraper.
+
+Während eines Laufs sammelt RunMetrics pro Request die Phasen (Verbindungsaufbau inkl. DNS,
+TLS, Senden, TTFB, Download), die empfangenen Bytes, pro Seite Parse- und Extraktionszeit
+sowie die Dauer der übrigen Stufen (Übersicht, Serialisierung, Schreiben, Index).
+Export als JSON-Report oder als Prometheus-Textfile (node_exporter textfile collector).
+"""
+import contextlib
+import contextvars
+import cProfile
+import datetime
+import json
+import threading
+import time
+
+from ligainsider_cache import write_if_changed
+from ligainsider_parser import get_backend
+
+# Aktiver Lauf; wird in asyncio-Tasks automatisch mitgenommen
+_current = contextvars.ContextVar('ligainsider_metrics', default=None)
+
+PHASES = ("connect", "tls", "send", "ttfb", "download", "total")
+PROMETHEUS_PREFIX = "ligainsider"
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def _summary(values):
+    return {
+        'count': len(values),
+        'sum': sum(values),
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'max': max(values) if values else 0.0,
+    }
+
+def _span(timings, start, end):
+    if start in timings and end in timings:
+        return timings[end] - timings[start]
+    return None
+
+def request_phases(timings, total):
+    """
+    Phasen eines Requests aus den httpcore-Trace-Zeitpunkten (Sekunden, None = nicht angefallen,
+    z.B. connect/tls bei wiederverwendeter Keep-Alive Verbindung). connect enthält die DNS-Auflösung.
+    """
+    return {
+        'connect': _span(timings, 'connect_tcp.started', 'connect_tcp.complete'),
+        'tls': _span(timings, 'start_tls.started', 'start_tls.complete'),
+        'send': _span(timings, 'send_request_headers.started', 'send_request_body.complete'),
+        'ttfb': _span(timings, 'send_request_headers.started', 'receive_response_headers.complete'),
+        'download': _span(timings, 'receive_response_body.started', 'receive_response_body.complete'),
+        'total': total,
+    }
+
+class TimedBackend:
+    """
+    Hüllt ein Parser-Backend ein und misst die Zeit für den Aufbau des Dokuments (parse);
+    alles andere während der Extraktion zählt als Extraktionszeit.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.parse_seconds = 0.0
+
+    def parse(self, text):
+        started = time.perf_counter()
+        try:
+            return self._backend.parse(text)
+        finally:
+            self.parse_seconds += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+class RunMetrics:
+    """
+    Messwerte eines Scraper-Laufs (bzw. einer Daemon-Aktualisierung).
+    """
+
+    def __init__(self, name="lineups"):
+        self.name = name
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+        self.requests = []
+        self.pages = []
+        self.errors = []
+        self.stages = {}
+        self.cache = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, url, status, size, phases):
+        with self._lock:
+            self.requests.append({'url': url, 'status': status, 'bytes': size, **phases})
+
+    def record_page(self, url, parse_seconds, extract_seconds):
+        with self._lock:
+            self.pages.append({'url': url, 'parse': parse_seconds, 'extract': extract_seconds})
+
+    def record_error(self, url, error):
+        with self._lock:
+            self.errors.append({'url': url, 'error': repr(error)})
+
+    def record_cache(self, result):
+        with self._lock:
+            self.cache[result] = self.cache.get(result, 0) + 1
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+        return self
+
+    def report(self):
+        """
+        JSON-Report: Zusammenfassung pro Phase/Stufe plus die Einzelwerte pro URL.
+        """
+        with self._lock:
+            requests = list(self.requests)
+            pages = list(self.pages)
+            status = {}
+            for request in requests:
+                key = str(request['status'] or 'error')
+                status[key] = status.get(key, 0) + 1
+            return {
+                'run': self.name,
+                'started': datetime.datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'duration_s': self.duration if self.duration is not None else time.perf_counter() - self._started,
+                'stages_s': dict(self.stages),
+                'gauges': dict(self.gauges),
+                'cache': dict(self.cache),
+                'requests': {
+                    'count': len(requests),
+                    'bytes': sum(request['bytes'] for request in requests),
+                    'status': status,
+                    'phases_s': {phase: _summary([r[phase] for r in requests if r[phase] is not None])
+                                 for phase in PHASES},
+                },
+                'pages': {
+                    'count': len(pages),
+                    'parse_s': _summary([page['parse'] for page in pages]),
+                    'extract_s': _summary([page['extract'] for page in pages]),
+                },
+                'errors': list(self.errors),
+                'urls': requests,
+                'parsed': pages,
+            }
+
+    def prometheus(self):
+        """
+        Prometheus-Textformat (Summaries mit Quantilen für Request-Phasen und Parse-Zeiten).
+        """
+        report = self.report()
+        name = PROMETHEUS_PREFIX
+        run = f'run="{self.name}"'
+        lines = []
+
+        def metric(metric_name, kind, help_text, samples):
+            lines.append(f"# HELP {name}_{metric_name} {help_text}")
+            lines.append(f"# TYPE {name}_{metric_name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join([run] + labels)
+                lines.append(f"{name}_{metric_name}{{{label_text}}} {float(value)!r}")
+
+        def summary_samples(labels, summary):
+            return [(labels + ['quantile="0.5"'], summary['p50']),
+                    (labels + ['quantile="0.95"'], summary['p95'])]
+
+        metric("run_duration_seconds", "gauge", "Dauer des letzten Laufs",
+               [([], report['duration_s'])])
+        metric("run_timestamp_seconds", "gauge", "Startzeit des letzten Laufs (Unix)",
+               [([], self.started_at)])
+        metric("stage_seconds", "gauge", "Dauer pro Stufe im letzten Lauf",
+               [([f'stage="{stage}"'], seconds) for stage, seconds in sorted(report['stages_s'].items())])
+        metric("requests", "gauge", "HTTP-Requests nach Status im letzten Lauf",
+               [([f'status="{status}"'], count) for status, count in sorted(report['requests']['status'].items())])
+        metric("received_bytes", "gauge", "Empfangene Bytes (Body) im letzten Lauf",
+               [([], report['requests']['bytes'])])
+        metric("cache_results", "gauge", "Cache-Ergebnisse (fresh, revalidated, stored) im letzten Lauf",
+               [([f'result="{result}"'], count) for result, count in sorted(report['cache'].items())])
+        metric("errors", "gauge", "Fehlgeschlagene Seiten im letzten Lauf",
+               [([], len(report['errors']))])
+
+        phase_samples = []
+        for phase, summary in report['requests']['phases_s'].items():
+            labels = [f'phase="{phase}"']
+            phase_samples += summary_samples(labels, summary)
+            phase_samples += [(labels + ['stat="sum"'], summary['sum']), (labels + ['stat="count"'], summary['count'])]
+        metric("request_phase_seconds", "gauge", "Request-Phasen (connect inkl. DNS) im letzten Lauf",
+               phase_samples)
+
+        page_samples = []
+        for step in ('parse', 'extract'):
+            summary = report['pages'][f'{step}_s']
+            labels = [f'step="{step}"']
+            page_samples += summary_samples(labels, summary)
+            page_samples += [(labels + ['stat="sum"'], summary['sum']), (labels + ['stat="count"'], summary['count'])]
+        metric("page_seconds", "gauge", "Parse- und Extraktionszeit pro Seite im letzten Lauf", page_samples)
+
+        for gauge, value in sorted(report['gauges'].items()):
+            metric(gauge, "gauge", gauge.replace('_', ' '), [([], value)])
+        return "\n".join(lines) + "\n"
+
+def start_run(name="lineups"):
+    """
+    Startet die Messung für den aktuellen Kontext (und alle danach erzeugten Tasks).
+    """
+    metrics = RunMetrics(name)
+    _current.set(metrics)
+    return metrics
+
+def stop_run():
+    metrics = _current.get()
+    _current.set(None)
+    return metrics.finish() if metrics is not None else None
+
+def current():
+    return _current.get()
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Misst die Dauer einer Stufe; ohne aktiven Lauf ein No-op.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - started)
+
+async def timed_get(client, url, headers=None):
+    """
+    client.get mit httpcore-Trace: zeichnet Phasen, Status und Bytes pro Versuch auf.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return await client.get(url, headers=headers)
+
+    timings = {}
+
+    async def trace(event_name, info):
+        # "http11.receive_response_headers.complete" -> "receive_response_headers.complete"
+        timings[".".join(event_name.split(".")[-2:])] = time.perf_counter()
+
+    started = time.perf_counter()
+    try:
+        response = await client.get(url, headers=headers, extensions={'trace': trace})
+    except Exception:
+        metrics.record_request(url, None, 0, request_phases(timings, time.perf_counter() - started))
+        raise
+    metrics.record_request(url, response.status_code, len(response.content),
+                           request_phases(timings, time.perf_counter() - started))
+    return response
+
+def timed_extract(extract, url, body):
+    """
+    Ruft extract(body) auf und zeichnet Parse- und Extraktionszeit der Seite auf.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return extract(body)
+    timed_backend = TimedBackend(get_backend())
+    started = time.perf_counter()
+    result = extract(body, timed_backend)
+    total = time.perf_counter() - started
+    metrics.record_page(url, timed_backend.parse_seconds, total - timed_backend.parse_seconds)
+    return result
+
+def write_report(metrics, path):
+    data = json.dumps(metrics.report(), ensure_ascii=False, indent=4).encode('utf-8')
+    write_if_changed(path, data)
+
+def write_prometheus(metrics, path):
+    """
+    Schreibt das Textfile atomar (der textfile collector darf keine halbe Datei lesen).
+    """
+    write_if_changed(path, metrics.prometheus().encode('utf-8'))
+
+@contextlib.contextmanager
+def profiled(path=None):
+    """
+    Optionaler cProfile-Hook: mit Pfad werden die Statistiken nach dem Block dorthin geschrieben
+    (auswerten mit python -m pstats PFAD oder snakeviz).
+    """
+    if not path:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
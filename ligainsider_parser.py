@@ -0,0 +1,524 @@
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+# Schnelle Parser sind optional; html.parser (bs4) bleibt immer als Fallback verfügbar
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+BASE_URL = "https://www.ligainsider.de"
+
+# Überschriften, unter denen die Aufstellung steht (Vorschau bzw. Live/Ergebnis-Ansicht)
+LINEUP_MARKERS = ("VORAUSSICHTLICHE AUFSTELLUNG", "Voraussichtliche Aufstellung")
+# Legende unterhalb der Aufstellung; alles danach gehört nicht mehr zum Block
+LINEUP_END_MARKER = "Spieler stand in der Startelf"
+LINEUP_MARKER_BYTES = tuple(marker.encode('utf-8') for marker in LINEUP_MARKERS)
+LINEUP_END_MARKER_BYTES = LINEUP_END_MARKER.encode('utf-8')
+
+# Spielerprofil-Links: /vorname-nachname_id/
+PLAYER_SLUG_RE = re.compile(r'^/?([a-zA-Z0-9-]+_\d+)/?$')
+# Team-Links der Spieltagsübersicht
+TEAM_LINK_RE = re.compile(r'/bundesliga/team/.*/saison-')
+# Fallback ohne player_position_row Markup: Links im Text-Bereich nach der Überschrift
+FALLBACK_LINK_RE = re.compile(r'<a\s[^>]*href="(/[a-zA-Z0-9-]+_\d+/)"[^>]*>(.*?)</a>', re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+# Spieltags-Auswahl der Team-Seite: <option value="/bundesliga/team/.../saison-2025-2026/183894" selected>19.
+MATCHDAY_OPTION_RE = re.compile(
+    r'<option\s+value="(/[^"]*/saison-(\d{4}-\d{4})/\d+)"\s*(selected)?[^>]*>\s*(\d+)\.\s*<')
+
+MAX_LINEUP_PLAYERS = 11
+
+# Version der Extraktor-Ausgabe; erhöhen, wenn sich das Ergebnis von extract_* ändert
+# (ligainsider_cache.LineupManifest verwirft dann die gemerkten Parse-Ergebnisse)
+EXTRACTOR_VERSION = 3
+
+def clean_text(text):
+    if not text: return ""
+    return " ".join(text.split())
+
+def player_slug(href):
+    """
+    Liefert die ligainsiderId (z.B. "nikola-vasilj_13866") eines Spielerprofil-Links oder None.
+    """
+    if not href:
+        return None
+    if href.startswith(BASE_URL):
+        href = href[len(BASE_URL):]
+    match = PLAYER_SLUG_RE.match(href.split('?')[0])
+    return match.group(1) if match else None
+
+def is_likely_flag_image(url):
+    """
+    Flaggen, Wappen und Team-Logos (kein Spielerfoto); wie isLikelyFlagImage in ImageHelpers.swift.
+    """
+    s = url.lower()
+    if 'images/nations' in s or '/nations/' in s:
+        return True
+    if '/flag/' in s or '/flags/' in s or '/country/' in s:
+        return True
+    if '-flag' in s or '/flag-' in s or 'flag.png' in s or 'flag.jpg' in s:
+        return True
+    if 'images/teams' in s or 'wappen' in s or '/teams/' in s:
+        return True
+    # Zweibuchstabige Ländercodes als Dateiname, z.B. 'de.png'
+    last = s.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+    stem, _, extension = last.partition('.')
+    return len(stem) == 2 and extension in ('png', 'jpg', 'jpeg')
+
+def is_likely_player_image(url):
+    """
+    Spielerfotos auf Ligainsider; wie isLikelyPlayerImage in ImageHelpers.swift.
+    """
+    s = url.lower()
+    if '/player/team/' in s or '/images/player/' in s:
+        return True
+    return any(hint in s for hint in ('/player/', 'player_img', 'player-image', 'playerphoto', 'player-photo'))
+
+def choose_player_image(candidates):
+    """
+    Bevorzugt echte Spielerfotos, sonst das erste Nicht-Flaggen-Bild.
+    """
+    candidates = [url for url in candidates if url and 'ligainsider.de' in url]
+    for url in candidates:
+        if is_likely_player_image(url) and not is_likely_flag_image(url):
+            return url
+    for url in candidates:
+        if not is_likely_flag_image(url):
+            return url
+    return None
+
+def _class_xpath(tag, cls):
+    return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+class HtmlParserBackend:
+    """
+    BeautifulSoup mit dem eingebauten html.parser (langsam, aber ohne Zusatzpakete).
+    """
+    name = "html.parser"
+
+    def parse(self, text):
+        return BeautifulSoup(text, 'html.parser')
+
+    def select_class(self, node, tag, cls):
+        return node.select(f"{tag}.{cls}")
+
+    def anchors(self, node):
+        return [(a.get('href'), a.get_text()) for a in node.find_all('a', href=True)]
+
+    def images(self, node):
+        return [img.get('src') for img in node.find_all('img', src=True)]
+
+    def links_and_images(self, node):
+        items = []
+        for element in node.find_all(['a', 'img']):
+            if element.name == 'a':
+                items.append(('a', element.get('href'), element.get_text()))
+            else:
+                items.append(('img', element.get('src') or element.get('data-src'), None))
+        return items
+
+class LxmlBackend:
+    name = "lxml"
+
+    def parse(self, text):
+        return lxml.html.document_fromstring(text)
+
+    def select_class(self, node, tag, cls):
+        return node.xpath(_class_xpath(tag, cls))
+
+    def anchors(self, node):
+        return [(a.get('href'), a.text_content()) for a in node.xpath('.//a[@href]')]
+
+    def images(self, node):
+        return [img.get('src') for img in node.xpath('.//img[@src]')]
+
+    def links_and_images(self, node):
+        items = []
+        for element in node.iter('a', 'img'):
+            if element.tag == 'a':
+                items.append(('a', element.get('href'), element.text_content()))
+            else:
+                items.append(('img', element.get('src') or element.get('data-src'), None))
+        return items
+
+class SelectolaxBackend:
+    name = "selectolax"
+
+    def parse(self, text):
+        return SelectolaxHTMLParser(text)
+
+    def select_class(self, node, tag, cls):
+        return node.css(f"{tag}.{cls}")
+
+    def anchors(self, node):
+        return [(a.attributes.get('href'), a.text(deep=True)) for a in node.css('a[href]')]
+
+    def images(self, node):
+        return [img.attributes.get('src') for img in node.css('img[src]')]
+
+    def links_and_images(self, node):
+        items = []
+        for element in node.css('a, img'):
+            if element.tag == 'a':
+                items.append(('a', element.attributes.get('href'), element.text(deep=True)))
+            else:
+                attributes = element.attributes
+                items.append(('img', attributes.get('src') or attributes.get('data-src'), None))
+        return items
+
+BACKENDS = {
+    SelectolaxBackend.name: (SelectolaxBackend, SelectolaxHTMLParser is not None),
+    LxmlBackend.name: (LxmlBackend, lxml is not None),
+    HtmlParserBackend.name: (HtmlParserBackend, True),
+}
+
+# Gewählter Parser für den Scraper (None = schnellster verfügbarer)
+_default_backend = None
+
+def available_backends():
+    """
+    Namen der installierten Backends, schnellstes zuerst.
+    """
+    return [name for name, (_, available) in BACKENDS.items() if available]
+
+def get_backend(name=None):
+    name = name or _default_backend or available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unbekannter Parser: {name}")
+    backend_class, available = BACKENDS[name]
+    if not available:
+        raise ValueError(f"Parser nicht installiert: {name}")
+    return backend_class()
+
+def set_backend(name):
+    """
+    Legt den Standard-Parser fest (None = automatisch).
+    """
+    global _default_backend
+    if name is not None:
+        get_backend(name)
+    _default_backend = name
+
+def _to_text(html):
+    if isinstance(html, bytes):
+        return html.decode('utf-8', errors='replace')
+    return html
+
+def _match_image(slug, images, used):
+    """
+    Ordnet einem Spieler das Bild zu, dessen Dateiname den Slug-Namen enthält,
+    sonst das erste noch unbenutzte Bild der Spalte (wie LigainsiderService.swift).
+    """
+    name_part = slug.split('_')[0].lower()
+    first_free = None
+    for index, url in enumerate(images):
+        if index in used:
+            continue
+        if first_free is None:
+            first_free = index
+        if name_part in url.lower():
+            used.add(index)
+            return url
+    if first_free is not None:
+        used.add(first_free)
+        return images[first_free]
+    return None
+
+def _extract_column(backend, column):
+    return _column_entries(backend.anchors(column), backend.images(column))
+
+def _column_entries(anchors, images):
+    images = [src for src in images if 'ligainsider.de' in src and '/player/team/' in src]
+    used_images = set()
+    entries = []
+    seen = set()
+    for href, text in anchors:
+        slug = player_slug(href)
+        if not slug:
+            continue
+        name = clean_text(text)
+        if len(name) < 2 or len(name) > 50 or name in seen:
+            continue
+        seen.add(name)
+        entries.append({'name': name, 'ligainsiderId': slug,
+                        'imageUrl': _match_image(slug, images, used_images)})
+    return entries
+
+def _lineup_player(entries):
+    """
+    Erster Spieler einer Spalte ist gesetzt, ein zweiter die Alternative.
+    """
+    main = dict(entries[0])
+    main['alternative'] = entries[1]['name'] if len(entries) > 1 else None
+    return {key: main[key] for key in ('name', 'alternative', 'ligainsiderId', 'imageUrl')}
+
+def _fallback_lineup(text):
+    """
+    Seiten ohne player_position_row Markup: alle Spieler-Links zwischen Überschrift
+    und Legende als eine Reihe (die ersten 11 eindeutigen Namen).
+    """
+    start = -1
+    for marker in LINEUP_MARKERS:
+        start = text.find(marker)
+        if start != -1:
+            break
+    if start == -1:
+        return []
+    end = text.find(LINEUP_END_MARKER, start)
+    area = text[start:end if end != -1 else start + 100000]
+
+    row = []
+    seen = set()
+    for href, raw_name in FALLBACK_LINK_RE.findall(area):
+        name = clean_text(TAG_RE.sub('', raw_name))
+        if len(name) < 3 or len(name) > 50 or name in seen:
+            continue
+        seen.add(name)
+        row.append({'name': name, 'alternative': None,
+                    'ligainsiderId': player_slug(href), 'imageUrl': None})
+        if len(row) >= MAX_LINEUP_PLAYERS:
+            break
+    return [row] if row else []
+
+def extract_lineup(html, backend=None):
+    """
+    Extrahiert die voraussichtliche Aufstellung als Liste von Reihen (Torwart, Abwehr, ...).
+    Jeder Spieler ist ein dict im Schema von LigainsiderPlayer
+    (name, alternative, ligainsiderId, imageUrl).
+    """
+    text = _to_text(html)
+    if not any(marker in text for marker in LINEUP_MARKERS):
+        return []
+
+    backend = backend or get_backend()
+    doc = backend.parse(text)
+
+    rows = []
+    # Ein Durchlauf über alle Reihen der Aufstellungsgrafik; jede Spalte ist eine Position,
+    # der erste Spieler ist gesetzt, ein zweiter die Alternative
+    for row_node in backend.select_class(doc, 'div', 'player_position_row'):
+        row = []
+        for column in backend.select_class(row_node, 'div', 'player_position_column'):
+            entries = _extract_column(backend, column)
+            if entries:
+                row.append(_lineup_player(entries))
+        if row:
+            rows.append(row)
+
+    if not rows:
+        return _fallback_lineup(text)
+    return rows
+
+class LineupStream:
+    """
+    Inkrementelle Variante von extract_lineup für gestreamte Antworten: feed(chunk) liefert True,
+    sobald die Legende unter der Aufstellung erreicht ist; der Rest der Seite wird nicht mehr
+    gebraucht und die Verbindung kann geschlossen werden.
+
+    Ab der Überschrift läuft der Block durch den Pull-Parser von lxml; jede Spalte wird bei
+    ihrem End-Tag ausgewertet und danach verworfen. Ohne lxml wird nur der Block gepuffert
+    und am Ende mit extract_lineup geparst.
+    """
+
+    def __init__(self):
+        self.head = bytearray()  # gelesene Bytes bis zur Legende (Wappen, Hash, Fallback)
+        self.bytes_read = 0
+        self.done = False
+        self.rows = None
+        self._start = None
+        self._fed = 0
+        self._parser = None
+        self._columns = []
+        self._rows = []
+
+    def feed(self, chunk):
+        if self.done:
+            return True
+        self.bytes_read += len(chunk)
+        searched = max(0, len(self.head) - len(LINEUP_END_MARKER_BYTES))
+        self.head += chunk
+
+        if self._start is None:
+            positions = [self.head.find(marker, max(0, searched - len(marker))) for marker in LINEUP_MARKER_BYTES]
+            positions = [position for position in positions if position != -1]
+            if not positions:
+                return False
+            self._start = self._fed = min(positions)
+            searched = self._start
+            if lxml is not None:
+                self._parser = lxml.etree.HTMLPullParser(events=('end',), tag='div', encoding='utf-8')
+                # HtmlElement (text_content) wie beim LxmlBackend
+                self._parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+
+        end = self.head.find(LINEUP_END_MARKER_BYTES, max(searched, self._start))
+        limit = end if end != -1 else len(self.head)
+        if self._parser is not None and limit > self._fed:
+            self._parser.feed(bytes(self.head[self._fed:limit]))
+            self._fed = limit
+            self._collect()
+        if end != -1:
+            del self.head[end:]
+            self.done = True
+        return self.done
+
+    def _collect(self):
+        backend = LxmlBackend()
+        for _, element in self._parser.read_events():
+            classes = (element.get('class') or "").split()
+            if 'player_position_column' in classes:
+                entries = _extract_column(backend, element)
+                if entries:
+                    self._columns.append(_lineup_player(entries))
+                element.clear()
+            elif 'player_position_row' in classes:
+                if self._columns:
+                    self._rows.append(self._columns)
+                self._columns = []
+                element.clear()
+
+    def close(self):
+        """
+        Beendet den Parse-Vorgang und liefert die Aufstellungsreihen (wie extract_lineup).
+        """
+        if self.rows is not None:
+            return self.rows
+        if self._start is None:
+            self.rows = []
+        elif self._parser is not None:
+            self._parser.close()
+            self._collect()
+            self.rows = self._rows or _fallback_lineup(_to_text(bytes(self.head)))
+        else:
+            self.rows = extract_lineup(bytes(self.head))
+        self._parser = None
+        return self.rows
+
+    @property
+    def logo(self):
+        return extract_team_logo(bytes(self.head))
+
+def extract_lineup_streaming(chunks):
+    """
+    extract_lineup über eine Folge von Byte-Blöcken; hört nach der Legende auf zu lesen.
+    Liefert (Reihen, gelesene Bytes).
+    """
+    stream = LineupStream()
+    for chunk in chunks:
+        if stream.feed(chunk):
+            break
+    return stream.close(), stream.bytes_read
+
+def lineup_names(rows):
+    """
+    Flache Namensliste der Startelf (Format von ligainsider_lineups.json).
+    """
+    return [player['name'] for row in rows for player in row][:MAX_LINEUP_PLAYERS]
+
+def extract_squad(html, backend=None):
+    """
+    Extrahiert alle Spieler einer Kader-Seite im Schema von LigainsiderPlayer
+    (wie fetchSquad(path:teamName:) in LigainsiderService.swift). Das Bild eines Spielers
+    ist das beste Foto im Link selbst oder zwischen dem vorherigen und diesem Spieler-Link.
+    """
+    backend = backend or get_backend()
+    doc = backend.parse(_to_text(html))
+
+    players = []
+    seen = set()
+    pending_images = []
+    for kind, value, text in backend.links_and_images(doc):
+        if kind == 'img':
+            pending_images.append(value)
+            continue
+        slug = player_slug(value)
+        if not slug:
+            continue
+        name = clean_text(text)
+        if not name or len(name) > 50:
+            # Foto-Links ohne Text: Bilder bleiben für den folgenden Namens-Link vorgemerkt
+            continue
+        image_url = choose_player_image(pending_images)
+        pending_images = []
+        if slug in seen:
+            continue
+        seen.add(slug)
+        players.append({'name': name, 'alternative': None, 'ligainsiderId': slug, 'imageUrl': image_url})
+    return players
+
+def extract_team_links(html, backend=None):
+    """
+    Liefert (href, Linktext) aller Team-Links der Spieltagsübersicht in Dokument-Reihenfolge.
+    """
+    backend = backend or get_backend()
+    doc = backend.parse(_to_text(html))
+    return [(href, text) for href, text in backend.anchors(doc) if TEAM_LINK_RE.search(href)]
+
+def is_team_logo(url):
+    return 'ligainsider.de' in url and ('wappen' in url or 'images/teams' in url)
+
+def extract_team_logo(html):
+    """
+    Wappen einer Team-Seite: das letzte Bild vor der Überschrift mit itemprop="name"
+    (wie fetchTeamData(url:) in LigainsiderService.swift), sonst None.
+    """
+    text = _to_text(html)
+    name_index = text.find('itemprop="name"')
+    if name_index == -1:
+        return None
+    src_index = text.rfind('src="', 0, name_index)
+    if src_index == -1:
+        return None
+    start = src_index + len('src="')
+    end = text.find('"', start, name_index)
+    if end == -1:
+        return None
+    url = text[start:end]
+    return url if is_team_logo(url) else None
+
+def extract_matchday_links(html):
+    """
+    Liefert die Spieltage aus der Auswahlliste einer Team-Seite als Liste von
+    (Saison, Spieltag, Pfad, ausgewählt) in Listen-Reihenfolge ("Top11" wird übersprungen).
+    """
+    links = []
+    for path, season, selected, matchday in MATCHDAY_OPTION_RE.findall(_to_text(html)):
+        links.append((season, int(matchday), path, bool(selected)))
+    return links
+
+def verify_backends(paths, repeat=5):
+    """
+    Prüft, dass alle installierten Backends dieselbe Aufstellung und denselben Kader liefern,
+    und misst die Parse-Zeit.
+    """
+    ok = True
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        reference = None
+        for name in available_backends():
+            backend = get_backend(name)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                rows = extract_lineup(html, backend)
+            elapsed = (time.perf_counter() - started) / repeat
+            squad = extract_squad(html, backend)
+            if reference is None:
+                reference = (rows, squad)
+            same = (rows, squad) == reference
+            ok = ok and same
+            print(f"{path} [{name}]: {sum(len(r) for r in rows)} Spieler, {len(squad)} im Kader, "
+                  f"{elapsed * 1000:.1f} ms, {'identisch' if same else 'ABWEICHUNG'}")
+    return ok
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or ["page_dump.html", "partial.html"]
+    sys.exit(0 if verify_backends(files) else 1)
@@ -0,0 +1,86 @@
+"""
+Parse-Stufe des Scrapers in einem Prozess-Pool.
+
+Die Netzwerk-Tasks laden nur die Bytes und reichen sie an ParseStage weiter; die Extraktion
+läuft in eigenen Prozessen (kein GIL), sodass Kader- und Mehr-Spieltags-Läufe mit der Anzahl
+der Kerne skalieren. Die Übergabe ist begrenzt: sind alle Plätze belegt, warten die
+Netzwerk-Tasks, statt beliebig viele Seiten im Speicher zu puffern.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ligainsider_metrics as metrics
+from ligainsider_parser import get_backend
+
+# Seiten pro Worker, die gleichzeitig in der Parse-Stufe warten dürfen
+PENDING_PER_WORKER = 2
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def _parse_job(extract, body, backend_name):
+    """
+    Läuft im Worker-Prozess: liefert (Ergebnis, Parse-Sekunden, Extraktions-Sekunden).
+    """
+    backend = metrics.TimedBackend(get_backend(backend_name))
+    started = time.perf_counter()
+    result = extract(body, backend)
+    total = time.perf_counter() - started
+    return result, backend.parse_seconds, total - backend.parse_seconds
+
+def _warm_up():
+    return os.getpid()
+
+class ParseStage:
+    """
+    Prozess-Pool für extract_lineup / extract_squad. workers=0 parst direkt im Event-Loop
+    (wie bisher, sinnvoll für wenige kleine Seiten).
+    """
+
+    def __init__(self, workers=0, max_pending=None):
+        self.workers = workers
+        self.max_pending = max_pending or max(1, workers) * PENDING_PER_WORKER
+        self._executor = None
+        self._slots = None
+
+    def start(self):
+        if self.workers and self._executor is None:
+            # spawn statt fork: der Elternprozess hat Event-Loop, Threads und offene Sockets
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            # Worker sofort starten, damit der Import nicht in den ersten Abruf fällt
+            for _ in range(self.workers):
+                self._executor.submit(_warm_up)
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def run(self, extract, url, body):
+        """
+        Extrahiert body mit extract(body, backend) im Pool und liefert das Ergebnis.
+        """
+        if self._executor is None:
+            return metrics.timed_extract(extract, url, body)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            result, parse_seconds, extract_seconds = await loop.run_in_executor(
+                self._executor, _parse_job, extract, body, get_backend().name)
+
+        run = metrics.current()
+        if run is not None:
+            run.record_page(url, parse_seconds, extract_seconds)
+        return result
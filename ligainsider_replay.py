@@ -0,0 +1,424 @@
+"""
+Aufzeichnen und Wiedergeben von Scraper-Läufen für reproduzierbare Regressionstests.
+
+record lädt den Spieltag wie fetch_lineups() (ohne Response-Cache, damit jede Seite wirklich
+geladen wird, und ohne ligainsider_lineups.json oder andere Ausgaben zu schreiben) und legt
+dabei jede Anfrage mit Antwort in einem Archiv unter ligainsider_recordings/ ab. Ein Archiv ist eine ZIP-Datei (Deflate) mit:
+
+    index.json        Version, Zeitpunkt, Optionen und pro Anfrage Methode, URL, Status, Header,
+                      Body-Hash und Zeitpunkt relativ zum Start
+    bodies/<sha256>   jeder Body genau einmal (inhaltsadressiert, dekodiert)
+    result.json       die Matches des Laufs (Erwartungswert; fehlt, wenn die Aufnahme unvollständig ist)
+
+replay spielt die Archive über einen httpx-Transport ohne Netzwerk und Wartezeit ab, lässt die
+komplette Extraktion laufen und vergleicht mit result.json. So lassen sich Parser-Änderungen
+gegen beliebig viele echte Spieltage prüfen; parse misst den reinen Parse-Durchsatz über alle
+aufgezeichneten Team-Seiten.
+
+    python ligainsider_replay.py record
+    python ligainsider_replay.py replay                      # alle Archive
+    python ligainsider_replay.py replay --stream --parse-workers 4
+    python ligainsider_replay.py parse --parser lxml
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import httpx
+
+import ligainsider_scraper as scraper
+from ligainsider_cache import content_hash
+from ligainsider_parser import available_backends, extract_lineup, get_backend, set_backend
+from ligainsider_pipeline import ParseStage, default_workers
+
+ARCHIVE_VERSION = 1
+RECORDINGS_DIR = "ligainsider_recordings"
+INDEX_NAME = "index.json"
+RESULT_NAME = "result.json"
+BODIES_PREFIX = "bodies/"
+
+# Der Body wird dekodiert gespeichert, diese Header passen dann nicht mehr
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+# Zeitbudget beim Abspielen: ohne Netzwerk nur relevant, falls etwas hängt
+REPLAY_DEADLINE = 600
+
+def get_recordings_dir():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), RECORDINGS_DIR)
+
+def default_archive_path():
+    return os.path.join(get_recordings_dir(), time.strftime("%Y%m%d-%H%M%S") + ".zip")
+
+def list_archives(directory=None):
+    directory = directory or get_recordings_dir()
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".zip"))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+def _stored_headers(headers):
+    return [[key, value] for key, value in headers.items() if key.lower() not in DROPPED_HEADERS]
+
+class ArchiveWriter:
+    """
+    Sammelt Anfragen während eines Laufs und schreibt das Archiv beim Schließen (atomar).
+    """
+
+    def __init__(self, path, options=None):
+        self.path = path
+        self.options = options or {}
+        self.entries = []
+        self.bodies = {}
+        self.recorded_at = time.time()
+        self._started = time.monotonic()
+
+    def add(self, method, url, status, headers, body, elapsed):
+        digest = content_hash(body)
+        self.bodies.setdefault(digest, body)
+        self.entries.append({'method': method, 'url': url, 'status': status, 'headers': _stored_headers(headers),
+                             'body': digest, 'at': round(time.monotonic() - self._started - elapsed, 4),
+                             'elapsed': round(elapsed, 4)})
+
+    def close(self, result=None):
+        index = {'version': ARCHIVE_VERSION, 'recordedAt': self.recorded_at, 'options': self.options,
+                 'baseUrl': scraper.BASE_URL, 'overviewUrl': scraper.OVERVIEW_URL, 'entries': self.entries}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        _write_archive(self.path, index, self.bodies, result)
+        return self.path
+
+def _write_archive(path, index, bodies, result):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED,
+                                                       compresslevel=9) as archive:
+            archive.writestr(INDEX_NAME, json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+            for digest in sorted(bodies):
+                archive.writestr(BODIES_PREFIX + digest, bodies[digest])
+            if result is not None:
+                archive.writestr(RESULT_NAME, json.dumps(result, ensure_ascii=False, indent=4))
+        # mkstemp legt 0600 an, die Ausgaben sollen wie bisher lesbar sein
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Reicht Anfragen an den echten Transport weiter und zeichnet Antwort samt vollständigem Body auf.
+    Gestreamte Abrufe bekommen den Body danach aus dem Speicher (das frühe Abbrechen spart beim
+    Aufzeichnen also nichts, dafür enthält das Archiv immer die ganze Seite).
+    """
+
+    def __init__(self, writer, inner):
+        self.writer = writer
+        self.inner = inner
+
+    async def handle_async_request(self, request):
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        try:
+            # Über einen Response mit Request dekodieren (gzip/br wie beim normalen Client)
+            decoded = httpx.Response(response.status_code, headers=response.headers, stream=response.stream,
+                                     request=request)
+            body = await decoded.aread()
+        finally:
+            await response.aclose()
+        self.writer.add(request.method, str(request.url), response.status_code, response.headers, body,
+                        time.monotonic() - started)
+        headers = _stored_headers(response.headers) + [['content-length', str(len(body))]]
+        return httpx.Response(response.status_code, headers=headers, content=body,
+                              extensions={'http_version': response.extensions.get('http_version', b"HTTP/1.1")})
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+class Archive:
+    """
+    Ein aufgezeichneter Lauf; alle Bodies werden beim Öffnen entpackt, damit das Abspielen
+    nur noch Speicherzugriffe enthält.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read(INDEX_NAME))
+            if index.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f"{path}: unbekannte Archiv-Version {index.get('version')}")
+            names = set(archive.namelist())
+            self.bodies = {name[len(BODIES_PREFIX):]: archive.read(name)
+                           for name in names if name.startswith(BODIES_PREFIX)}
+            self.result = json.loads(archive.read(RESULT_NAME)) if RESULT_NAME in names else None
+        self.index = index
+        self.entries = index['entries']
+        self.responses = collections.defaultdict(list)
+        for entry in self.entries:
+            self.responses[(entry['method'], entry['url'])].append(entry)
+
+    @property
+    def name(self):
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def pages(self, pattern=None):
+        """
+        (URL, Body) aller erfolgreichen GETs, jede URL einmal; optional nur passende URLs.
+        """
+        seen = set()
+        for entry in self.entries:
+            url = entry['url']
+            if entry['method'] != "GET" or entry['status'] != 200 or url in seen:
+                continue
+            if pattern is None or pattern.search(url):
+                seen.add(url)
+                yield url, self.bodies[entry['body']]
+
+    def save_result(self, result):
+        bodies = {digest: body for digest, body in self.bodies.items()}
+        _write_archive(self.path, self.index, bodies, result)
+        self.result = result
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Beantwortet Anfragen aus einem Archiv. Mehrfach aufgezeichnete URLs (Retries) werden in
+    der aufgezeichneten Reihenfolge geliefert; fehlende URLs bekommen 404 und landen in misses.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.misses = []
+        self._served = collections.Counter()
+
+    async def handle_async_request(self, request):
+        key = (request.method, str(request.url))
+        entries = self.archive.responses.get(key)
+        if not entries:
+            self.misses.append(key[1])
+            return httpx.Response(404, headers={'X-Replay': 'miss'}, content=b"")
+        entry = entries[min(self._served[key], len(entries) - 1)]
+        self._served[key] += 1
+        body = self.archive.bodies[entry['body']]
+        headers = entry['headers'] + [['content-length', str(len(body))]]
+        return httpx.Response(entry['status'], headers=headers, content=body)
+
+async def record_async(path=None, max_concurrency=scraper.DEFAULT_MAX_CONCURRENCY,
+                       max_connections=scraper.DEFAULT_MAX_CONNECTIONS, timeout=scraper.DEFAULT_TIMEOUT,
+                       deadline=scraper.DEFAULT_DEADLINE, parse_workers=scraper.DEFAULT_PARSE_WORKERS):
+    """
+    Lädt den Spieltag wie fetch_lineups() (ohne Cache) und zeichnet den HTTP-Verkehr auf. Die
+    Matches bleiben im Speicher, ligainsider_lineups.json und die übrigen Ausgaben werden nicht
+    angefasst. Als Erwartung gespeichert werden sie nur, wenn das Abspielen der Aufnahme ohne
+    fehlende URLs dasselbe Ergebnis liefert (sonst z.B. Deadline erreicht oder Seite fehlgeschlagen).
+    Liefert (Archiv-Pfad, Erfolg).
+    """
+    options = {'max_concurrency': max_concurrency, 'max_connections': max_connections, 'timeout': timeout,
+               'deadline': deadline}
+    writer = ArchiveWriter(path or default_archive_path(), options)
+    scraper.set_transport_factory(lambda limits: RecordingTransport(writer, httpx.AsyncHTTPTransport(limits=limits)))
+    try:
+        with ParseStage(parse_workers) as parse_stage:
+            async with scraper.create_async_client(max_connections=max_connections, timeout=timeout) as client:
+                matches = await scraper.scrape_matches_async(client, max_concurrency=max_concurrency,
+                                                             deadline=deadline, parse_stage=parse_stage)
+    except Exception as e:
+        print(f"Aufnahme fehlgeschlagen: {e!r}")
+        return writer.close(None), False
+    finally:
+        scraper.set_transport_factory(None)
+
+    path = writer.close(None)
+    archive = Archive(path)
+    replayed, misses, _ = await replay_async(archive, parse_workers=parse_workers)
+    if misses:
+        print(f"{len(misses)} Anfragen ohne vollständige Antwort aufgezeichnet (Deadline?), keine Erwartung gespeichert")
+        return path, False
+    if compare_results(matches, replayed):
+        print("Abspielen der Aufnahme liefert ein anderes Ergebnis, keine Erwartung gespeichert")
+        return path, False
+    archive.save_result(matches)
+    return path, True
+
+@contextlib.contextmanager
+def _replaying(archive, transport):
+    """
+    Scraper auf die aufgezeichneten URLs und den Archiv-Transport umstellen (auch wenn sich
+    BASE_URL/OVERVIEW_URL seit der Aufnahme geändert haben).
+    """
+    urls = scraper.BASE_URL, scraper.OVERVIEW_URL
+    scraper.BASE_URL = archive.index.get('baseUrl', scraper.BASE_URL)
+    scraper.OVERVIEW_URL = archive.index.get('overviewUrl', scraper.OVERVIEW_URL)
+    scraper.set_transport_factory(lambda limits: transport)
+    try:
+        yield
+    finally:
+        scraper.set_transport_factory(None)
+        scraper.BASE_URL, scraper.OVERVIEW_URL = urls
+
+async def replay_async(archive, stream=False, parse_workers=scraper.DEFAULT_PARSE_WORKERS,
+                       max_concurrency=scraper.DEFAULT_MAX_CONCURRENCY, verbose=False):
+    """
+    Spielt ein Archiv ab und liefert (Matches, fehlende URLs, Sekunden).
+    """
+    transport = ReplayTransport(archive)
+    output = None if verbose else io.StringIO()
+    started = time.perf_counter()
+    with _replaying(archive, transport):
+        with contextlib.redirect_stdout(output) if output is not None else contextlib.nullcontext():
+            with ParseStage(parse_workers) as parse_stage:
+                async with scraper.create_async_client() as client:
+                    matches = await scraper.scrape_matches_async(client, max_concurrency=max_concurrency,
+                                                                 deadline=REPLAY_DEADLINE, parse_stage=parse_stage,
+                                                                 stream=stream)
+    return matches, transport.misses, time.perf_counter() - started
+
+def compare_results(expected, actual):
+    """
+    Beschreibungen der abweichenden Matches (leer = identisch).
+    """
+    differences = []
+    if len(expected) != len(actual):
+        differences.append(f"{len(expected)} Spiele erwartet, {len(actual)} erhalten")
+    for index, (before, after) in enumerate(zip(expected, actual)):
+        if before == after:
+            continue
+        fields = sorted(key for key in set(before) | set(after) if before.get(key) != after.get(key))
+        differences.append(f"Spiel {index + 1} ({before.get('homeTeam')} - {before.get('awayTeam')}): "
+                           f"{', '.join(fields)}")
+    return differences
+
+def run_replay(paths, stream=False, parse_workers=scraper.DEFAULT_PARSE_WORKERS, update=False, verbose=False):
+    """
+    Regressionslauf über alle Archive; liefert True, wenn alle Ergebnisse übereinstimmen.
+    """
+    ok = True
+    total_pages = total_bytes = 0
+    total_seconds = 0.0
+    for path in paths:
+        archive = Archive(path)
+        matches, misses, seconds = asyncio.run(replay_async(archive, stream, parse_workers, verbose=verbose))
+        served = [entry for entry in archive.entries if entry['method'] == "GET"]
+        pages = len(served)
+        total_pages += pages
+        total_bytes += sum(len(archive.bodies[entry['body']]) for entry in served)
+        total_seconds += seconds
+
+        if misses:
+            # Nie eine Erwartung aus einem Lauf mit fehlenden Antworten speichern
+            status = "keine Erwartung gespeichert" if update or archive.result is None else "nicht verglichen"
+        elif update or archive.result is None:
+            archive.save_result(matches)
+            status = "Erwartung gespeichert"
+        else:
+            differences = compare_results(archive.result, matches)
+            status = "✅ identisch" if not differences else f"❌ {len(differences)} Abweichungen"
+            if differences:
+                ok = False
+                for difference in differences:
+                    print(f"    {difference}")
+        if misses:
+            ok = False
+            status += f", {len(misses)} URLs nicht im Archiv"
+        print(f"{archive.name}: {len(matches)} Spiele, {pages} Seiten, {seconds * 1000:.0f} ms  {status}")
+
+    if paths:
+        print(f"{len(paths)} Archive, {total_pages} Seiten ({total_bytes / 1e6:.1f} MB) in {total_seconds:.2f} s "
+              f"= {total_pages / max(total_seconds, 1e-9):.0f} Seiten/s")
+    return ok
+
+def measure_parse(paths, backends=None, repeat=1):
+    """
+    Parse-Durchsatz über alle aufgezeichneten Team-Seiten, pro Backend. Liefert False, wenn
+    sich die Backends bei einer Seite unterscheiden.
+    """
+    pages = [body for path in paths for _, body in Archive(path).pages(scraper.TEAM_URL_RE)]
+    if not pages:
+        print("Keine Team-Seiten in den Archiven")
+        return False
+    megabytes = sum(len(body) for body in pages) / 1e6
+    reference = None
+    ok = True
+    for name in backends or available_backends():
+        backend = get_backend(name)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            results = [extract_lineup(body, backend) for body in pages]
+        seconds = (time.perf_counter() - started) / repeat
+        if reference is None:
+            reference = results
+        same = results == reference
+        ok = ok and same
+        print(f"[{name}] {len(pages)} Seiten ({megabytes:.1f} MB) in {seconds:.2f} s = "
+              f"{len(pages) / seconds:.0f} Seiten/s, {megabytes / seconds:.1f} MB/s"
+              f"{'' if same else '  ABWEICHUNG zum ersten Backend'}")
+    return ok
+
+def show_archives(paths):
+    for path in paths:
+        archive = Archive(path)
+        recorded = time.strftime('%d.%m.%Y %H:%M', time.localtime(archive.index['recordedAt']))
+        size = os.path.getsize(path)
+        raw = sum(len(body) for body in archive.bodies.values())
+        print(f"{archive.name}: {recorded}, {len(archive.entries)} Anfragen, {len(archive.bodies)} Bodies, "
+              f"{raw / 1e6:.1f} MB -> {size / 1e6:.1f} MB, "
+              f"{len(archive.result) if archive.result is not None else '-'} Spiele erwartet")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraper-Läufe aufzeichnen und deterministisch abspielen")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="fetch_lineups() ausführen und den HTTP-Verkehr archivieren")
+    record.add_argument('--archive', default=None, metavar='PFAD',
+                        help=f"Ziel (Standard: {RECORDINGS_DIR}/<Zeitstempel>.zip)")
+    record.add_argument('--concurrency', type=int, default=scraper.DEFAULT_MAX_CONCURRENCY)
+    record.add_argument('--connections', type=int, default=scraper.DEFAULT_MAX_CONNECTIONS)
+    record.add_argument('--timeout', type=float, default=scraper.DEFAULT_TIMEOUT)
+    record.add_argument('--deadline', type=float, default=scraper.DEFAULT_DEADLINE)
+
+    replay = commands.add_parser('replay', help="Archive abspielen und mit dem aufgezeichneten Ergebnis vergleichen")
+    replay.add_argument('archives', nargs='*', help=f"Archive (Standard: alle in {RECORDINGS_DIR}/)")
+    replay.add_argument('--stream', action='store_true', help="Team-Seiten wie mit --stream gestreamt parsen")
+    replay.add_argument('--parse-workers', type=int, nargs='?', const=default_workers(),
+                        default=scraper.DEFAULT_PARSE_WORKERS, metavar='N', help="Seiten in N Prozessen parsen")
+    replay.add_argument('--parser', choices=available_backends(), default=None, help="HTML-Parser")
+    replay.add_argument('--update', action='store_true',
+                        help="Aktuelles Ergebnis als neue Erwartung in die Archive schreiben")
+    replay.add_argument('-v', '--verbose', action='store_true', help="Ausgaben des Scrapers anzeigen")
+
+    parse = commands.add_parser('parse', help="Parse-Durchsatz über alle aufgezeichneten Team-Seiten")
+    parse.add_argument('archives', nargs='*')
+    parse.add_argument('--parser', action='append', choices=available_backends(),
+                       help="Nur diese Backends (mehrfach möglich)")
+    parse.add_argument('--repeat', type=int, default=1)
+
+    show = commands.add_parser('list', help="Vorhandene Archive anzeigen")
+    show.add_argument('archives', nargs='*')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        path, ok = asyncio.run(record_async(args.archive, max_concurrency=args.concurrency,
+                                            max_connections=args.connections, timeout=args.timeout,
+                                            deadline=args.deadline))
+        print(f"Archiv geschrieben: {path}" + ("" if ok else " (Lauf fehlgeschlagen, ohne Erwartungswert)"))
+        sys.exit(0 if ok else 1)
+
+    paths = args.archives or list_archives()
+    if not paths:
+        print(f"Keine Archive in {get_recordings_dir()}")
+        sys.exit(1)
+    if args.command == 'replay':
+        set_backend(args.parser)
+        sys.exit(0 if run_replay(paths, args.stream, args.parse_workers, args.update, args.verbose) else 1)
+    if args.command == 'parse':
+        sys.exit(0 if measure_parse(paths, args.parser, args.repeat) else 1)
+    show_archives(paths)
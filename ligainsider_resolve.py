@@ -0,0 +1,564 @@
+"""
+Zuordnung Kickbase-Spieler -> Ligainsider-Spieler für den ganzen Markt auf einmal.
+
+Statt jeden Spieler einzeln gegen den kompletten Cache zu filtern (getLigainsiderPlayer im
+Swift-Code, auf jedem Gerät erneut und mit denselben Mehrdeutigkeiten), wird die Zuordnung hier
+einmal berechnet und als Tabelle Kickbase-ID -> ligainsiderId gespeichert (ligainsider_player_map.json).
+
+Ablauf:
+  1. Teams: Kickbase-Team-ID (tid) -> Ligainsider-Kader über die Überschneidung der Nachnamen
+     (die Spielerliste enthält keine Teamnamen).
+  2. Blocking: Kandidaten sind die Spieler desselben Teams mit dem normalisierten Nachnamen als
+     Namensteil; ohne Treffer das ganze Team (Tippfehler), ohne Team alle Teams mit Nachnamen-Treffer.
+  3. Scoring: Trigramm-Ähnlichkeit (Jaccard) als Matrixprodukt über alle offenen Spieler, plus
+     Bonus für Nach- und Vornamen als Namensteil.
+  4. Eindeutig: jede ligainsiderId wird höchstens einmal vergeben, ein Spieler erst, wenn sein
+     bester freier Kandidat klar vorn liegt; echte Gleichstände (gleicher Nachname im Kader, kein
+     Vorname) bleiben offen und werden als mehrdeutig mit Kandidaten gespeichert.
+
+Bestehende Zuordnungen bleiben stabil, solange die ligainsiderId noch in einem Kader steht (auch
+nach Vereinswechseln); neu berechnet werden nur neue, ungeklärte und aus den Kadern verschwundene
+Spieler. Einträge mit method "manual" werden nie überschrieben.
+
+    python ligainsider_resolve.py --players players.json              # Antwort von /v4/competitions/1/players
+    python ligainsider_resolve.py --competition 1 --token ...         # direkt über die API
+    python ligainsider_resolve.py --show 1234
+    python ligainsider_resolve.py --check
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from kickbase_scoring import _first, player_list
+from ligainsider_cache import content_hash, write_if_changed
+from ligainsider_index import FUZZY_MIN_LENGTH, deletion_variants, normalize, tokens
+
+PLAYER_MAP_FILE = "ligainsider_player_map.json"
+SQUADS_FILE = "ligainsider_squads.json"
+PLAYER_MAP_VERSION = 1
+
+# Score = SIMILARITY_WEIGHT * Trigramm-Ähnlichkeit + Boni für Namensteile
+SIMILARITY_WEIGHT = 0.55
+SURNAME_BONUS = 0.3
+# Nachname mit Edit-Distanz 1 (Tippfehler) bekommt diesen Anteil des Nachnamen-Bonus
+FUZZY_SURNAME_SHARE = 0.6
+FIRST_NAME_BONUS = 0.15
+MIN_SCORE = 0.35
+# Liegt der zweitbeste Kandidat so nah am besten, wird der Eintrag als mehrdeutig markiert
+AMBIGUITY_MARGIN = 0.05
+# Anteil der Spieler eines Kickbase-Teams, deren Nachname im Kader vorkommen muss
+MIN_TEAM_OVERLAP = 0.3
+
+MANUAL = "manual"
+
+def _script_path(name):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+def kickbase_player(player):
+    """
+    (id, tid, Vorname, Nachname) normalisiert; die Spielerliste hat nur n (Anzeigename, meist
+    der Nachname), Detail-Antworten zusätzlich fn/ln.
+    """
+    player_id = str(_first(player, ('pi', 'i', 'id'), ''))
+    team_id = str(_first(player, ('tid', 'teamId'), ''))
+    first = normalize(_first(player, ('fn', 'firstName'), ''))
+    last = normalize(_first(player, ('ln', 'lastName'), '') or _first(player, ('n', 'name'), ''))
+    return player_id, team_id, first, last
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def near_token(token, parts):
+    """
+    token kommt mit höchstens einem gelöschten, eingefügten oder ersetzten Zeichen in parts vor
+    (Symmetric-Delete wie im Index).
+    """
+    if token in parts:
+        return True
+    if len(token) < FUZZY_MIN_LENGTH - 1:
+        return False
+    variants = deletion_variants(token)
+    return any(part in variants or token in deletion_variants(part) or variants & deletion_variants(part)
+               for part in parts if abs(len(part) - len(token)) <= 1)
+
+class _Vectorizer:
+    """
+    Binäre Trigramm-Vektoren; das Matrixprodukt liefert die Schnittmengen aller Paare auf einmal.
+    """
+
+    def __init__(self, *texts):
+        vocabulary = sorted(set().union(*(trigrams(text) for group in texts for text in group)))
+        self.index = {gram: position for position, gram in enumerate(vocabulary)}
+
+    def matrix(self, texts):
+        matrix = np.zeros((len(texts), len(self.index)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row, [self.index[gram] for gram in trigrams(text) if gram in self.index]] = 1.0
+        return matrix
+
+def jaccard_matrix(left, right):
+    """
+    Jaccard-Ähnlichkeit der Trigramm-Mengen für alle Paare (len(left) x len(right)).
+    """
+    if not left or not right:
+        return np.zeros((len(left), len(right)), dtype=np.float32)
+    vectorizer = _Vectorizer(left, right)
+    a, b = vectorizer.matrix(left), vectorizer.matrix(right)
+    intersection = a @ b.T
+    union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :] - intersection
+    return intersection / np.maximum(union, 1.0)
+
+class SquadTable:
+    """
+    Alle Ligainsider-Spieler der Kader als Spalten plus Block-Index (Team, Namensteil) -> Zeilen.
+    """
+
+    def __init__(self, squads):
+        self.ids, self.teams, self.names, self.surnames, self.parts = [], [], [], [], []
+        self.blocks = {}
+        self.rows_by_team = {}
+        self.row_by_id = {}
+        for team in sorted(squads):
+            for player in squads[team]:
+                player_id = player.get('ligainsiderId')
+                if not player_id or player_id in self.row_by_id:
+                    continue
+                row = len(self.ids)
+                name_tokens = tokens(player.get('name') or player_id)
+                parts = set(tokens(player_id)) | set(name_tokens)
+                self.row_by_id[player_id] = row
+                self.ids.append(player_id)
+                self.teams.append(team)
+                self.names.append(" ".join(name_tokens))
+                self.surnames.append(" ".join(name_tokens[1:]) or " ".join(name_tokens))
+                self.parts.append(parts)
+                self.rows_by_team.setdefault(team, []).append(row)
+                for part in parts:
+                    self.blocks.setdefault((team, part), []).append(row)
+                    self.blocks.setdefault((None, part), []).append(row)
+
+def align_teams(players, squad_table):
+    """
+    Kickbase-Team-ID -> Ligainsider-Teamname: Paare mit der größten Nachnamen-Überschneidung,
+    jedes Team höchstens einmal.
+    """
+    team_ids = sorted({team_id for _, team_id, _, _ in players if team_id})
+    teams = sorted(squad_table.rows_by_team)
+    if not team_ids or not teams:
+        return {}
+    overlap = np.zeros((len(team_ids), len(teams)), dtype=np.int32)
+    sizes = np.zeros(len(team_ids), dtype=np.int32)
+    team_position = {team: position for position, team in enumerate(teams)}
+    id_position = {team_id: position for position, team_id in enumerate(team_ids)}
+    for _, team_id, _, last in players:
+        if not team_id:
+            continue
+        sizes[id_position[team_id]] += 1
+        surname = (tokens(last) or [None])[-1]
+        hits = {squad_table.teams[row] for row in squad_table.blocks.get((None, surname), ())}
+        for team in hits:
+            overlap[id_position[team_id], team_position[team]] += 1
+
+    mapping = {}
+    used = set()
+    order = np.argsort(-overlap, axis=None, kind='stable')
+    for flat in order:
+        row, column = divmod(int(flat), len(teams))
+        if overlap[row, column] == 0:
+            break
+        if team_ids[row] in mapping or teams[column] in used:
+            continue
+        if overlap[row, column] < max(1, MIN_TEAM_OVERLAP * sizes[row]):
+            continue
+        mapping[team_ids[row]] = teams[column]
+        used.add(teams[column])
+    return mapping
+
+def candidate_rows(squad_table, team, first, last):
+    """
+    Block-Kandidaten und Art des Blocks ("block", "team" oder "global").
+    """
+    last_tokens = tokens(last)
+    keys = last_tokens or tokens(first)
+    if team is not None:
+        rows = sorted({row for key in keys for row in squad_table.blocks.get((team, key), ())})
+        if rows:
+            return rows, "block"
+        return list(squad_table.rows_by_team.get(team, ())), "team"
+    rows = sorted({row for key in keys for row in squad_table.blocks.get((None, key), ())})
+    return rows, "global"
+
+def score_candidates(players, squad_table, candidates):
+    """
+    Scores aller (Spieler, Kandidat)-Paare. players: [(id, tid, Vorname, Nachname)],
+    candidates: pro Spieler die Kandidaten-Zeilen. Liefert eine Liste von Score-Arrays.
+    """
+    if not players:
+        return []
+    columns = sorted({row for rows in candidates for row in rows})
+    if not columns:
+        return [np.zeros(0, dtype=np.float32) for _ in players]
+    column_position = {row: position for position, row in enumerate(columns)}
+    full = jaccard_matrix([f"{first} {last}".strip() for _, _, first, last in players],
+                          [squad_table.names[row] for row in columns])
+    surname = jaccard_matrix([last for _, _, _, last in players], [squad_table.surnames[row] for row in columns])
+    similarity = np.maximum(full, surname)
+
+    scores = []
+    for index, ((_, _, first, last), rows) in enumerate(zip(players, candidates)):
+        positions = np.array([column_position[row] for row in rows], dtype=np.intp)
+        surname_tokens = set(tokens(last))
+        first_tokens = set(tokens(first))
+        surname_hit = np.array([1.0 if surname_tokens and surname_tokens <= squad_table.parts[row] else
+                                FUZZY_SURNAME_SHARE if surname_tokens and all(
+                                    near_token(token, squad_table.parts[row]) for token in surname_tokens) else 0.0
+                                for row in rows], dtype=np.float32)
+        first_hit = np.array([bool(first_tokens) and bool(first_tokens & squad_table.parts[row]) for row in rows],
+                             dtype=np.float32)
+        scores.append(SIMILARITY_WEIGHT * similarity[index, positions] + SURNAME_BONUS * surname_hit
+                      + FIRST_NAME_BONUS * first_hit)
+    return scores
+
+def resolve(players, squad_table, team_map, reserved=()):
+    """
+    Ordnet players ([(id, tid, Vorname, Nachname)]) eindeutig zu; reserved sind bereits vergebene
+    ligainsiderIds. Ein Spieler wird erst vergeben, wenn sein bester noch freier Kandidat klar vor
+    dem zweitbesten liegt; so lösen sich gleiche Nachnamen auf, sobald die Namensvettern mit
+    Vornamen vergeben sind. Was danach gleichauf bleibt, wird nicht geraten (ligainsiderId None,
+    ambiguous mit den Kandidaten). Liefert Kickbase-ID -> Eintrag.
+    """
+    candidates, methods = [], []
+    for _, team_id, first, last in players:
+        rows, method = candidate_rows(squad_table, team_map.get(team_id), first, last)
+        candidates.append(rows)
+        methods.append(method)
+    scores = score_candidates(players, squad_table, candidates)
+
+    pairs = sorted((-float(score), players[index][0], squad_table.ids[row], index, row)
+                   for index, (rows, player_scores) in enumerate(zip(candidates, scores))
+                   for row, score in zip(rows, player_scores) if score >= MIN_SCORE)
+    options = {}
+    for negative_score, _, ligainsider_id, index, row in pairs:
+        options.setdefault(index, []).append((-negative_score, ligainsider_id, row))
+
+    results = {player_id: {'ligainsiderId': None, 'team': team_map.get(team_id), 'score': 0.0,
+                           'method': None, 'ambiguous': False}
+               for player_id, team_id, _, _ in players}
+    taken = set(reserved)
+    assigned = set()
+
+    def claim(index):
+        # Bester freier Kandidat, falls er klar vor dem zweitbesten liegt
+        available = [option for option in options[index] if option[1] not in taken]
+        if not available or (len(available) > 1 and available[0][0] - available[1][0] < AMBIGUITY_MARGIN):
+            return None
+        return available[0]
+
+    progress = True
+    while progress:
+        progress = False
+        claims = {index: claim(index) for index in options if index not in assigned}
+        for index, option in sorted(((index, option) for index, option in claims.items() if option),
+                                    key=lambda item: (-item[1][0], players[item[0]][0])):
+            score, ligainsider_id, row = option
+            if ligainsider_id in taken:
+                continue
+            assigned.add(index)
+            taken.add(ligainsider_id)
+            progress = True
+            results[players[index][0]] = {'ligainsiderId': ligainsider_id, 'team': squad_table.teams[row],
+                                          'score': round(score, 3), 'method': methods[index], 'ambiguous': False}
+
+    for index, ranked in options.items():
+        if index in assigned:
+            continue
+        available = [option for option in ranked if option[1] not in taken]
+        entry = results[players[index][0]]
+        entry['ambiguous'] = len(available) > 1
+        entry['candidates'] = [ligainsider_id for _, ligainsider_id, _ in available[:5]]
+    return results
+
+class PlayerMap:
+    """
+    Persistente Zuordnung Kickbase-ID -> ligainsiderId, inkrementell aktualisiert.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or _script_path(PLAYER_MAP_FILE)
+        data = self._load()
+        self.teams = data.get('teams', {})
+        self.players = data.get('players', {})
+        self.input_hash = data.get('inputHash')
+        self.updated_at = data.get('updatedAt')
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != PLAYER_MAP_VERSION:
+            print(f"Zuordnung {self.path}: unbekannte Version {data.get('version')}, wird neu aufgebaut")
+            return {}
+        return data
+
+    def get(self, kickbase_id):
+        entry = self.players.get(str(kickbase_id))
+        return entry.get('ligainsiderId') if entry else None
+
+    def _is_stable(self, entry, squad_table):
+        # Die ligainsiderId gehört zum Spieler, nicht zum Verein: bei einem Wechsel bleibt sie gültig,
+        # auch wenn Kickbase und Ligainsider den Wechsel zu unterschiedlichen Zeitpunkten abbilden
+        return entry.get('method') == MANUAL or entry.get('ligainsiderId') in squad_table.row_by_id
+
+    def update(self, kickbase_players, squads):
+        """
+        Gleicht die Tabelle mit der aktuellen Spielerliste und den Kadern ab; liefert einen Bericht.
+        """
+        started = time.perf_counter()
+        report = {'players': 0, 'kept': 0, 'new': 0, 'changed': 0, 'unresolved': 0, 'ambiguous': 0,
+                  'teams': 0, 'skipped': False}
+        players = [kickbase_player(player) for player in kickbase_players]
+        players = [player for player in players if player[0]]
+        report['players'] = len(players)
+        input_hash = content_hash(json.dumps([players, squads], ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        if input_hash == self.input_hash:
+            report['skipped'] = True
+            report['seconds'] = time.perf_counter() - started
+            return report
+
+        squad_table = SquadTable(squads)
+        self.teams = align_teams(players, squad_table)
+        report['teams'] = len(self.teams)
+
+        open_players = []
+        reserved = set()
+        for player in players:
+            entry = self.players.get(player[0])
+            if entry and self._is_stable(entry, squad_table):
+                report['kept'] += 1
+                ligainsider_id = entry.get('ligainsiderId')
+                if ligainsider_id in squad_table.row_by_id:
+                    reserved.add(ligainsider_id)
+                    # Bei Vereinswechseln wandert das Team mit
+                    entry['team'] = squad_table.teams[squad_table.row_by_id[ligainsider_id]]
+            else:
+                open_players.append(player)
+
+        now = time.time()
+        for player_id, result in resolve(open_players, squad_table, self.teams, reserved).items():
+            previous = self.players.get(player_id)
+            if result['ligainsiderId'] is None:
+                report['unresolved'] += 1
+            elif previous is None or not previous.get('ligainsiderId'):
+                report['new'] += 1
+            elif previous['ligainsiderId'] != result['ligainsiderId']:
+                report['changed'] += 1
+            if result['ambiguous']:
+                report['ambiguous'] += 1
+            same = previous is not None and previous.get('ligainsiderId') == result['ligainsiderId']
+            result['since'] = previous.get('since', now) if same else now
+            self.players[player_id] = result
+
+        self.input_hash = input_hash
+        self.updated_at = now
+        report['seconds'] = time.perf_counter() - started
+        return report
+
+    def save(self):
+        data = {'version': PLAYER_MAP_VERSION, 'updatedAt': self.updated_at, 'inputHash': self.input_hash,
+                'teams': self.teams, 'players': self.players}
+        return write_if_changed(self.path, json.dumps(data, ensure_ascii=False, indent=4, sort_keys=True)
+                                .encode('utf-8'))
+
+def naive_lookup(players, squads):
+    """
+    Referenz: je Spieler ein Filter über alle Kader-Spieler (wie getLigainsiderPlayer), O(n*m).
+    """
+    everyone = [player for team in sorted(squads) for player in squads[team] if player.get('ligainsiderId')]
+    result = {}
+    for player_id, _, first, last in players:
+        surname = (tokens(last) or [""])[-1]
+        hits = [player for player in everyone if surname in tokens(player['ligainsiderId'])]
+        both = [player for player in hits if first and first in tokens(player['ligainsiderId'])]
+        chosen = (both or hits or [None])[0]
+        result[player_id] = chosen['ligainsiderId'] if chosen else None
+    return result
+
+# ---------------------------------------------------------------------------------------------
+# Prüfung mit synthetischen Kadern
+# ---------------------------------------------------------------------------------------------
+
+FIRST_NAMES = ["Lukas", "Jonas", "Leon", "Felix", "Maximilian", "Niklas", "Jan", "Tim", "Paul", "Finn",
+               "Luka", "Mateo", "Ivan", "Marko", "Joško", "Mário", "André", "Dominik", "Kevin", "Florian",
+               "Jérôme", "Nicolás", "Yann", "Kōji", "Mats", "Sören", "Jürgen", "Ömer", "Çağlar", "Benjamin"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz",
+              "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+              "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Krause", "Meier",
+              "Lehmann", "Modrić", "Gvardiol", "Stanišić", "Kovačić", "Pereira Lage", "Dos Santos", "Özcan",
+              "Çalhanoğlu", "Đurić", "Gulácsi", "Nübel", "Kimmich", "Raum", "Sané", "Gnabry", "Wirtz", "Kleindienst",
+              "Baumgartl", "Stiller", "Mittelstädt", "Føllesdal", "Haaland", "Sørloth", "Łukasz", "Żyliński"]
+
+def synthetic_market(seed=0, teams=18, squad_size=30):
+    """
+    Kader im Ligainsider-Schema und die passende Kickbase-Spielerliste mit typischen
+    Abweichungen (nur Nachname, fehlende Akzente, Tippfehler, gleiche Nachnamen im Team).
+    Liefert (squads, kickbase_players, erwartete Zuordnung).
+    """
+    rng = np.random.default_rng(seed)
+    squads, kickbase, expected = {}, [], {}
+    next_id = 10000
+    for team_index in range(teams):
+        team = f"Verein {team_index + 1:02d}"
+        team_id = str(2 + team_index * 3)
+        squads[team] = []
+        surnames = rng.choice(len(LAST_NAMES), size=squad_size, replace=True)
+        for slot in range(squad_size):
+            first = FIRST_NAMES[int(rng.integers(len(FIRST_NAMES)))]
+            last = LAST_NAMES[int(surnames[slot])]
+            # Spieler mit gleichem Vor- und Nachnamen im selben Team gibt es nicht
+            if any(p['name'] == f"{first} {last}" for p in squads[team]):
+                continue
+            next_id += 1
+            slug = normalize(f"{first} {last}").replace(' ', '-')
+            ligainsider_id = f"{slug}_{next_id}"
+            squads[team].append({'name': f"{first} {last}", 'alternative': None, 'ligainsiderId': ligainsider_id,
+                                 'imageUrl': None})
+            kickbase_id = str(next_id * 7 % 100003)
+            variant = rng.random()
+            if variant < 0.1 and len(last) > 5:
+                position = int(rng.integers(1, len(last) - 1))
+                shown = last[:position] + last[position + 1:]          # Tippfehler
+            elif variant < 0.3:
+                shown = normalize(last).title()                        # ohne Akzente
+            else:
+                shown = last
+            player = {'pi': kickbase_id, 'n': shown, 'tid': team_id, 'pos': int(rng.integers(1, 5)), 'p': 0}
+            if rng.random() < 0.5:
+                player['fn'] = first
+            kickbase.append(player)
+            expected[kickbase_id] = ligainsider_id
+    return squads, kickbase, expected
+
+def verify(seed=0, path=None):
+    """
+    Trefferquote gegen die bekannte Zuordnung, Vergleich mit der Einzelsuche und
+    inkrementelle Updates (unverändert, Neuzugang, Wechsel, manuelle Einträge).
+    """
+    import tempfile
+
+    squads, kickbase, expected = synthetic_market(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        table = PlayerMap(path or os.path.join(directory, PLAYER_MAP_FILE))
+        report = table.update(kickbase, squads)
+        correct = sum(1 for kickbase_id, ligainsider_id in expected.items() if table.get(kickbase_id) == ligainsider_id)
+        wrong = sum(1 for kickbase_id, ligainsider_id in expected.items()
+                    if table.get(kickbase_id) not in (None, ligainsider_id))
+        # Ohne Vornamen nicht unterscheidbar: gleicher Nachname mehrfach im selben Kader
+        surnames = {player['ligainsiderId']: (team, normalize(player['name'].split(' ', 1)[1]))
+                    for team, players_ in squads.items() for player in players_}
+        duplicates = {key for key, count in collections.Counter(surnames.values()).items() if count > 1}
+        resolvable = sum(1 for player in kickbase if 'fn' in player or surnames[expected[player['pi']]] not in duplicates)
+        print(f"Batch: {report['players']} Spieler ({resolvable} unterscheidbar), {report['teams']} Teams zugeordnet, "
+              f"{report['seconds'] * 1000:.0f} ms, {correct} richtig, {wrong} falsch, "
+              f"{report['unresolved']} offen, {report['ambiguous']} mehrdeutig")
+
+        players = [kickbase_player(player) for player in kickbase]
+        started = time.perf_counter()
+        naive = naive_lookup(players, squads)
+        naive_seconds = time.perf_counter() - started
+        naive_correct = sum(1 for kickbase_id, ligainsider_id in expected.items() if naive[kickbase_id] == ligainsider_id)
+        print(f"Einzelsuche: {naive_seconds * 1000:.0f} ms, {naive_correct} richtig")
+        ok = wrong == 0 and correct >= 0.97 * resolvable and correct > naive_correct
+        table.save()
+
+        # Unverändert: Fast-Path über den Eingabe-Hash
+        again = PlayerMap(table.path).update(kickbase, squads)
+        ok = ok and again['skipped']
+
+        # Neuzugang, Wechsel und manueller Eintrag
+        table = PlayerMap(table.path)
+        moved = next(player for player in kickbase if table.get(player['pi']) == expected[player['pi']])
+        old_team = next(team for team, players_ in squads.items()
+                        if any(p['ligainsiderId'] == expected[moved['pi']] for p in players_))
+        new_team = next(team for team in sorted(squads) if team != old_team)
+        player = next(p for p in squads[old_team] if p['ligainsiderId'] == expected[moved['pi']])
+        squads[old_team].remove(player)
+        squads[new_team].append(player)
+        moved['tid'] = next(p['tid'] for p in kickbase if table.teams.get(p['tid']) == new_team)
+        squads[new_team].append({'name': "Neuer Zugang", 'alternative': None, 'ligainsiderId': "neuer-zugang_99999",
+                                 'imageUrl': None})
+        kickbase.append({'pi': "99999", 'n': "Zugang", 'fn': "Neuer", 'tid': moved['tid']})
+        manual_id = kickbase[5]['pi']
+        table.players[manual_id] = {'ligainsiderId': "manuell_1", 'team': None, 'score': 1.0, 'method': MANUAL,
+                                    'ambiguous': False}
+        report = table.update(kickbase, squads)
+        ok = (ok and table.get(moved['pi']) == expected[moved['pi']] and table.players[moved['pi']]['team'] == new_team
+              and table.get("99999") == "neuer-zugang_99999" and table.get(manual_id) == "manuell_1"
+              and report['kept'] >= correct - 2)
+        print(f"Inkrementell: {report['kept']} stabil, {report['new']} neu, {report['changed']} geändert, "
+              f"{report['seconds'] * 1000:.0f} ms")
+    print("✅ Zuordnung ok" if ok else "❌ Zuordnung fehlerhaft")
+    return ok
+
+async def fetch_players_async(competition_id, token=None, email=None, password=None):
+    from kickbase_api import KickbaseClient
+
+    async with KickbaseClient(token=token) as api:
+        if email:
+            await api.login(email, password)
+        response = await api.get_competitions_players(competitionId=competition_id)
+    return player_list(response.json() or {})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kickbase-Spieler den Ligainsider-Kadern zuordnen")
+    parser.add_argument('--players', help="Antwort von /v4/competitions/{competitionId}/players (JSON)")
+    parser.add_argument('--squads', default=None, help=f"Ligainsider-Kader (Standard: {SQUADS_FILE})")
+    parser.add_argument('--map', default=None, help=f"Zuordnungstabelle (Standard: {PLAYER_MAP_FILE})")
+    parser.add_argument('--competition', type=int, default=1)
+    parser.add_argument('--token', default=os.environ.get("KICKBASE_TOKEN"))
+    parser.add_argument('--email', default=os.environ.get("KICKBASE_EMAIL"))
+    parser.add_argument('--password', default=os.environ.get("KICKBASE_PASSWORD"))
+    parser.add_argument('--show', metavar='KICKBASE_ID', help="Eintrag eines Spielers anzeigen")
+    parser.add_argument('--unresolved', action='store_true', help="Nicht und mehrdeutig zugeordnete Spieler auflisten")
+    parser.add_argument('--check', action='store_true', help="Prüfung mit synthetischen Kadern")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if verify() else 1)
+
+    table = PlayerMap(args.map)
+    if args.show:
+        entry = table.players.get(args.show)
+        print(json.dumps(entry, ensure_ascii=False, indent=4) if entry else "Nicht zugeordnet")
+        sys.exit(0 if entry and entry.get('ligainsiderId') else 1)
+
+    if args.players:
+        with open(args.players, 'r', encoding='utf-8') as f:
+            kickbase_players = player_list(json.load(f))
+    elif args.token or args.email:
+        kickbase_players = asyncio.run(fetch_players_async(args.competition, args.token, args.email, args.password))
+    else:
+        parser.error("--players, --token/--email oder --check angeben")
+    with open(args.squads or _script_path(SQUADS_FILE), 'r', encoding='utf-8') as f:
+        squads = json.load(f)
+
+    report = table.update(kickbase_players, squads)
+    changed = table.save()
+    if report['skipped']:
+        print("Spielerliste und Kader unverändert, Zuordnung bleibt bestehen.")
+    else:
+        print(f"{report['players']} Spieler, {report['teams']} Teams: {report['kept']} stabil, {report['new']} neu, "
+              f"{report['changed']} geändert, {report['unresolved']} offen, {report['ambiguous']} mehrdeutig "
+              f"({report['seconds'] * 1000:.0f} ms){'' if changed else ', Datei unverändert'}")
+    if args.unresolved:
+        for kickbase_id, entry in sorted(table.players.items()):
+            if not entry.get('ligainsiderId') or entry.get('ambiguous'):
+                print(f"  {kickbase_id}: {entry.get('ligainsiderId') or '-'} ({entry.get('team') or 'Team unbekannt'})")
@@ -1,14 +1,69 @@
 import requests
-from bs4 import BeautifulSoup
+import httpx
+import argparse
+import asyncio
+import contextlib
 import json
 import os
 import sys
-import concurrent.futures
+import time
 import re
 
+import ligainsider_metrics as metrics
+
+from ligainsider_assets import (DEFAULT_ASSET_CONCURRENCY, AssetStore, asset_urls, attach_hashes,
+                                prefetch_assets_async, write_manifest)
+from ligainsider_cache import LineupManifest, ResponseCache, content_hash, write_if_changed
+from ligainsider_feed import EventFeed, describe
+from ligainsider_snapshot import write_binary_outputs
+from ligainsider_index import INDEX_FILE, build_index, serialize_index
+from ligainsider_pipeline import ParseStage, default_workers
+from ligainsider_parser import (EXTRACTOR_VERSION, LineupStream, available_backends, extract_lineup, extract_squad,
+                                extract_team_links, extract_team_logo, lineup_names, set_backend)
+from ligainsider_throttle import RETRY_STATUS, AdaptiveLimiter, request_with_retry, request_with_retry_async
+
+BASE_URL = "https://www.ligainsider.de"
 # Einstiegs-URL: Die Übersicht des aktuellen Spieltags
-OVERVIEW_URL = "https://www.ligainsider.de/bundesliga/spieltage/"
+OVERVIEW_URL = BASE_URL + "/bundesliga/spieltage/"
 OUTPUT_FILE = "ligainsider_lineups.json"
+NDJSON_OUTPUT_FILE = "ligainsider_lineups.ndjson"
+SQUADS_OUTPUT_FILE = "ligainsider_squads.json"
+
+# Kader-Pfade wie in LigainsiderService.swift (teamSquadPaths); nur Fallback, wenn die
+# Übersicht nicht erreichbar ist. Normalerweise werden die Pfade aus den Team-Links abgeleitet.
+TEAM_SQUAD_PATHS = {
+    "FC Bayern München": "/fc-bayern-muenchen/1/kader/",
+    "Borussia Dortmund": "/borussia-dortmund/14/kader/",
+    "RB Leipzig": "/rb-leipzig/43/kader/",
+    "Bayer 04 Leverkusen": "/bayer-04-leverkusen/4/kader/",
+    "VfB Stuttgart": "/vfb-stuttgart/11/kader/",
+    "Eintracht Frankfurt": "/eintracht-frankfurt/5/kader/",
+    "VfL Wolfsburg": "/vfl-wolfsburg/24/kader/",
+    "SC Freiburg": "/sc-freiburg/8/kader/",
+    "1. FC Heidenheim": "/1-fc-heidenheim-1846/1376/kader/",
+    "Werder Bremen": "/werder-bremen/6/kader/",
+    "FC Augsburg": "/fc-augsburg/80/kader/",
+    "TSG Hoffenheim": "/tsg-hoffenheim/30/kader/",
+    "1. FSV Mainz 05": "/1-fsv-mainz-05/16/kader/",
+    "Borussia M'gladbach": "/borussia-moenchengladbach/13/kader/",
+    "1. FC Union Berlin": "/1-fc-union-berlin/62/kader/",
+    "VfL Bochum": "/vfl-bochum/29/kader/",
+    "FC St. Pauli": "/fc-st-pauli/20/kader/",
+    "Holstein Kiel": "/holstein-kiel/321/kader/",
+}
+
+# /bundesliga/team/fc-st-pauli/20/saison-... -> /fc-st-pauli/20/kader/
+TEAM_URL_RE = re.compile(r'/bundesliga/team/([^/]+)/(\d+)/')
+
+# Standardwerte für die Fetch-Engine
+DEFAULT_MAX_CONCURRENCY = 10   # Obergrenze gleichzeitiger Team-Abrufe (adaptiv, siehe AdaptiveLimiter)
+DEFAULT_MAX_CONNECTIONS = 10   # Größe des Keep-Alive Pools
+DEFAULT_TIMEOUT = 10           # Sekunden pro Request
+DEFAULT_DEADLINE = 60          # Sekunden für den gesamten Lauf
+DEFAULT_PARSE_WORKERS = 0      # Prozesse für die Parse-Stufe (0 = im Event-Loop parsen)
+
+# Geteilte Session für synchrone Einzelabrufe (Keep-Alive statt neuem Handshake pro Seite)
+_session = None
 
 def clean_text(text):
     if not text: return ""
@@ -19,169 +74,766 @@ def get_headers():
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
     }
 
-def fetch_team_lineup(team_url):
+def get_session():
+    """
+    Liefert die prozessweit geteilte requests.Session für synchrone Abrufe.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(get_headers())
+    return _session
+
+# Optionaler Ersatz-Transport für alle asynchronen Clients (Aufzeichnen/Wiedergeben, siehe ligainsider_replay.py)
+_transport_factory = None
+
+def set_transport_factory(factory):
+    """
+    factory(limits) liefert den httpx-Transport für jeden neuen Client; None = normales Netzwerk.
+    """
+    global _transport_factory
+    _transport_factory = factory
+
+def create_async_client(max_connections=DEFAULT_MAX_CONNECTIONS, timeout=DEFAULT_TIMEOUT, keepalive_expiry=5.0):
+    """
+    Erzeugt den asynchronen HTTP-Client mit einem gemeinsamen Keep-Alive Verbindungspool.
+    Alle Seiten eines Laufs laufen über diese Verbindungen (ein Handshake pro Verbindung).
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                          keepalive_expiry=keepalive_expiry)
+    transport = _transport_factory(limits) if _transport_factory is not None else None
+    return httpx.AsyncClient(headers=get_headers(), limits=limits, timeout=timeout, follow_redirects=True,
+                             transport=transport)
+
+def parse_team_lineup(html):
+    """
+    Extrahiert die voraussichtliche Aufstellung aus dem HTML einer Team-Detailseite.
+    """
+    return lineup_names(extract_lineup(html))
+
+def parse_match_pairs(html):
+    """
+    Liest die Spielpaarungen (Heim, Gast) aus der Übersichtsseite des Spieltags.
+    """
+    # Finde alle Spielpaarungen auf der Übersichtsseite.
+    # Strategie: Suche nach Links, die '/bundesliga/team/' und '/saison-' enthalten.
+    # Diese treten paarweise auf (Heim, Gast).
+
+    team_links = extract_team_links(html)
+
+    # Wir gruppieren die Links immer in 2er Paaren (Heim vs Gast)
+    # Dies ist eine Heuristik, die davon ausgeht, dass die Links in der Reihenfolge Heim, Gast im HTML stehen.
+
+    match_pairs = []
+    current_pair = []
+
+    for url, text in team_links:
+        if not url.startswith('http'):
+            url = BASE_URL + url
+
+        name = clean_text(text)
+        # Bereinige Namen (manchmal steht "FC Bayern München FC Bayern München" drin wegen hidden text)
+        if len(name) > 40 and name[:len(name)//2].strip() == name[len(name)//2:].strip():
+             name = name[:len(name)//2].strip()
+
+        current_pair.append({'name': name, 'url': url})
+
+        if len(current_pair) == 2:
+            match_pairs.append(current_pair)
+            current_pair = []
+
+    return match_pairs
+
+def parse_team_page(url, body, manifest=None, extract=None):
+    """
+    Parst eine Team-Seite (Standard: in Aufstellungsreihen); unveränderte Seiten (gleicher Hash)
+    übernehmen das Ergebnis aus dem Manifest des letzten Laufs.
+    """
+    extract = extract or extract_lineup
+    if manifest is None:
+        return metrics.timed_extract(extract, url, body)
+
+    body_hash = content_hash(body)
+    result = manifest.lookup(url, body_hash)
+    if result is None:
+        result = metrics.timed_extract(extract, url, body)
+        manifest.update(url, body_hash, result)
+    return result
+
+async def parse_team_page_async(url, body, manifest=None, extract=None, parse_stage=None):
+    """
+    Wie parse_team_page, die Extraktion läuft aber über die Parse-Stufe (Prozess-Pool).
+    Der Hash-Vergleich mit dem Manifest bleibt im Hauptprozess.
+    """
+    if parse_stage is None:
+        return parse_team_page(url, body, manifest, extract)
+
+    extract = extract or extract_lineup
+    body_hash = content_hash(body) if manifest is not None else None
+    if manifest is not None:
+        result = manifest.lookup(url, body_hash)
+        if result is not None:
+            return result
+    result = await parse_stage.run(extract, url, body)
+    if manifest is not None:
+        manifest.update(url, body_hash, result)
+    return result
+
+def build_match(pair, results, logos=None):
+    """
+    Baut den Match-Eintrag einer Paarung aus den geladenen Aufstellungsreihen (Key: URL)
+    und den Wappen der Team-Seiten (Key: URL).
+    """
+    logos = logos or {}
+    home = pair[0]
+    away = pair[1]
+
+    home_lineup = lineup_names(results.get(home['url'], []))
+    away_lineup = lineup_names(results.get(away['url'], []))
+
+    # Fallback falls leer (optional: leere Liste lassen)
+    if not home_lineup: home_lineup = ["Keine Daten"]
+    if not away_lineup: away_lineup = ["Keine Daten"]
+
+    return {
+        "homeTeam": home['name'],
+        "awayTeam": away['name'],
+        "homeLogo": logos.get(home['url']),
+        "awayLogo": logos.get(away['url']),
+        "homeLineup": home_lineup,
+        "awayLineup": away_lineup,
+        "url": home['url'] # Link zur Heimseite als Referenz
+    }
+
+def build_matches(match_pairs, results, logos=None):
+    """
+    Baut aus den Paarungen und den geladenen Aufstellungsreihen (Key: URL) die Match-Liste.
+    """
+    return [build_match(pair, results, logos) for pair in match_pairs]
+
+def get_output_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, OUTPUT_FILE)
+
+def save_matches(matches, binary=False):
+    """
+    Speichert die Matches als JSON. Die Datei wird nur (atomar) neu geschrieben,
+    wenn sich der Inhalt geändert hat; Rückgabe: (Pfad, geändert).
+    Mit binary zusätzlich als kompakter Snapshot plus Patch zum vorherigen Stand (Mobile-Sync).
+    """
+    file_path = get_output_path()
+
+    with metrics.stage("serialize"):
+        data = json.dumps(matches, ensure_ascii=False, indent=4).encode('utf-8')
+    with metrics.stage("write"):
+        changed = write_if_changed(file_path, data)
+        if binary:
+            write_binary_outputs(matches, file_path, "lineups")
+
+    return file_path, changed
+
+def fetch_page(url, cache=None, deadline_at=None):
+    """
+    Lädt eine Seite synchron; mit Cache wird bedingt angefragt bzw. innerhalb der TTL gar nicht.
+    429/5xx und Verbindungsfehler werden mit Backoff wiederholt, solange das Zeitbudget reicht.
+    """
+    session = get_session()
+    if cache is None:
+        response = request_with_retry(lambda: session.get(url, timeout=DEFAULT_TIMEOUT), deadline_at)
+        response.raise_for_status()
+        return response.content
+
+    body, fresh = cache.lookup(url)
+    if body is not None and fresh:
+        return body
+
+    headers = cache.conditional_headers(url)
+    response = request_with_retry(lambda: session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT), deadline_at)
+    if response.status_code == 304 and body is not None:
+        cache.revalidated(url, response.headers)
+        return body
+    response.raise_for_status()
+    cache.store(url, response.content, response.headers)
+    return response.content
+
+def _record_cache(result):
+    run = metrics.current()
+    if run is not None:
+        run.record_cache(result)
+
+def _record_error(url, error):
+    run = metrics.current()
+    if run is not None:
+        run.record_error(url, error)
+
+async def fetch_page_async(client, url, cache=None, limiter=None, deadline_at=None):
+    """
+    Asynchrone Variante von fetch_page über den geteilten Client. Nur echte Netzwerk-Requests
+    belegen einen Platz im Limiter; Treffer im Cache gehen daran vorbei.
+    """
+    if cache is None:
+        response = await request_with_retry_async(lambda: metrics.timed_get(client, url), limiter, deadline_at)
+        response.raise_for_status()
+        return response.content
+
+    body, fresh = cache.lookup(url)
+    if body is not None and fresh:
+        _record_cache("fresh")
+        return body
+
+    headers = cache.conditional_headers(url)
+    response = await request_with_retry_async(lambda: metrics.timed_get(client, url, headers),
+                                              limiter, deadline_at)
+    if response.status_code == 304 and body is not None:
+        cache.revalidated(url, response.headers)
+        _record_cache("revalidated")
+        return body
+    response.raise_for_status()
+    cache.store(url, response.content, response.headers)
+    _record_cache("stored")
+    return response.content
+
+async def fetch_lineup_stream_async(client, url, limiter=None, deadline_at=None):
+    """
+    Lädt eine Team-Seite gestreamt und parst die Aufstellung während des Downloads (LineupStream).
+    Sobald die Legende unter der Aufstellung gelesen ist, wird die Verbindung geschlossen; der Rest
+    der Seite wird nicht übertragen. Ohne Cache: ein Teil-Body taugt nicht als Cache-Eintrag.
+    Liefert den abgeschlossenen LineupStream (rows, logo, head, bytes_read).
+    """
+    async def send():
+        response = await client.send(client.build_request("GET", url), stream=True)
+        if response.status_code in RETRY_STATUS:
+            # Wird wiederholt: Verbindung freigeben, Header (Retry-After) bleiben lesbar
+            await response.aclose()
+        return response
+
+    started = time.perf_counter()
+    response = await request_with_retry_async(send, limiter, deadline_at)
+    lineup = LineupStream()
+    parse_seconds = 0.0
+    try:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            parse_started = time.perf_counter()
+            done = lineup.feed(chunk)
+            parse_seconds += time.perf_counter() - parse_started
+            if done:
+                break
+    finally:
+        await response.aclose()
+    parse_started = time.perf_counter()
+    lineup.close()
+    parse_seconds += time.perf_counter() - parse_started
+
+    run = metrics.current()
+    if run is not None:
+        run.record_request(url, response.status_code, lineup.bytes_read,
+                           metrics.request_phases({}, time.perf_counter() - started))
+        run.record_page(url, parse_seconds, 0.0)
+    return lineup
+
+def get_index_path():
+    return os.path.join(os.path.dirname(get_output_path()), INDEX_FILE)
+
+def update_index(players=()):
+    """
+    Schreibt den Namens-Index (ligainsider_index.json) neben die Ausgabe. Grundlage sind die
+    zuletzt geladenen Kader plus die übergebenen Spieler (z.B. aus den Aufstellungen).
+    """
+    all_players = []
+    try:
+        with open(get_squads_output_path(), 'r', encoding='utf-8') as f:
+            for squad in json.load(f).values():
+                all_players.extend(squad)
+    except (OSError, ValueError):
+        pass
+    all_players.extend(players)
+    if not all_players:
+        return False
+    return write_if_changed(get_index_path(), serialize_index(build_index(all_players)))
+
+async def prefetch_images_async(client, matches=(), squads=None, players=(), deadline=DEFAULT_DEADLINE,
+                                thumbnail_size=None, max_concurrency=DEFAULT_ASSET_CONCURRENCY):
+    """
+    Lädt Wappen und Spielerfotos in den inhaltsadressierten Store und schreibt das Asset-Manifest
+    des Modus (Kader oder Aufstellungen). Liefert URL -> Hash; die Hashes kommen erst beim
+    Schreiben der Ausgabe dazu (attach_hashes), die geparsten Zeilen bleiben unverändert.
+    """
+    store = AssetStore()
+    try:
+        mapping = await prefetch_assets_async(client, asset_urls(matches, squads, players), store,
+                                              max_concurrency, deadline, thumbnail_size)
+        with metrics.stage("write"):
+            write_manifest(store, set(mapping.values()), kind='squads' if squads is not None else 'lineups')
+    finally:
+        store.save()
+    return mapping
+
+def publish_events(team_rows, feed=None):
+    """
+    Vergleicht die Aufstellungen mit dem letzten Stand und hängt die Änderungen an das Ereignis-Log.
+    """
+    feed = feed or EventFeed()
+    new_events = feed.update(team_rows)
+    for event in new_events:
+        print(f"Änderung #{event['id']}: {describe(event)}")
+    if not new_events:
+        print("Keine Änderungen an den Aufstellungen.")
+    return new_events
+
+def fetch_team_lineup(team_url, cache=None):
     """
     Besucht die Team-Detailseite eines Spiels und extrahiert die voraussichtliche Aufstellung.
     """
     print(f"Lade Aufstellung von: {team_url}")
     try:
-        response = requests.get(team_url, headers=get_headers(), timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        players = []
-        
-        # Suche nach dem Bereich "Voraussichtliche Aufstellung"
-        # Die Struktur ist oft: H2 Header -> DIV Container -> Spieler Links
-        # Wir suchen nach Links, die auf ein Spielerprofil verweisen und im Content-Bereich liegen.
-        
-        # Strategie: Suche nach dem Header und nimm die nachfolgenden Spielernamen
-        headers = soup.find_all(string=re.compile("VORAUSSICHTLICHE AUFSTELLUNG"))
-        
-        for header in headers:
-            # Wir suchen den Container, der diesen Header enthält
-            container = header.find_parent('div') or header.find_parent('section')
-            if not container: continue
-            
-            # Manchmal ist der Container höher im Baum
-            lineup_box = container.find_parent('div', class_='content_box') or container.find_parent('div')
-            
-            if lineup_box:
-                # Sammle alle Links zu Spielern in diesem Bereich
-                # Ligainsider Spieler Links haben format: /vorname-nachname_id/
-                player_links = lineup_box.find_all('a', href=re.compile(r'/[a-zA-Z0-9-]+_\d+/'))
-                
-                # Filter: Wir wollen nur die ersten 11 eindeutigen Spieler
-                # Oft werden Ersatzspieler oder verletzte auch gelistet, aber die S11 steht meist als Block oben oder grafisch.
-                # Ein starkes Indiz ist oft, dass S11 Spieler fett gedruckt sind oder in einer Aufstellungsgrafik stehen.
-                # Vereinfacht nehmen wir die ersten 11 gefundenen Namen im relevanten Bereich.
-                
-                start_eleven_candidates = []
-                seen = set()
-                
-                for link in player_links:
-                    name = clean_text(link.text)
-                    if not name or name in seen: continue
-                    
-                    # Ignoriere Links, die "News" oder ähnliches im Text haben, falls falsch gematcht
-                    if len(name) < 3: continue 
-                    
-                    seen.add(name)
-                    start_eleven_candidates.append(name)
-                    
-                    if len(start_eleven_candidates) >= 11:
-                        break
-                
-                if start_eleven_candidates:
-                    players = start_eleven_candidates
-                    break # Gefunden
-        
-        return players
+        return parse_team_lineup(fetch_page(team_url, cache))
 
     except Exception as e:
         print(f"Fehler bei {team_url}: {e}")
         return []
 
-def fetch_lineups():
+async def fetch_team_async(client, team_url, limiter, cache=None, manifest=None, deadline_at=None,
+                           parse_stage=None, stream=False):
+    """
+    Lädt eine Team-Seite über den geteilten Client und liefert (Aufstellungsreihen, Wappen-URL).
+    Der Limiter begrenzt die Anzahl gleichzeitiger Abrufe und passt sie an die Antwortzeiten an.
+    Mit stream=True wird nur bis zum Ende der Aufstellung gelesen (ohne Cache und Manifest).
+    """
+    print(f"Lade Aufstellung von: {team_url}")
+    try:
+        if stream:
+            lineup = await fetch_lineup_stream_async(client, team_url, limiter, deadline_at)
+            return lineup.rows, lineup.logo
+        body = await fetch_page_async(client, team_url, cache, limiter, deadline_at)
+        rows = await parse_team_page_async(team_url, body, manifest, parse_stage=parse_stage)
+        # Das Wappen ist ein einzelner String-Scan und braucht weder Parser noch Manifest
+        return rows, extract_team_logo(body)
+
+    except Exception as e:
+        print(f"Fehler bei {team_url}: {e}")
+        _record_error(team_url, e)
+        return [], None
+
+def _record_limiter(limiter, elapsed):
+    run = metrics.current()
+    if run is not None:
+        run.add_stage("fetch", elapsed)
+        run.set_gauge("concurrency_limit", int(limiter.limit))
+        run.set_gauge("throttle_decreases", limiter.decreases)
+        run.set_gauge("retries", limiter.retries)
+
+async def _stream_indexed_matches(client, max_concurrency, deadline, cache, manifest, players=None,
+                                  parse_stage=None, stream=False, team_rows=None):
+    """
+    Liefert (Index der Paarung, Match) in der Reihenfolge, in der beide Team-Seiten fertig sind.
+    Teams, die bis zur Deadline nicht geladen sind, werden abgebrochen und als leer gewertet.
+    Ist players eine Liste, werden alle Spieler der Aufstellungen dort gesammelt, ist team_rows
+    ein dict, die Aufstellungsreihen pro Teamname (für den Änderungs-Feed).
+    """
+    started = time.monotonic()
+    deadline_at = started + deadline
+
+    with metrics.stage("overview"):
+        overview = await asyncio.wait_for(fetch_page_async(client, OVERVIEW_URL, cache, deadline_at=deadline_at),
+                                          timeout=deadline)
+        match_pairs = parse_match_pairs(overview)
+
+    print(f"Gefundene Spiele: {len(match_pairs)}")
+
+    # Alle Team-Seiten gleichzeitig laden, begrenzt durch den adaptiven Limiter
+    limiter = AdaptiveLimiter(max_concurrency)
+    tasks = {}
+    for pair in match_pairs:
+        for team in pair:
+            if team['url'] not in tasks:
+                tasks[team['url']] = asyncio.create_task(
+                    fetch_team_async(client, team['url'], limiter, cache, manifest, deadline_at, parse_stage, stream))
+    task_urls = {task: url for url, task in tasks.items()}
+    team_names = {team['url']: team['name'] for pair in match_pairs for team in pair}
+
+    results = {} # Key: URL, Value: Aufstellungsreihen
+    logos = {}   # Key: URL, Value: Wappen-URL
+    open_pairs = dict(enumerate(match_pairs))
+    pending = set(tasks.values())
+    try:
+        while pending:
+            remaining = max(0.0, deadline - (time.monotonic() - started))
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"Deadline erreicht: {len(pending)} Team-Seiten abgebrochen")
+                break
+
+            for task in done:
+                rows, logo = task.result() if task.exception() is None else ([], None)
+                results[task_urls[task]] = rows
+                logos[task_urls[task]] = logo
+                if players is not None:
+                    players.extend(player for row in rows for player in row)
+                if team_rows is not None:
+                    team_rows[team_names[task_urls[task]]] = rows
+
+            # Paarungen ausgeben, sobald Heim und Gast vorliegen
+            for index, pair in list(open_pairs.items()):
+                if all(team['url'] in results for team in pair):
+                    del open_pairs[index]
+                    match = build_match(pair, results, logos)
+                    # Ausgegebene Aufstellungen nicht weiter im Speicher halten
+                    for team in pair:
+                        if not any(team in other for other in open_pairs.values()):
+                            results.pop(team['url'], None)
+                            logos.pop(team['url'], None)
+                    yield index, match
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    print(limiter.summary())
+    _record_limiter(limiter, time.monotonic() - started)
+
+    # Nach der Deadline: restliche Paarungen mit dem, was vorliegt
+    for index, pair in open_pairs.items():
+        yield index, build_match(pair, results, logos)
+
+    if manifest is not None:
+        manifest.prune(tasks, TEAM_URL_RE)
+
+async def stream_matches_async(client, max_concurrency=DEFAULT_MAX_CONCURRENCY, deadline=DEFAULT_DEADLINE,
+                               cache=None, manifest=None, parse_stage=None, stream=False):
+    """
+    Async-Generator: liefert jedes Match, sobald Heim- und Gast-Aufstellung geparst sind.
+    """
+    async for _, match in _stream_indexed_matches(client, max_concurrency, deadline, cache, manifest,
+                                                  parse_stage=parse_stage, stream=stream):
+        yield match
+
+async def scrape_matches_async(client, max_concurrency=DEFAULT_MAX_CONCURRENCY, deadline=DEFAULT_DEADLINE,
+                               cache=None, manifest=None, players=None, parse_stage=None, stream=False,
+                               team_rows=None):
+    """
+    Lädt Übersicht und alle Team-Seiten über den übergebenen Client und liefert die Match-Liste
+    in der Reihenfolge der Übersichtsseite.
+    """
+    indexed = [item async for item in _stream_indexed_matches(client, max_concurrency, deadline, cache, manifest,
+                                                              players, parse_stage, stream, team_rows)]
+    return [match for _, match in sorted(indexed, key=lambda item: item[0])]
+
+async def iter_matches_async(max_concurrency=DEFAULT_MAX_CONCURRENCY, max_connections=DEFAULT_MAX_CONNECTIONS,
+                             timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE, use_cache=True,
+                             parse_workers=DEFAULT_PARSE_WORKERS, stream=False):
+    """
+    Wie stream_matches_async, verwaltet Client, Cache, Manifest und Parse-Stufe aber selbst.
+    """
+    cache = ResponseCache() if use_cache else None
+    manifest = LineupManifest(version=EXTRACTOR_VERSION) if use_cache else None
+    try:
+        with ParseStage(parse_workers) as parse_stage:
+            async with create_async_client(max_connections=max_connections, timeout=timeout) as client:
+                async for match in stream_matches_async(client, max_concurrency=max_concurrency, deadline=deadline,
+                                                        cache=cache, manifest=manifest, parse_stage=parse_stage,
+                                                        stream=stream):
+                    yield match
+    finally:
+        if cache is not None:
+            cache.save()
+        if manifest is not None:
+            manifest.save()
+
+def iter_matches(**kwargs):
+    """
+    Synchroner Generator für In-Process-Konsumenten; liefert dieselben Einträge wie
+    ligainsider_lineups.json, aber jedes Match sofort, sobald es vollständig ist.
+    """
+    loop = asyncio.new_event_loop()
+    matches = iter_matches_async(**kwargs)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(matches.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(matches.aclose())
+        loop.close()
+
+async def fetch_lineups_async(max_concurrency=DEFAULT_MAX_CONCURRENCY, max_connections=DEFAULT_MAX_CONNECTIONS,
+                              timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE, use_cache=True,
+                              parse_workers=DEFAULT_PARSE_WORKERS, assets=False, thumbnail_size=None, stream=False,
+                              events=False, binary=False):
     print(f"Starte Abruf des Spieltags von {OVERVIEW_URL}...")
-    
+
+    cache = ResponseCache() if use_cache else None
+    manifest = LineupManifest(version=EXTRACTOR_VERSION) if use_cache else None
+    players = []
+    team_rows = {} if events else None
     try:
-        response = requests.get(OVERVIEW_URL, headers=get_headers())
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        matches = []
-        
-        # Finde alle Spielpaarungen auf der Übersichtsseite.
-        # Strategie: Suche nach Links, die '/bundesliga/team/' und '/saison-' enthalten.
-        # Diese treten paarweise auf (Heim, Gast).
-        
-        team_links = soup.find_all('a', href=re.compile(r'/bundesliga/team/.*/saison-'))
-        
-        # Wir gruppieren die Links immer in 2er Paaren (Heim vs Gast)
-        # Dies ist eine Heuristik, die davon ausgeht, dass die Links in der Reihenfolge Heim, Gast im HTML stehen.
-        
-        match_pairs = []
-        current_pair = []
-        
-        for link in team_links:
-            url = link['href']
-            if not url.startswith('http'):
-                url = "https://www.ligainsider.de" + url
-            
-            name = clean_text(link.text)
-            # Bereinige Namen (manchmal steht "FC Bayern München FC Bayern München" drin wegen hidden text)
-            if len(name) > 40 and name[:len(name)//2].strip() == name[len(name)//2:].strip():
-                 name = name[:len(name)//2].strip()
-
-            current_pair.append({'name': name, 'url': url})
-            
-            if len(current_pair) == 2:
-                match_pairs.append(current_pair)
-                current_pair = []
-
-        print(f"Gefundene Spiele: {len(match_pairs)}")
-
-        # Parallelisierung: Wir laden alle Team-Seiten gleichzeitig
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Erstelle Liste von Aufgaben
-            future_to_team = {}
-            for pair in match_pairs:
-                home = pair[0]
-                away = pair[1]
-                
-                # Starte Task für Heim
-                future_home = executor.submit(fetch_team_lineup, home['url'])
-                future_to_team[future_home] = (home, 'home')
-                
-                # Starte Task für Gast
-                future_away = executor.submit(fetch_team_lineup, away['url'])
-                future_to_team[future_away] = (away, 'away')
-            
-            # Ergebnisse sammeln
-            results = {} # Key: URL, Value: Lineup List
-            for future in concurrent.futures.as_completed(future_to_team):
-                team_info, side = future_to_team[future]
-                try:
-                    lineup = future.result()
-                    results[team_info['url']] = lineup
-                except Exception as exc:
-                    print(f"Task generated an exception: {exc}")
-                    results[team_info['url']] = []
-
-        # Matches zusammenbauen
-        for pair in match_pairs:
-            home = pair[0]
-            away = pair[1]
-            
-            home_lineup = results.get(home['url'], [])
-            away_lineup = results.get(away['url'], [])
-            
-            # Fallback falls leer (optional: leere Liste lassen)
-            if not home_lineup: home_lineup = ["Keine Daten"]
-            if not away_lineup: away_lineup = ["Keine Daten"]
-
-            matches.append({
-                "homeTeam": home['name'],
-                "awayTeam": away['name'],
-                "homeLineup": home_lineup,
-                "awayLineup": away_lineup,
-                "url": home['url'] # Link zur Heimseite als Referenz
-            })
+        with ParseStage(parse_workers) as parse_stage:
+            async with create_async_client(max_connections=max_connections, timeout=timeout) as client:
+                matches = await scrape_matches_async(client, max_concurrency=max_concurrency, deadline=deadline,
+                                                     cache=cache, manifest=manifest, players=players,
+                                                     parse_stage=parse_stage, stream=stream, team_rows=team_rows)
+                if assets:
+                    hashes = await prefetch_images_async(client, matches, players=players, deadline=deadline,
+                                                         thumbnail_size=thumbnail_size)
+                    matches, _, players = attach_hashes(hashes, matches, players=players)
 
         # JSON speichern
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(script_dir, OUTPUT_FILE)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(matches, f, ensure_ascii=False, indent=4)
-            
-        print(f"Erfolgreich {len(matches)} Spiele gespeichert in {file_path}.")
+        file_path, changed = save_matches(matches, binary=binary)
+        with metrics.stage("index"):
+            update_index(players)
+        if events:
+            publish_events(team_rows)
+
+        if changed:
+            print(f"Erfolgreich {len(matches)} Spiele gespeichert in {file_path}.")
+        else:
+            print(f"Keine Änderungen, {file_path} bleibt unverändert.")
         return True
 
     except Exception as e:
-        print(f"Haupt-Fehler: {e}")
+        print(f"Haupt-Fehler: {e!r}")
         return False
 
+    finally:
+        if cache is not None:
+            cache.save()
+        if manifest is not None:
+            manifest.save()
+
+def fetch_lineups(**kwargs):
+    """
+    Synchroner Einstiegspunkt (z.B. für cron); läuft über die asynchrone Engine.
+    """
+    return asyncio.run(fetch_lineups_async(**kwargs))
+
+def squad_path_for(team_url):
+    """
+    Leitet den Kader-Pfad aus dem Team-Link der Übersicht ab.
+    """
+    match = TEAM_URL_RE.search(team_url)
+    if not match:
+        return None
+    return f"/{match.group(1)}/{match.group(2)}/kader/"
+
+async def fetch_squad_async(client, path, team_name, limiter, cache=None, manifest=None, deadline_at=None,
+                            parse_stage=None):
+    """
+    Lädt die Kader-Seite eines Teams und liefert alle Spieler im LigainsiderPlayer-Schema.
+    """
+    url = BASE_URL + path
+    print(f"Lade Kader von: {url}")
+    try:
+        body = await fetch_page_async(client, url, cache, limiter, deadline_at)
+        return await parse_team_page_async(url, body, manifest, extract_squad, parse_stage)
+
+    except Exception as e:
+        print(f"Fehler Kader {team_name}: {e}")
+        _record_error(url, e)
+        return []
+
+async def get_squad_paths_async(client, cache=None, deadline_at=None):
+    """
+    Kader-Pfade aller Teams des aktuellen Spieltags (Name -> Pfad), sonst TEAM_SQUAD_PATHS.
+    """
+    try:
+        overview = await fetch_page_async(client, OVERVIEW_URL, cache, deadline_at=deadline_at)
+        paths = {}
+        for pair in parse_match_pairs(overview):
+            for team in pair:
+                path = squad_path_for(team['url'])
+                if path:
+                    paths[team['name']] = path
+        if paths:
+            return paths
+    except Exception as e:
+        print(f"Übersicht nicht verfügbar ({e}), nutze bekannte Kader-Pfade")
+    return dict(TEAM_SQUAD_PATHS)
+
+async def scrape_squads_async(client, max_concurrency=DEFAULT_MAX_CONCURRENCY, deadline=DEFAULT_DEADLINE,
+                              cache=None, manifest=None, parse_stage=None):
+    """
+    Lädt alle Kader gleichzeitig (wie fetchAllSquadsAsync) und liefert Teamname -> Spielerliste.
+    """
+    started = time.monotonic()
+    deadline_at = started + deadline
+    squad_paths = await asyncio.wait_for(get_squad_paths_async(client, cache, deadline_at), timeout=deadline)
+
+    limiter = AdaptiveLimiter(max_concurrency)
+    tasks = {name: asyncio.create_task(
+                 fetch_squad_async(client, path, name, limiter, cache, manifest, deadline_at, parse_stage))
+             for name, path in squad_paths.items()}
+
+    remaining = max(0.0, deadline - (time.monotonic() - started))
+    squads = {}
+    if tasks:
+        done, pending = await asyncio.wait(tasks.values(), timeout=remaining)
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"Deadline erreicht: {len(pending)} Kader-Seiten abgebrochen")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for name, task in tasks.items():
+            squads[name] = task.result() if task in done and task.exception() is None else []
+        print(limiter.summary())
+        _record_limiter(limiter, time.monotonic() - started)
+
+    return squads
+
+def get_squads_output_path():
+    return os.path.join(os.path.dirname(get_output_path()), SQUADS_OUTPUT_FILE)
+
+async def fetch_squads_async(max_concurrency=DEFAULT_MAX_CONCURRENCY, max_connections=DEFAULT_MAX_CONNECTIONS,
+                             timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE, use_cache=True,
+                             parse_workers=DEFAULT_PARSE_WORKERS, assets=False, thumbnail_size=None, binary=False):
+    """
+    Kader-Modus: schreibt alle Kader nach SQUADS_OUTPUT_FILE (Teamname -> [LigainsiderPlayer]).
+    """
+    print("Starte Kader-Abruf für alle Teams...")
+
+    cache = ResponseCache() if use_cache else None
+    manifest = LineupManifest(version=EXTRACTOR_VERSION) if use_cache else None
+    try:
+        with ParseStage(parse_workers) as parse_stage:
+            async with create_async_client(max_connections=max_connections, timeout=timeout) as client:
+                squads = await scrape_squads_async(client, max_concurrency=max_concurrency, deadline=deadline,
+                                                   cache=cache, manifest=manifest, parse_stage=parse_stage)
+                if assets:
+                    hashes = await prefetch_images_async(client, squads=squads, deadline=deadline,
+                                                         thumbnail_size=thumbnail_size)
+                    _, squads, _ = attach_hashes(hashes, squads=squads)
+
+        file_path = get_squads_output_path()
+        with metrics.stage("serialize"):
+            data = json.dumps(squads, ensure_ascii=False, indent=4).encode('utf-8')
+        player_count = sum(len(players) for players in squads.values())
+        with metrics.stage("write"):
+            changed = write_if_changed(file_path, data)
+            if binary:
+                write_binary_outputs(squads, file_path, "squads")
+        if changed:
+            print(f"Kader-Abruf beendet. {player_count} Spieler gespeichert in {file_path}.")
+        else:
+            print(f"Kader-Abruf beendet. Keine Änderungen, {file_path} bleibt unverändert.")
+        with metrics.stage("index"):
+            update_index()
+        return True
+
+    except Exception as e:
+        print(f"Haupt-Fehler: {e!r}")
+        return False
+
+    finally:
+        if cache is not None:
+            cache.save()
+        if manifest is not None:
+            manifest.save()
+
+def fetch_squads(**kwargs):
+    return asyncio.run(fetch_squads_async(**kwargs))
+
+def get_ndjson_output_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, NDJSON_OUTPUT_FILE)
+
+async def write_ndjson_async(out, **kwargs):
+    """
+    Schreibt eine kompakte JSON-Zeile pro Match, sobald das Match vollständig ist.
+    """
+    count = 0
+    async for match in iter_matches_async(**kwargs):
+        out.write(json.dumps(match, ensure_ascii=False, separators=(',', ':')) + "\n")
+        out.flush()
+        count += 1
+    return count
+
+async def fetch_lineups_ndjson_async(path=None, **kwargs):
+    """
+    Streaming-Modus: NDJSON nach path ('-' = stdout, Standard: NDJSON_OUTPUT_FILE).
+    Bei stdout laufen die Fortschrittsmeldungen über stderr.
+    """
+    print(f"Starte Abruf des Spieltags von {OVERVIEW_URL}...", file=sys.stderr)
+    try:
+        if path == '-':
+            out = sys.stdout
+            with contextlib.redirect_stdout(sys.stderr):
+                count = await write_ndjson_async(out, **kwargs)
+        else:
+            path = path or get_ndjson_output_path()
+            with open(path, 'w', encoding='utf-8') as out:
+                count = await write_ndjson_async(out, **kwargs)
+        print(f"Erfolgreich {count} Spiele gestreamt.", file=sys.stderr)
+        return True
+
+    except Exception as e:
+        print(f"Haupt-Fehler: {e!r}", file=sys.stderr)
+        return False
+
+def fetch_lineups_ndjson(path=None, **kwargs):
+    return asyncio.run(fetch_lineups_ndjson_async(path, **kwargs))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lädt die voraussichtlichen Aufstellungen von ligainsider.de")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Obergrenze gleichzeitiger Team-Abrufe (wird je nach Antwortzeiten angepasst)")
+    parser.add_argument('--connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help="Maximale Anzahl offener Verbindungen im Pool")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help="Timeout pro Request in Sekunden")
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                        help="Zeitlimit für den gesamten Lauf inkl. Wiederholungen in Sekunden")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="HTTP-Cache und Parse-Manifest auf der Platte nicht verwenden")
+    parser.add_argument('--parser', choices=available_backends(), default=None,
+                        help="HTML-Parser (Standard: schnellster installierter)")
+    parser.add_argument('--ndjson', nargs='?', const='', default=None, metavar='PFAD',
+                        help="Matches als NDJSON streamen ('-' = stdout, ohne Pfad: ligainsider_lineups.ndjson)")
+    parser.add_argument('--squads', action='store_true',
+                        help="Alle Kader laden und nach ligainsider_squads.json schreiben")
+    parser.add_argument('--parse-workers', type=int, nargs='?', const=default_workers(),
+                        default=DEFAULT_PARSE_WORKERS, metavar='N',
+                        help="Seiten in N Prozessen parsen (ohne N: alle Kerne, 0 = im Event-Loop)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Team-Seiten nur bis zum Ende der Aufstellung laden und dabei parsen (ohne Cache)")
+    parser.add_argument('--events', action='store_true',
+                        help="Änderungen pro Spieler gegenüber dem letzten Lauf an ligainsider_events.ndjson anhängen")
+    parser.add_argument('--assets', action='store_true',
+                        help="Wappen und Spielerfotos inhaltsadressiert cachen und Hashes in die Ausgabe schreiben")
+    parser.add_argument('--thumbnail', type=int, default=None, metavar='PX',
+                        help="Mit --assets zusätzlich Vorschaubilder mit max. PX Pixeln erzeugen (Pillow)")
+    parser.add_argument('--binary', action='store_true',
+                        help="Zusätzlich kompakten Binär-Snapshot (.bin) und Delta-Patch (.patch) für die Apps schreiben")
+    parser.add_argument('--metrics-json', metavar='PFAD',
+                        help="Zeitmessung pro Stufe und URL als JSON-Report schreiben")
+    parser.add_argument('--metrics-prom', metavar='PFAD',
+                        help="Messwerte als Prometheus-Textfile schreiben (z.B. .../textfile/ligainsider.prom)")
+    parser.add_argument('--profile', metavar='PFAD', help="Lauf mit cProfile messen und Statistiken speichern")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    fetch_lineups()
+    args = parse_args()
+    set_backend(args.parser)
+    options = dict(max_concurrency=args.concurrency, max_connections=args.connections,
+                   timeout=args.timeout, deadline=args.deadline, use_cache=not args.no_cache,
+                   parse_workers=args.parse_workers)
+    if args.metrics_json or args.metrics_prom:
+        metrics.start_run("squads" if args.squads else "lineups")
+    with metrics.profiled(args.profile):
+        asset_options = dict(assets=args.assets, thumbnail_size=args.thumbnail, binary=args.binary)
+        if args.squads:
+            ok = fetch_squads(**options, **asset_options)
+        elif args.ndjson is not None:
+            ok = fetch_lineups_ndjson(args.ndjson or None, **options, stream=args.stream)
+        else:
+            ok = fetch_lineups(**options, **asset_options, stream=args.stream, events=args.events)
+    run = metrics.stop_run()
+    if run is not None:
+        run.set_gauge("success", int(ok))
+        if args.metrics_json:
+            metrics.write_report(run, args.metrics_json)
+        if args.metrics_prom:
+            metrics.write_prometheus(run, args.metrics_prom)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,569 @@
+"""
+Kompaktes Binärformat für Aufstellungen und Kader (Sync zu den Apps) plus Delta-Patches.
+
+Aufbau einer Datei:
+
+    4 Bytes Magic (b"LISN" Snapshot, b"LIPT" Patch) | 1 Byte Schema-Version | 1 Byte Kompression
+    | komprimierter msgpack-Payload
+
+Aufstellungen und Kader haben ein festes, positionales Schema pro Inhalt (LINEUP_FIELDS,
+SQUAD_FIELDS): Feldnamen stehen nicht in der Datei, jedes Feld ist eine Spalte über alle
+Datensätze. Jeder String (Teamnamen, Spielernamen, IDs, URLs) steht genau einmal in einer
+String-Tabelle; die Spalten sind eine typisierte Index-Spalte darauf (ein Byte pro Wert bis 255
+Strings). Was nicht ins Schema passt, wird unverändert als msgpack abgelegt.
+Kompression: zstd, wenn das Paket zstandard installiert ist, sonst Deflate ohne gzip-Rahmen.
+
+Ein Patch beschreibt die Änderungen gegenüber dem vorherigen Snapshot als Liste von Operationen
+(setzen, löschen, anhängen, kürzen) auf Pfaden im Datenbaum. base/target sind Hashes des
+kanonischen JSON, ein Client wendet den Patch nur auf genau den Stand an, den er hat.
+JSON bleibt als kompatible Ausgabe daneben bestehen.
+
+    python ligainsider_scraper.py --binary       # schreibt zusätzlich .bin und .patch
+    python ligainsider_snapshot.py info ligainsider_lineups.bin
+    python ligainsider_snapshot.py --check
+"""
+import argparse
+import array
+import gzip
+import hashlib
+import itertools
+import json
+import operator
+import os
+import sys
+import time
+import zlib
+
+import msgpack
+
+from ligainsider_cache import write_if_changed
+
+# zstd ist optional; Deflate (zlib) ist immer verfügbar
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SNAPSHOT_MAGIC = b"LISN"
+PATCH_MAGIC = b"LIPT"
+# 2: positionale Schemas statt String-Tabelle über den ganzen Datenbaum
+SCHEMA_VERSION = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_DEFLATE = 3
+
+# Patch-Operationen
+OP_SET = 0
+OP_DELETE = 1
+OP_APPEND = 2
+OP_TRUNCATE = 3
+
+ZSTD_LEVEL = 19
+
+class SnapshotError(ValueError):
+    pass
+
+def default_compression():
+    return COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_DEFLATE
+
+def _compress(data, compression):
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SnapshotError("zstandard nicht installiert")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if compression == COMPRESSION_DEFLATE:
+        # Rohes Deflate: spart die 18 Bytes gzip-Kopf und -Prüfsumme (die Datei hat eigenen Kopf + Hash)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+    if compression == COMPRESSION_GZIP:
+        # mtime=0: gleicher Inhalt ergibt dieselben Bytes (write_if_changed greift)
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return data
+
+def _decompress(data, compression):
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SnapshotError("zstd-komprimierter Snapshot, aber zstandard nicht installiert")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == COMPRESSION_DEFLATE:
+        return zlib.decompress(data, -15)
+    if compression == COMPRESSION_GZIP:
+        return gzip.decompress(data)
+    if compression == COMPRESSION_NONE:
+        return data
+    raise SnapshotError(f"Unbekannte Kompression: {compression}")
+
+def content_hash(data):
+    """
+    Hash des kanonischen JSON (unabhängig von Kodierung und Kompression).
+    """
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+# ---------------------------------------------------------------------------------------------
+# Positionale Schemas
+# ---------------------------------------------------------------------------------------------
+
+# Felder in fester Reihenfolge (wie build_match / extract_squad sie erzeugen, Hashes aus
+# attach_hashes am Ende). Felder mit Listen von Strings stehen in LIST_FIELDS.
+LINEUP_FIELDS = ("homeTeam", "awayTeam", "homeLogo", "awayLogo", "homeLineup", "awayLineup", "url",
+                 "homeLogoHash", "awayLogoHash")
+SQUAD_FIELDS = ("name", "alternative", "ligainsiderId", "imageUrl", "imageHash")
+LIST_FIELDS = frozenset(("homeLineup", "awayLineup"))
+
+# Aufbau des Datenteils: LAYOUT_GENERIC ist der unveränderte Datenbaum (für alles, was nicht
+# ins Schema passt), die anderen sind Spalten pro Feld
+LAYOUT_GENERIC = 0
+LAYOUT_LINEUPS = 1
+LAYOUT_SQUADS = 2
+
+def build_string_table(strings):
+    """
+    Verschiedene Strings in der Reihenfolge ihres ersten Vorkommens. Die Strings werden Spalte für
+    Spalte gesammelt; sind alle einmalig, ist die Tabelle damit genau die Index-Spalte in Klartext.
+    """
+    return list(dict.fromkeys(strings))
+
+def _fits(records, fields):
+    for record in records:
+        if not isinstance(record, dict):
+            return False
+        for key, value in record.items():
+            if key not in fields:
+                return False
+            if key in LIST_FIELDS:
+                if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                    return False
+            elif value is not None and not isinstance(value, str):
+                return False
+    return True
+
+def _layout_for(data):
+    if isinstance(data, list) and _fits(data, LINEUP_FIELDS):
+        return LAYOUT_LINEUPS
+    if (isinstance(data, dict) and all(isinstance(players, list) for players in data.values())
+            and _fits([player for players in data.values() for player in players], SQUAD_FIELDS)):
+        return LAYOUT_SQUADS
+    return LAYOUT_GENERIC
+
+def _index_typecode(strings):
+    # Indizes 0..len(strings): ein Byte bis 255 Strings, sonst zwei bzw. vier
+    if len(strings) <= 0xff:
+        return 'B'
+    return 'H' if len(strings) <= 0xffff else 'I'
+
+def _pack_indexes(indexes, strings):
+    column = array.array(_index_typecode(strings), indexes)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+def _unpack_indexes(blob, strings):
+    column = array.array(_index_typecode(strings))
+    column.frombytes(blob)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+def _encode_records(records, fields, strings):
+    """
+    Spalten der Datensätze: [Anzahl, Feldmaske(n), Werte pro Feld, Listenlängen, Indizes].
+    Die Feldmaske hat ein Bit pro Schema-Feld; haben alle Datensätze dieselben Felder (der
+    Normalfall), steht sie einmal da, sonst als Liste pro Datensatz. Alle Strings stehen Feld für
+    Feld in Schema-Reihenfolge als eine typisierte Spalte von Indizes in die String-Tabelle
+    (+1, 0 = None, little-endian); Listenfelder haben zusätzlich die Länge jeder Liste. Kommt jeder
+    String genau einmal vor (Normalfall bei Aufstellungen), ist die Tabelle selbst die Spalte und
+    die Indizes entfallen (None).
+    """
+    masks = [sum(1 << fields.index(key) for key in record) for record in records]
+    counts, lengths, values = [], [], []
+    for field in fields:
+        column = [record[field] for record in records if field in record]
+        if field in LIST_FIELDS:
+            lengths.append([len(value) for value in column])
+            column = [text for value in column for text in value]
+        counts.append(len(column))
+        values.extend(column)
+    if values == strings:
+        indexes = None
+    else:
+        index = {text: position for position, text in enumerate(strings, 1)}
+        indexes = _pack_indexes([0 if value is None else index[value] for value in values], strings)
+    presence = masks if len(set(masks)) > 1 else (masks[0] if masks else 0)
+    return [len(records), presence, counts, lengths, indexes]
+
+def _decode_records(encoded, fields, strings):
+    size, presence, counts, lengths, indexes = encoded
+    if indexes is None:
+        flat = strings
+    else:
+        table = [None] + strings
+        indexes = _unpack_indexes(indexes, strings)
+        # Ein itemgetter über alle Indizes (liefert bei genau einem Index keinen Tupel)
+        flat = list(operator.itemgetter(*indexes)(table)) if len(indexes) > 1 else [table[i] for i in indexes]
+    # Spaltenweise füllen ist schneller als dict(zip(...)) pro Zeile
+    records = [{} for _ in range(size)]
+    start = 0
+    list_lengths = iter(lengths)
+    for bit, (field, count) in enumerate(zip(fields, counts)):
+        if isinstance(presence, int):
+            owners = records if presence >> bit & 1 else ()
+        else:
+            owners = [record for record, mask in zip(records, presence) if mask >> bit & 1]
+        if field in LIST_FIELDS:
+            end = start
+            for record, length in zip(owners, next(list_lengths)):
+                record[field] = flat[end:end + length]
+                end += length
+        else:
+            for record, value in zip(owners, flat[start:start + count]):
+                record[field] = value
+        start += count
+    return records
+
+def _strings_of(records, fields):
+    # Spaltenweise in Schema-Reihenfolge, wie _encode_records die Indizes schreibt
+    for field in fields:
+        for record in records:
+            value = record.get(field)
+            if field in LIST_FIELDS:
+                yield from value or ()
+            elif value is not None:
+                yield value
+
+# ---------------------------------------------------------------------------------------------
+# Container
+# ---------------------------------------------------------------------------------------------
+
+def _pack(magic, payload, compression):
+    body = msgpack.packb(payload, use_bin_type=True)
+    compressed = _compress(body, compression)
+    # Kleine Patches werden durch den Kompressions-Header größer, dann unkomprimiert ablegen
+    if len(compressed) >= len(body):
+        compression, compressed = COMPRESSION_NONE, body
+    return magic + bytes((SCHEMA_VERSION, compression)) + compressed
+
+def _unpack(magic, blob):
+    if blob[:4] != magic:
+        raise SnapshotError("Kein Ligainsider-Snapshot bzw. -Patch")
+    version, compression = blob[4], blob[5]
+    if version != SCHEMA_VERSION:
+        raise SnapshotError(f"Schema-Version {version} wird nicht unterstützt (erwartet {SCHEMA_VERSION})")
+    return msgpack.unpackb(_decompress(blob[6:], compression), raw=False, strict_map_key=False, use_list=True)
+
+def encode_snapshot(data, kind="lineups", compression=None):
+    """
+    Kodiert data (JSON-artige Struktur) als Snapshot; kind beschreibt den Inhalt ("lineups", "squads").
+    Payload: [kind, Hash (16 Bytes), Zeitpunkt, Layout, String-Tabelle, Daten].
+    """
+    layout = _layout_for(data)
+    if layout == LAYOUT_LINEUPS:
+        strings = build_string_table(_strings_of(data, LINEUP_FIELDS))
+        body = _encode_records(data, LINEUP_FIELDS, strings)
+    elif layout == LAYOUT_SQUADS:
+        players = [player for squad in data.values() for player in squad]
+        strings = build_string_table(itertools.chain(data, _strings_of(players, SQUAD_FIELDS)))
+        index = {text: position for position, text in enumerate(strings, 1)}
+        body = [[index[team] for team in data], [len(squad) for squad in data.values()],
+                _encode_records(players, SQUAD_FIELDS, strings)]
+    else:
+        strings = []
+        body = data
+    payload = [kind, bytes.fromhex(content_hash(data)), int(time.time()), layout, strings, body]
+    return _pack(SNAPSHOT_MAGIC, payload, default_compression() if compression is None else compression)
+
+def decode_snapshot(blob):
+    """
+    Liefert (kind, hash, data).
+    """
+    kind, digest, _, layout, strings, body = _unpack(SNAPSHOT_MAGIC, blob)
+    if layout == LAYOUT_LINEUPS:
+        data = _decode_records(body, LINEUP_FIELDS, strings)
+    elif layout == LAYOUT_SQUADS:
+        teams, counts, records = body
+        players = _decode_records(records, SQUAD_FIELDS, strings)
+        offsets = list(itertools.accumulate(counts, initial=0))
+        data = {strings[team - 1]: players[begin:end] for team, begin, end in zip(teams, offsets, offsets[1:])}
+    elif layout == LAYOUT_GENERIC:
+        data = body
+    else:
+        raise SnapshotError(f"Unbekanntes Layout: {layout}")
+    return kind, digest.hex(), data
+
+# ---------------------------------------------------------------------------------------------
+# Delta-Patches
+# ---------------------------------------------------------------------------------------------
+
+def diff(old, new, path=()):
+    """
+    Operationen, die old in new überführen: (OP, Pfad, Wert). Dicts und Listen werden rekursiv
+    verglichen, Listen unterschiedlicher Länge über gemeinsamen Anfang plus Anhängen/Kürzen.
+    """
+    if type(old) is not type(new):
+        return [(OP_SET, path, new)]
+    if isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append((OP_DELETE, path + (key,), None))
+        for key, value in new.items():
+            if key not in old:
+                ops.append((OP_SET, path + (key,), value))
+            else:
+                ops.extend(diff(old[key], value, path + (key,)))
+        return ops
+    if isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for position in range(common):
+            ops.extend(diff(old[position], new[position], path + (position,)))
+        if len(new) > common:
+            ops.append((OP_APPEND, path, new[common:]))
+        elif len(old) > common:
+            ops.append((OP_TRUNCATE, path, common))
+        return ops
+    return [] if old == new else [(OP_SET, path, new)]
+
+def _container(root, path):
+    node = root
+    for key in path[:-1]:
+        node = node[key]
+    return node
+
+def apply_ops(data, ops):
+    """
+    Wendet die Operationen auf eine tiefe Kopie von data an und liefert das Ergebnis.
+    """
+    root = {'': json.loads(json.dumps(data))}
+    for op, path, value in ops:
+        path = ('',) + tuple(path)
+        if op == OP_SET:
+            _container(root, path)[path[-1]] = value
+        elif op == OP_DELETE:
+            del _container(root, path)[path[-1]]
+        elif op == OP_APPEND:
+            _container(root, path)[path[-1]].extend(value)
+        elif op == OP_TRUNCATE:
+            del _container(root, path)[path[-1]][value:]
+        else:
+            raise SnapshotError(f"Unbekannte Patch-Operation: {op}")
+    return root['']
+
+def encode_patch(old, new, kind="lineups", compression=None):
+    """
+    Binärer Patch von old nach new. Payload: [kind, Basis-Hash, Ziel-Hash (je 16 Bytes), Operationen];
+    Wiederholungen in Pfaden und Werten fängt die Kompression ab.
+    """
+    ops = [[op, list(path), value] for op, path, value in diff(old, new)]
+    payload = [kind, bytes.fromhex(content_hash(old)), bytes.fromhex(content_hash(new)), ops]
+    return _pack(PATCH_MAGIC, payload, default_compression() if compression is None else compression)
+
+def apply_patch(data, blob, base_hash=None):
+    """
+    Wendet einen Patch auf data an; liefert (neuer Hash, neue Daten). Passt der Basis-Hash
+    nicht, muss der Client den vollständigen Snapshot laden.
+    """
+    _, base, target, ops = _unpack(PATCH_MAGIC, blob)
+    if (base_hash or content_hash(data)) != base.hex():
+        raise SnapshotError("Patch passt nicht zum vorhandenen Stand, vollständigen Snapshot laden")
+    return target.hex(), apply_ops(data, ops)
+
+# ---------------------------------------------------------------------------------------------
+# Ausgabe neben den JSON-Dateien
+# ---------------------------------------------------------------------------------------------
+
+def binary_paths(json_path):
+    stem = os.path.splitext(json_path)[0]
+    return stem + ".bin", stem + ".patch"
+
+def write_binary_outputs(data, json_path, kind="lineups", compression=None):
+    """
+    Schreibt den Snapshot (<name>.bin) und, falls ein vorheriger Snapshot existiert und sich der
+    Inhalt geändert hat, den Patch davon (<name>.patch). Rückgabe: (Snapshot-Pfad, geändert).
+    """
+    snapshot_path, patch_path = binary_paths(json_path)
+    previous = None
+    try:
+        with open(snapshot_path, 'rb') as f:
+            _, previous_hash, previous = decode_snapshot(f.read())
+    except (OSError, SnapshotError, ValueError):
+        previous_hash = None
+    if previous is not None and previous_hash == content_hash(data):
+        return snapshot_path, False
+    if previous is not None:
+        write_if_changed(patch_path, encode_patch(previous, data, kind, compression))
+    return snapshot_path, write_if_changed(snapshot_path, encode_snapshot(data, kind, compression))
+
+def compare_sizes(data, kind="lineups"):
+    """
+    Bytes für pretty JSON, kompaktes JSON, gzip-JSON und den Snapshot (alle verfügbaren Kompressionen).
+    """
+    compact = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sizes = {
+        'json (indent=4)': len(json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')),
+        'json (kompakt)': len(compact),
+        'json + gzip': len(gzip.compress(compact, compresslevel=9, mtime=0)),
+        'snapshot (ohne Kompression)': len(encode_snapshot(data, kind, COMPRESSION_NONE)),
+        'snapshot + deflate': len(encode_snapshot(data, kind, COMPRESSION_DEFLATE)),
+    }
+    if zstandard is not None:
+        sizes['snapshot + zstd'] = len(encode_snapshot(data, kind, COMPRESSION_ZSTD))
+    return sizes
+
+def _best_times(functions, arguments, repeat=15, number=100):
+    """
+    Bestzeit pro Aufruf in ms für jede Funktion. Die Durchläufe wechseln sich ab, damit Last
+    auf der Maschine alle Kandidaten gleich trifft.
+    """
+    best = [float('inf')] * len(functions)
+    for _ in range(repeat):
+        for position, (function, argument) in enumerate(zip(functions, arguments)):
+            started = time.perf_counter()
+            for _ in range(number):
+                function(argument)
+            best[position] = min(best[position], (time.perf_counter() - started) / number)
+    return [seconds * 1000 for seconds in best]
+
+def _load_gzip_json(blob):
+    return json.loads(gzip.decompress(blob))
+
+def _sample_matches():
+    # Aufstellungen aus den Fixtures, auf 9 Spiele verteilt (ohne Netzwerk)
+    from ligainsider_parser import extract_lineup, extract_squad, lineup_names
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    pages = []
+    for name in ("page_dump.html", "partial.html"):
+        with open(os.path.join(script_dir, name), 'rb') as f:
+            pages.append(f.read())
+    names = lineup_names(extract_lineup(pages[0]))
+    squad = extract_squad(pages[0])
+    # Wie am Spieltag: jeder Spieler steht nur in einer Aufstellung
+    matches = [{"homeTeam": f"Heim {index}", "awayTeam": f"Gast {index}",
+                "homeLogo": f"https://cdn.ligainsider.de/images/teams/small/heim-{index}.png",
+                "awayLogo": f"https://cdn.ligainsider.de/images/teams/small/gast-{index}.png",
+                "homeLineup": [f"{name} {2 * index}" for name in names],
+                "awayLineup": [f"{name} {2 * index + 1}" for name in names[::-1]],
+                "url": f"https://www.ligainsider.de/bundesliga/team/heim-{index}/"} for index in range(9)]
+    squads = {f"Team {index}": squad[index:] + squad[:index] for index in range(18)}
+    return matches, squads
+
+def verify():
+    """
+    Roundtrip von Snapshot und Patch (Fixtures plus Randfälle). Schlägt außerdem fehl, wenn der
+    Snapshot nicht kleiner als gzip-JSON ist oder der Patch für eine geänderte Startelf-Position
+    nicht kleiner als gzip-JSON ist. Ohne Zeitmessung (siehe verify_decode_speed).
+    """
+    matches, squads = _sample_matches()
+    ok = True
+    with_hashes = [dict(match, homeLogoHash="ab" * 32, awayLogoHash=None) for match in matches]
+    irregular = [{"awayTeam": "Gast", "homeTeam": "Heim", "homeLineup": []}, {}, dict(matches[0], url=None)]
+    cases = [("lineups", matches), ("lineups", with_hashes), ("lineups", irregular), ("lineups", []),
+             ("squads", squads), ("squads", {"Leer": [], "Team": [{"name": "A", "imageHash": None}]}), ("squads", {}),
+             ("randfälle", {"a": [1, -5, 2 ** 40, 1.5, True, None, "", "ä"], "b": {"1": [], "": {"x": 0}}}),
+             ("randfälle", [{"homeTeam": 1}]), ("randfälle", {"Team": [{"name": "A", "extra": 1}]})]
+    compressions = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_DEFLATE) + ((COMPRESSION_ZSTD,) if zstandard else ())
+    for kind, data in cases:
+        for compression in compressions:
+            decoded_kind, digest, decoded = decode_snapshot(encode_snapshot(data, kind, compression))
+            if decoded != data or decoded_kind != kind or digest != content_hash(data):
+                print(f"❌ Roundtrip {kind} (Kompression {compression}): {decoded!r:.200}")
+                ok = False
+        if _layout_for(data) != LAYOUT_GENERIC and kind == "randfälle":
+            print(f"❌ {data!r} fälschlich im Schema")
+            ok = False
+
+    # Patches: eine geänderte Startelf-Position plus strukturelle Änderungen
+    one_slot = json.loads(json.dumps(matches))
+    one_slot[3]["homeLineup"][5] = "Neuer Spieler"
+    changed = json.loads(json.dumps(one_slot))
+    changed[7]["awayLogo"] = "https://cdn.ligainsider.de/images/teams/small/x-wappen.png"
+    changed[0]["homeLineup"] = changed[0]["homeLineup"][:10]
+    changed.append(dict(changed[1], homeTeam="Nachholspiel"))
+    del changed[2]["url"]
+    for old, new in ((matches, one_slot), (matches, changed), (changed, matches), (matches, matches), (squads, {}),
+                     ([], matches)):
+        blob = encode_patch(old, new)
+        target, result = apply_patch(old, blob)
+        if result != new or target != content_hash(new):
+            print("❌ Patch-Roundtrip")
+            ok = False
+    try:
+        apply_patch(changed, encode_patch(matches, changed))
+        print("❌ Patch auf falschen Stand angewendet")
+        ok = False
+    except SnapshotError:
+        pass
+
+    for kind, data in (("lineups", matches), ("squads", squads)):
+        sizes = compare_sizes(data, kind)
+        baseline = sizes['json (indent=4)']
+        print(f"{kind}: " + ", ".join(f"{name} {size} B ({baseline / size:.1f}x)" for name, size in sizes.items()))
+        blob = encode_snapshot(data, kind)
+        if len(blob) >= sizes['json + gzip']:
+            print(f"❌ {kind}: Snapshot {len(blob)} B nicht kleiner als json + gzip {sizes['json + gzip']} B")
+            ok = False
+
+    gzip_json = compare_sizes(matches)['json + gzip']
+    slot_patch = len(encode_patch(matches, one_slot))
+    print(f"Patch für eine geänderte Startelf-Position: {slot_patch} B, "
+          f"mehrere Änderungen: {len(encode_patch(matches, changed))} B (json + gzip {gzip_json} B)")
+    if slot_patch >= gzip_json:
+        print("❌ Patch nicht kleiner als der komplette gzip-JSON-Stand")
+        ok = False
+    print("✅ Snapshot-Format ok" if ok else "❌ Snapshot-Format fehlerhaft")
+    return ok
+
+def verify_decode_speed():
+    """
+    Zeitmessung für --check: der Snapshot muss schneller dekodieren als gzip-JSON
+    (gzip.decompress + json.loads). Hängt von der Maschine ab, daher nicht Teil von verify().
+    """
+    matches, squads = _sample_matches()
+    ok = True
+    for kind, data in (("lineups", matches), ("squads", squads)):
+        # Gleicher Vergleich wie bei der Größe: beide Seiten komprimiert, ab den Bytes
+        compact = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        blob = encode_snapshot(data, kind)
+        binary_ms, json_ms = _best_times((decode_snapshot, _load_gzip_json),
+                                         (blob, gzip.compress(compact, compresslevel=9, mtime=0)))
+        print(f"{kind}: dekodieren {binary_ms:.3f} ms (Snapshot) vs. {json_ms:.3f} ms (json + gzip)")
+        if binary_ms >= json_ms:
+            print(f"❌ {kind}: Snapshot dekodiert langsamer als JSON")
+            ok = False
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kompakter Binär-Snapshot der Ligainsider-Ausgaben")
+    parser.add_argument('--check', action='store_true',
+                        help="Roundtrip-, Größen- und Geschwindigkeitsprüfung mit den Fixtures")
+    commands = parser.add_subparsers(dest='command')
+    info = commands.add_parser('info', help="Kopf und Größenvergleich eines Snapshots")
+    info.add_argument('path')
+    decode = commands.add_parser('decode', help="Snapshot als JSON ausgeben")
+    decode.add_argument('path')
+    encode = commands.add_parser('encode', help="JSON-Datei als Snapshot (und Patch) daneben schreiben")
+    encode.add_argument('path')
+    encode.add_argument('--kind', default=None, help="Inhalt (Standard: aus dem Dateinamen)")
+    args = parser.parse_args()
+
+    if args.check or args.command is None:
+        ok = verify()
+        sys.exit(0 if verify_decode_speed() and ok else 1)
+    if args.command == 'encode':
+        with open(args.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        kind = args.kind or ("squads" if "squads" in os.path.basename(args.path) else "lineups")
+        path, changed = write_binary_outputs(data, args.path, kind)
+        print(f"{path} {'geschrieben' if changed else 'unverändert'}")
+        sys.exit(0)
+    with open(args.path, 'rb') as f:
+        blob = f.read()
+    kind, digest, data = decode_snapshot(blob)
+    if args.command == 'decode':
+        print(json.dumps(data, ensure_ascii=False, indent=4))
+    else:
+        print(f"{args.path}: {kind}, Schema {blob[4]}, Kompression {blob[5]}, Hash {digest}, {len(blob)} B")
+        for name, size in compare_sizes(data, kind).items():
+            print(f"  {name:<28} {size:>8} B")
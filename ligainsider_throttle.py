@@ -0,0 +1,178 @@
+import asyncio
+import random
+import time
+
+import httpx
+import requests
+
+# Statuscodes, bei denen der Server überlastet ist bzw. drosselt -> später erneut versuchen
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+MAX_RETRIES = 4             # Wiederholungen pro Request (zusätzlich zum ersten Versuch)
+BACKOFF_BASE = 0.5          # Sekunden, verdoppelt sich pro Versuch
+BACKOFF_MAX = 8.0           # Obergrenze für eine einzelne Wartezeit
+DEFAULT_RETRY_BUDGET = 30   # Sekunden für einen Einzelabruf ohne vorgegebene Deadline
+
+# AIMD-Parameter
+INITIAL_LIMIT = 2           # Start-Parallelität, wächst im Slow-Start schnell bis zur Grenze
+DECREASE_FACTOR = 0.5       # Multiplikative Senkung bei Überlast
+LATENCY_TOLERANCE = 2.0     # Latenz-EWMA > Faktor * Basislatenz gilt als Überlast
+LATENCY_SLACK = 0.05        # ... aber erst ab so vielen Sekunden über der Basislatenz
+EWMA_WEIGHT = 0.2
+
+TRANSIENT_ERRORS = (httpx.TransportError, requests.ConnectionError, requests.Timeout)
+
+def backoff_delay(attempt):
+    """
+    Exponentieller Backoff mit vollem Jitter: zufällig zwischen 0 und BASE * 2^attempt.
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def retry_after(response):
+    """
+    Wartezeit aus dem Retry-After Header (nur Sekundenangabe), sonst None.
+    """
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveLimiter:
+    """
+    Begrenzt gleichzeitige Requests mit einer Grenze nach AIMD (wie TCP):
+    pro erfolgreichem Fenster +1, bei 429/5xx, Timeouts oder steigender Latenz halbieren.
+    Wird wie eine Semaphore benutzt: async with limiter: ...
+    """
+
+    def __init__(self, max_limit, min_limit=1, initial=INITIAL_LIMIT):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(max(self.min_limit, min(initial, self.max_limit)))
+        self.slow_start = True
+        self.in_flight = 0
+        self.baseline = None      # kleinste beobachtete Latenz
+        self.latency = None       # EWMA der Latenz
+        self.decreases = 0
+        self.retries = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency):
+        self.latency = latency if self.latency is None else (1 - EWMA_WEIGHT) * self.latency + EWMA_WEIGHT * latency
+        self.baseline = latency if self.baseline is None else min(self.baseline, latency)
+
+        if self.latency > max(self.baseline * LATENCY_TOLERANCE, self.baseline + LATENCY_SLACK):
+            self.on_overload()
+            return
+        # Slow-Start: +1 pro Antwort (verdoppelt sich pro Fenster), danach +1 pro Fenster.
+        # Wartende Requests sehen die neue Grenze beim nächsten Freigeben (__aexit__).
+        self.limit = min(self.max_limit, self.limit + (1 if self.slow_start else 1 / self.limit))
+
+    def on_overload(self):
+        now = time.monotonic()
+        # Höchstens einmal pro Latenz-Fenster senken, sonst kollabiert die Grenze bei einer Fehlerserie
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self.slow_start = False
+        self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+        self.decreases += 1
+        # Überlast macht die bisherige Latenz-Historie wertlos
+        self.latency = self.baseline
+
+    def summary(self):
+        return (f"Parallelität {int(self.limit)}/{self.max_limit}, "
+                f"{self.decreases} Drosselungen, {self.retries} Wiederholungen")
+
+async def request_with_retry_async(send, limiter=None, deadline_at=None):
+    """
+    Führt send() (liefert eine httpx-Response) mit Wiederholungen aus. Jeder Versuch belegt einen
+    Platz im Limiter und meldet Latenz bzw. Überlast zurück; gewartet wird außerhalb des Limiters.
+    Ist das Zeitbudget (deadline_at, time.monotonic()) erschöpft, zählt der letzte Versuch.
+    """
+    if deadline_at is None:
+        deadline_at = time.monotonic() + DEFAULT_RETRY_BUDGET
+
+    attempt = 0
+    while True:
+        response = None
+        error = None
+        async with (limiter or _NO_LIMIT):
+            started = time.monotonic()
+            try:
+                response = await send()
+            except TRANSIENT_ERRORS as e:
+                error = e
+            elapsed = time.monotonic() - started
+            if limiter is not None:
+                if error is None and response.status_code not in RETRY_STATUS:
+                    limiter.on_success(elapsed)
+                else:
+                    limiter.on_overload()
+
+        if error is None and response.status_code not in RETRY_STATUS:
+            return response
+
+        delay = retry_after(response)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        if attempt >= MAX_RETRIES or time.monotonic() + delay >= deadline_at:
+            if error is not None:
+                raise error
+            return response
+
+        attempt += 1
+        if limiter is not None:
+            limiter.retries += 1
+        await asyncio.sleep(delay)
+
+def request_with_retry(send, deadline_at=None):
+    """
+    Synchrone Variante für requests (ohne Limiter, die Einzelabrufe laufen nacheinander).
+    """
+    if deadline_at is None:
+        deadline_at = time.monotonic() + DEFAULT_RETRY_BUDGET
+
+    attempt = 0
+    while True:
+        response = None
+        error = None
+        try:
+            response = send()
+        except TRANSIENT_ERRORS as e:
+            error = e
+
+        if error is None and response.status_code not in RETRY_STATUS:
+            return response
+
+        delay = retry_after(response)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        if attempt >= MAX_RETRIES or time.monotonic() + delay >= deadline_at:
+            if error is not None:
+                raise error
+            return response
+
+        attempt += 1
+        time.sleep(delay)
+
+class _NoLimit:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+_NO_LIMIT = _NoLimit()
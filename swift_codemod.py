@@ -0,0 +1,598 @@
+"""
+Codemods für die Swift-Quellen: ein Durchlauf pro Datei, alle Transformationen auf einmal.
+
+Ersetzt die Einweg-Skripte (patch_view*.py, fix_transfer_view.py, move_props_to_filtersheet.py,
+refactor_search.py, fix_ligainsider*.py), die Klammern per str.find zählten und blind
+ersetzten. Hier zerlegt ein Swift-Tokenizer die Datei einmal (Strings inkl. Interpolation,
+mehrzeilige und Raw-Strings, verschachtelte Kommentare); Klammerpaare und Typ-/Member-
+Grenzen kommen aus den Tokens. Jede registrierte Transformation liefert nur Edits
+(Start, Ende, Text) auf dem Original; überlappende Edits oder ein danach unausgeglichenes
+Klammerbild verwerfen die ganze Datei.
+
+Dateien laufen parallel in einem Prozess-Pool. Dateien, die mit denselben Transformationen
+schon einmal ohne Änderung durchliefen, werden über ihren Inhalts-Hash übersprungen.
+Standard ist Dry-Run mit Unified Diff; --write schreibt.
+
+    python swift_codemod.py --list
+    python swift_codemod.py -t filter-sheet-bindings KickbaseCore/Sources
+    python swift_codemod.py -t search-find-range --write KickbaseCore/Sources
+"""
+import argparse
+import difflib
+import fnmatch
+import hashlib
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(SCRIPT_DIR, ".swift_codemod_cache.json")
+
+# ---------------------------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------------------------
+
+class Token:
+    __slots__ = ("kind", "start", "end")
+
+    def __init__(self, kind, start, end):
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"<{self.kind} {self.start}:{self.end}>"
+
+IDENT_RE = re.compile(r'[@#$]?[A-Za-z_][A-Za-z0-9_]*|\$[0-9]+|`[^`\n]+`')
+NUMBER_RE = re.compile(r'0[xob][0-9a-fA-F_]+|[0-9][0-9_]*(?:\.[0-9][0-9_]*)?(?:[eE][+-]?[0-9]+)?')
+SPACE_RE = re.compile(r'[ \t\f\r]+')
+OPERATOR_RE = re.compile(r'[-+*/=<>!&|^~?%.]+')
+PUNCTUATION = set("{}()[],:;")
+OPEN = {"{": "}", "(": ")", "[": "]"}
+CLOSE = {"}": "{", ")": "(", "]": "["}
+TRIVIA = ("space", "newline", "comment")
+
+def _skip_block_comment(text, i):
+    # Swift-Blockkommentare dürfen verschachtelt sein
+    depth = 0
+    length = len(text)
+    while i < length:
+        if text.startswith("/*", i):
+            depth += 1
+            i += 2
+        elif text.startswith("*/", i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    return length
+
+def _skip_interpolation(text, i):
+    """
+    i zeigt hinter '\\(' ; liefert die Position hinter der schließenden Klammer.
+    """
+    depth = 1
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"' or (char == '#' and _string_start(text, i)):
+            i = _skip_string(text, i)
+            continue
+        if text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline < 0 else newline
+            continue
+        if text.startswith("/*", i):
+            i = _skip_block_comment(text, i)
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return length
+
+def _string_start(text, i):
+    j = i
+    while j < len(text) and text[j] == '#':
+        j += 1
+    return j < len(text) and text[j] == '"'
+
+def _skip_string(text, i):
+    """
+    Liefert das Ende eines String-Literals ab i ("...", \"\"\"...\"\"\", #"..."#).
+    """
+    hashes = 0
+    while text[i] == '#':
+        hashes += 1
+        i += 1
+    multiline = text.startswith('"""', i)
+    i += 3 if multiline else 1
+    closing = ('"""' if multiline else '"') + '#' * hashes
+    escape = '\\' + '#' * hashes
+    length = len(text)
+    while i < length:
+        if text.startswith(escape, i):
+            i += len(escape)
+            if i < length and text[i] == '(':
+                i = _skip_interpolation(text, i + 1)
+            else:
+                i += 1
+            continue
+        if text.startswith(closing, i):
+            return i + len(closing)
+        if text[i] == '\n' and not multiline:
+            return i
+        i += 1
+    return length
+
+def tokenize(text):
+    tokens = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        start = i
+        if char == '\n':
+            kind, i = "newline", i + 1
+        elif char in " \t\f\r":
+            kind, i = "space", SPACE_RE.match(text, i).end()
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            kind, i = "comment", (length if newline < 0 else newline)
+        elif text.startswith("/*", i):
+            kind, i = "comment", _skip_block_comment(text, i)
+        elif char == '"' or (char == '#' and _string_start(text, i)):
+            kind, i = "string", _skip_string(text, i)
+        elif char in PUNCTUATION:
+            kind, i = "punct", i + 1
+        elif char.isdigit():
+            kind, i = "number", NUMBER_RE.match(text, i).end()
+        else:
+            match = IDENT_RE.match(text, i)
+            if match:
+                kind, i = "ident", match.end()
+            else:
+                match = OPERATOR_RE.match(text, i)
+                kind, i = ("op", match.end()) if match else ("other", i + 1)
+        tokens.append(Token(kind, start, i))
+    return tokens
+
+# ---------------------------------------------------------------------------------------------
+# Quelltext-Modell
+# ---------------------------------------------------------------------------------------------
+
+TYPE_KEYWORDS = ("struct", "class", "enum", "extension", "actor", "protocol")
+MEMBER_KEYWORDS = ("var", "let", "func", "init", "subscript", "struct", "class", "enum", "typealias", "case")
+MODIFIERS = {"private", "fileprivate", "internal", "public", "open", "static", "final", "override",
+             "lazy", "weak", "unowned", "mutating", "nonmutating", "nonisolated", "dynamic", "convenience",
+             "required", "indirect"}
+
+class SwiftSource:
+    """
+    Tokens einer Datei, code = Indizes der Nicht-Trivia-Tokens, pairs = Klammerpaare
+    (Index in code -> Index in code).
+    """
+
+    def __init__(self, text, path=""):
+        self.text = text
+        self.path = path
+        self.tokens = tokenize(text)
+        self.code = [i for i, token in enumerate(self.tokens) if token.kind not in TRIVIA]
+        self.pairs = {}
+        self.balanced = True
+        stack = []
+        for position, index in enumerate(self.code):
+            value = self.value(position)
+            if value in OPEN and self.tokens[index].kind == "punct":
+                stack.append(position)
+            elif value in CLOSE and self.tokens[index].kind == "punct":
+                if not stack or self.value(stack[-1]) != CLOSE[value]:
+                    self.balanced = False
+                    continue
+                opening = stack.pop()
+                self.pairs[opening] = position
+                self.pairs[position] = opening
+        if stack:
+            self.balanced = False
+
+    def value(self, position):
+        token = self.tokens[self.code[position]]
+        return self.text[token.start:token.end]
+
+    def start(self, position):
+        return self.tokens[self.code[position]].start
+
+    def end(self, position):
+        return self.tokens[self.code[position]].end
+
+    def find(self, pattern, begin=0, end=None):
+        """
+        Positionen (in code), an denen die Token-Folge von pattern beginnt; Leerraum und
+        Kommentare zählen nicht, Strings und Kommentare werden nie durchsucht.
+        """
+        wanted = [pattern[t.start:t.end] for t in tokenize(pattern) if t.kind not in TRIVIA]
+        end = len(self.code) if end is None else end
+        for position in range(begin, end - len(wanted) + 1):
+            if all(self.value(position + k) == wanted[k] for k in range(len(wanted))):
+                yield position
+
+    def block_after(self, position):
+        """
+        Position der ersten '{' ab position und ihre schließende Klammer.
+        """
+        for current in range(position, len(self.code)):
+            if self.value(current) == "{":
+                return current, self.pairs.get(current)
+        return None, None
+
+    def type_body(self, name):
+        """
+        (öffnende, schließende) Klammer des Rumpfs von struct/class/enum/extension name.
+        """
+        for keyword in TYPE_KEYWORDS:
+            for position in self.find(f"{keyword} {name}"):
+                following = self.value(position + 2) if position + 2 < len(self.code) else ""
+                if following in ("{", ":", "<", "where", "."):
+                    return self.block_after(position)
+        return None, None
+
+    def line_start(self, offset):
+        return self.text.rfind("\n", 0, offset) + 1
+
+    def line_end(self, offset):
+        newline = self.text.find("\n", offset)
+        return len(self.text) if newline < 0 else newline + 1
+
+    def members(self, open_position, close_position):
+        """
+        Direkte Member eines Rumpfs: Liste (Name, Start-Offset, End-Offset), Start inklusive
+        Attributen, Modifiern und unmittelbar darüber stehender Kommentarzeilen, Ende inklusive
+        Zeilenumbruch.
+        """
+        result = []
+        position = open_position + 1
+        while position < close_position:
+            value = self.value(position)
+            if value in OPEN:
+                position = self.pairs.get(position, position) + 1
+                continue
+            if value in MEMBER_KEYWORDS:
+                first = position
+                while first > open_position + 1 and (self.value(first - 1) in MODIFIERS or self.value(first - 1).startswith("@")
+                                                     or (self.value(first - 1) == ")" and self.value(self.pairs.get(first - 1, 0) - 1).startswith("@"))):
+                    first = self.pairs[first - 1] - 1 if self.value(first - 1) == ")" else first - 1
+                name = self.value(position + 1) if value not in ("init", "subscript") else value
+                end = self._member_end(position, close_position)
+                result.append((name, self._leading_comments(self.line_start(self.start(first))), self.line_end(self.end(end))))
+                position = end + 1
+                continue
+            position += 1
+        return result
+
+    def _member_end(self, position, close_position):
+        # Bis zur ersten Rumpf-Klammer (bzw. Zeilenende bei Deklarationen ohne Rumpf)
+        line = self.text.count("\n", 0, self.start(position))
+        current = position + 1
+        last = position
+        while current < close_position:
+            value = self.value(current)
+            if value in MEMBER_KEYWORDS and self.text.count("\n", 0, self.start(current)) > line and value != "case":
+                return last
+            if value == "{":
+                return self.pairs.get(current, current)
+            if value in OPEN:
+                current = self.pairs.get(current, current)
+            last = current
+            current += 1
+        return last
+
+    def _leading_comments(self, offset):
+        # Direkt darüber stehende Kommentarzeilen (ohne Leerzeile dazwischen) gehören zum Member
+        while offset > 0:
+            previous = self.line_start(offset - 1)
+            line = self.text[previous:offset].strip()
+            if not line.startswith("//"):
+                break
+            offset = previous
+        return offset
+
+class Edit:
+    __slots__ = ("start", "end", "text")
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f"<Edit {self.start}:{self.end} {self.text[:20]!r}>"
+
+class CodemodError(Exception):
+    pass
+
+def apply_edits(text, edits):
+    edits = sorted(edits, key=lambda edit: (edit.start, edit.end))
+    for previous, current in zip(edits, edits[1:]):
+        if current.start < previous.end:
+            raise CodemodError(f"überlappende Edits {previous!r} und {current!r}")
+    parts = []
+    cursor = 0
+    for edit in edits:
+        parts.append(text[cursor:edit.start])
+        parts.append(edit.text)
+        cursor = edit.end
+    parts.append(text[cursor:])
+    return "".join(parts)
+
+# ---------------------------------------------------------------------------------------------
+# Bausteine für Transformationen
+# ---------------------------------------------------------------------------------------------
+
+def rename_call(source, method, new_method, labels=None):
+    """
+    .method(...) -> .new_method(...) und Argument-Labels nach labels umbenennen (nur in
+    genau diesen Aufrufen, nie in Strings oder Kommentaren).
+    """
+    edits = []
+    for position in source.find(f".{method}("):
+        edits.append(Edit(source.start(position + 1), source.end(position + 1), new_method))
+        close = source.pairs.get(position + 2)
+        if close is None or not labels:
+            continue
+        current = position + 3
+        while current < close:
+            value = source.value(current)
+            if value in labels and source.value(current + 1) == ":" and source.value(current - 1) in ("(", ","):
+                edits.append(Edit(source.start(current), source.end(current), labels[value]))
+            if value in OPEN:
+                current = source.pairs.get(current, current)
+            current += 1
+    return edits
+
+def replace_block(source, header, new_text):
+    """
+    Ersetzt 'header { ... }' komplett durch new_text (header als Token-Folge, z.B.
+    'Section("Werte-Filter")').
+    """
+    for position in source.find(header):
+        opening, closing = source.block_after(position)
+        if closing is None:
+            continue
+        return [Edit(source.start(position), source.end(closing), new_text)]
+    return []
+
+def insert_member(source, type_name, code, before=None):
+    """
+    Fügt code als Member in type_name ein, vor dem Member before (sonst am Rumpfende).
+    Nichts passiert, wenn der erste Member von code dort schon existiert.
+    """
+    opening, closing = source.type_body(type_name)
+    if closing is None:
+        return []
+    snippet = SwiftSource("struct _ {\n" + code + "\n}")
+    new_names = {name for name, _, _ in snippet.members(*snippet.type_body("_"))}
+    members = source.members(opening, closing)
+    if new_names & {name for name, _, _ in members}:
+        return []
+    offset = source.line_start(source.start(closing))
+    for name, start, _ in members:
+        if name == before:
+            offset = start
+            break
+    return [Edit(offset, offset, code.rstrip("\n") + "\n\n")]
+
+def move_members(source, names, target_type, before=None):
+    """
+    Verschiebt die Member names (samt Kommentaren) aus beliebigen Typen der Datei in target_type.
+    """
+    target_open, target_close = source.type_body(target_type)
+    if target_close is None:
+        return []
+    names = set(names)
+    edits, moved = [], []
+    target_members = source.members(target_open, target_close)
+    for position in range(len(source.code)):
+        if source.value(position) not in TYPE_KEYWORDS:
+            continue
+        opening, closing = source.block_after(position)
+        if closing is None or opening == target_open or source.value(position + 1) == target_type:
+            continue
+        for name, start, end in source.members(opening, closing):
+            if name in names and (start, end) not in [(edit.start, edit.end) for edit in edits]:
+                edits.append(Edit(start, end, ""))
+                moved.append(source.text[start:end])
+    if not moved:
+        return []
+    offset = source.line_start(source.start(target_close))
+    for name, start, _ in target_members:
+        if name == before:
+            offset = start
+            break
+    edits.append(Edit(offset, offset, "".join(block if block.endswith("\n") else block + "\n" for block in moved)))
+    return edits
+
+# ---------------------------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------------------------
+
+TRANSFORMS = {}
+
+def register(name, pattern="*.swift", description=""):
+    """
+    Dekorator: function(source) -> Liste von Edits, angewendet auf Dateien, deren Pfad zu
+    pattern passt (fnmatch auf den Pfad relativ zum Projekt).
+    """
+    def decorator(function):
+        try:
+            version = hashlib.sha1(inspect.getsource(function).encode("utf-8")).hexdigest()[:12]
+        except (OSError, TypeError):
+            version = "0"
+        TRANSFORMS[name] = (function, pattern, description or (function.__doc__ or "").strip().split("\n")[0], version)
+        return function
+    return decorator
+
+@register("search-find-range", "*/Services/LigainsiderService.swift",
+          "refactor_search.py: .range(of:, range:) -> .findRange(of:, in:)")
+def search_find_range(source):
+    return rename_call(source, "range", "findRange", {"range": "in"})
+
+@register("filter-sheet-bindings", "*/TransferRecommendationsView.swift",
+          "patch_view*/fix_transfer_view/move_props_to_filtersheet: Text-Bindings der Filter in FilterSheet")
+def filter_sheet_bindings(source):
+    names = ("maxPriceBinding", "minPointsBinding", "minConfidenceBinding",
+             "maxPriceBindingCompat", "minPointsBindingCompat", "minConfidenceBindingCompat")
+    return move_members(source, names, "FilterSheet", before="filters")
+
+# ---------------------------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------------------------
+
+def signature(names):
+    return hashlib.sha1(",".join(f"{name}@{TRANSFORMS[name][3]}" for name in sorted(names)).encode()).hexdigest()
+
+def content_digest(data, names):
+    return hashlib.sha256(data + signature(names).encode()).hexdigest()
+
+def _load_modules(modules):
+    """
+    Importiert Zusatzmodule mit @register-Transformationen. Läuft das Skript als __main__ (bzw.
+    im spawn-Worker als __mp_main__), zeigt "swift_codemod" auf dieses Modul, damit
+    `from swift_codemod import register` in die laufende Registry einträgt statt in eine Kopie.
+    """
+    sys.modules.setdefault("swift_codemod", sys.modules[__name__])
+    for module in modules:
+        importlib.import_module(module)
+
+def transform_file(path, names, relative, known_digest=None):
+    """
+    Ein Durchlauf über eine Datei. Liefert (Pfad, Digest, neuer Text oder None, Fehler oder None,
+    übersprungen).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = content_digest(data, names)
+    if digest == known_digest:
+        return path, digest, None, None, True
+    active = [name for name in names if fnmatch.fnmatch(relative, TRANSFORMS[name][1])]
+    if not active:
+        return path, digest, None, None, False
+    text = data.decode("utf-8")
+    source = SwiftSource(text, path)
+    edits = []
+    try:
+        for name in active:
+            edits.extend(TRANSFORMS[name][0](source) or [])
+        if not edits:
+            return path, digest, None, None, False
+        result = apply_edits(text, edits)
+        if source.balanced and not SwiftSource(result).balanced:
+            raise CodemodError("Klammern nach dem Umbau nicht mehr ausgeglichen")
+    except CodemodError as error:
+        return path, digest, None, str(error), False
+    return path, digest, (result if result != text else None), None, False
+
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in ("build", "Build", "DerivedData"))
+            files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".swift"))
+    return files
+
+def load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def run(paths, names, write=False, jobs=None, modules=(), cache_path=CACHE_PATH, out=sys.stdout):
+    """
+    Wendet die Transformationen names auf alle Swift-Dateien unter paths an.
+    Liefert (geändert, übersprungen, Fehler).
+    """
+    files = collect_files(paths)
+    cache = load_cache(cache_path) if cache_path else {}
+    relative = {path: os.path.relpath(os.path.abspath(path), SCRIPT_DIR) for path in files}
+    jobs = jobs if jobs is not None else min(os.cpu_count() or 1, 8)
+    args = [(path, names, relative[path], cache.get(relative[path])) for path in files]
+
+    if jobs > 1 and len(files) > 1:
+        # spawn wie in ligainsider_pipeline: Worker importieren Registry und Zusatzmodule neu
+        with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_load_modules, initargs=(list(modules),)) as pool:
+            results = list(pool.map(transform_file, *zip(*args), chunksize=max(1, len(args) // (jobs * 4))))
+    else:
+        results = [transform_file(*arg) for arg in args]
+
+    changed, skipped, failed = [], 0, []
+    for path, digest, result, error, was_skipped in results:
+        key = relative[path]
+        if was_skipped:
+            skipped += 1
+            continue
+        if error:
+            failed.append((path, error))
+            cache.pop(key, None)
+            continue
+        if result is None:
+            cache[key] = digest
+            continue
+        changed.append(path)
+        with open(path, "r", encoding="utf-8") as f:
+            original = f.read()
+        if write:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(result)
+            cache.pop(key, None)
+        else:
+            out.writelines(difflib.unified_diff(original.splitlines(True), result.splitlines(True),
+                                                f"a/{key}", f"b/{key}"))
+
+    if cache_path:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=0, sort_keys=True)
+    return changed, skipped, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Swift-Codemods in einem Durchlauf (Dry-Run mit Diff)")
+    parser.add_argument('paths', nargs='*', default=[os.path.join(SCRIPT_DIR, "KickbaseCore", "Sources")])
+    parser.add_argument('-t', '--transform', action='append', default=[], help="Transformation (mehrfach)")
+    parser.add_argument('-m', '--module', action='append', default=[], help="Modul mit weiteren @register-Transformationen")
+    parser.add_argument('--write', action='store_true', help="Änderungen schreiben statt Diff ausgeben")
+    parser.add_argument('--jobs', type=int, help="Prozesse (Standard: Kerne, max. 8)")
+    parser.add_argument('--no-cache', action='store_true', help="Inhalts-Hash-Cache ignorieren")
+    parser.add_argument('--list', action='store_true', help="Registrierte Transformationen anzeigen")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    _load_modules(args.module)
+    if args.list:
+        for name, (_, pattern, description, _) in sorted(TRANSFORMS.items()):
+            print(f"{name:<24} {pattern:<40} {description}")
+        raise SystemExit(0)
+    unknown = [name for name in args.transform if name not in TRANSFORMS]
+    if unknown or not args.transform:
+        parser.error(f"unbekannte Transformation: {', '.join(unknown)}" if unknown else "mindestens ein --transform angeben")
+
+    changed, skipped, failed = run(args.paths, args.transform, args.write, args.jobs, args.module,
+                                   None if args.no_cache else CACHE_PATH,
+                                   out=sys.stdout)
+    for path, error in failed:
+        print(f"❌ {path}: {error}", file=sys.stderr)
+    verb = "geändert" if args.write else "würden geändert"
+    print(f"{len(changed)} Dateien {verb}, {skipped} unverändert übersprungen, {len(failed)} Fehler", file=sys.stderr)
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Die Skripte liegen flach im Repo-Wurzelverzeichnis
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def fixture_path():
+    def path(name):
+        return os.path.join(ROOT, name)
+    return path
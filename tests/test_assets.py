@@ -0,0 +1,74 @@
+"""
+Bild-Hashes: nur in der Ausgabe eines Laufs mit --assets, nie im LineupManifest.
+"""
+import json
+
+import httpx
+import pytest
+
+import ligainsider_assets
+import ligainsider_cache
+import ligainsider_scraper
+from ligainsider_assets import attach_hashes
+from ligainsider_bench import build_overview
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch, fixture_path):
+    with open(fixture_path("page_dump.html"), "rb") as f:
+        team_page = f.read()
+    overview = build_overview(4)
+
+    def handler(request):
+        path = request.url.path
+        if path.startswith("/bundesliga/spieltage/"):
+            return httpx.Response(200, content=overview)
+        if path.startswith("/bundesliga/team/") or path.endswith("/kader/"):
+            return httpx.Response(200, content=team_page)
+        if path.endswith((".png", ".jpg")):
+            return httpx.Response(200, content=PNG, headers={"Content-Type": "image/png"})
+        return httpx.Response(404)
+
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(ligainsider_cache, "get_cache_dir", lambda: cache_dir)
+    monkeypatch.setattr(ligainsider_assets, "get_cache_dir", lambda: cache_dir)
+    monkeypatch.setattr(ligainsider_assets, "get_manifest_path",
+                        lambda kind='lineups': str(tmp_path / ligainsider_assets.ASSET_MANIFEST_FILES[kind]))
+    monkeypatch.setattr(ligainsider_scraper, "OUTPUT_FILE", str(tmp_path / "ligainsider_lineups.json"))
+    monkeypatch.setattr(ligainsider_scraper, "_transport_factory", lambda limits: httpx.MockTransport(handler))
+    return tmp_path
+
+def _manifest_keys(tmp_path):
+    with open(tmp_path / "cache" / ligainsider_cache.MANIFEST_FILE, encoding="utf-8") as f:
+        text = f.read()
+    return {key for key in ("imageHash", "homeLogoHash", "awayLogoHash") if f'"{key}"' in text}
+
+def test_attach_hashes_copies():
+    squads = {"A": [{"name": "X", "imageUrl": "u1"}, {"name": "Y", "imageUrl": None}]}
+    matches = [{"homeLogo": "l1", "awayLogo": "l2"}]
+    new_matches, new_squads, players = attach_hashes({"u1": "h1", "l1": "h2"}, matches, squads, squads["A"])
+    assert new_matches == [{"homeLogo": "l1", "awayLogo": "l2", "homeLogoHash": "h2", "awayLogoHash": None}]
+    assert [player["imageHash"] for player in new_squads["A"]] == ["h1", None]
+    assert [player["imageHash"] for player in players] == ["h1", None]
+    assert "imageHash" not in squads["A"][0]
+    assert "homeLogoHash" not in matches[0]
+
+@pytest.mark.parametrize("mode", ["lineups", "squads"])
+def test_hashes_not_persisted_in_manifest(scraper, mode):
+    fetch = ligainsider_scraper.fetch_lineups if mode == "lineups" else ligainsider_scraper.fetch_squads
+    output = scraper / ("ligainsider_lineups.json" if mode == "lineups" else "ligainsider_squads.json")
+    index = scraper / ligainsider_scraper.INDEX_FILE
+    key = "homeLogoHash" if mode == "lineups" else "imageHash"
+
+    assert fetch(assets=True) is True
+    assert key in output.read_text(encoding="utf-8")
+    assert "imageHash" in index.read_text(encoding="utf-8")
+    assert (scraper / ligainsider_assets.ASSET_MANIFEST_FILES[mode]).exists()
+    assert _manifest_keys(scraper) == set()
+
+    # Zweiter Lauf ohne Bilder: Seiten kommen aus dem Manifest, Hashes dürfen nicht mitkommen
+    assert fetch(assets=False) is True
+    assert _manifest_keys(scraper) == set()
+    assert key not in output.read_text(encoding="utf-8")
+    assert "imageHash" not in index.read_text(encoding="utf-8")
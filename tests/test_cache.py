@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+import ligainsider_cache
+from ligainsider_cache import ResponseCache, _atomic_write, write_if_changed
+
+TEAM_URL = "https://www.ligainsider.de/bundesliga/team/fc-st-pauli/"
+OTHER_URL = "https://www.ligainsider.de/bundesliga/team/sv-werder-bremen/"
+
+def _index(directory):
+    with open(os.path.join(directory, ligainsider_cache.INDEX_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+def test_lookup_and_conditional_headers(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store(TEAM_URL, b"<html>a</html>", {'ETag': '"v1"', 'Last-Modified': 'Sat, 01 Mar 2025 10:00:00 GMT'})
+    assert cache.lookup(TEAM_URL) == (b"<html>a</html>", True)
+    assert cache.conditional_headers(TEAM_URL) == {'If-None-Match': '"v1"',
+                                                   'If-Modified-Since': 'Sat, 01 Mar 2025 10:00:00 GMT'}
+    cache.save()
+    assert ResponseCache(str(tmp_path)).lookup(TEAM_URL)[0] == b"<html>a</html>"
+
+def test_expired_entry_is_not_fresh(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_rules=[])
+    cache.store(TEAM_URL, b"x", {})
+    cache._entries[TEAM_URL]['stored_at'] -= ligainsider_cache.DEFAULT_TTL + 1
+    assert cache.lookup(TEAM_URL) == (b"x", False)
+
+def test_two_processes_keep_each_others_entries(tmp_path):
+    daemon = ResponseCache(str(tmp_path))
+    cron = ResponseCache(str(tmp_path))
+    daemon.store(TEAM_URL, b"daemon", {})
+    cron.store(OTHER_URL, b"cron", {})
+    daemon.save()
+    cron.save()
+    assert set(_index(str(tmp_path))) == {TEAM_URL, OTHER_URL}
+    # Der zuerst gespeicherte Prozess sieht die Einträge des anderen nach dem nächsten save()
+    daemon.store(TEAM_URL, b"daemon 2", {})
+    daemon.save()
+    assert daemon.lookup(OTHER_URL)[0] == b"cron"
+    assert set(_index(str(tmp_path))) == {TEAM_URL, OTHER_URL}
+
+def test_evicted_entry_is_not_merged_back(tmp_path):
+    first = ResponseCache(str(tmp_path), max_bytes=10)
+    first.store(TEAM_URL, b"12345678", {})
+    first.save()
+    second = ResponseCache(str(tmp_path), max_bytes=10)
+    second.store(OTHER_URL, b"abcdefgh", {})  # verdrängt TEAM_URL
+    second.save()
+    assert set(_index(str(tmp_path))) == {OTHER_URL}
+    assert not os.path.exists(first._body_path(first.key_for(TEAM_URL)))
+
+def test_sweep_removes_old_orphan_bodies_only(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    old = os.path.join(str(tmp_path), "0" * 40 + ".body")
+    fresh = os.path.join(str(tmp_path), "1" * 40 + ".body")
+    for path in (old, fresh):
+        with open(path, 'wb') as f:
+            f.write(b"verwaist")
+    stale = time.time() - ligainsider_cache.ORPHAN_GRACE - 60
+    os.utime(old, (stale, stale))
+    cache.store(TEAM_URL, b"x", {})
+    cache.save()
+    assert not os.path.exists(old)
+    # Kann der Body eines anderen Prozesses sein, dessen Index noch nicht gespeichert ist
+    assert os.path.exists(fresh)
+    assert os.path.exists(cache._body_path(cache.key_for(TEAM_URL)))
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = os.path.join(str(tmp_path), "out.json")
+    _atomic_write(path, b"1")
+    assert write_if_changed(path, b"1") is False
+    assert write_if_changed(path, b"2") is True
+    assert os.listdir(str(tmp_path)) == ["out.json"]
+    assert os.stat(path).st_mode & 0o777 == 0o644
@@ -0,0 +1,45 @@
+"""
+Swift-Codemods: Tokenizer-Edits und Zusatzmodule mit eigenen Transformationen über die CLI.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+
+import swift_codemod
+from swift_codemod import SwiftSource, apply_edits, rename_call
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "swift_codemod.py")
+
+PLUGIN = textwrap.dedent('''
+    from swift_codemod import register, rename_call
+
+    @register("rename-load", "*.swift", "load() -> fetch()")
+    def rename_load(source):
+        return rename_call(source, "load", "fetch")
+''')
+
+def test_rename_call_ignores_strings_and_comments():
+    text = 'let a = x.range(of: "y", range: r) // x.range(of: z, range: r)\nlet s = "x.range(of: q, range: r)"\n'
+    result = apply_edits(text, rename_call(SwiftSource(text), "range", "findRange", {"range": "in"}))
+    assert result.splitlines()[0] == 'let a = x.findRange(of: "y", in: r) // x.range(of: z, range: r)'
+    assert result.splitlines()[1] == text.splitlines()[1]
+
+def test_external_module_with_workers(tmp_path):
+    (tmp_path / "codemod_plugin.py").write_text(PLUGIN, encoding="utf-8")
+    sources = tmp_path / "Sources"
+    sources.mkdir()
+    for index in range(3):
+        (sources / f"File{index}.swift").write_text(f"func f{index}() {{\n    store.load()\n}}\n", encoding="utf-8")
+
+    listed = subprocess.run([sys.executable, SCRIPT, "-m", "codemod_plugin", "--list"], cwd=tmp_path,
+                            capture_output=True, text=True, check=True)
+    assert "rename-load" in listed.stdout
+
+    subprocess.run([sys.executable, SCRIPT, "-m", "codemod_plugin", "-t", "rename-load", "--jobs", "2", "--write",
+                    "--no-cache", str(sources)], cwd=tmp_path, capture_output=True, text=True, check=True)
+    for index in range(3):
+        assert (sources / f"File{index}.swift").read_text(encoding="utf-8") == f"func f{index}() {{\n    store.fetch()\n}}\n"
+
+def test_builtin_transforms_registered():
+    assert {"search-find-range", "filter-sheet-bindings"} <= set(swift_codemod.TRANSFORMS)
@@ -0,0 +1,87 @@
+"""
+Exakter Aufstellungs-Solver gegen Brute-Force und an kleinen Hand-Beispielen.
+"""
+import numpy as np
+import pytest
+
+from kickbase_lineup import FORMATIONS, Candidates, LineupSolver, brute_force, random_players, slot_scores
+
+def _player(player_id, position, average, value, club="1", **fields):
+    player = {"i": player_id, "pos": position, "ap": average, "p": 200, "mv": value, "prc": value, "mvt": 0,
+              "st": 0, "tid": club}
+    player.update(fields)
+    return player
+
+def _full_team(average=50.0, value=1_000_000):
+    # 1-4-4-2 mit gleich starken Spielern
+    counts = FORMATIONS["4-4-2"]
+    return [_player(f"own{position}{slot}", position, average, value)
+            for position, count in zip((1, 2, 3, 4), counts) for slot in range(count)]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(8):
+        team, market = random_players(rng, own=int(rng.integers(8, 14)), market=int(rng.integers(4, 9)), clubs=3)
+        candidates = Candidates.from_players(team, market)
+        formation = str(rng.choice(list(FORMATIONS)))
+        budget = None if rng.random() < 0.2 else int(rng.integers(-candidates.own_value, 20_000_000))
+        club_limit = None if rng.random() < 0.3 else int(rng.integers(1, 3))
+        lineup = LineupSolver(candidates, club_limit).solve(formation, budget)
+        expected = brute_force(candidates, formation, budget, club_limit)
+        if expected is None:
+            assert lineup is None, (formation, budget, club_limit)
+        else:
+            assert lineup.score == pytest.approx(expected, abs=1e-9), (formation, budget, club_limit)
+
+def test_slot_scores():
+    scores = slot_scores([10.0, 10.0, 10.0, 10.0], [2_000_000, -2_000_000, 0, 0], [0, 0, 1, 2], [1, 4, 2, 3])
+    assert list(scores) == pytest.approx([(20 + 2) * 1.2, (20 - 2) * 1.15, 20 - 5, 20 - 2])
+
+def test_buys_market_player_only_when_affordable():
+    team = _full_team()
+    star = _player("star", 4, 200.0, 5_000_000)
+    candidates = Candidates.from_players(team, [star])
+    solver = LineupSolver(candidates)
+    # Kein Geld und kein Verkauf möglich (alle eigenen spielen): der Star passt nicht ins Budget
+    assert "star" not in solver.solve("4-4-2", budget=0).to_dict(candidates)["marketPlayersNeeded"]
+    lineup = solver.solve("4-4-2", budget=5_000_000).to_dict(candidates)
+    assert lineup["marketPlayersNeeded"] == ["star"]
+    # Der verdrängte Stürmer wird verkauft
+    assert lineup["saleProceeds"] == 1_000_000
+
+def test_club_limit_applies_to_market_players():
+    team = _full_team()
+    market = [_player(f"m{index}", 3, 150.0, 100_000, club="9") for index in range(4)]
+    candidates = Candidates.from_players(team, market)
+    lineup = LineupSolver(candidates, max_players_per_team=3).solve("4-4-2")
+    assert len(lineup.to_dict(candidates)["marketPlayersNeeded"]) == 3
+    unlimited = LineupSolver(candidates, max_players_per_team=None).solve("4-4-2")
+    assert len(unlimited.to_dict(candidates)["marketPlayersNeeded"]) == 4
+
+def test_market_prefilter():
+    team = _full_team()
+    market = [_player("injured", 4, 300.0, 1, st=8), _player("few-points", 4, 300.0, 1, p=139),
+              _player("own10", 1, 300.0, 1)]
+    candidates = Candidates.from_players(team, market)
+    assert list(candidates.ids) == [player["i"] for player in team]
+
+def test_incomplete_squad_is_infeasible():
+    team = [player for player in _full_team() if player["pos"] != 1]
+    assert LineupSolver(Candidates.from_players(team)).solve("4-4-2") is None
+
+def test_evaluate_matches_solve():
+    rng = np.random.default_rng(3)
+    team, market = random_players(rng, own=16, market=60, clubs=6)
+    solver = LineupSolver(Candidates.from_players(team, market))
+    budgets = [-5_000_000, 0, 3_000_000, 20_000_000]
+    formations, scores = solver.evaluate(budgets, ["4-4-2", "3-5-2"])
+    for row, formation in enumerate(formations):
+        for column, budget in enumerate(budgets):
+            lineup = solver.solve(formation, budget)
+            if lineup is None:
+                assert np.isnan(scores[row, column])
+            else:
+                assert scores[row, column] == pytest.approx(lineup.score)
+    best = solver.best(20_000_000)
+    assert best.score == pytest.approx(max(solver.solve(formation, 20_000_000).score for formation in FORMATIONS))
@@ -0,0 +1,63 @@
+"""
+Aufstellung aus den gespeicherten Seiten (page_dump.html: komplette Team-Seite,
+partial.html: nach der Legende abgeschnitten).
+"""
+import pytest
+
+from ligainsider_parser import (available_backends, extract_lineup, extract_team_logo, get_backend, lineup_names,
+                                player_slug, set_backend)
+
+PAGES = ["page_dump.html", "partial.html"]
+
+@pytest.fixture(params=PAGES)
+def page(request, fixture_path):
+    with open(fixture_path(request.param), 'rb') as f:
+        return f.read()
+
+def test_lineup_rows_and_players(page):
+    rows = extract_lineup(page)
+    assert [len(row) for row in rows] == [1, 3, 4, 3]
+    assert lineup_names(rows)[:3] == ['Vasilj', 'Dźwigała', 'Wahl']
+    keeper = rows[0][0]
+    assert set(keeper) == {'name', 'alternative', 'ligainsiderId', 'imageUrl'}
+    assert keeper['ligainsiderId'] == player_slug("/" + keeper['ligainsiderId'] + "/")
+    assert len({player['ligainsiderId'] for row in rows for player in row}) == 11
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_agree(page, backend):
+    assert extract_lineup(page, get_backend(backend)) == extract_lineup(page, get_backend("html.parser"))
+
+def test_page_without_lineup():
+    assert extract_lineup(b"<html><body><h1>Kader</h1></body></html>") == []
+
+def test_fallback_without_position_markup():
+    html = ('<h2>VORAUSSICHTLICHE AUFSTELLUNG</h2><p><a href="/nikola-vasilj_13866/">Nikola <b>Vasilj</b></a>'
+            '<a href="/eric-smith_21950/">Eric Smith</a><a href="/eric-smith_21950/">Eric Smith</a></p>'
+            '<p>Spieler stand in der Startelf</p><a href="/danach_1/">Nach der Legende</a>')
+    assert extract_lineup(html) == [[
+        {'name': 'Nikola Vasilj', 'alternative': None, 'ligainsiderId': 'nikola-vasilj_13866', 'imageUrl': None},
+        {'name': 'Eric Smith', 'alternative': None, 'ligainsiderId': 'eric-smith_21950', 'imageUrl': None},
+    ]]
+
+@pytest.mark.parametrize("href, slug", [
+    ("/nikola-vasilj_13866/", "nikola-vasilj_13866"),
+    ("https://www.ligainsider.de/nikola-vasilj_13866/?ref=1", "nikola-vasilj_13866"),
+    ("/bundesliga/team/fc-st-pauli_20/", None),
+    (None, None),
+])
+def test_player_slug(href, slug):
+    assert player_slug(href) == slug
+
+def test_team_logo(fixture_path):
+    with open(fixture_path("page_dump.html"), 'rb') as f:
+        html = f.read()
+    assert extract_team_logo(html) == "https://cdn.ligainsider.de/images/teams/medium/fc-st-pauli-wappen.png"
+
+def test_team_logo_with_unterminated_src():
+    # Das Anführungszeichen von itemprop="name" darf nicht als Ende der URL gelten
+    html = '<img src="https://cdn.ligainsider.de/images/teams/medium/x-wappen.png <h2 itemprop="name">X</h2>'
+    assert extract_team_logo(html) is None
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend("gibt-es-nicht")
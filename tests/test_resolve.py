@@ -0,0 +1,109 @@
+"""
+Zuordnung Kickbase -> Ligainsider: Trefferquote auf synthetischen Kadern, Mehrdeutigkeiten und
+inkrementelle Updates der gespeicherten Tabelle.
+"""
+import collections
+import json
+
+import pytest
+
+from ligainsider_index import normalize
+from ligainsider_resolve import (MANUAL, PLAYER_MAP_VERSION, PlayerMap, SquadTable, align_teams, kickbase_player,
+                                 naive_lookup, resolve, synthetic_market)
+
+SQUADS = {"A": [{"name": "Lukas Müller", "ligainsiderId": "lukas-mueller_1"},
+                {"name": "Jonas Müller", "ligainsiderId": "jonas-mueller_2"},
+                {"name": "Tim Koch", "ligainsiderId": "tim-koch_3"}]}
+
+@pytest.fixture
+def market():
+    return synthetic_market(seed=0)
+
+def _resolve(kickbase):
+    players = [kickbase_player(player) for player in kickbase]
+    table = SquadTable(SQUADS)
+    return resolve(players, table, align_teams(players, table))
+
+def test_kickbase_player_normalizes():
+    assert kickbase_player({'i': 5, 'tid': 3, 'fn': "Joško", 'n': "Gvardiol"}) == ("5", "3", "josko", "gvardiol")
+    assert kickbase_player({'pi': "7", 'teamId': "2", 'ln': "Sané", 'n': "ignoriert"})[3] == "sane"
+
+def test_same_surname_without_first_name_stays_open():
+    result = _resolve([{'i': "1", 'n': "Müller", 'tid': "2"}, {'i': "2", 'n': "Koch", 'tid': "2"}])
+    assert result["2"]["ligainsiderId"] == "tim-koch_3"
+    assert result["1"]["ligainsiderId"] is None
+    assert result["1"]["ambiguous"] is True
+    assert sorted(result["1"]["candidates"]) == ["jonas-mueller_2", "lukas-mueller_1"]
+
+def test_first_name_resolves_the_namesake():
+    # Jonas ist über den Vornamen eindeutig, danach bleibt für den zweiten Müller nur Lukas
+    result = _resolve([{'i': "1", 'n': "Müller", 'tid': "2"}, {'i': "3", 'n': "Müller", 'fn': "Jonas", 'tid': "2"}])
+    assert result["3"]["ligainsiderId"] == "jonas-mueller_2"
+    assert result["1"]["ligainsiderId"] == "lukas-mueller_1"
+
+def test_synthetic_market_accuracy(market, tmp_path):
+    squads, kickbase, expected = market
+    table = PlayerMap(str(tmp_path / "map.json"))
+    report = table.update(kickbase, squads)
+    assert report['players'] == len(kickbase)
+    assert report['teams'] == len(squads)
+    correct = sum(table.get(kickbase_id) == ligainsider_id for kickbase_id, ligainsider_id in expected.items())
+    wrong = [kickbase_id for kickbase_id, ligainsider_id in expected.items()
+             if table.get(kickbase_id) not in (None, ligainsider_id)]
+    assert wrong == []
+
+    # Ohne Vornamen nicht unterscheidbar: gleicher Nachname mehrfach im selben Kader
+    surnames = {player['ligainsiderId']: (team, normalize(player['name'].split(' ', 1)[1]))
+                for team, players in squads.items() for player in players}
+    duplicates = {key for key, count in collections.Counter(surnames.values()).items() if count > 1}
+    resolvable = sum(1 for player in kickbase if 'fn' in player or surnames[expected[player['pi']]] not in duplicates)
+    assert correct >= 0.97 * resolvable
+
+    naive = naive_lookup([kickbase_player(player) for player in kickbase], squads)
+    assert correct > sum(naive[kickbase_id] == ligainsider_id for kickbase_id, ligainsider_id in expected.items())
+
+def test_unchanged_input_is_skipped(market, tmp_path):
+    squads, kickbase, _ = market
+    table = PlayerMap(str(tmp_path / "map.json"))
+    table.update(kickbase, squads)
+    assert table.save() is True
+    assert PlayerMap(table.path).update(kickbase, squads)['skipped'] is True
+
+def test_incremental_update(market, tmp_path):
+    squads, kickbase, expected = market
+    table = PlayerMap(str(tmp_path / "map.json"))
+    table.update(kickbase, squads)
+    table.save()
+    table = PlayerMap(table.path)
+
+    # Vereinswechsel: ligainsiderId bleibt, das Team wandert mit
+    moved = next(player for player in kickbase if table.get(player['pi']) == expected[player['pi']])
+    old_team = table.players[moved['pi']]['team']
+    new_team = next(team for team in sorted(squads) if team != old_team)
+    player = next(p for p in squads[old_team] if p['ligainsiderId'] == expected[moved['pi']])
+    squads[old_team].remove(player)
+    squads[new_team].append(player)
+    moved['tid'] = next(tid for tid, team in table.teams.items() if team == new_team)
+    # Neuzugang und manueller Eintrag
+    squads[new_team].append({'name': "Neuer Zugang", 'alternative': None, 'ligainsiderId': "neuer-zugang_99999"})
+    kickbase.append({'pi': "99999", 'n': "Zugang", 'fn': "Neuer", 'tid': moved['tid']})
+    manual_id = kickbase[5]['pi']
+    table.players[manual_id] = {'ligainsiderId': "manuell_1", 'team': None, 'score': 1.0, 'method': MANUAL,
+                                'ambiguous': False}
+
+    report = table.update(kickbase, squads)
+    assert table.get(moved['pi']) == expected[moved['pi']]
+    assert table.players[moved['pi']]['team'] == new_team
+    assert table.get("99999") == "neuer-zugang_99999"
+    assert table.get(manual_id) == "manuell_1"
+    assert report['new'] >= 1
+    assert report['changed'] == 0
+
+def test_unknown_version_is_rebuilt(tmp_path):
+    path = tmp_path / "map.json"
+    path.write_text(json.dumps({'version': PLAYER_MAP_VERSION + 1, 'players': {"1": {'ligainsiderId': "x"}}}),
+                    encoding="utf-8")
+    assert PlayerMap(str(path)).get("1") is None
+    path.write_text(json.dumps({'version': PLAYER_MAP_VERSION, 'players': {"1": {'ligainsiderId': "x"}}}),
+                    encoding="utf-8")
+    assert PlayerMap(str(path)).get(1) == "x"
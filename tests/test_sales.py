@@ -0,0 +1,71 @@
+"""
+Verkaufsempfehlungen im Batch gegen reference_league() (Liga für Liga wie im Swift-Code).
+"""
+import numpy as np
+import pytest
+
+import kickbase_sales
+from kickbase_sales import (GOAL_BALANCE_BUDGET, GOAL_IMPROVE_POSITION, GOAL_MAX_VALUE, GOAL_RAISE_CAPITAL,
+                            GOAL_REDUCE_RISK, _random_market, _random_players, evaluate_all, prepare,
+                            reference_league)
+
+@pytest.fixture(scope="module")
+def leagues():
+    rng = np.random.default_rng(0)
+    competition = _random_players(rng, 300)
+    shared_market = _random_market(rng, competition, ["0", "1", "2"])
+    specs = []
+    for number in range(24):
+        squad = [dict(p) for p in rng.choice(competition, int(rng.integers(0, 18)), replace=False)]
+        choice = rng.random()
+        market = None if choice < 0.3 else shared_market if choice < 0.6 else _random_market(rng, competition, ["0", "1"])
+        specs.append({"id": f"L{number}", "squad": squad, "market": market,
+                      "budget": int(rng.choice([rng.integers(-40_000_000, 10_000_000), 0, -1])),
+                      "mpst": None if rng.random() < 0.2 else int(rng.integers(0, 4)),
+                      "userId": None if market is None else str(rng.integers(0, 3))})
+    return competition, specs
+
+def _expected(competition, spec):
+    market = spec["market"]
+    if market is None:
+        market = [dict(p, price=p["marketValue"], seller={"id": ""}) for p in competition]
+    return reference_league(spec["squad"], market, spec["budget"], spec["userId"], spec["mpst"])
+
+def _actual(sales):
+    return [(s["playerToSell"]["id"], s["priority"], [(r["player"]["id"], r["score"]) for r in s["replacements"]],
+             s["explanation"]) for s in sales]
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_batch_matches_reference(leagues, workers):
+    competition, specs = leagues
+    pool, indexes, jobs = prepare(competition, specs)
+    # Ligen ohne eigenen Markt teilen sich den Wettbewerb, der gemeinsame Markt einen Index
+    assert len(indexes) < len(specs)
+    results, hits, misses = evaluate_all(pool, indexes, jobs, workers)
+    assert [result["leagueId"] for result in results] == [spec["id"] for spec in specs]
+    assert misses > 0
+    for spec, result in zip(specs, results):
+        recommendations = result["recommendations"]
+        for goal, sales in _expected(competition, spec).items():
+            assert _actual(recommendations[goal]) == sales, (spec["id"], goal)
+        # In Swift Stubs
+        assert recommendations[GOAL_IMPROVE_POSITION] == [] and recommendations[GOAL_MAX_VALUE] == []
+    assert any(result["recommendations"][goal] for result in results
+               for goal in (GOAL_BALANCE_BUDGET, GOAL_REDUCE_RISK, GOAL_RAISE_CAPITAL))
+
+class _NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("Worker-Prozesse gestartet")
+
+def test_small_batches_run_inline(leagues, monkeypatch):
+    competition, specs = leagues
+    pool, indexes, jobs = prepare(competition, specs)
+    monkeypatch.setattr(kickbase_sales, "ProcessPoolExecutor", _NoPool)
+    monkeypatch.setattr(kickbase_sales.os, "cpu_count", lambda: 4)
+    inline, _, _ = evaluate_all(pool, indexes, jobs)
+    assert len(inline) == len(specs)
+
+    # Ab der Schwelle auf allen Kernen
+    monkeypatch.setattr(kickbase_sales, "PARALLEL_MIN_SQUAD_PLAYERS", 1)
+    with pytest.raises(AssertionError, match="Worker-Prozesse"):
+        evaluate_all(pool, indexes, jobs)
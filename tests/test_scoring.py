@@ -0,0 +1,90 @@
+"""
+Vektorisierte Markt-Bewertung gegen die zeilenweise Portierung der Swift-Formeln.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from kickbase_scoring import (FORM_DECLINING, FORM_IMPROVING, RISK_HIGH, RISK_MEDIUM, MarketColumns, _random_market,
+                              _random_squad, _random_stats, reference_score, reference_team_positions, score_market,
+                              stats_from_performances, team_positions, top_recommendations)
+
+def _player(**fields):
+    player = {"id": "1", "position": 3, "number": 12, "averagePoints": 90.0, "totalPoints": 900,
+              "marketValue": 10_000_000, "marketValueTrend": 0, "price": 10_000_000, "status": 0,
+              "seller": {"id": "7"}}
+    player.update(fields)
+    return player
+
+def _score(players, squad=(), user="0"):
+    weak, strong = team_positions(squad)
+    return score_market(MarketColumns(players), weak, strong, current_user_ids=[user])
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_reference_per_player(seed):
+    rng = np.random.default_rng(seed)
+    market = _random_market(rng, 400)
+    squad = _random_squad(rng)
+    stats = _random_stats(rng, market)
+    weak, strong = team_positions(squad)
+    result = score_market(MarketColumns(market).set_stats(stats), weak, strong)
+    ref_weak, ref_strong = reference_team_positions(squad)
+    assert set(np.flatnonzero(weak)) == ref_weak and set(np.flatnonzero(strong)) == ref_strong
+    for index, player in enumerate(market):
+        expected = reference_score(player, ref_weak, ref_strong, stats.get(player["id"]))
+        for key, value in expected.items():
+            assert result[key][index] == pytest.approx(value, abs=1e-9), (player, key)
+
+def test_field_name_variants():
+    short = {"i": "9", "fn": "Max", "ln": "Muster", "pos": 2, "ap": 80.5, "p": 500, "mv": 1, "mvt": -3,
+             "prc": 2_000_000, "st": 4, "sellerId": "u1"}
+    columns = MarketColumns([short])
+    assert (columns.ids[0], columns.names[0], columns.seller_ids[0]) == ("9", "Max Muster", "u1")
+    assert (columns.position[0], columns.average_points[0], columns.total_points[0], columns.price[0],
+            columns.status[0]) == (2, 80.5, 500, 2_000_000, 4)
+
+def test_form_and_risk():
+    result = _score([_player(marketValueTrend=600_000), _player(marketValueTrend=-600_000, status=4),
+                     _player(status=8)])
+    assert result["form"][0] == FORM_IMPROVING
+    assert result["form"][1] == FORM_DECLINING
+    assert result["risk_level"][1] == RISK_HIGH  # angeschlagen und fallend
+    assert result["injury_risk"][1] == RISK_MEDIUM
+    assert result["injury_risk"][2] == RISK_HIGH
+
+def test_weak_position_gets_bonus():
+    squad = [{"position": 1, "totalPoints": 200}] + [{"position": 2, "totalPoints": 200}] * 3 + \
+            [{"position": 4, "totalPoints": 200}]
+    weak, strong = team_positions(squad)
+    assert list(np.flatnonzero(weak)) == [3]  # kein Mittelfeld
+    assert list(np.flatnonzero(strong)) == [1, 2, 4]
+    result = _score([_player(position=3), _player(position=2)], squad)
+    assert result["score"][0] - result["score"][1] == pytest.approx(4.0 - 0.5)
+
+def test_recommendation_filters():
+    result = _score([_player(), _player(seller={"id": "0"}), _player(status=16), _player(averagePoints=69.9)])
+    assert list(result["recommended"]) == [True, False, False, False]
+
+def test_top_recommendations_sorted_per_league():
+    players = [_player(id=str(index), number=[4, 12, 20][index % 3]) for index in range(6)]
+    markets = [MarketColumns(players[:3]), MarketColumns(players[3:])]
+    columns = MarketColumns.concat(markets)
+    weak, strong = team_positions([])
+    result = score_market(columns, np.array([weak, weak]), np.array([strong, strong]))
+    picks = top_recommendations(columns, result, limit=2)
+    assert set(picks) == {0, 1}
+    # Rückennummer: >= 15 +1, >= 10 +0,5, < 5 -1
+    assert [pick["id"] for pick in picks[0]] == ["2", "1"]
+    assert [pick["id"] for pick in picks[1]] == ["5", "4"]
+    assert all(len(league) == 2 for league in picks.values())
+
+def test_stats_from_performance_example(fixture_path):
+    with open(fixture_path("Kickbasehelper/ResponseExamples/PerformanceResponse.json"), encoding='utf-8') as f:
+        performance = json.load(f)
+    season = performance["it"][-1]["ph"]
+    stats = stats_from_performances({"example": performance, "empty": {}})
+    assert stats["example"] == (next(match["day"] for match in season if match.get("cur")),
+                                sum(1 for match in season if match.get("st") in (3, 5)),
+                                sum(1 for match in season if match.get("st") == 5))
+    assert stats["empty"] == (0, 0, 0)
@@ -0,0 +1,93 @@
+"""
+Binär-Snapshot und Patches: Roundtrips, Anwenden auf den richtigen Stand, Größe gegen gzip-JSON.
+"""
+import json
+
+import pytest
+
+import ligainsider_snapshot
+from ligainsider_snapshot import (COMPRESSION_DEFLATE, COMPRESSION_GZIP, COMPRESSION_NONE, COMPRESSION_ZSTD,
+                                  SnapshotError, apply_patch, binary_paths, compare_sizes, content_hash,
+                                  decode_snapshot, encode_patch, encode_snapshot, write_binary_outputs)
+
+COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_DEFLATE] + (
+    [COMPRESSION_ZSTD] if ligainsider_snapshot.zstandard is not None else [])
+
+@pytest.fixture(scope="module")
+def samples():
+    return ligainsider_snapshot._sample_matches()
+
+def _cases(matches, squads):
+    return [
+        ("lineups", matches),
+        ("lineups", [dict(match, homeLogoHash="ab" * 32, awayLogoHash=None) for match in matches]),
+        ("lineups", [{"awayTeam": "Gast", "homeTeam": "Heim", "homeLineup": []}, {}, dict(matches[0], url=None)]),
+        ("lineups", []),
+        ("squads", squads),
+        ("squads", {"Leer": [], "Team": [{"name": "A", "imageHash": None}]}),
+        ("squads", {}),
+        ("generic", {"a": [1, -5, 2 ** 40, 1.5, True, None, "", "ä"], "b": {"1": [], "": {"x": 0}}}),
+        ("generic", [{"homeTeam": 1}]),
+        ("generic", {"Team": [{"name": "A", "extra": 1}]}),
+    ]
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_snapshot_roundtrip(samples, compression):
+    for kind, data in _cases(*samples):
+        decoded_kind, digest, decoded = decode_snapshot(encode_snapshot(data, kind, compression))
+        assert decoded == data, kind
+        assert decoded_kind == kind
+        assert digest == content_hash(data)
+
+def test_generic_data_stays_out_of_the_schema(samples):
+    for kind, data in _cases(*samples):
+        if kind == "generic":
+            assert ligainsider_snapshot._layout_for(data) == ligainsider_snapshot.LAYOUT_GENERIC
+
+def _changed(matches):
+    one_slot = json.loads(json.dumps(matches))
+    one_slot[3]["homeLineup"][5] = "Neuer Spieler"
+    changed = json.loads(json.dumps(one_slot))
+    changed[7]["awayLogo"] = "https://cdn.ligainsider.de/images/teams/small/x-wappen.png"
+    changed[0]["homeLineup"] = changed[0]["homeLineup"][:10]
+    changed.append(dict(changed[1], homeTeam="Nachholspiel"))
+    del changed[2]["url"]
+    return one_slot, changed
+
+def test_patch_roundtrip(samples):
+    matches, squads = samples
+    one_slot, changed = _changed(matches)
+    for old, new in ((matches, one_slot), (matches, changed), (changed, matches), (matches, matches), (squads, {}),
+                     ([], matches)):
+        target, result = apply_patch(old, encode_patch(old, new))
+        assert result == new
+        assert target == content_hash(new)
+
+def test_patch_rejects_wrong_base(samples):
+    matches, _ = samples
+    _, changed = _changed(matches)
+    with pytest.raises(SnapshotError):
+        apply_patch(changed, encode_patch(matches, changed))
+    with pytest.raises(SnapshotError):
+        decode_snapshot(b"XXXX" + encode_snapshot(matches)[4:])
+
+def test_smaller_than_gzip_json(samples):
+    matches, squads = samples
+    for kind, data in (("lineups", matches), ("squads", squads)):
+        assert len(encode_snapshot(data, kind)) < compare_sizes(data, kind)['json + gzip'], kind
+    one_slot, _ = _changed(matches)
+    assert len(encode_patch(matches, one_slot)) < compare_sizes(matches)['json + gzip']
+
+def test_write_binary_outputs(tmp_path, samples):
+    matches, _ = samples
+    json_path = str(tmp_path / "ligainsider_lineups.json")
+    snapshot_path, patch_path = binary_paths(json_path)
+    assert snapshot_path.endswith("ligainsider_lineups.bin") and patch_path.endswith("ligainsider_lineups.patch")
+
+    write_binary_outputs(matches, json_path)
+    one_slot, _ = _changed(matches)
+    write_binary_outputs(one_slot, json_path)
+    with open(snapshot_path, 'rb') as f:
+        assert decode_snapshot(f.read())[2] == one_slot
+    with open(patch_path, 'rb') as f:
+        assert apply_patch(matches, f.read())[1] == one_slot
@@ -0,0 +1,35 @@
+"""
+Kader-Extraktion (--squads) auf der gespeicherten Team-Seite.
+"""
+import pytest
+
+from ligainsider_parser import available_backends, choose_player_image, extract_squad, get_backend
+
+@pytest.fixture
+def page(fixture_path):
+    with open(fixture_path("page_dump.html"), 'rb') as f:
+        return f.read()
+
+def test_squad_players(page):
+    squad = extract_squad(page)
+    assert len(squad) == 29
+    assert squad[0] == {'name': 'Vasilj', 'alternative': None, 'ligainsiderId': 'nikola-vasilj_13866',
+                        'imageUrl': 'https://cdn.ligainsider.de/images/player/team/minor/nikola-vasilj-pauli-25-26.jpg'}
+    assert len({player['ligainsiderId'] for player in squad}) == len(squad)
+
+def test_squad_images_are_player_photos(page):
+    images = [player['imageUrl'] for player in extract_squad(page) if player['imageUrl']]
+    assert images
+    assert not any('wappen' in url or '/nations/' in url for url in images)
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_agree(page, backend):
+    assert extract_squad(page, get_backend(backend)) == extract_squad(page, get_backend("html.parser"))
+
+def test_choose_player_image_skips_flags():
+    assert choose_player_image([
+        "https://cdn.ligainsider.de/images/nations/de.png",
+        "https://example.com/player/x.jpg",
+        "https://cdn.ligainsider.de/images/player/team/minor/x.jpg",
+    ]) == "https://cdn.ligainsider.de/images/player/team/minor/x.jpg"
+    assert choose_player_image(["https://cdn.ligainsider.de/images/teams/small/x-wappen.png"]) is None
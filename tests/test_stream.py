@@ -0,0 +1,70 @@
+"""
+Gestreamtes Parsen der Team-Seiten (LineupStream) gegen extract_lineup und das Stream-Szenario
+des Benchmarks.
+"""
+import pytest
+
+import ligainsider_bench
+import ligainsider_parser
+from ligainsider_parser import LineupStream, extract_lineup, extract_lineup_streaming
+
+@pytest.fixture(params=["page_dump.html", "partial.html"])
+def page(request, fixture_path):
+    with open(fixture_path(request.param), 'rb') as f:
+        return f.read()
+
+@pytest.fixture
+def full_page(fixture_path):
+    with open(fixture_path("page_dump.html"), 'rb') as f:
+        return f.read()
+
+def _chunks(html, size):
+    return [html[start:start + size] for start in range(0, len(html), size)]
+
+@pytest.mark.parametrize("size", [1, 512, 4096, 65536])
+def test_streaming_matches_full_parse(page, size):
+    rows, bytes_read = extract_lineup_streaming(_chunks(page, size))
+    assert rows == extract_lineup(page)
+    # Nach der Legende wird nicht weitergelesen
+    assert bytes_read < len(page) or size >= len(page)
+
+def test_stream_stops_after_legend(full_page):
+    stream = LineupStream()
+    finished = [stream.feed(chunk) for chunk in _chunks(full_page, 4096)]
+    assert finished.index(True) < len(finished) - 1
+    assert stream.done
+    assert stream.bytes_read < len(full_page) // 2
+    assert stream.close() == extract_lineup(full_page)
+    # close() ist idempotent, weitere Blöcke werden ignoriert
+    assert stream.feed(b"<div>") is True
+    assert stream.close() == extract_lineup(full_page)
+
+def test_stream_without_lxml(page, monkeypatch):
+    monkeypatch.setattr(ligainsider_parser, 'lxml', None)
+    rows, _ = extract_lineup_streaming(_chunks(page, 4096))
+    assert rows == extract_lineup(page)
+
+def test_stream_without_lineup():
+    stream = LineupStream()
+    assert stream.feed(b"<html><body>Keine Aufstellung</body></html>") is False
+    assert stream.close() == []
+
+def test_stream_logo(full_page):
+    stream = LineupStream()
+    for chunk in _chunks(full_page, 4096):
+        if stream.feed(chunk):
+            break
+    assert stream.logo == "https://cdn.ligainsider.de/images/teams/medium/fc-st-pauli-wappen.png"
+
+def test_bench_stream_label(monkeypatch):
+    if ligainsider_parser.lxml is not None:
+        assert ligainsider_bench.stream_label() == "lxml-stream"
+    monkeypatch.setattr(ligainsider_parser, 'lxml', None)
+    assert ligainsider_bench.stream_label().endswith("-buffered-stream")
+
+def test_bench_rejects_backend_with_stream():
+    with pytest.raises(SystemExit):
+        ligainsider_bench.parse_args(["--stream", "--parser", ligainsider_parser.available_backends()[0]])
+    with pytest.raises(ValueError):
+        ligainsider_bench.run_benchmark(backends=["lxml"], stream=True)
+    assert ligainsider_bench.parse_args(["--stream"]).stream
@@ -0,0 +1,97 @@
+"""
+Trend-Engine: Fenstersummen gegen polyfit, inkrementelle Updates gegen refresh(), Puffer-Speicherung.
+"""
+import numpy as np
+import pytest
+
+from kickbase_trends import (RaggedHistory, TrendEngine, marketvalue_series, new_points, performance_series,
+                             rolling, state_path, window_sums)
+
+def _series(rng, players=40, days=60):
+    series = {}
+    for index in range(players):
+        length = int(rng.integers(1, days + 1))
+        start = 19000 + int(rng.integers(0, days))
+        values = np.maximum(rng.uniform(5e5, 3e7) + np.cumsum(rng.normal(0, 1.5e5, length)), 5e5).round()
+        series[f"p{index}"] = (list(range(start, start + length)), list(values))
+    return series
+
+def test_from_series_sorts_and_reserves():
+    history = RaggedHistory.from_series({"a": ([3, 1, 2], [30, 10, 20]), "b": ([], [])})
+    x, y = history.series("a")
+    assert list(x) == [1, 2, 3]
+    assert list(y) == [10, 20, 30]
+    assert list(history.capacity) == [8, 8]
+    assert list(history.last_x()) == [3, -np.inf]
+
+def test_window_sums_match_polyfit():
+    series = _series(np.random.default_rng(0))
+    engine = TrendEngine(RaggedHistory.from_series(series), windows=(7, 30))
+    stats = engine.stats(horizon=0.0)
+    for player_id, (x, y) in series.items():
+        i = engine.history.index[player_id]
+        for window in engine.windows:
+            xs, ys = np.asarray(x[-window:], float), np.asarray(y[-window:], float)
+            assert stats[window]["n"][i] == len(xs)
+            assert stats[window]["mean"][i] == pytest.approx(ys.mean())
+            if len(xs) >= 2:
+                slope, _ = np.polyfit(xs - engine.origin, ys, 1)
+                assert stats[window]["slope"][i] == pytest.approx(slope, rel=1e-6, abs=1e-6), (player_id, window)
+
+def test_incremental_add_matches_refresh():
+    rng = np.random.default_rng(1)
+    series = _series(rng)
+    updates = 20
+    cut = {player_id: (x[:max(1, len(x) - updates)], y[:max(1, len(y) - updates)]) for player_id, (x, y) in series.items()}
+    engine = TrendEngine(RaggedHistory.from_series(cut, reserve=0.0))
+    # Alle fehlenden Tage auf einmal; mehrere Punkte pro Spieler laufen in Runden
+    ids, xs, ys = new_points(engine.history, series)
+    assert engine.add(ids, xs, ys) == len(ids)
+    for player_id, (x, y) in series.items():
+        assert list(engine.history.series(player_id)[1]) == y
+
+    incremental = {window: sums.copy() for window, sums in engine.sums.items()}
+    engine.refresh()
+    for window in engine.windows:
+        np.testing.assert_allclose(incremental[window], engine.sums[window], rtol=1e-9, atol=1e-3)
+
+def test_add_replaces_same_day_and_ignores_older_points():
+    engine = TrendEngine(RaggedHistory.from_series({"a": ([1, 2, 3], [10.0, 20.0, 30.0])}), windows=(2, 3))
+    assert engine.add(["a", "a"], [0, 3], [99.0, 35.0]) == 1
+    assert list(engine.history.series("a")[1]) == [10.0, 20.0, 35.0]
+    assert engine.add(["neu"], [5], [1.0]) == 1
+    assert engine.history.series("neu")[1].tolist() == [1.0]
+    sums = {window: engine.sums[window].copy() for window in engine.windows}
+    engine.refresh()
+    for window in engine.windows:
+        np.testing.assert_allclose(sums[window], engine.sums[window])
+
+def test_rolling_mean_per_segment():
+    history = RaggedHistory.from_series({"a": ([1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0]), "b": ([1, 2], [10.0, 20.0])})
+    offsets, rolled = rolling(history, 2)
+    assert list(offsets) == [0, 4, 6]
+    assert rolled["mean"].tolist() == pytest.approx([1.0, 1.5, 2.5, 3.5, 10.0, 15.0])
+    assert rolled["slope"].tolist() == pytest.approx([0.0, 1.0, 1.0, 1.0, 0.0, 10.0])
+
+def test_window_sums_count_short_series():
+    history = RaggedHistory.from_series({"a": ([1, 2], [1.0, 1.0]), "b": ([], [])})
+    assert window_sums(history, 7)[:, 0].tolist() == [2, 0]
+
+def test_response_series():
+    values = marketvalue_series({"1": {"it": [{"dt": 19000, "mv": 5}, {"dt": "x", "mv": 1}]}, "2": None})
+    assert values == {"1": ([19000], [5]), "2": ([], [])}
+    points = performance_series({"1": {"it": [{"ti": "2024/2025", "ph": [{"day": 1, "p": 50}, {"day": 2}]}]}})
+    assert points == {"1": ([2024 * 34], [50])}
+
+def test_state_path():
+    assert state_path("trends") == "trends.npz"
+    assert state_path("trends.npz") == "trends.npz"
+
+def test_save_load_roundtrip(tmp_path):
+    history = RaggedHistory.from_series(_series(np.random.default_rng(2), players=10))
+    path = str(tmp_path / "trends")
+    history.save(path)
+    loaded = RaggedHistory.load(path)
+    assert loaded.ids == history.ids
+    for name in ("starts", "lengths", "capacity", "x", "y"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(history, name))